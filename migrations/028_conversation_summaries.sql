@@ -0,0 +1,33 @@
+-- Migration: Rolling conversation summaries
+-- Stores a per-user summary of conversation turns that no longer fit in the
+-- agent's token-budgeted history window. The summary is folded forward
+-- incrementally: each update merges only messages newer than
+-- summarized_through, it is never recomputed from the full history.
+
+CREATE TABLE IF NOT EXISTS conversation_summaries (
+    user_id VARCHAR(255) PRIMARY KEY REFERENCES users(telegram_id) ON DELETE CASCADE,
+    summary TEXT NOT NULL,
+    summarized_through TIMESTAMPTZ NOT NULL,   -- timestamp of the newest message folded in
+    message_count INTEGER NOT NULL DEFAULT 0,  -- total messages folded in so far
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+-- conversation_history.timestamp is TIMESTAMPTZ (migration 011) and is
+-- compared with summarized_through in Python, so both must be aware.
+-- Converts tables created by an earlier version of this migration.
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'conversation_summaries'
+          AND column_name = 'summarized_through'
+          AND data_type = 'timestamp without time zone'
+    ) THEN
+        ALTER TABLE conversation_summaries
+            ALTER COLUMN summarized_through TYPE TIMESTAMPTZ USING summarized_through AT TIME ZONE 'UTC',
+            ALTER COLUMN updated_at TYPE TIMESTAMPTZ USING updated_at AT TIME ZONE 'UTC';
+    END IF;
+END $$;
+
+COMMENT ON TABLE conversation_summaries IS
+'Rolling summary of conversation_history messages older than the agent context window';
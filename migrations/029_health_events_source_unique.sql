@@ -0,0 +1,19 @@
+-- Migration: Unique source key on health_events
+-- Makes event ingestion idempotent: bulk loads and live inserts use
+-- ON CONFLICT (source_table, source_id) DO NOTHING instead of checking
+-- for an existing row first.
+
+-- Remove duplicates left by earlier non-idempotent runs (keep the oldest row)
+DELETE FROM health_events a
+USING health_events b
+WHERE a.source_id IS NOT NULL
+  AND a.source_table = b.source_table
+  AND a.source_id = b.source_id
+  AND (a.created_at, a.id) > (b.created_at, b.id);
+
+-- Replaces the non-unique lookup index from migration 021
+CREATE UNIQUE INDEX IF NOT EXISTS idx_health_events_source_unique
+ON health_events(source_table, source_id)
+WHERE source_id IS NOT NULL;
+
+DROP INDEX IF EXISTS idx_health_events_source;
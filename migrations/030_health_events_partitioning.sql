@@ -0,0 +1,193 @@
+-- Migration: Monthly range partitions for health_events
+-- Pattern detection, surfacing and the nightly mining job all read
+-- health_events by (user_id, timestamp range). This converts the single
+-- heap table into monthly partitions on timestamp so those reads only touch
+-- the months they ask for, and old months can be detached without a DELETE.
+--
+-- - Parent keeps the same columns and B-tree indexes (created per partition)
+-- - BRIN index on timestamp for range scans that don't filter by user
+-- - Primary key and source-key unique index include timestamp, as required
+--   for unique indexes on a partitioned table
+-- - health_events_default catches rows outside the pre-created months
+-- - ensure_health_events_partitions() / archive_health_events_partitions()
+--   are called by the partition maintenance job (src/scheduler/partition_maintenance.py)
+
+BEGIN;
+
+-- ================================================================
+-- Move the existing table aside
+-- ================================================================
+ALTER TABLE health_events RENAME TO health_events_unpartitioned;
+ALTER TABLE health_events_unpartitioned RENAME CONSTRAINT health_events_pkey TO health_events_unpartitioned_pkey;
+DROP INDEX IF EXISTS idx_health_events_user_time;
+DROP INDEX IF EXISTS idx_health_events_user_type_time;
+DROP INDEX IF EXISTS idx_health_events_metadata;
+DROP INDEX IF EXISTS idx_health_events_source_unique;
+DROP INDEX IF EXISTS idx_health_events_pattern_query;
+
+-- ================================================================
+-- Partitioned table
+-- ================================================================
+CREATE TABLE health_events (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    user_id VARCHAR(255) NOT NULL REFERENCES users(telegram_id) ON DELETE CASCADE,
+    event_type VARCHAR(50) NOT NULL,
+    timestamp TIMESTAMP NOT NULL,
+    metadata JSONB NOT NULL,
+    source_table VARCHAR(50),
+    source_id UUID,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (id, timestamp),
+
+    CONSTRAINT valid_event_type CHECK (
+        event_type IN (
+            'meal',
+            'sleep',
+            'exercise',
+            'symptom',
+            'mood',
+            'stress',
+            'tracker',
+            'custom'
+        )
+    )
+) PARTITION BY RANGE (timestamp);
+
+CREATE TABLE health_events_default PARTITION OF health_events DEFAULT;
+
+-- Detached partitions are moved here (still queryable, dump/drop at will)
+CREATE SCHEMA IF NOT EXISTS health_events_archive;
+
+-- ================================================================
+-- Indexes (created on every partition automatically)
+-- ================================================================
+CREATE INDEX idx_health_events_user_time
+ON health_events(user_id, timestamp DESC);
+
+CREATE INDEX idx_health_events_user_type_time
+ON health_events(user_id, event_type, timestamp DESC);
+
+CREATE INDEX idx_health_events_metadata
+ON health_events USING GIN(metadata jsonb_path_ops);
+
+CREATE INDEX idx_health_events_pattern_query
+ON health_events(user_id, event_type, timestamp DESC)
+INCLUDE (metadata);
+
+-- Events are appended roughly in timestamp order, so a BRIN index is tiny
+-- and lets time-only scans (retention checks, benchmarks, ad-hoc analytics)
+-- skip most of each partition
+CREATE INDEX idx_health_events_timestamp_brin
+ON health_events USING BRIN(timestamp) WITH (pages_per_range = 32);
+
+-- Idempotent ingestion (migration 029); timestamp is part of the key because
+-- it is the partition key. Migration 034 replaces this with a source-key
+-- table, since a re-ingested record can carry a different timestamp.
+CREATE UNIQUE INDEX idx_health_events_source_unique
+ON health_events(source_table, source_id, timestamp)
+WHERE source_id IS NOT NULL;
+
+-- ================================================================
+-- Partition management
+-- ================================================================
+
+-- Create the partition for the month containing p_month (no-op if it exists)
+CREATE OR REPLACE FUNCTION create_health_events_partition(p_month DATE)
+RETURNS BOOLEAN AS $$
+DECLARE
+    v_start DATE := date_trunc('month', p_month)::DATE;
+    v_end DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::DATE;
+    v_name TEXT := 'health_events_' || to_char(v_start, 'YYYY_MM');
+BEGIN
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF health_events FOR VALUES FROM (%L) TO (%L)',
+        v_name, v_start, v_end
+    );
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Make sure partitions exist from the current month through p_months_ahead
+CREATE OR REPLACE FUNCTION ensure_health_events_partitions(p_months_ahead INTEGER DEFAULT 3)
+RETURNS INTEGER AS $$
+DECLARE
+    v_month DATE;
+    v_created INTEGER := 0;
+BEGIN
+    FOR v_month IN
+        SELECT generate_series(
+            date_trunc('month', CURRENT_DATE),
+            date_trunc('month', CURRENT_DATE) + make_interval(months => p_months_ahead),
+            INTERVAL '1 month'
+        )::DATE
+    LOOP
+        IF create_health_events_partition(v_month) THEN
+            v_created := v_created + 1;
+        END IF;
+    END LOOP;
+    RETURN v_created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Detach monthly partitions that end before the retention cutoff and move
+-- them to the health_events_archive schema. Returns the archived names.
+CREATE OR REPLACE FUNCTION archive_health_events_partitions(p_retain_months INTEGER)
+RETURNS SETOF TEXT AS $$
+DECLARE
+    v_cutoff DATE := (date_trunc('month', CURRENT_DATE) - make_interval(months => p_retain_months))::DATE;
+    v_name TEXT;
+BEGIN
+    FOR v_name IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'health_events'::regclass
+          AND c.relname ~ '^health_events_[0-9]{4}_[0-9]{2}$'
+          AND to_date(substring(c.relname FROM '[0-9]{4}_[0-9]{2}$'), 'YYYY_MM') < v_cutoff
+        ORDER BY c.relname
+    LOOP
+        EXECUTE format('ALTER TABLE health_events DETACH PARTITION %I', v_name);
+        EXECUTE format('ALTER TABLE %I SET SCHEMA health_events_archive', v_name);
+        RETURN NEXT v_name;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ================================================================
+-- Copy existing events
+-- ================================================================
+
+-- One partition per month from the oldest event through three months ahead,
+-- so nothing lands in the default partition
+SELECT create_health_events_partition(m::DATE)
+FROM generate_series(
+    date_trunc('month', COALESCE((SELECT MIN(timestamp) FROM health_events_unpartitioned), CURRENT_DATE)),
+    date_trunc('month', CURRENT_DATE) + INTERVAL '3 months',
+    INTERVAL '1 month'
+) AS m;
+
+INSERT INTO health_events
+(id, user_id, event_type, timestamp, metadata, source_table, source_id, created_at)
+SELECT id, user_id, event_type, timestamp, metadata, source_table, source_id, created_at
+FROM health_events_unpartitioned;
+
+DROP TABLE health_events_unpartitioned;
+
+-- ================================================================
+-- Table Comments (Documentation)
+-- ================================================================
+COMMENT ON TABLE health_events IS 'Unified timeline of all user health events, range-partitioned by month on timestamp. Enables cross-domain pattern detection (e.g., food-sleep correlations)';
+COMMENT ON COLUMN health_events.event_type IS 'Type of health event: meal, sleep, exercise, symptom, mood, stress, tracker, custom';
+COMMENT ON COLUMN health_events.timestamp IS 'When the event occurred (user timezone converted to UTC). Partition key';
+COMMENT ON COLUMN health_events.metadata IS 'Event-specific data in JSONB. Schema varies by event_type (meals have calories, sleep has quality rating, etc.)';
+COMMENT ON COLUMN health_events.source_table IS 'Original table name (food_entries, sleep_entries, etc.) for backfill tracking';
+COMMENT ON COLUMN health_events.source_id IS 'Original record UUID. Used for idempotent ingestion (ON CONFLICT on source keys)';
+
+COMMIT;
+
+ANALYZE health_events;
@@ -0,0 +1,117 @@
+-- Migration: Trigram fuzzy matching for food formulas
+-- fuzzy_match_formula() used to load every formula a user owns and score
+-- each one with difflib in Python. This adds pg_trgm indexes on formula
+-- names and keywords and match_formulas_fuzzy(), which scores and ranks a
+-- user's formulas in one round trip. It is the fallback behind the
+-- in-process formula name index (src/services/formula_name_index.py) and
+-- uses the same scoring:
+--
+-- - 1.0 if any keyword appears in the text
+-- - otherwise the best similarity() of the text against the name and each keyword
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Keywords flattened to one lowercase string so they can be trigram-indexed
+CREATE OR REPLACE FUNCTION formula_keywords_text(p_keywords TEXT[])
+RETURNS TEXT AS $$
+    SELECT LOWER(array_to_string(p_keywords, ' '))
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE INDEX IF NOT EXISTS idx_food_formulas_name_trgm
+    ON food_formulas USING GIN (LOWER(name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_food_formulas_keywords_trgm
+    ON food_formulas USING GIN (formula_keywords_text(keywords) gin_trgm_ops);
+
+-- Ranked fuzzy matches for free text, best first (ties go to the most used formula)
+--
+-- Candidates come from two index-backed lookups before scoring:
+-- - trigram matches: name % text (similarity) or text <% keywords (word
+--   similarity), with both thresholds set to p_threshold for this
+--   transaction so the GIN indexes above do the filtering. Word similarity
+--   against the joined keywords is never lower than the similarity to any
+--   single keyword, so no formula that scores >= p_threshold is missed.
+-- - keyword containment (score 1.0), which trigram operators can't express
+CREATE OR REPLACE FUNCTION match_formulas_fuzzy(
+    p_user_id TEXT,
+    p_text TEXT,
+    p_threshold FLOAT DEFAULT 0.6,
+    p_limit INTEGER DEFAULT 5
+)
+RETURNS TABLE (
+    formula_id UUID,
+    name VARCHAR(200),
+    keywords TEXT[],
+    foods JSONB,
+    total_calories INTEGER,
+    total_macros JSONB,
+    times_used INTEGER,
+    match_score FLOAT
+) AS $$
+DECLARE
+    v_text TEXT := LOWER(p_text);
+BEGIN
+    PERFORM set_config('pg_trgm.similarity_threshold', p_threshold::TEXT, true);
+    PERFORM set_config('pg_trgm.word_similarity_threshold', p_threshold::TEXT, true);
+
+    RETURN QUERY
+    WITH candidates AS (
+        SELECT ff.id
+        FROM food_formulas ff
+        WHERE ff.user_id = p_user_id
+          AND (
+              LOWER(ff.name) % v_text
+              OR v_text <% formula_keywords_text(ff.keywords)
+          )
+        UNION
+        SELECT ff.id
+        FROM food_formulas ff
+        WHERE ff.user_id = p_user_id
+          AND EXISTS (
+              SELECT 1 FROM unnest(ff.keywords) k
+              WHERE k <> '' AND strpos(v_text, LOWER(k)) > 0
+          )
+    ),
+    scored AS (
+        SELECT
+            ff.id,
+            ff.name,
+            ff.keywords,
+            ff.foods,
+            ff.total_calories,
+            ff.total_macros,
+            ff.times_used,
+            ff.last_used_at,
+            (
+                CASE
+                    WHEN EXISTS (
+                        SELECT 1 FROM unnest(ff.keywords) k
+                        WHERE k <> '' AND strpos(v_text, LOWER(k)) > 0
+                    ) THEN 1.0
+                    ELSE GREATEST(
+                        similarity(LOWER(ff.name), v_text),
+                        COALESCE((
+                            SELECT MAX(similarity(LOWER(k), v_text))
+                            FROM unnest(ff.keywords) k
+                        ), 0)
+                    )
+                END
+            )::FLOAT AS match_score
+        FROM food_formulas ff
+        JOIN candidates c ON c.id = ff.id
+    )
+    SELECT s.id, s.name, s.keywords, s.foods, s.total_calories, s.total_macros,
+           s.times_used, s.match_score
+    FROM scored s
+    WHERE s.match_score >= p_threshold
+    ORDER BY s.match_score DESC, s.times_used DESC, s.last_used_at DESC
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION match_formulas_fuzzy IS
+'Fuzzy-match free text against a user''s formulas (keyword containment, then trigram similarity to name/keywords), ranked best first';
+
+COMMIT;
@@ -0,0 +1,143 @@
+-- Migration: Incremental meal-group index for formula detection
+-- detect_formula_candidates() used to re-read every food entry in the
+-- look-back window and regroup them in Python on each run. Instead, each
+-- food entry now carries its normalized meal-group key (computed in
+-- src/utils/meal_grouping.py) and meal_group_stats keeps per-user, per-key
+-- counts, a running calorie mean/variance (Welford) and last-seen time,
+-- updated when entries are saved or corrected. Candidate detection is an
+-- indexed read of this table.
+--
+-- Existing entries are keyed by scripts/backfill_meal_groups.py.
+
+BEGIN;
+
+ALTER TABLE food_entries ADD COLUMN IF NOT EXISTS meal_group_key TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_food_entries_meal_group
+    ON food_entries(user_id, meal_group_key, timestamp DESC)
+    WHERE meal_group_key IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS meal_group_stats (
+    user_id VARCHAR(255) NOT NULL REFERENCES users(telegram_id) ON DELETE CASCADE,
+    group_key TEXT NOT NULL,
+    occurrence_count INTEGER NOT NULL DEFAULT 0,
+
+    -- Welford accumulators over entries with non-zero calories
+    calorie_count INTEGER NOT NULL DEFAULT 0,
+    calorie_mean DOUBLE PRECISION NOT NULL DEFAULT 0,
+    calorie_m2 DOUBLE PRECISION NOT NULL DEFAULT 0,
+
+    first_seen_at TIMESTAMPTZ NOT NULL,
+    last_seen_at TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (user_id, group_key),
+    CHECK (occurrence_count >= 0),
+    CHECK (calorie_count >= 0)
+);
+
+-- food_entries.timestamp is TIMESTAMPTZ; tables created before these columns
+-- were switched to match are converted in place (stored values read as UTC)
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'meal_group_stats'
+          AND column_name = 'last_seen_at'
+          AND data_type = 'timestamp without time zone'
+    ) THEN
+        ALTER TABLE meal_group_stats
+            ALTER COLUMN first_seen_at TYPE TIMESTAMPTZ USING first_seen_at AT TIME ZONE 'UTC',
+            ALTER COLUMN last_seen_at TYPE TIMESTAMPTZ USING last_seen_at AT TIME ZONE 'UTC',
+            ALTER COLUMN updated_at TYPE TIMESTAMPTZ USING updated_at AT TIME ZONE 'UTC';
+    END IF;
+END $$;
+
+-- The TIMESTAMP overload couldn't be called with food_entries.timestamp
+DROP FUNCTION IF EXISTS record_meal_group(TEXT, TEXT, INTEGER, TIMESTAMP);
+
+CREATE INDEX IF NOT EXISTS idx_meal_group_stats_candidates
+    ON meal_group_stats(user_id, last_seen_at DESC)
+    INCLUDE (occurrence_count);
+
+-- Add one entry to its meal group
+CREATE OR REPLACE FUNCTION record_meal_group(
+    p_user_id TEXT,
+    p_group_key TEXT,
+    p_calories INTEGER,
+    p_seen_at TIMESTAMPTZ
+)
+RETURNS VOID AS $$
+DECLARE
+    v_has_calories BOOLEAN := COALESCE(p_calories, 0) <> 0;
+    v_calories DOUBLE PRECISION := COALESCE(p_calories, 0);
+    v_seen_at TIMESTAMPTZ := COALESCE(p_seen_at, CURRENT_TIMESTAMP);
+BEGIN
+    INSERT INTO meal_group_stats AS s
+    (user_id, group_key, occurrence_count, calorie_count, calorie_mean, calorie_m2,
+     first_seen_at, last_seen_at)
+    VALUES (
+        p_user_id, p_group_key, 1,
+        CASE WHEN v_has_calories THEN 1 ELSE 0 END,
+        CASE WHEN v_has_calories THEN v_calories ELSE 0 END,
+        0,
+        v_seen_at, v_seen_at
+    )
+    ON CONFLICT (user_id, group_key) DO UPDATE SET
+        occurrence_count = s.occurrence_count + 1,
+        calorie_count = s.calorie_count + CASE WHEN v_has_calories THEN 1 ELSE 0 END,
+        -- mean' = mean + (x - mean) / n'
+        calorie_mean = CASE WHEN v_has_calories
+            THEN s.calorie_mean + (v_calories - s.calorie_mean) / (s.calorie_count + 1)
+            ELSE s.calorie_mean END,
+        -- m2' = m2 + (x - mean) * (x - mean')
+        calorie_m2 = CASE WHEN v_has_calories
+            THEN s.calorie_m2 + (v_calories - s.calorie_mean)
+                 * (v_calories - (s.calorie_mean + (v_calories - s.calorie_mean) / (s.calorie_count + 1)))
+            ELSE s.calorie_m2 END,
+        first_seen_at = LEAST(s.first_seen_at, v_seen_at),
+        last_seen_at = GREATEST(s.last_seen_at, v_seen_at),
+        updated_at = CURRENT_TIMESTAMP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Remove one entry from its meal group (entry corrected into another group
+-- or its calories changed). last_seen_at is not rolled back.
+CREATE OR REPLACE FUNCTION forget_meal_group(
+    p_user_id TEXT,
+    p_group_key TEXT,
+    p_calories INTEGER
+)
+RETURNS VOID AS $$
+DECLARE
+    v_has_calories BOOLEAN := COALESCE(p_calories, 0) <> 0;
+    v_calories DOUBLE PRECISION := COALESCE(p_calories, 0);
+BEGIN
+    UPDATE meal_group_stats s SET
+        occurrence_count = GREATEST(s.occurrence_count - 1, 0),
+        calorie_count = CASE WHEN v_has_calories THEN GREATEST(s.calorie_count - 1, 0) ELSE s.calorie_count END,
+        -- mean' = (n * mean - x) / (n - 1)
+        calorie_mean = CASE
+            WHEN NOT v_has_calories THEN s.calorie_mean
+            WHEN s.calorie_count <= 1 THEN 0
+            ELSE (s.calorie_count * s.calorie_mean - v_calories) / (s.calorie_count - 1) END,
+        -- m2' = m2 - (x - mean) * (x - mean')
+        calorie_m2 = CASE
+            WHEN NOT v_has_calories THEN s.calorie_m2
+            WHEN s.calorie_count <= 1 THEN 0
+            ELSE GREATEST(s.calorie_m2 - (v_calories - s.calorie_mean)
+                 * (v_calories - (s.calorie_count * s.calorie_mean - v_calories) / (s.calorie_count - 1)), 0) END,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE s.user_id = p_user_id AND s.group_key = p_group_key;
+
+    DELETE FROM meal_group_stats
+    WHERE user_id = p_user_id AND group_key = p_group_key AND occurrence_count = 0;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON TABLE meal_group_stats IS 'Per-user meal groups (same foods, similar quantities) with occurrence counts and running calorie statistics. Maintained on food entry save/update; read by formula detection';
+COMMENT ON COLUMN meal_group_stats.calorie_m2 IS 'Welford sum of squared calorie deviations; population variance = calorie_m2 / calorie_count';
+COMMENT ON COLUMN food_entries.meal_group_key IS 'Normalized meal-group key (src/utils/meal_grouping.py); NULL until backfilled';
+
+COMMIT;
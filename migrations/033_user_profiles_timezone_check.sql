@@ -0,0 +1,11 @@
+-- Migration 033: Accept every IANA timezone name in user_profiles
+-- The check from migration 010 only allowed Area/Location names, so
+-- three-part and hyphenated zones (America/Argentina/Buenos_Aires,
+-- America/Port-au-Prince, Etc/GMT+5) failed on insert. Names are still
+-- validated against the tz database by the application before saving.
+
+ALTER TABLE user_profiles DROP CONSTRAINT IF EXISTS valid_timezone;
+
+ALTER TABLE user_profiles
+ADD CONSTRAINT valid_timezone
+CHECK (timezone ~ '^[A-Za-z0-9_+-]+(/[A-Za-z0-9_+-]+)*$');
@@ -0,0 +1,127 @@
+-- Migration 034: Source-key dedupe and partition moves for health_events
+-- Migration 030 had to put timestamp into the unique source key because
+-- unique indexes on a partitioned table must contain the partition key.
+-- That made ingestion idempotent on (source_table, source_id, timestamp)
+-- only: the same source record re-ingested with a different timestamp got
+-- a second event.
+--
+-- - health_event_sources (not partitioned) holds one row per source key.
+--   A BEFORE INSERT trigger on health_events claims the key and skips the
+--   event if it is already taken, so every insert path (INSERT, COPY,
+--   backfills) is idempotent on (source_table, source_id) again.
+-- - create_health_events_partition() moves rows that landed in the default
+--   partition into the new month before attaching it. Creating a partition
+--   over a range the default partition holds rows for used to fail.
+
+-- ================================================================
+-- Source keys
+-- ================================================================
+CREATE TABLE IF NOT EXISTS health_event_sources (
+    source_table VARCHAR(50) NOT NULL,
+    source_id UUID NOT NULL,
+    event_id UUID NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (source_table, source_id)
+);
+
+-- delete_health_event() releases the key of the event it deletes
+CREATE INDEX IF NOT EXISTS idx_health_event_sources_event
+ON health_event_sources(event_id);
+
+-- Remove duplicates that slipped in under the timestamped key (keep the oldest)
+DELETE FROM health_events a
+USING health_events b
+WHERE a.source_id IS NOT NULL
+  AND a.source_table = b.source_table
+  AND a.source_id = b.source_id
+  AND (a.created_at, a.id) > (b.created_at, b.id);
+
+INSERT INTO health_event_sources (source_table, source_id, event_id)
+SELECT source_table, source_id, id
+FROM health_events
+WHERE source_id IS NOT NULL
+ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION claim_health_event_source()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.source_id IS NULL THEN
+        RETURN NEW;
+    END IF;
+
+    INSERT INTO health_event_sources (source_table, source_id, event_id)
+    VALUES (NEW.source_table, NEW.source_id, NEW.id)
+    ON CONFLICT DO NOTHING;
+
+    -- Key already taken: skip the event (like ON CONFLICT DO NOTHING)
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_claim_health_event_source ON health_events;
+CREATE TRIGGER trigger_claim_health_event_source
+BEFORE INSERT ON health_events
+FOR EACH ROW
+EXECUTE FUNCTION claim_health_event_source();
+
+-- Replaced by health_event_sources
+DROP INDEX IF EXISTS idx_health_events_source_unique;
+
+-- ================================================================
+-- Partition creation over rows in the default partition
+-- ================================================================
+CREATE OR REPLACE FUNCTION create_health_events_partition(p_month DATE)
+RETURNS BOOLEAN AS $$
+DECLARE
+    v_start DATE := date_trunc('month', p_month)::DATE;
+    v_end DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::DATE;
+    v_name TEXT := 'health_events_' || to_char(v_start, 'YYYY_MM');
+BEGIN
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    -- Block inserts into the default partition until the month is attached
+    LOCK TABLE health_events_default IN SHARE ROW EXCLUSIVE MODE;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM health_events_default
+        WHERE timestamp >= v_start AND timestamp < v_end
+    ) THEN
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF health_events FOR VALUES FROM (%L) TO (%L)',
+            v_name, v_start, v_end
+        );
+        RETURN TRUE;
+    END IF;
+
+    -- The default partition already holds rows for this month: build the
+    -- partition as a plain table, move the rows over, then attach it.
+    -- The table isn't attached yet, so the rows keep their source keys.
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE health_events INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        v_name
+    );
+    EXECUTE format(
+        'WITH moved AS (
+            DELETE FROM health_events_default
+            WHERE timestamp >= %L AND timestamp < %L
+            RETURNING *
+        )
+        INSERT INTO %I SELECT * FROM moved',
+        v_start, v_end, v_name
+    );
+    EXECUTE format(
+        'ALTER TABLE health_events ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        v_name, v_start, v_end
+    );
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON TABLE health_event_sources IS 'One row per ingested source record (source_table, source_id). Claimed by trigger_claim_health_event_source so health_events ingestion is idempotent across partitions';
+COMMENT ON COLUMN health_events.source_id IS 'Original record UUID. Ingestion is idempotent on (source_table, source_id) via health_event_sources';
@@ -0,0 +1,3 @@
+-- Rollback script for Migration 028: Conversation Summaries
+
+DROP TABLE IF EXISTS conversation_summaries;
@@ -0,0 +1,7 @@
+-- Rollback script for Migration 029: Unique source key on health_events
+
+CREATE INDEX IF NOT EXISTS idx_health_events_source
+ON health_events(source_table, source_id)
+WHERE source_id IS NOT NULL;
+
+DROP INDEX IF EXISTS idx_health_events_source_unique;
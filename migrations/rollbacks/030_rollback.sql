@@ -0,0 +1,47 @@
+-- Rollback script for Migration 030: Monthly range partitions for health_events
+-- Copies attached partitions back into a single table. Partitions already
+-- moved to the health_events_archive schema are left there.
+
+BEGIN;
+
+ALTER TABLE health_events RENAME TO health_events_partitioned;
+ALTER INDEX idx_health_events_user_time RENAME TO idx_health_events_partitioned_user_time;
+ALTER INDEX idx_health_events_user_type_time RENAME TO idx_health_events_partitioned_user_type_time;
+ALTER INDEX idx_health_events_metadata RENAME TO idx_health_events_partitioned_metadata;
+ALTER INDEX idx_health_events_pattern_query RENAME TO idx_health_events_partitioned_pattern_query;
+ALTER INDEX idx_health_events_source_unique RENAME TO idx_health_events_partitioned_source_unique;
+ALTER TABLE health_events_partitioned RENAME CONSTRAINT health_events_pkey TO health_events_partitioned_pkey;
+
+CREATE TABLE health_events (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id VARCHAR(255) NOT NULL REFERENCES users(telegram_id) ON DELETE CASCADE,
+    event_type VARCHAR(50) NOT NULL,
+    timestamp TIMESTAMP NOT NULL,
+    metadata JSONB NOT NULL,
+    source_table VARCHAR(50),
+    source_id UUID,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT valid_event_type CHECK (
+        event_type IN ('meal', 'sleep', 'exercise', 'symptom', 'mood', 'stress', 'tracker', 'custom')
+    )
+);
+
+INSERT INTO health_events
+(id, user_id, event_type, timestamp, metadata, source_table, source_id, created_at)
+SELECT id, user_id, event_type, timestamp, metadata, source_table, source_id, created_at
+FROM health_events_partitioned;
+
+DROP TABLE health_events_partitioned CASCADE;
+
+CREATE INDEX idx_health_events_user_time ON health_events(user_id, timestamp DESC);
+CREATE INDEX idx_health_events_user_type_time ON health_events(user_id, event_type, timestamp DESC);
+CREATE INDEX idx_health_events_metadata ON health_events USING GIN(metadata jsonb_path_ops);
+CREATE INDEX idx_health_events_pattern_query ON health_events(user_id, event_type, timestamp DESC) INCLUDE (metadata);
+CREATE UNIQUE INDEX idx_health_events_source_unique ON health_events(source_table, source_id) WHERE source_id IS NOT NULL;
+
+DROP FUNCTION IF EXISTS archive_health_events_partitions(INTEGER);
+DROP FUNCTION IF EXISTS ensure_health_events_partitions(INTEGER);
+DROP FUNCTION IF EXISTS create_health_events_partition(DATE);
+
+COMMIT;
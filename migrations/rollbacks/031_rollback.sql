@@ -0,0 +1,11 @@
+-- Rollback script for Migration 031: Trigram fuzzy matching for food formulas
+-- pg_trgm is left installed; other objects may depend on it.
+
+BEGIN;
+
+DROP FUNCTION IF EXISTS match_formulas_fuzzy(TEXT, TEXT, FLOAT, INTEGER);
+DROP INDEX IF EXISTS idx_food_formulas_keywords_trgm;
+DROP INDEX IF EXISTS idx_food_formulas_name_trgm;
+DROP FUNCTION IF EXISTS formula_keywords_text(TEXT[]);
+
+COMMIT;
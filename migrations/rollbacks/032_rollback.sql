@@ -0,0 +1,12 @@
+-- Rollback script for Migration 032: Incremental meal-group index for formula detection
+
+BEGIN;
+
+DROP FUNCTION IF EXISTS forget_meal_group(TEXT, TEXT, INTEGER);
+DROP FUNCTION IF EXISTS record_meal_group(TEXT, TEXT, INTEGER, TIMESTAMPTZ);
+DROP FUNCTION IF EXISTS record_meal_group(TEXT, TEXT, INTEGER, TIMESTAMP);
+DROP TABLE IF EXISTS meal_group_stats;
+DROP INDEX IF EXISTS idx_food_entries_meal_group;
+ALTER TABLE food_entries DROP COLUMN IF EXISTS meal_group_key;
+
+COMMIT;
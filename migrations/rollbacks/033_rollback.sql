@@ -0,0 +1,8 @@
+-- Rollback script for Migration 033: Accept every IANA timezone name
+-- Fails while any profile holds a timezone the old check rejects.
+
+ALTER TABLE user_profiles DROP CONSTRAINT IF EXISTS valid_timezone;
+
+ALTER TABLE user_profiles
+ADD CONSTRAINT valid_timezone
+CHECK (timezone ~ '^[A-Za-z_]+/[A-Za-z_]+$|^UTC$');
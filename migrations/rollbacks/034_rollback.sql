@@ -0,0 +1,29 @@
+-- Rollback script for Migration 034: Source-key dedupe for health_events
+-- Restores the timestamped unique source key from migration 030.
+
+DROP TRIGGER IF EXISTS trigger_claim_health_event_source ON health_events;
+DROP FUNCTION IF EXISTS claim_health_event_source();
+DROP TABLE IF EXISTS health_event_sources;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_health_events_source_unique
+ON health_events(source_table, source_id, timestamp)
+WHERE source_id IS NOT NULL;
+
+CREATE OR REPLACE FUNCTION create_health_events_partition(p_month DATE)
+RETURNS BOOLEAN AS $$
+DECLARE
+    v_start DATE := date_trunc('month', p_month)::DATE;
+    v_end DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::DATE;
+    v_name TEXT := 'health_events_' || to_char(v_start, 'YYYY_MM');
+BEGIN
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF health_events FOR VALUES FROM (%L) TO (%L)',
+        v_name, v_start, v_end
+    );
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Meal Group Backfill Script
+
+Computes food_entries.meal_group_key for every food entry and rebuilds
+meal_group_stats (migration 032) from scratch, one user at a time. New and
+corrected entries keep the index up to date on their own; run this once
+after applying the migration, and again whenever the key normalization in
+src/utils/meal_grouping.py changes.
+
+Each user is rebuilt in a single transaction, so the script can be stopped
+and re-run at any time.
+
+Usage:
+    python scripts/backfill_meal_groups.py
+    python scripts/backfill_meal_groups.py --user 123456789
+
+Requirements:
+    - Database connection configured (DATABASE_URL env var)
+    - Migration 032 applied
+"""
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.db.connection import db
+from src.utils.meal_grouping import meal_group_key
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Same aggregates record_meal_group() maintains incrementally
+# (calorie_m2 = population variance * count)
+REBUILD_STATS = """
+    INSERT INTO meal_group_stats
+    (user_id, group_key, occurrence_count, calorie_count, calorie_mean, calorie_m2,
+     first_seen_at, last_seen_at)
+    SELECT
+        user_id,
+        meal_group_key,
+        COUNT(*),
+        COUNT(NULLIF(total_calories, 0)),
+        COALESCE(AVG(NULLIF(total_calories, 0)), 0),
+        COALESCE(VAR_POP(NULLIF(total_calories, 0)) * COUNT(NULLIF(total_calories, 0)), 0),
+        COALESCE(MIN(timestamp), CURRENT_TIMESTAMP),
+        COALESCE(MAX(timestamp), CURRENT_TIMESTAMP)
+    FROM food_entries
+    WHERE user_id = %s AND meal_group_key <> ''
+    GROUP BY user_id, meal_group_key
+"""
+
+
+async def get_user_ids(only_user: Optional[str]) -> List[str]:
+    if only_user:
+        return [only_user]
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute("SELECT DISTINCT user_id FROM food_entries ORDER BY user_id")
+            return [row["user_id"] for row in await cur.fetchall()]
+
+
+async def backfill_user(user_id: str) -> tuple[int, int]:
+    """
+    Key every entry of one user and rebuild their meal_group_stats
+
+    Returns:
+        (entries keyed, meal groups)
+    """
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "SELECT id, foods, meal_group_key FROM food_entries WHERE user_id = %s",
+                (user_id,)
+            )
+            updates = []
+            for row in await cur.fetchall():
+                key = meal_group_key(row["foods"])
+                if key != row["meal_group_key"]:
+                    updates.append((key, row["id"]))
+
+            if updates:
+                await cur.executemany(
+                    "UPDATE food_entries SET meal_group_key = %s WHERE id = %s",
+                    updates
+                )
+
+            await cur.execute("DELETE FROM meal_group_stats WHERE user_id = %s", (user_id,))
+            await cur.execute(REBUILD_STATS, (user_id,))
+            groups = cur.rowcount
+
+            await conn.commit()
+
+    return len(updates), groups
+
+
+async def main(only_user: Optional[str] = None) -> int:
+    """Backfill all users (or one)"""
+    try:
+        await db.init_pool()
+        logger.info("✅ Database connection established")
+    except Exception as e:
+        logger.error(f"❌ Failed to connect to database: {e}")
+        return 1
+
+    try:
+        user_ids = await get_user_ids(only_user)
+        logger.info(f"Backfilling meal groups for {len(user_ids)} users")
+
+        started = time.monotonic()
+        total_keyed = total_groups = 0
+        for i, user_id in enumerate(user_ids, 1):
+            keyed, groups = await backfill_user(user_id)
+            total_keyed += keyed
+            total_groups += groups
+            logger.info(f"[{i}/{len(user_ids)}] {user_id}: {keyed} entries keyed, {groups} meal groups")
+
+        logger.info(
+            f"✅ Backfill complete in {time.monotonic() - started:.1f}s: "
+            f"{total_keyed} entries keyed, {total_groups} meal groups"
+        )
+        return 0
+
+    except Exception as e:
+        logger.error(f"❌ Backfill failed (safe to re-run): {e}", exc_info=True)
+        return 1
+
+    finally:
+        await db.close_pool()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backfill meal_group_key and meal_group_stats")
+    parser.add_argument("--user", help="Only backfill this user id")
+
+    args = parser.parse_args()
+
+    exit_code = asyncio.run(main(args.user))
+    sys.exit(exit_code)
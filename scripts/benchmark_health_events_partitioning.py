@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+health_events Partitioning Benchmark
+
+Compares the query get_health_events() runs against two copies of the
+health_events layout as they grow (default 1M → 10M → 100M rows):
+
+- heap: single table with the migration 021 B-tree indexes
+- partitioned: monthly range partitions with the same B-tree indexes plus
+  the BRIN index on timestamp (migration 030)
+
+For each size it reports p50/p95 latency of 30-day and 90-day per-user
+reads (the pattern detection / nightly mining shape) and of a one-day
+all-users count (the BRIN shape), plus total relation size.
+
+Everything is created in a scratch schema (health_events_bench) and dropped
+at the end unless --keep is passed. Loading 100M rows takes a while and
+needs roughly 60 GB of disk for both layouts; run it against a scratch
+database, not production.
+
+Usage:
+    python scripts/benchmark_health_events_partitioning.py
+    python scripts/benchmark_health_events_partitioning.py --sizes 1000000 10000000
+    python scripts/benchmark_health_events_partitioning.py --sizes 100000 --queries 50 --keep
+
+Requirements:
+    - Database connection configured (DATABASE_URL env var)
+"""
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.db.connection import db
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SCHEMA = "health_events_bench"
+DEFAULT_SIZES = [1_000_000, 10_000_000, 100_000_000]
+LOAD_CHUNK = 1_000_000
+EVENT_TYPES = ["meal", "sleep", "exercise", "symptom", "mood", "stress", "tracker", "custom"]
+
+# Same statement as get_health_events() without an event_type filter
+USER_RANGE_QUERY = """
+    SELECT id, user_id, event_type, timestamp, metadata, source_table, source_id, created_at
+    FROM {table}
+    WHERE user_id = %s
+      AND timestamp >= %s
+      AND timestamp <= %s
+    ORDER BY timestamp DESC
+"""
+
+DAY_COUNT_QUERY = """
+    SELECT COUNT(*) AS count FROM {table}
+    WHERE timestamp >= %s AND timestamp < %s
+"""
+
+COLUMNS = """
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    user_id VARCHAR(255) NOT NULL,
+    event_type VARCHAR(50) NOT NULL,
+    timestamp TIMESTAMP NOT NULL,
+    metadata JSONB NOT NULL,
+    source_table VARCHAR(50),
+    source_id UUID,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+"""
+
+
+async def setup_schema(start: datetime, months: int) -> None:
+    """Create both layouts (empty) in the scratch schema"""
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            await cur.execute(f"CREATE SCHEMA {SCHEMA}")
+
+            await cur.execute(f"CREATE TABLE {SCHEMA}.heap ({COLUMNS}, PRIMARY KEY (id))")
+            await cur.execute(
+                f"CREATE TABLE {SCHEMA}.partitioned ({COLUMNS}, PRIMARY KEY (id, timestamp)) "
+                f"PARTITION BY RANGE (timestamp)"
+            )
+            month = start.replace(day=1)
+            for _ in range(months + 1):
+                next_month = (month + timedelta(days=32)).replace(day=1)
+                await cur.execute(
+                    f"CREATE TABLE {SCHEMA}.partitioned_{month:%Y_%m} "
+                    f"PARTITION OF {SCHEMA}.partitioned FOR VALUES FROM (%s) TO (%s)",
+                    (month, next_month)
+                )
+                month = next_month
+
+            for table in ("heap", "partitioned"):
+                await cur.execute(
+                    f"CREATE INDEX ON {SCHEMA}.{table} (user_id, timestamp DESC)"
+                )
+                await cur.execute(
+                    f"CREATE INDEX ON {SCHEMA}.{table} (user_id, event_type, timestamp DESC)"
+                )
+            await cur.execute(
+                f"CREATE INDEX ON {SCHEMA}.partitioned USING BRIN (timestamp) "
+                f"WITH (pages_per_range = 32)"
+            )
+            await conn.commit()
+
+
+async def load_rows(
+    table: str, first: int, count: int, total: int, users: int, start: datetime, span: timedelta
+) -> None:
+    """
+    Append rows first..first+count with timestamps increasing across the span,
+    like a live table, and users/event types spread round-robin.
+    """
+    step_seconds = span.total_seconds() / total
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            for chunk_start in range(first, first + count, LOAD_CHUNK):
+                chunk_end = min(chunk_start + LOAD_CHUNK, first + count)
+                await cur.execute(
+                    f"""
+                    INSERT INTO {SCHEMA}.{table} (user_id, event_type, timestamp, metadata)
+                    SELECT
+                        'bench_user_' || (g % %s),
+                        (%s::text[])[(1 + g % 8)::int],
+                        %s::timestamp + make_interval(secs => g * %s),
+                        jsonb_build_object('calories', g % 1200, 'seq', g)
+                    FROM generate_series(%s::bigint, %s::bigint - 1) AS g
+                    """,
+                    (users, EVENT_TYPES, start, step_seconds, chunk_start, chunk_end)
+                )
+                await conn.commit()
+                logger.info(f"  {table}: {chunk_end:,} rows loaded")
+            await cur.execute(f"ANALYZE {SCHEMA}.{table}")
+            await conn.commit()
+
+
+async def time_queries(table: str, users: int, start: datetime, end: datetime, queries: int) -> Dict[str, float]:
+    """Run the benchmark query mix against one table; returns latency percentiles in ms"""
+    rng = random.Random(42)
+    results: Dict[str, List[float]] = {"30d": [], "90d": [], "day_count": []}
+
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            for _ in range(queries):
+                user_id = f"bench_user_{rng.randrange(users)}"
+                window_end = start + (end - start) * rng.random()
+                for label, days in (("30d", 30), ("90d", 90)):
+                    began = time.perf_counter()
+                    await cur.execute(
+                        USER_RANGE_QUERY.format(table=f"{SCHEMA}.{table}"),
+                        (user_id, window_end - timedelta(days=days), window_end)
+                    )
+                    await cur.fetchall()
+                    results[label].append((time.perf_counter() - began) * 1000)
+
+                day = start + (end - start) * rng.random()
+                began = time.perf_counter()
+                await cur.execute(
+                    DAY_COUNT_QUERY.format(table=f"{SCHEMA}.{table}"),
+                    (day, day + timedelta(days=1))
+                )
+                await cur.fetchone()
+                results["day_count"].append((time.perf_counter() - began) * 1000)
+
+            await cur.execute(
+                "SELECT pg_total_relation_size(c.oid) "
+                "+ COALESCE((SELECT SUM(pg_total_relation_size(i.inhrelid)) "
+                "            FROM pg_inherits i WHERE i.inhparent = c.oid), 0) AS size "
+                "FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE n.nspname = %s AND c.relname = %s",
+                (SCHEMA, table)
+            )
+            size = (await cur.fetchone())["size"]
+
+    stats = {"size_gb": float(size) / 1024 ** 3}
+    for label, timings in results.items():
+        timings.sort()
+        stats[f"{label}_p50"] = statistics.median(timings)
+        stats[f"{label}_p95"] = timings[int(len(timings) * 0.95) - 1]
+    return stats
+
+
+def print_report(rows: List[Dict]) -> None:
+    """Print results as a markdown table"""
+    print()
+    print("| rows | layout | size GB | 30d p50 | 30d p95 | 90d p50 | 90d p95 | 1-day count p50 | 1-day count p95 |")
+    print("|---:|---|---:|---:|---:|---:|---:|---:|---:|")
+    for r in rows:
+        print(
+            f"| {r['rows']:,} | {r['layout']} | {r['size_gb']:.2f} "
+            f"| {r['30d_p50']:.1f} | {r['30d_p95']:.1f} "
+            f"| {r['90d_p50']:.1f} | {r['90d_p95']:.1f} "
+            f"| {r['day_count_p50']:.1f} | {r['day_count_p95']:.1f} |"
+        )
+    print("\nLatencies in ms.")
+
+
+async def main(sizes: List[int], users: int, months: int, queries: int, keep: bool) -> int:
+    """Grow both layouts through each size and benchmark at every step"""
+    end = datetime(2026, 1, 1)
+    start = end - timedelta(days=30 * months)
+    span = end - start
+
+    await db.init_pool()
+    rows: List[Dict] = []
+    try:
+        logger.info(f"Creating {SCHEMA} ({months} monthly partitions, {users:,} users)")
+        await setup_schema(start, months)
+
+        total = max(sizes)
+        loaded = 0
+        for size in sorted(sizes):
+            logger.info(f"Growing tables to {size:,} rows...")
+            for table in ("heap", "partitioned"):
+                await load_rows(table, loaded, size - loaded, total, users, start, span)
+            loaded = size
+
+            # Only query the part of the timeline that has been filled so far
+            filled_end = start + span * (loaded / total)
+            for table in ("heap", "partitioned"):
+                logger.info(f"Benchmarking {table} at {size:,} rows...")
+                stats = await time_queries(table, users, start, filled_end, queries)
+                rows.append({"rows": size, "layout": table, **stats})
+
+        print_report(rows)
+        return 0
+
+    except Exception as e:
+        logger.error(f"❌ Benchmark failed: {e}", exc_info=True)
+        return 1
+
+    finally:
+        if not keep:
+            async with db.connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+                    await conn.commit()
+        await db.close_pool()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark partitioned vs heap health_events")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Row counts to benchmark at")
+    parser.add_argument("--users", type=int, default=10_000, help="Distinct users in the synthetic data")
+    parser.add_argument("--months", type=int, default=36, help="Months of history the rows are spread over")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per shape per step")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark schema afterwards")
+
+    args = parser.parse_args()
+
+    exit_code = asyncio.run(main(args.sizes, args.users, args.months, args.queries, args.keep))
+    sys.exit(exit_code)
@@ -9,31 +9,40 @@ This script backfills the health_events table with existing data from:
 - tracking_entries → tracker events
 
 Key Features:
-- Idempotent: Can run multiple times safely (checks source_id for duplicates)
-- Batch processing: Processes 1000 records at a time for memory efficiency
-- Progress tracking: Logs progress every 100 records
-- Transaction safety: Each batch is a transaction (rollback on failure)
+- Idempotent: Can run multiple times safely (ON CONFLICT on source_table/source_id)
+- Bulk loading: Each batch is written with one binary COPY (create_health_events_bulk)
+- Streaming: Source rows are read through one server-side cursor in (timestamp, id)
+  order (db.stream), so memory stays bounded and there is no LIMIT/OFFSET
+- Resumable: The last migrated key per table is saved to a checkpoint file
+- Progress tracking: Logs rows/s and ETA after every batch
 - Preserves all timestamps and metadata
 
 Usage:
     python scripts/migrate_historical_events.py
+    python scripts/migrate_historical_events.py --batch-size 5000
+    python scripts/migrate_historical_events.py --restart   # ignore checkpoint
 
 Requirements:
     - Database connection configured (DATABASE_URL env var)
     - Tables must exist: health_events, food_entries, sleep_entries, tracking_entries
+    - Migration 029 applied (unique index on health_events source keys)
 """
 import asyncio
+import json
 import logging
 import sys
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from uuid import UUID
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
 
 # Add project root to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.db.connection import db
-from src.services.health_events import create_health_event, check_duplicate_event
+from src.services.health_events import create_health_events_bulk
 
 # Configure logging
 logging.basicConfig(
@@ -42,306 +51,221 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Batch size for processing (1000 records at a time)
+# Batch size for processing (rows fetched and copied per round trip)
 BATCH_SIZE = 1000
 
+DEFAULT_CHECKPOINT = Path(__file__).parent / ".migrate_historical_events.checkpoint.json"
+
+
+@dataclass
+class SourceSpec:
+    """How to read one source table and turn its rows into health events"""
+    table: str
+    event_type: str
+    # FROM clause the resume filter applies to (used for counting)
+    from_clause: str
+    # SELECT returning id, user_id, ts plus metadata columns; {where} receives the resume filter
+    select: str
+    # Qualified key columns used for the resume filter
+    ts_column: str
+    id_column: str
+    build_metadata: Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def _food_metadata(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "meal_type": row["meal_type"],
+        "total_calories": row["total_calories"],
+        "total_macros": row["total_macros"],
+        "foods": row["foods"],
+        "photo_path": row["photo_path"],
+        "notes": row["notes"]
+    }
 
-async def migrate_food_entries():
-    """
-    Migrate all food_entries to health_events as 'meal' events.
-
-    Metadata schema:
-    {
-        "meal_type": str,
-        "total_calories": int,
-        "total_macros": dict,
-        "foods": list,
-        "photo_path": str | null,
-        "notes": str | null
+
+def _sleep_metadata(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "bedtime": str(row["bedtime"]),
+        "wake_time": str(row["wake_time"]),
+        "sleep_latency_minutes": row["sleep_latency_minutes"],
+        "total_sleep_hours": row["total_sleep_hours"],
+        "night_wakings": row["night_wakings"],
+        "sleep_quality_rating": row["sleep_quality_rating"],
+        "disruptions": row["disruptions"],
+        "phone_usage": row["phone_usage"],
+        "phone_duration_minutes": row["phone_duration_minutes"],
+        "alertness_rating": row["alertness_rating"]
     }
-    """
-    logger.info("=" * 60)
-    logger.info("MIGRATING FOOD ENTRIES → MEAL EVENTS")
-    logger.info("=" * 60)
 
-    async with db.connection() as conn:
-        async with conn.cursor() as cur:
-            # Get total count
-            await cur.execute("SELECT COUNT(*) FROM food_entries")
-            total = (await cur.fetchone())[0]
-            logger.info(f"Total food_entries to migrate: {total}")
-
-            if total == 0:
-                logger.info("No food entries to migrate. Skipping.")
-                return
-
-            # Process in batches
-            offset = 0
-            migrated = 0
-            skipped = 0
-
-            while offset < total:
-                logger.info(f"Processing batch: {offset} to {offset + BATCH_SIZE}...")
-
-                await cur.execute(
-                    """
-                    SELECT id, user_id, timestamp, photo_path, foods,
-                           total_calories, total_macros, meal_type, notes
-                    FROM food_entries
-                    ORDER BY timestamp ASC
-                    LIMIT %s OFFSET %s
-                    """,
-                    (BATCH_SIZE, offset)
-                )
-
-                rows = await cur.fetchall()
-
-                for row in rows:
-                    entry_id = row["id"]
-
-                    # Check if already migrated (idempotent)
-                    if await check_duplicate_event("food_entries", entry_id):
-                        skipped += 1
-                        continue
-
-                    # Build metadata
-                    metadata = {
-                        "meal_type": row["meal_type"],
-                        "total_calories": row["total_calories"],
-                        "total_macros": row["total_macros"],
-                        "foods": row["foods"],
-                        "photo_path": row["photo_path"],
-                        "notes": row["notes"]
-                    }
-
-                    # Create health event
-                    try:
-                        await create_health_event(
-                            user_id=row["user_id"],
-                            event_type="meal",
-                            timestamp=row["timestamp"],
-                            metadata=metadata,
-                            source_table="food_entries",
-                            source_id=entry_id
-                        )
-                        migrated += 1
-
-                        # Progress logging every 100 records
-                        if migrated % 100 == 0:
-                            logger.info(f"Progress: {migrated}/{total} food entries migrated...")
-
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to migrate food_entry {entry_id}: {e}",
-                            exc_info=True
-                        )
-                        # Continue processing (don't fail entire batch)
-                        continue
-
-                offset += BATCH_SIZE
-
-            logger.info(
-                f"✅ Food entries migration complete: "
-                f"{migrated} migrated, {skipped} skipped (already existed)"
-            )
-
-
-async def migrate_sleep_entries():
-    """
-    Migrate all sleep_entries to health_events as 'sleep' events.
-
-    Metadata schema:
-    {
-        "bedtime": str (HH:MM),
-        "wake_time": str (HH:MM),
-        "sleep_latency_minutes": int,
-        "total_sleep_hours": float,
-        "night_wakings": int,
-        "sleep_quality_rating": int (1-10),
-        "disruptions": list[str],
-        "phone_usage": bool,
-        "phone_duration_minutes": int | null,
-        "alertness_rating": int (1-10)
+
+def _tracker_metadata(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "category_name": row["category_name"],
+        "category_id": str(row["category_id"]),
+        "data": row["data"],
+        "notes": row["notes"]
     }
-    """
-    logger.info("=" * 60)
-    logger.info("MIGRATING SLEEP ENTRIES → SLEEP EVENTS")
-    logger.info("=" * 60)
 
-    async with db.connection() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute("SELECT COUNT(*) FROM sleep_entries")
-            total = (await cur.fetchone())[0]
-            logger.info(f"Total sleep_entries to migrate: {total}")
-
-            if total == 0:
-                logger.info("No sleep entries to migrate. Skipping.")
-                return
-
-            offset = 0
-            migrated = 0
-            skipped = 0
-
-            while offset < total:
-                logger.info(f"Processing batch: {offset} to {offset + BATCH_SIZE}...")
-
-                await cur.execute(
-                    """
-                    SELECT id, user_id, logged_at, bedtime, sleep_latency_minutes,
-                           wake_time, total_sleep_hours, night_wakings,
-                           sleep_quality_rating, disruptions, phone_usage,
-                           phone_duration_minutes, alertness_rating
-                    FROM sleep_entries
-                    ORDER BY logged_at ASC
-                    LIMIT %s OFFSET %s
-                    """,
-                    (BATCH_SIZE, offset)
-                )
-
-                rows = await cur.fetchall()
-
-                for row in rows:
-                    entry_id = row["id"]
-
-                    if await check_duplicate_event("sleep_entries", entry_id):
-                        skipped += 1
-                        continue
-
-                    # Build metadata
-                    metadata = {
-                        "bedtime": str(row["bedtime"]),
-                        "wake_time": str(row["wake_time"]),
-                        "sleep_latency_minutes": row["sleep_latency_minutes"],
-                        "total_sleep_hours": row["total_sleep_hours"],
-                        "night_wakings": row["night_wakings"],
-                        "sleep_quality_rating": row["sleep_quality_rating"],
-                        "disruptions": row["disruptions"],
-                        "phone_usage": row["phone_usage"],
-                        "phone_duration_minutes": row["phone_duration_minutes"],
-                        "alertness_rating": row["alertness_rating"]
-                    }
-
-                    try:
-                        await create_health_event(
-                            user_id=row["user_id"],
-                            event_type="sleep",
-                            timestamp=row["logged_at"],
-                            metadata=metadata,
-                            source_table="sleep_entries",
-                            source_id=entry_id
-                        )
-                        migrated += 1
-
-                        if migrated % 100 == 0:
-                            logger.info(f"Progress: {migrated}/{total} sleep entries migrated...")
-
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to migrate sleep_entry {entry_id}: {e}",
-                            exc_info=True
-                        )
-                        continue
-
-                offset += BATCH_SIZE
-
-            logger.info(
-                f"✅ Sleep entries migration complete: "
-                f"{migrated} migrated, {skipped} skipped"
-            )
-
-
-async def migrate_tracking_entries():
+
+SOURCES = [
+    SourceSpec(
+        table="food_entries",
+        event_type="meal",
+        from_clause="food_entries",
+        select="""
+            SELECT id, user_id, timestamp AS ts, photo_path, foods,
+                   total_calories, total_macros, meal_type, notes
+            FROM food_entries
+            {where}
+            ORDER BY timestamp, id
+        """,
+        ts_column="timestamp",
+        id_column="id",
+        build_metadata=_food_metadata,
+    ),
+    SourceSpec(
+        table="sleep_entries",
+        event_type="sleep",
+        from_clause="sleep_entries",
+        select="""
+            SELECT id, user_id, logged_at AS ts, bedtime, sleep_latency_minutes,
+                   wake_time, total_sleep_hours, night_wakings,
+                   sleep_quality_rating, disruptions, phone_usage,
+                   phone_duration_minutes, alertness_rating
+            FROM sleep_entries
+            {where}
+            ORDER BY logged_at, id
+        """,
+        ts_column="logged_at",
+        id_column="id",
+        build_metadata=_sleep_metadata,
+    ),
+    SourceSpec(
+        table="tracking_entries",
+        event_type="tracker",
+        from_clause="tracking_entries te",
+        select="""
+            SELECT te.id, te.user_id, te.timestamp AS ts, te.data, te.notes,
+                   tc.name as category_name, tc.id as category_id
+            FROM tracking_entries te
+            JOIN tracking_categories tc ON te.category_id = tc.id
+            {where}
+            ORDER BY te.timestamp, te.id
+        """,
+        ts_column="te.timestamp",
+        id_column="te.id",
+        build_metadata=_tracker_metadata,
+    ),
+]
+
+
+def load_checkpoint(path: Path) -> Dict[str, Dict[str, str]]:
+    """Load {table: {"ts": iso, "id": str}} from the checkpoint file"""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_checkpoint(path: Path, checkpoint: Dict[str, Dict[str, str]]) -> None:
+    """Write the checkpoint atomically so an interrupted run can't corrupt it"""
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(checkpoint, indent=2))
+    tmp.replace(path)
+
+
+async def count_remaining(spec: SourceSpec, after: Optional[Dict[str, str]]) -> int:
+    """Count source rows after the checkpoint key (for progress/ETA only)"""
+    where, params = _resume_filter(spec, after)
+    count = await db.fetchval(f"SELECT COUNT(*) FROM {spec.from_clause} {where}", params)
+    return count or 0
+
+
+def _resume_filter(spec: SourceSpec, after: Optional[Dict[str, str]]) -> tuple[str, tuple]:
+    if not after:
+        return "", ()
+    return (
+        f"WHERE ({spec.ts_column}, {spec.id_column}) > (%s, %s)",
+        (datetime.fromisoformat(after["ts"]), UUID(after["id"])),
+    )
+
+
+async def migrate_source(
+    spec: SourceSpec,
+    checkpoint: Dict[str, Dict[str, str]],
+    checkpoint_path: Path,
+    batch_size: int = BATCH_SIZE
+) -> None:
     """
-    Migrate all tracking_entries to health_events as 'tracker' events.
-
-    Metadata schema:
-    {
-        "category_name": str,
-        "category_id": str (UUID),
-        "data": dict,
-        "notes": str | null
-    }
+    Copy every row of one source table into health_events.
+
+    Streams rows in (timestamp, id) order from a server-side cursor starting
+    after the checkpointed key, bulk-inserts every batch_size rows, then
+    advances the checkpoint. Rows that were already migrated (or created
+    live) are skipped by ON CONFLICT.
     """
     logger.info("=" * 60)
-    logger.info("MIGRATING TRACKING ENTRIES → TRACKER EVENTS")
+    logger.info(f"MIGRATING {spec.table.upper()} → {spec.event_type.upper()} EVENTS")
     logger.info("=" * 60)
 
-    async with db.connection() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute("SELECT COUNT(*) FROM tracking_entries")
-            total = (await cur.fetchone())[0]
-            logger.info(f"Total tracking_entries to migrate: {total}")
-
-            if total == 0:
-                logger.info("No tracking entries to migrate. Skipping.")
-                return
-
-            offset = 0
-            migrated = 0
-            skipped = 0
-
-            while offset < total:
-                logger.info(f"Processing batch: {offset} to {offset + BATCH_SIZE}...")
-
-                await cur.execute(
-                    """
-                    SELECT te.id, te.user_id, te.timestamp, te.data, te.notes,
-                           tc.name as category_name, tc.id as category_id
-                    FROM tracking_entries te
-                    JOIN tracking_categories tc ON te.category_id = tc.id
-                    ORDER BY te.timestamp ASC
-                    LIMIT %s OFFSET %s
-                    """,
-                    (BATCH_SIZE, offset)
-                )
-
-                rows = await cur.fetchall()
-
-                for row in rows:
-                    entry_id = row["id"]
-
-                    if await check_duplicate_event("tracking_entries", entry_id):
-                        skipped += 1
-                        continue
-
-                    # Build metadata
-                    metadata = {
-                        "category_name": row["category_name"],
-                        "category_id": str(row["category_id"]),
-                        "data": row["data"],
-                        "notes": row["notes"]
-                    }
-
-                    try:
-                        await create_health_event(
-                            user_id=row["user_id"],
-                            event_type="tracker",
-                            timestamp=row["timestamp"],
-                            metadata=metadata,
-                            source_table="tracking_entries",
-                            source_id=entry_id
-                        )
-                        migrated += 1
-
-                        if migrated % 100 == 0:
-                            logger.info(f"Progress: {migrated}/{total} tracker entries migrated...")
-
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to migrate tracking_entry {entry_id}: {e}",
-                            exc_info=True
-                        )
-                        continue
-
-                offset += BATCH_SIZE
-
-            logger.info(
-                f"✅ Tracker entries migration complete: "
-                f"{migrated} migrated, {skipped} skipped"
-            )
-
-
-async def main():
+    after = checkpoint.get(spec.table)
+    total = await count_remaining(spec, after)
+    if after:
+        logger.info(f"Resuming {spec.table} after {after['ts']} / {after['id']}")
+    logger.info(f"Total {spec.table} to migrate: {total}")
+
+    if total == 0:
+        logger.info(f"No {spec.table} to migrate. Skipping.")
+        return
+
+    progress = {"processed": 0, "migrated": 0, "started": time.monotonic()}
+
+    async def write_batch(rows: List[Dict[str, Any]]) -> None:
+        events = [
+            {
+                "user_id": row["user_id"],
+                "event_type": spec.event_type,
+                "timestamp": row["ts"],
+                "metadata": spec.build_metadata(row),
+                "source_table": spec.table,
+                "source_id": row["id"],
+            }
+            for row in rows
+        ]
+        progress["migrated"] += await create_health_events_bulk(events)
+        progress["processed"] += len(rows)
+
+        last = rows[-1]
+        checkpoint[spec.table] = {"ts": last["ts"].isoformat(), "id": str(last["id"])}
+        save_checkpoint(checkpoint_path, checkpoint)
+
+        processed = progress["processed"]
+        elapsed = time.monotonic() - progress["started"]
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        eta = (total - processed) / rate if rate > 0 else 0.0
+        logger.info(
+            f"Progress: {processed}/{total} {spec.table} "
+            f"({rate:.0f} rows/s, ETA {max(eta, 0):.0f}s)"
+        )
+
+    # One server-side cursor over the remaining rows, consumed batch_size at a time
+    where, params = _resume_filter(spec, after)
+    batch: List[Dict[str, Any]] = []
+    async for row in db.stream(spec.select.format(where=where), params, fetch_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            await write_batch(batch)
+            batch = []
+    if batch:
+        await write_batch(batch)
+
+    processed, migrated = progress["processed"], progress["migrated"]
+    logger.info(
+        f"✅ {spec.table} migration complete: "
+        f"{migrated} migrated, {processed - migrated} skipped (already existed)"
+    )
+
+
+async def main(batch_size: int = BATCH_SIZE, checkpoint_path: Path = DEFAULT_CHECKPOINT, restart: bool = False):
     """Run all migrations"""
     start_time = datetime.now()
 
@@ -350,6 +274,8 @@ async def main():
     logger.info(f"Started at: {start_time.isoformat()}")
     logger.info("=" * 60)
 
+    checkpoint = {} if restart else load_checkpoint(checkpoint_path)
+
     # Initialize database connection pool
     try:
         await db.init_pool()
@@ -360,9 +286,8 @@ async def main():
 
     try:
         # Run migrations in sequence
-        await migrate_food_entries()
-        await migrate_sleep_entries()
-        await migrate_tracking_entries()
+        for spec in SOURCES:
+            await migrate_source(spec, checkpoint, checkpoint_path, batch_size)
 
         end_time = datetime.now()
         duration = end_time - start_time
@@ -371,12 +296,13 @@ async def main():
         logger.info("✅ MIGRATION COMPLETE")
         logger.info(f"Finished at: {end_time.isoformat()}")
         logger.info(f"Total duration: {duration}")
+        logger.info(f"Checkpoint: {checkpoint_path}")
         logger.info("=" * 60)
 
         return 0
 
     except Exception as e:
-        logger.error(f"❌ Migration failed: {e}", exc_info=True)
+        logger.error(f"❌ Migration failed (re-run to resume from checkpoint): {e}", exc_info=True)
         return 1
 
     finally:
@@ -386,5 +312,14 @@ async def main():
 
 
 if __name__ == "__main__":
-    exit_code = asyncio.run(main())
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backfill health_events from historical entries")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per COPY batch")
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT, help="Checkpoint file path")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start from the beginning")
+
+    args = parser.parse_args()
+
+    exit_code = asyncio.run(main(args.batch_size, args.checkpoint, args.restart))
     sys.exit(exit_code)
@@ -29,7 +29,9 @@ from src.db.queries import (
 from src.memory.file_manager import MemoryFileManager
 from src.memory.db_manager import DatabaseMemoryManager
 from src.memory.system_prompt import generate_system_prompt
+from src.memory.context_window import build_context_window, format_summary_for_prompt
 from src.utils.datetime_helpers import now_utc, today_user_timezone
+from src.utils.timezone_resolver import timezone_resolver
 from src.agent.dynamic_tools import (
     validate_tool_code,
     classify_tool_type,
@@ -1554,6 +1556,7 @@ async def update_food_entry_tool(
         new_macros = None
         if any([new_protein is not None, new_carbs is not None, new_fat is not None]):
             # Get current entry to fill in missing values (use user's timezone for date)
+            await timezone_resolver.resolve(deps.telegram_id)
             today = today_user_timezone(deps.telegram_id)
             entries = await get_food_entries_by_date(
                 user_id=deps.telegram_id,
@@ -2429,7 +2432,7 @@ async def create_dynamic_tool(
             parameters_schema=parameters_schema,
             return_schema=return_schema,
             function_code=function_code,
-            created_by="system"
+            created_by=deps.telegram_id
         )
 
         # If write tool, require approval
@@ -2477,7 +2480,7 @@ async def create_dynamic_tool(
             )
 
         # Read-only tool - load immediately
-        await tool_manager.load_all_tools()  # Reload tools
+        await tool_manager.load_tool(tool_id)
 
         return DynamicToolCreationResult(
             success=True,
@@ -2913,10 +2916,23 @@ async def get_agent_response(
         bot_application=bot_application,
     )
 
+    # Trim history to the token budget; older turns come from the rolling summary
+    context_window = await build_context_window(telegram_id, message_history or [])
+    if context_window.summary:
+        system_prompt += format_summary_for_prompt(context_window.summary)
+    logger.info(
+        f"[CONTEXT] {len(context_window.messages)} history messages, "
+        f"{len(context_window.dropped)} dropped, ~{context_window.tokens} tokens"
+    )
+    if ENABLE_PROMETHEUS:
+        from src.monitoring.prometheus_metrics import metrics
+        if metrics.enabled:
+            metrics.agent_history_tokens.observe(context_window.tokens)
+
     # Convert message_history from dicts to ModelMessage objects
     converted_history = []
-    if message_history:
-        for msg in message_history:
+    if context_window.messages:
+        for msg in context_window.messages:
             if msg.get("role") == "user":
                 converted_history.append(ModelRequest.user_text_prompt(msg["content"]))
             elif msg.get("role") == "assistant":
@@ -2990,7 +3006,7 @@ async def get_agent_response(
         dynamic_agent.tool(get_my_challenges)
 
         # Register dynamically loaded tools
-        tool_manager.register_tools_on_agent(dynamic_agent)
+        tool_manager.register_tools_on_agent(dynamic_agent, deps.telegram_id)
 
         # Run agent with message history for context (converted to ModelMessage objects)
         # Track agent call timing for Prometheus
@@ -3083,7 +3099,7 @@ async def get_agent_response(
                 fallback_agent.tool(get_my_challenges)
 
                 # Register dynamically loaded tools
-                tool_manager.register_tools_on_agent(fallback_agent)
+                tool_manager.register_tools_on_agent(fallback_agent, deps.telegram_id)
 
                 # Run with fallback model (converted history)
                 result = await fallback_agent.run(
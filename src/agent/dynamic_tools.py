@@ -3,9 +3,11 @@ Dynamic tool creation, validation, loading, and registration system
 Enables self-extending AI agent capabilities
 """
 import ast
+import hashlib
 import re
 import logging
 import time
+from types import CodeType
 from typing import Optional, Callable, Any
 from pydantic import BaseModel
 from src.exceptions import ToolValidationError
@@ -128,60 +130,125 @@ def classify_tool_type(function_code: str, description: str) -> str:
 # Dynamic Tool Loading & Registration
 # ==========================================
 
+def tool_code_hash(function_code: str) -> str:
+    """Cache key for a tool's compiled code"""
+    return hashlib.sha256(function_code.encode("utf-8")).hexdigest()
+
+
+def is_tool_relevant(tool: dict, user_id: Optional[str]) -> bool:
+    """
+    Whether a tool should be offered to a user's agent.
+
+    Tools created by 'system' (including every tool created before
+    create_dynamic_tool recorded its creator) are shared; tools with a user
+    id in created_by are only registered for that user.
+    """
+    created_by = tool.get("created_by") or "system"
+    return user_id is None or created_by in ("system", user_id)
+
+
 class DynamicToolManager:
-    """Manages dynamic tool lifecycle"""
+    """
+    Manages dynamic tool lifecycle
+
+    Tool metadata and code are loaded from the database, but a tool is only
+    compiled the first time it is registered or executed. Compiled code
+    objects are cached by code hash, so reloading an unchanged tool (or two
+    tools with identical code) never recompiles, and every tool executes in
+    a copy of one base namespace built once per process.
+    """
 
     def __init__(self):
         self.loaded_tools: dict[str, Callable] = {}
         self.tool_metadata: dict[str, dict] = {}
+        self._code_cache: dict[str, CodeType] = {}
+        self._base_namespace: Optional[dict[str, Any]] = None
 
     async def load_all_tools(self) -> list[str]:
         """
         Load all enabled tools from database
 
+        Tools whose code is unchanged keep their compiled function; the rest
+        are compiled lazily on first use.
+
         Returns:
             List of loaded tool names
         """
         from src.db.queries import get_all_enabled_tools
 
         tools = await get_all_enabled_tools()
-        loaded_names = []
-
-        for tool in tools:
-            try:
-                func = self._create_function_from_code(
-                    tool["function_code"],
-                    tool["tool_name"]
-                )
 
-                self.loaded_tools[tool["tool_name"]] = func
-                self.tool_metadata[tool["tool_name"]] = tool
-                loaded_names.append(tool["tool_name"])
+        enabled = {tool["tool_name"] for tool in tools}
+        for tool_name in list(self.tool_metadata):
+            if tool_name not in enabled:
+                self.unload_tool(tool_name)
 
-                logger.info(f"Loaded dynamic tool: {tool['tool_name']}")
-
-            except Exception as e:
-                logger.error(f"Failed to load tool {tool['tool_name']}: {e}")
+        for tool in tools:
+            self._set_tool(tool)
 
-        return loaded_names
+        logger.info(f"Loaded {len(tools)} dynamic tools")
+        return [tool["tool_name"] for tool in tools]
 
-    def _create_function_from_code(
-        self,
-        function_code: str,
-        tool_name: str
-    ) -> Callable:
+    async def load_tool(self, tool_id: str) -> Optional[str]:
         """
-        Compile and create function object from code string
+        Load (or reload) a single tool after it is created or approved
 
         Args:
-            function_code: Python function code
-            tool_name: Tool name for error messages
+            tool_id: Tool UUID
 
         Returns:
-            Compiled function object
+            Tool name, or None if the tool doesn't exist or is disabled
+        """
+        from src.db.queries import get_tool_by_id
+
+        tool = await get_tool_by_id(tool_id)
+        if not tool or not tool.get("enabled", True):
+            if tool:
+                self.unload_tool(tool["tool_name"])
+            return None
+
+        self._set_tool(tool)
+        logger.info(f"Loaded dynamic tool: {tool['tool_name']}")
+        return tool["tool_name"]
+
+    def unload_tool(self, tool_name: str) -> None:
+        """Forget a tool (its compiled code stays cached by hash)"""
+        self.loaded_tools.pop(tool_name, None)
+        self.tool_metadata.pop(tool_name, None)
+
+    def _set_tool(self, tool: dict) -> None:
+        """Store tool metadata, dropping the compiled function if the code changed"""
+        tool_name = tool["tool_name"]
+        previous = self.tool_metadata.get(tool_name)
+        if previous is None or previous["function_code"] != tool["function_code"]:
+            self.loaded_tools.pop(tool_name, None)
+        self.tool_metadata[tool_name] = tool
+
+    def get_tool_function(self, tool_name: str) -> Callable:
+        """Compiled function for a loaded tool, compiling it on first use"""
+        func = self.loaded_tools.get(tool_name)
+        if func is None:
+            if tool_name not in self.tool_metadata:
+                raise ValueError(f"Tool not found: {tool_name}")
+            func = self._create_function_from_code(
+                self.tool_metadata[tool_name]["function_code"],
+                tool_name
+            )
+            self.loaded_tools[tool_name] = func
+        return func
+
+    def _get_base_namespace(self) -> dict[str, Any]:
+        """
+        Names available to every tool, built once per process.
+
+        Tools get a copy, so nothing a tool defines leaks into the base.
         """
+        if self._base_namespace is not None:
+            return self._base_namespace
+
         # Import result models from agent module
         from src.agent import (
+            AgentDeps,
             ProfileUpdateResult,
             PreferenceSaveResult,
             TrackingCategoryResult,
@@ -192,9 +259,18 @@ class DynamicToolManager:
             UserInfoResult,
             DynamicToolCreationResult,
         )
+        import json
+        import datetime
+        from uuid import uuid4
+        from src.db import queries
 
-        # Create namespace for execution
-        namespace = {
+        namespace: dict[str, Any] = {
+            # Query functions that might be referenced
+            name: getattr(queries, name)
+            for name in dir(queries)
+            if not name.startswith('_')
+        }
+        namespace.update({
             'BaseModel': BaseModel,
             'Optional': Optional,
             'Any': Any,
@@ -209,68 +285,93 @@ class DynamicToolManager:
             'VisualPatternResult': VisualPatternResult,
             'UserInfoResult': UserInfoResult,
             'DynamicToolCreationResult': DynamicToolCreationResult,
-        }
+            # Commonly needed modules
+            'json': json,
+            'datetime': datetime,
+            'uuid4': uuid4,
+            # AgentDeps for type hints
+            'AgentDeps': AgentDeps,
+        })
+
+        self._base_namespace = namespace
+        return namespace
+
+    def _compile_tool_code(self, function_code: str, tool_name: str) -> CodeType:
+        """Compiled code object for function_code, cached by code hash"""
+        code_hash = tool_code_hash(function_code)
+        code = self._code_cache.get(code_hash)
+        if code is None:
+            code = compile(function_code, f"<dynamic_tool_{tool_name}>", "exec")
+            self._code_cache[code_hash] = code
+        return code
 
-        # Import commonly needed modules
-        import json
-        import datetime
-        from uuid import uuid4
+    def _create_function_from_code(
+        self,
+        function_code: str,
+        tool_name: str
+    ) -> Callable:
+        """
+        Compile and create function object from code string
+
+        Args:
+            function_code: Python function code
+            tool_name: Tool name for error messages
 
-        namespace['json'] = json
-        namespace['datetime'] = datetime
-        namespace['uuid4'] = uuid4
+        Returns:
+            Compiled function object
+        """
+        namespace = dict(self._get_base_namespace())
 
         # Import db connection if needed
         if 'db.connection()' in function_code:
             from src.db.connection import db
             namespace['db'] = db
 
-        # Import all query functions that might be referenced
-        from src.db import queries
-        for attr_name in dir(queries):
-            if not attr_name.startswith('_'):
-                namespace[attr_name] = getattr(queries, attr_name)
-
-        # Import AgentDeps for type hints
-        from src.agent import AgentDeps
-        namespace['AgentDeps'] = AgentDeps
-
         # Execute code to define function
         try:
-            exec(compile(function_code, f"<dynamic_tool_{tool_name}>", "exec"), namespace)
+            code = self._compile_tool_code(function_code, tool_name)
+            exec(code, namespace)
         except Exception as e:
             logger.error(f"Failed to compile tool {tool_name}: {e}")
             raise
 
-        # Extract the function (should be the only async function defined)
+        # Look the function up by the name its def declares (validated code
+        # defines exactly one), so a tool may shadow a base namespace name
         func = None
-        for name, obj in namespace.items():
-            if callable(obj) and hasattr(obj, '__name__') and not name.startswith('_'):
-                # Check if it's the function we just defined
-                if hasattr(obj, '__code__'):
-                    func = obj
-                    break
-
-        if not func:
+        for const in code.co_consts:
+            if isinstance(const, CodeType) and not const.co_name.startswith('<'):
+                func = namespace.get(const.co_name)
+                break
+
+        if not callable(func):
             raise ValueError(f"No function found in code for {tool_name}")
 
         return func
 
-    def register_tools_on_agent(self, agent) -> int:
+    def register_tools_on_agent(self, agent, user_id: Optional[str] = None) -> int:
         """
-        Register all loaded tools on a PydanticAI agent
+        Register loaded tools on a PydanticAI agent
 
         Args:
             agent: PydanticAI Agent instance
+            user_id: Only register tools relevant to this user (all if None)
 
         Returns:
             Number of tools registered
         """
         count = 0
-        for tool_name, func in self.loaded_tools.items():
+        for tool_name, metadata in self.tool_metadata.items():
+            if not is_tool_relevant(metadata, user_id):
+                continue
+            try:
+                func = self.get_tool_function(tool_name)
+            except Exception as e:
+                logger.error(f"Failed to load tool {tool_name}: {e}")
+                continue
+
             agent.tool(func)
             count += 1
-            logger.info(f"Registered dynamic tool on agent: {tool_name}")
+            logger.debug(f"Registered dynamic tool on agent: {tool_name}")
 
         return count
 
@@ -293,9 +394,7 @@ class DynamicToolManager:
         """
         from src.db.queries import log_tool_execution
 
-        if tool_name not in self.loaded_tools:
-            raise ValueError(f"Tool not found: {tool_name}")
-
+        func = self.get_tool_function(tool_name)
         metadata = self.tool_metadata[tool_name]
         tool_id = metadata["id"]
 
@@ -306,7 +405,7 @@ class DynamicToolManager:
 
         try:
             # Execute tool
-            result = await self.loaded_tools[tool_name](**kwargs)
+            result = await func(**kwargs)
             success = True
             return result
 
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from src.agent import AgentDeps
 
 from src.services.formula_detection import get_formula_detection_service
+from src.services.formula_name_index import formula_name_index
 from src.services.formula_suggestions import get_suggestion_service
 from src.db.connection import db
 
@@ -308,6 +309,8 @@ async def create_formula_from_entry(
                 formula_id = result["id"] if result else None
                 await conn.commit()
 
+        formula_name_index.invalidate(ctx.deps.telegram_id)
+
         if not formula_id:
             return FormulaResult(
                 success=False,
@@ -7,7 +7,11 @@ Implements 3-agent validation with voting and explanations:
 - Agent 3: Validator Agent (reasonableness checking & consensus)
 
 Phase 2 of food accuracy improvements (Issue #28)
+
+The two model estimates run concurrently, each with its own deadline, and
+the validator agent is only consulted when the estimates disagree.
 """
+import asyncio
 import logging
 from typing import List, Optional, Dict, Any, Tuple
 from pydantic import BaseModel, Field
@@ -16,9 +20,17 @@ from datetime import datetime
 from src.models.food import FoodItem, VisionAnalysisResult, FoodMacros
 from src.config import OPENAI_API_KEY, ANTHROPIC_API_KEY, AGENT_MODEL
 from src.utils.reasonableness_rules import validate_food_items
+from src.utils.vision import encode_image
 
 logger = logging.getLogger(__name__)
 
+# Per-provider deadlines for a single estimate (seconds)
+OPENAI_ESTIMATE_TIMEOUT = 20.0
+ANTHROPIC_ESTIMATE_TIMEOUT = 25.0
+
+# Agreement level from _simple_comparison at which the validator agent is skipped
+SKIP_VALIDATOR_AGREEMENT = "high"
+
 
 class AgentEstimate(BaseModel):
     """Estimate from a single agent"""
@@ -50,12 +62,15 @@ class NutritionConsensusEngine:
     3-agent consensus system for nutrition validation.
 
     Workflow:
-    1. Get estimates from OpenAI vision model
-    2. Get estimates from Anthropic vision model
-    3. Compare results with validator agent
-    4. Determine consensus level (high/medium/low)
-    5. Blend results or request clarification
-    6. Provide explanation to user
+    1. Get estimates from OpenAI and Anthropic vision models concurrently
+    2. If both agree closely, skip the validator; otherwise compare the
+       results with the validator agent
+    3. Determine consensus level (high/medium/low)
+    4. Blend results or request clarification
+    5. Provide explanation to user
+
+    If one provider fails or misses its deadline, the other estimate is
+    used on its own with low confidence.
     """
 
     def __init__(self):
@@ -93,23 +108,19 @@ class NutritionConsensusEngine:
             if photo_path or image_data:
                 logger.info("Getting consensus for photo-based food entry")
 
-                # Ensure we have image data
+                # Ensure we have image data (file read off the event loop)
                 if not image_data and photo_path:
-                    import base64
-                    with open(photo_path, "rb") as f:
-                        image_data = base64.b64encode(f.read()).decode('utf-8')
-
-                # Agent 1: OpenAI
-                openai_estimate = await self._get_openai_estimate(
-                    image_data, photo_path, caption, visual_patterns
-                )
-                agent_estimates.append(openai_estimate)
-
-                # Agent 2: Anthropic
-                anthropic_estimate = await self._get_anthropic_estimate(
-                    image_data, photo_path, caption, visual_patterns
-                )
-                agent_estimates.append(anthropic_estimate)
+                    image_data = await asyncio.to_thread(encode_image, photo_path)
+
+                # Agents 1 and 2: OpenAI and Anthropic, concurrently
+                agent_estimates, failures = await self._gather_estimates([
+                    ("openai", OPENAI_ESTIMATE_TIMEOUT, self._get_openai_estimate(
+                        image_data, photo_path, caption, visual_patterns
+                    )),
+                    ("anthropic", ANTHROPIC_ESTIMATE_TIMEOUT, self._get_anthropic_estimate(
+                        image_data, photo_path, caption, visual_patterns
+                    )),
+                ])
 
             # Text analysis: use parsed result as first estimate, get second opinion
             elif parsed_text_result:
@@ -126,22 +137,34 @@ class NutritionConsensusEngine:
                 agent_estimates.append(text_estimate)
 
                 # Agent 2: Get second opinion from Anthropic on text description
-                anthropic_text_estimate = await self._get_anthropic_text_estimate(
-                    caption or "food description",
-                    visual_patterns
-                )
-                agent_estimates.append(anthropic_text_estimate)
+                second_opinion, failures = await self._gather_estimates([
+                    ("anthropic", ANTHROPIC_ESTIMATE_TIMEOUT, self._get_anthropic_text_estimate(
+                        caption or "food description",
+                        visual_patterns
+                    )),
+                ])
+                agent_estimates.extend(second_opinion)
 
             else:
                 raise ValueError("Must provide either photo data or parsed_text_result")
 
-            # Agent 3: Validator agent analyzes both estimates
-            validator_analysis = await self._validate_with_agent(
-                agent_estimates[0],
-                agent_estimates[1],
-                photo_path,
-                caption
-            )
+            if len(agent_estimates) < 2:
+                # One provider missed its deadline: use the best available estimate
+                return self._create_fallback_consensus(
+                    agent_estimates[0], "; ".join(failures)
+                )
+
+            # Agent 3: Validator agent, only when the estimates disagree
+            validator_analysis = self._simple_comparison(agent_estimates[0], agent_estimates[1])
+            if validator_analysis["agreement"] == SKIP_VALIDATOR_AGREEMENT:
+                logger.info("Estimates agree closely, skipping validator agent")
+            else:
+                validator_analysis = await self._validate_with_agent(
+                    agent_estimates[0],
+                    agent_estimates[1],
+                    photo_path,
+                    caption
+                )
 
             # Determine consensus
             consensus = await self._determine_consensus(
@@ -163,6 +186,49 @@ class NutritionConsensusEngine:
             else:
                 raise
 
+    async def _gather_estimates(
+        self,
+        calls: List[Tuple[str, float, Any]]
+    ) -> Tuple[List[AgentEstimate], List[str]]:
+        """
+        Run estimate coroutines concurrently, each with its own deadline
+
+        Args:
+            calls: (provider, timeout_seconds, coroutine) tuples
+
+        Returns:
+            (estimates that finished in time, in call order; failure messages)
+
+        Raises:
+            The first error if every call failed
+        """
+        results = await asyncio.gather(
+            *(asyncio.wait_for(coro, timeout) for _, timeout, coro in calls),
+            return_exceptions=True
+        )
+
+        estimates: List[AgentEstimate] = []
+        failures: List[str] = []
+        errors: List[BaseException] = []
+        for (provider, timeout, _), result in zip(calls, results):
+            if isinstance(result, asyncio.TimeoutError):
+                # str(TimeoutError()) is empty; give the fallback a readable reason
+                message = f"{provider} estimate timed out after {timeout:.0f}s"
+                failures.append(message)
+                errors.append(asyncio.TimeoutError(message))
+            elif isinstance(result, BaseException):
+                failures.append(f"{provider} estimate failed: {result}")
+                errors.append(result)
+            else:
+                estimates.append(result)
+
+        for failure in failures:
+            logger.warning(f"Consensus: {failure}")
+
+        if not estimates and errors:
+            raise errors[0]
+        return estimates, failures
+
     async def _get_openai_estimate(
         self,
         image_data: str,
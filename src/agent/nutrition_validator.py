@@ -3,16 +3,77 @@ Multi-Agent Nutrition Validator
 
 Implements cross-model validation and reasonableness checking to prevent
 unrealistic calorie/macro estimates from vision AI.
+
+Cross-model validation costs a second full vision call, so it is adaptive:
+it only runs when the primary result looks like an outlier (not high
+confidence, failed reasonableness checks, or disagreement with USDA data),
+within a per-user hourly budget. A small random sample of results that
+would have been skipped is still cross-checked so the accuracy impact of
+skipping can be measured (nutrition_cross_validation_outcome_total with
+reason="audit_sample").
 """
+import asyncio
 import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
 from typing import List, Optional, Dict, Any, Tuple
 from src.models.food import FoodItem, VisionAnalysisResult, FoodMacros
 from src.utils.reasonableness_rules import validate_food_items, check_reasonableness
 from src.config import VISION_MODEL, OPENAI_API_KEY, ANTHROPIC_API_KEY
+from src.observability.metrics import (
+    nutrition_cross_validation_total,
+    nutrition_cross_validation_outcome_total,
+)
 
 logger = logging.getLogger(__name__)
 
 
+class CrossValidationConfig:
+    """Adaptive cross-model validation configuration constants"""
+    # Run cross-validation on every call instead of only for outliers
+    ALWAYS = False
+
+    # Secondary vision calls allowed per user per hour (outliers beyond this are not escalated)
+    MAX_PER_USER_PER_HOUR = 10
+
+    # Fraction of skip-eligible results cross-checked anyway to measure accuracy impact
+    AUDIT_SAMPLE_RATE = 0.05
+
+    # USDA items below this confidence aren't used for agreement checks
+    USDA_MIN_CONFIDENCE = 0.7
+
+
+@dataclass
+class CrossValidationDecision:
+    """Whether to run cross-model validation, and why"""
+    run: bool
+    reason: str  # low_confidence/unreasonable/usda_disagreement/no_usda_match/audit_sample/always/confident/budget_exhausted
+
+
+class CrossValidationBudget:
+    """Sliding one-hour window of secondary vision calls per user"""
+
+    def __init__(self, max_per_hour: int = CrossValidationConfig.MAX_PER_USER_PER_HOUR):
+        self.max_per_hour = max_per_hour
+        self._calls: Dict[str, deque] = {}
+
+    def try_acquire(self, user_id: Optional[str]) -> bool:
+        """Reserve one call for the user; False if the hourly budget is used up"""
+        if user_id is None:
+            return True
+
+        now = time.monotonic()
+        calls = self._calls.setdefault(user_id, deque())
+        while calls and now - calls[0] >= 3600:
+            calls.popleft()
+        if len(calls) >= self.max_per_hour:
+            return False
+        calls.append(now)
+        return True
+
+
 class NutritionValidator:
     """
     Multi-agent validator for nutrition estimates.
@@ -30,6 +91,8 @@ class NutritionValidator:
             self.secondary_model = "anthropic:claude-3-5-sonnet-latest"
         else:
             self.secondary_model = "openai:gpt-4o-mini"
+        self.budget = CrossValidationBudget()
+        self._stats = {"run": 0, "skipped": 0}
 
     async def validate_with_cross_model(
         self,
@@ -62,12 +125,10 @@ class NutritionValidator:
 
         # Get secondary analysis
         try:
-            from src.utils.vision import analyze_with_openai, analyze_with_anthropic
-            import base64
+            from src.utils.vision import analyze_with_openai, analyze_with_anthropic, encode_image
 
-            # Read image
-            with open(photo_path, "rb") as f:
-                image_data = base64.b64encode(f.read()).decode('utf-8')
+            # Read image (off the event loop)
+            image_data = await asyncio.to_thread(encode_image, photo_path)
 
             # Call secondary model
             if self.secondary_model.startswith("openai:"):
@@ -193,7 +254,8 @@ class NutritionValidator:
         caption: Optional[str] = None,
         visual_patterns: Optional[str] = None,
         usda_verified_items: Optional[List[FoodItem]] = None,
-        enable_cross_validation: bool = True
+        enable_cross_validation: bool = True,
+        user_id: Optional[str] = None
     ) -> Tuple[VisionAnalysisResult, List[str]]:
         """
         Comprehensive validation of vision analysis results.
@@ -204,28 +266,45 @@ class NutritionValidator:
             caption: User caption
             visual_patterns: User's visual patterns
             usda_verified_items: USDA-verified items (if available)
-            enable_cross_validation: Whether to perform cross-model validation
+            enable_cross_validation: Allow cross-model validation (run only
+                when decide_cross_validation() says so)
+            user_id: User's Telegram ID, for the hourly cross-validation budget
 
         Returns:
             Tuple of (validated_result, all_warnings)
         """
         all_warnings = []
 
-        # Step 1: Cross-model validation (if enabled)
+        # Step 1: Cheap checks on the primary result
+        _, reasonableness_warnings = validate_food_items(vision_result.foods)
+        usda_warnings = []
+        if usda_verified_items:
+            usda_warnings = self._compare_with_usda(vision_result.foods, usda_verified_items)
+
+        # Step 2: Cross-model validation, only for outliers
         if enable_cross_validation:
-            vision_result, cross_warnings = await self.validate_with_cross_model(
-                vision_result, photo_path, caption, visual_patterns
+            decision = self.decide_cross_validation(
+                vision_result, usda_verified_items, reasonableness_warnings, usda_warnings, user_id
             )
-            all_warnings.extend(cross_warnings)
+            self._record_decision(decision)
 
-        # Step 2: Reasonableness checks
-        _, reasonableness_warnings = validate_food_items(vision_result.foods)
-        all_warnings.extend(reasonableness_warnings)
+            if decision.run:
+                primary_result = vision_result
+                vision_result, cross_warnings = await self.validate_with_cross_model(
+                    vision_result, photo_path, caption, visual_patterns
+                )
+                all_warnings.extend(cross_warnings)
+                self._record_outcome(decision, cross_warnings)
 
-        # Step 3: USDA comparison (if available)
-        if usda_verified_items:
-            usda_warnings = self._compare_with_usda(vision_result.foods, usda_verified_items)
-            all_warnings.extend(usda_warnings)
+                # Re-check if the result was blended
+                if vision_result is not primary_result:
+                    _, reasonableness_warnings = validate_food_items(vision_result.foods)
+                    if usda_verified_items:
+                        usda_warnings = self._compare_with_usda(vision_result.foods, usda_verified_items)
+
+        # Step 3: Reasonableness and USDA warnings
+        all_warnings.extend(reasonableness_warnings)
+        all_warnings.extend(usda_warnings)
 
         # Step 4: Determine if we should flag for review
         if len(all_warnings) >= 3:
@@ -241,6 +320,95 @@ class NutritionValidator:
 
         return vision_result, all_warnings
 
+    def decide_cross_validation(
+        self,
+        vision_result: VisionAnalysisResult,
+        usda_verified_items: Optional[List[FoodItem]],
+        reasonableness_warnings: List[str],
+        usda_warnings: List[str],
+        user_id: Optional[str] = None
+    ) -> CrossValidationDecision:
+        """
+        Decide whether a second vision model should check this result.
+
+        Escalates when the primary result isn't high confidence, fails
+        reasonableness checks, disagrees with USDA data or has no USDA
+        match to agree with. Escalations are limited by the user's hourly
+        budget.
+
+        Args:
+            vision_result: Primary vision analysis result
+            usda_verified_items: USDA-verified items (if available)
+            reasonableness_warnings: Warnings from validate_food_items()
+            usda_warnings: Warnings from _compare_with_usda()
+            user_id: User's Telegram ID
+
+        Returns:
+            CrossValidationDecision
+        """
+        if CrossValidationConfig.ALWAYS:
+            reason = "always"
+        elif vision_result.confidence != "high":
+            reason = "low_confidence"
+        elif reasonableness_warnings:
+            reason = "unreasonable"
+        elif usda_warnings:
+            reason = "usda_disagreement"
+        elif not self._has_usda_match(vision_result.foods, usda_verified_items):
+            reason = "no_usda_match"
+        elif random.random() < CrossValidationConfig.AUDIT_SAMPLE_RATE:
+            reason = "audit_sample"
+        else:
+            return CrossValidationDecision(run=False, reason="confident")
+
+        if not self.budget.try_acquire(user_id):
+            return CrossValidationDecision(run=False, reason="budget_exhausted")
+        return CrossValidationDecision(run=True, reason=reason)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counts of cross-validation calls run and skipped"""
+        total = self._stats["run"] + self._stats["skipped"]
+        return {
+            **self._stats,
+            "skip_rate": self._stats["skipped"] / total if total else 0.0,
+        }
+
+    def _has_usda_match(
+        self,
+        ai_foods: List[FoodItem],
+        usda_foods: Optional[List[FoodItem]]
+    ) -> bool:
+        """True if at least one food has confident USDA data to compare against"""
+        if not usda_foods or len(ai_foods) != len(usda_foods):
+            return False
+        return any(
+            (food.confidence_score or 0.0) >= CrossValidationConfig.USDA_MIN_CONFIDENCE
+            and food.calories > 0
+            for food in usda_foods
+        )
+
+    def _record_decision(self, decision: CrossValidationDecision) -> None:
+        self._stats["run" if decision.run else "skipped"] += 1
+        nutrition_cross_validation_total.labels(
+            decision="run" if decision.run else "skip",
+            reason=decision.reason
+        ).inc()
+        logger.info(
+            f"[CROSS_VALIDATION] {'run' if decision.run else 'skip'} ({decision.reason})"
+        )
+
+    def _record_outcome(self, decision: CrossValidationDecision, cross_warnings: List[str]) -> None:
+        if any("Cross-model validation failed" in w for w in cross_warnings):
+            outcome = "error"
+        elif cross_warnings:
+            outcome = "disagreed"
+        else:
+            outcome = "agreed"
+        nutrition_cross_validation_outcome_total.labels(
+            reason=decision.reason,
+            outcome=outcome
+        ).inc()
+
     def _compare_with_usda(
         self,
         ai_foods: List[FoodItem],
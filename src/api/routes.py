@@ -21,13 +21,12 @@ from src.agent import get_agent_response
 from src.memory.db_manager import db_memory_manager as memory_manager
 from src.db.queries import (
     user_exists, create_user,
-    get_conversation_history, clear_conversation_history,
-    save_conversation_message,
     get_food_entries_by_date,
     get_active_reminders, create_reminder, get_reminder_by_id,
     get_user_xp_level, get_user_streaks, get_user_achievements
 )
 from src.db.connection import db
+from src.db.conversation_store import conversation_store
 from src.models.reminder import Reminder, ReminderSchedule
 
 logger = logging.getLogger(__name__)
@@ -60,7 +59,7 @@ async def chat(
         # Get conversation history if not provided
         message_history = request.message_history
         if not message_history:
-            message_history = await get_conversation_history(user_id, limit=20)
+            message_history = await conversation_store.get_history(user_id, limit=20)
 
         # Get agent response (same function Telegram bot uses)
         response = await get_agent_response(
@@ -73,8 +72,7 @@ async def chat(
         )
 
         # Save conversation
-        await save_conversation_message(user_id, "user", request.message, message_type="text")
-        await save_conversation_message(user_id, "assistant", response, message_type="text")
+        await conversation_store.save_turn(user_id, request.message, response)
 
         return ChatResponse(
             response=response,
@@ -368,7 +366,7 @@ async def clear_conversation(
                 detail=f"User {user_id} not found"
             )
 
-        await clear_conversation_history(user_id)
+        await conversation_store.clear(user_id)
         logger.info(f"Cleared conversation for user {user_id}")
         return None
 
@@ -834,6 +832,18 @@ async def get_metrics():
             ),
         }
 
+        # Write-behind sink (queued telemetry/audit writes)
+        from src.db.write_behind import write_behind_sink
+        database_metrics["write_behind"] = write_behind_sink.get_stats()
+
+        # Per-statement timings, slow queries and pool checkout wait
+        from src.db.instrumentation import statement_registry
+        database_metrics["statements"] = statement_registry.get_stats()
+
+        # Hot queries executed as prepared statements
+        from src.db.prepared import prepared_statements
+        database_metrics["prepared_statements"] = prepared_statements.get_stats()
+
         # Redis cache statistics
         cache = get_cache()
         cache_stats = {}
@@ -922,6 +932,31 @@ async def get_cache_statistics(api_key: str = Depends(verify_api_key)):
     }
 
 
+@router.get("/api/debug/loop")
+async def get_event_loop_state(
+    stack_frames: int = 10,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Event loop diagnostics
+
+    Returns lag percentiles, recent callbacks that blocked the loop (with
+    the stack that was running) and every unfinished task with the stack
+    where it is suspended. The bot, JobQueue and API share this loop.
+    """
+    from src.observability.loop_monitor import dump_tasks, loop_monitor
+
+    tasks = dump_tasks(max_frames=max(0, min(stack_frames, 50)))
+
+    return {
+        "monitor": loop_monitor.get_stats(),
+        "slow_callbacks": loop_monitor.recent_slow_callbacks(),
+        "task_count": len(tasks),
+        "tasks": tasks,
+        "timestamp": datetime.now()
+    }
+
+
 # ============================================================================
 # Formula API Endpoints (Epic 009 - Phase 3)
 # ============================================================================
@@ -932,6 +967,7 @@ from src.api.models import (
     FormulaUseRequest, FormulaSuggestionRequest, FormulaSuggestionResponse
 )
 from src.services.formula_detection import get_formula_detection_service
+from src.services.formula_name_index import formula_name_index
 from src.services.formula_suggestions import get_suggestion_service
 
 
@@ -976,6 +1012,8 @@ async def create_formula(
                 result = await cur.fetchone()
                 await conn.commit()
 
+        formula_name_index.invalidate(user_id)
+
         return FormulaResponse(
             id=str(result["id"]),
             name=request.name,
@@ -1212,6 +1250,8 @@ async def update_formula(
                 row = await cur.fetchone()
                 await conn.commit()
 
+        formula_name_index.invalidate(user_id)
+
         if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1279,6 +1319,8 @@ async def delete_formula(
                 deleted_count = cur.rowcount
                 await conn.commit()
 
+        formula_name_index.invalidate(user_id)
+
         if deleted_count == 0:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
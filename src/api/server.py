@@ -42,6 +42,23 @@ async def lifespan(app: FastAPI):
     await db.init_pool()
     logger.info("Database pool initialized")
 
+    # Event loop monitor (already running when started from main.py)
+    from src.config import LOOP_MONITOR_ENABLED
+    from src.observability.loop_monitor import loop_monitor
+    owns_loop_monitor = LOOP_MONITOR_ENABLED and not loop_monitor.running
+    if owns_loop_monitor:
+        loop_monitor.start()
+
+    from src.db.write_behind import write_behind_sink
+    write_behind_sink.start()
+
+    # Redis cache and cross-process invalidation (already up when started from main.py)
+    from src.cache.redis_client import close_cache, get_cache, init_cache
+    owns_cache = get_cache() is None
+    if owns_cache:
+        from src.config import REDIS_URL, ENABLE_CACHE
+        await init_cache(REDIS_URL, enabled=ENABLE_CACHE)
+
     # Load dynamic tools
     from src.agent.dynamic_tools import tool_manager
     loaded_tools = await tool_manager.load_all_tools()
@@ -59,8 +76,15 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down API server...")
+    await write_behind_sink.stop()
+    from src.services.health_events import health_event_batcher
+    await health_event_batcher.drain()
+    if owns_cache:
+        await close_cache()
     await db.close_pool()
     logger.info("Database pool closed")
+    if owns_loop_monitor:
+        await loop_monitor.stop()
 
 
 def create_api_application() -> FastAPI:
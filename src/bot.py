@@ -1,4 +1,5 @@
 """Telegram bot setup and handlers"""
+import asyncio
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -8,14 +9,13 @@ import telegram.error
 from src.config import TELEGRAM_BOT_TOKEN, DATA_PATH, TELEGRAM_TOPIC_FILTER, ENABLE_SENTRY
 from src.utils.auth import is_authorized
 from src.db.queries import (
-    save_conversation_message,
-    get_conversation_history,
-    clear_conversation_history,
     approve_tool,
     reject_tool,
     get_tool_by_name,
     get_pending_approvals,
 )
+from src.db.conversation_store import conversation_store
+from src.db.connection import POOL_BACKGROUND, db, uses_pool
 from src.memory.db_manager import db_memory_manager as memory_manager
 from src.memory.mem0_manager import mem0_manager
 from src.agent import get_agent_response
@@ -619,7 +619,7 @@ async def clear_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         return
 
     try:
-        await clear_conversation_history(user_id)
+        await conversation_store.clear(user_id)
         await update.message.reply_text(
             "🧹 Conversation history cleared! Starting fresh.\n\n"
             "I'll still remember your profile, preferences, and data - "
@@ -653,10 +653,11 @@ async def approve_tool_command(update: Update, context: ContextTypes.DEFAULT_TYP
     approval_id = context.args[0]
 
     try:
-        await approve_tool(approval_id, user_id)
+        tool_id = await approve_tool(approval_id, user_id)
 
-        # Reload tools to make newly approved tool available
-        await tool_manager.load_all_tools()
+        # Load just the approved tool to make it available
+        if tool_id:
+            await tool_manager.load_tool(tool_id)
 
         await update.message.reply_text(
             f"✅ Tool approved and loaded\n\n"
@@ -1020,7 +1021,8 @@ async def _analyze_and_validate_nutrition(
         caption=caption,
         visual_patterns=visual_patterns,
         usda_verified_items=verified_foods,
-        enable_cross_validation=True  # Enable multi-model cross-checking
+        enable_cross_validation=True,  # Cross-checks outliers only (adaptive)
+        user_id=user_id
     )
 
     # Use validated results
@@ -1163,13 +1165,14 @@ async def _save_food_entry_with_habits(
         # Store embedding asynchronously (will be generated automatically)
         # Using entry.id from the saved entry
         import asyncio
-        asyncio.create_task(
-            visual_search.store_image_embedding(
-                food_entry_id=str(entry.id),
-                user_id=user_id,
-                photo_path=str(photo_path)
+        with db.use_pool(POOL_BACKGROUND):
+            asyncio.create_task(
+                visual_search.store_image_embedding(
+                    food_entry_id=str(entry.id),
+                    user_id=user_id,
+                    photo_path=str(photo_path)
+                )
             )
-        )
         logger.info(f"[VISUAL_SEARCH] Queued embedding generation for entry {entry.id}")
     except Exception as e:
         logger.warning(f"[VISUAL_SEARCH] Failed to queue embedding: {e}")
@@ -1234,7 +1237,8 @@ async def _save_food_entry_with_habits(
 
         # Queue plate detection in background
         import asyncio
-        asyncio.create_task(detect_and_link_plate())
+        with db.use_pool(POOL_BACKGROUND):
+            asyncio.create_task(detect_and_link_plate())
         logger.info(f"[PLATE_RECOGNITION] Queued plate detection for entry {entry.id}")
 
     except Exception as e:
@@ -1326,11 +1330,11 @@ async def _send_response_and_log(
         "validation_warnings": validation_warnings if validation_warnings else None
     }
 
-    await save_conversation_message(
-        user_id, "user", photo_description, message_type="photo", metadata=photo_metadata
-    )
-    await save_conversation_message(
-        user_id, "assistant", response_message, message_type="photo_response"
+    await conversation_store.save_turn(
+        user_id, photo_description, response_message,
+        user_message_type="photo",
+        assistant_message_type="photo_response",
+        user_metadata=photo_metadata
     )
 
 
@@ -1449,7 +1453,7 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             await log_feature_usage(user_id, "voice_notes")
 
             # Load conversation history (auto-filters unhelpful "I don't know" responses)
-            message_history = await get_conversation_history(user_id, limit=20)
+            message_history = await conversation_store.get_history(user_id, limit=20)
 
             # Get AI response using the transcribed text
             response = await get_agent_response(
@@ -1462,12 +1466,14 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             "transcription": transcribed_text,
             "duration_seconds": voice.duration
         }
-        await save_conversation_message(
-            user_id, "user", transcribed_text, message_type="voice", metadata=voice_metadata
+        await conversation_store.save_turn(
+            user_id, transcribed_text, response,
+            user_message_type="voice",
+            user_metadata=voice_metadata
         )
-        await save_conversation_message(user_id, "assistant", response, message_type="text")
 
         # Move auto-save to background task (don't block response)
+        @uses_pool(POOL_BACKGROUND)
         async def background_voice_memory_tasks():
             """Run memory operations in background after response is sent"""
             await auto_save_user_info(user_id, transcribed_text, response)
@@ -1504,10 +1510,13 @@ async def handle_location(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         # Detect timezone from coordinates
         from src.utils.timezone_helper import get_timezone_from_coordinates, update_timezone_in_profile
 
-        detected_timezone = get_timezone_from_coordinates(latitude, longitude)
+        detected_timezone = await asyncio.to_thread(get_timezone_from_coordinates, latitude, longitude)
 
-        # Update user's profile
-        success = update_timezone_in_profile(user_id, detected_timezone)
+        # Update user's profile (database is the source of truth, profile.md kept for onboarding)
+        from src.services.container import get_container
+        success = await get_container().user_service.set_timezone(user_id, detected_timezone)
+        if success:
+            await asyncio.to_thread(update_timezone_in_profile, user_id, detected_timezone)
 
         if success:
             await update.message.reply_text(
@@ -0,0 +1,149 @@
+"""
+Cross-process cache invalidation over Redis pub/sub.
+
+The bot and API run as separate processes (and the API scales
+horizontally). Each keeps its own in-process L1 cache
+(src/utils/cache.py), so a write in one process must evict L1 entries
+everywhere. Writers publish the invalidated tags on CACHE_INVALIDATION_CHANNEL.
+Every process subscribes and drops the matching L1 entries; messages
+a process published itself are ignored because it already dropped them
+locally.
+
+Caches outside cache_with_ttl (the conversation store) register a
+listener with add_listener() and get the tags of every message from
+another process.
+
+Pub/sub is fire-and-forget: a process that is disconnected when a
+message is sent misses it. The L1 TTL bounds how long such an entry can
+stay stale.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.observability.metrics import cache_invalidation_messages_total
+
+logger = logging.getLogger(__name__)
+
+CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+RESUBSCRIBE_DELAY_SECONDS = 1.0
+
+
+class InvalidationBus:
+    """Publishes invalidated cache tags and applies those from other processes."""
+
+    def __init__(self, channel: str = CACHE_INVALIDATION_CHANNEL):
+        self.channel = channel
+        self.instance_id = uuid.uuid4().hex
+        self._client: Optional[Any] = None
+        self._pubsub: Optional[Any] = None
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: List[Callable[[List[str]], Any]] = []
+        self._stats = {"published": 0, "received": 0, "errors": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add_listener(self, listener: Callable[[List[str]], Any]) -> None:
+        """Also pass the tags of every message from another process to listener."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    async def start(self, client: Any) -> None:
+        """Subscribe with a redis.asyncio client and start applying messages."""
+        if self.running:
+            return
+
+        self._client = client
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.channel)
+        self._task = asyncio.create_task(self._listen(), name="cache-invalidation-listener")
+        logger.info(f"Cache invalidation bus subscribed to '{self.channel}'")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._pubsub:
+            try:
+                await self._pubsub.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing cache invalidation subscription: {e}")
+            self._pubsub = None
+
+        self._client = None
+
+    async def publish(self, tags: Iterable[str]) -> bool:
+        """Tell other processes to drop L1 entries under these tags."""
+        if self._client is None:
+            return False
+
+        message = json.dumps({"origin": self.instance_id, "tags": list(tags)})
+        try:
+            await self._client.publish(self.channel, message)
+        except Exception as e:
+            logger.error(f"Cache invalidation publish failed: {e}")
+            self._stats["errors"] += 1
+            return False
+
+        self._stats["published"] += 1
+        cache_invalidation_messages_total.labels(direction="published").inc()
+        return True
+
+    def handle(self, data: Any) -> int:
+        """
+        Apply one message; returns the number of L1 entries dropped.
+
+        Messages from this process are skipped.
+        """
+        from src.utils.cache import invalidate_tags
+
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed cache invalidation message: {e}")
+            self._stats["errors"] += 1
+            return 0
+
+        if message.get("origin") == self.instance_id:
+            return 0
+
+        self._stats["received"] += 1
+        cache_invalidation_messages_total.labels(direction="received").inc()
+        tags = list(message.get("tags", ()))
+        for listener in self._listeners:
+            try:
+                listener(tags)
+            except Exception as e:
+                logger.error(f"Cache invalidation listener failed: {e}")
+                self._stats["errors"] += 1
+        return invalidate_tags(*tags, broadcast=False)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message.get("type") == "message":
+                        self.handle(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # redis-py reconnects and resubscribes on the next read
+                logger.error(f"Cache invalidation listener error: {e}")
+                self._stats["errors"] += 1
+                await asyncio.sleep(RESUBSCRIBE_DELAY_SECONDS)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"running": self.running, "channel": self.channel, **self._stats}
+
+
+# Global bus (started by init_cache)
+invalidation_bus = InvalidationBus()
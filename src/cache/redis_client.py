@@ -2,19 +2,23 @@
 Redis caching client for performance optimization.
 
 Provides async Redis operations with:
-- Automatic serialization/deserialization
+- Automatic serialization/deserialization (orjson/msgpack, zlib for large values)
 - TTL-based caching
+- Batch reads and writes (MGET, pipelined SETEX) in one round trip
+- Tag-based invalidation (a Redis set per tag lists the keys under it)
 - Graceful degradation on Redis failures
 - Connection pooling
-- Cache statistics
+- Cache statistics and per-operation latency histograms
 """
 
-import json
 import logging
-from typing import Any, Optional
-import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional
 from contextlib import asynccontextmanager
 
+from src.cache.serializers import Serializer, get_serializer
+from src.observability.metrics import cache_operation_duration_seconds
+
 logger = logging.getLogger(__name__)
 
 # Try to import redis
@@ -25,29 +29,184 @@ except ImportError:
     REDIS_AVAILABLE = False
     logger.warning("redis not available - caching will be disabled")
 
+# Redis set holding the keys tagged with a tag
+TAG_KEY_PREFIX = "tag:"
+
+# Operation name → labelled cache_operation_duration_seconds child
+_operation_histograms: Dict[str, Any] = {}
+
+
+def _tag_key(tag: str) -> str:
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
+def _queue_tags(pipe: Any, key: str, tags: Iterable[str], ttl: Optional[int]) -> int:
+    """
+    Queue SADDs indexing key under each tag; returns the number of commands queued.
+
+    A tag set lives as long as its longest-lived key: EXPIRE NX sets the
+    first TTL and EXPIRE GT only ever extends it (Redis >= 7.0). Keys without
+    a TTL make the set persistent.
+    """
+    queued = 0
+    for tag in tags:
+        tag_key = _tag_key(tag)
+        pipe.sadd(tag_key, key)
+        if ttl:
+            pipe.expire(tag_key, ttl, nx=True)
+            pipe.expire(tag_key, ttl, gt=True)
+            queued += 3
+        else:
+            pipe.persist(tag_key)
+            queued += 2
+    return queued
+
+
+def _observe(operation: str, start: float) -> None:
+    """Record the latency of one cache operation started at perf_counter() `start`"""
+    histogram = _operation_histograms.get(operation)
+    if histogram is None:
+        histogram = _operation_histograms[operation] = cache_operation_duration_seconds.labels(
+            operation=operation
+        )
+    histogram.observe(time.perf_counter() - start)
+
+
+class CachePipeline:
+    """
+    Cache commands queued on one Redis pipeline and sent in a single round trip.
+
+    Values are serialized like RedisCache.set() and GET results decoded like
+    RedisCache.get(). Use through RedisCache.pipeline(), which executes the
+    queued commands when the block exits without an exception.
+    """
+
+    def __init__(self, cache: "RedisCache", pipe: Any):
+        self._cache = cache
+        self._pipe = pipe
+        # (command, key) per queued command, in order
+        self._commands: List[tuple] = []
+        self.results: Optional[List[Any]] = None
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def get(self, key: str) -> "CachePipeline":
+        self._pipe.get(key)
+        self._commands.append(("get", key))
+        return self
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None
+    ) -> "CachePipeline":
+        serialized = self._cache.serializer.dumps(value)
+        if ttl:
+            self._pipe.setex(key, ttl, serialized)
+        else:
+            self._pipe.set(key, serialized)
+        self._commands.append(("set", key))
+        if tags:
+            queued = _queue_tags(self._pipe, key, tags, ttl)
+            self._commands.extend([("tag", key)] * queued)
+        return self
+
+    def delete(self, key: str) -> "CachePipeline":
+        self._pipe.delete(key)
+        self._commands.append(("delete", key))
+        return self
+
+    def expire(self, key: str, ttl: int) -> "CachePipeline":
+        self._pipe.expire(key, ttl)
+        self._commands.append(("expire", key))
+        return self
+
+    async def execute(self) -> List[Any]:
+        """
+        Send all queued commands.
+
+        Returns:
+            One result per queued get/set/delete/expire, in order: decoded
+            value (or None) for get, True/False for the rest. Commands that
+            failed return None.
+        """
+        start = time.perf_counter()
+        try:
+            raw = await self._pipe.execute(raise_on_error=False)
+        except Exception as e:
+            logger.error(f"Redis pipeline error ({len(self._commands)} commands): {e}")
+            self._cache._stats["errors"] += 1
+            self.results = [None] * len(self._commands)
+            return self.results
+        finally:
+            _observe("pipeline", start)
+
+        stats = self._cache._stats
+        results = []
+        for (command, key), value in zip(self._commands, raw):
+            if command == "tag":
+                # Tag bookkeeping isn't reported as a result of its own
+                if isinstance(value, Exception):
+                    logger.error(f"Redis tag index error for key '{key}': {value}")
+                    stats["errors"] += 1
+                continue
+            if isinstance(value, Exception):
+                logger.error(f"Redis pipelined {command.upper()} error for key '{key}': {value}")
+                stats["errors"] += 1
+                results.append(None)
+            elif command == "get":
+                results.append(self._cache._decode(key, value))
+            elif command == "set":
+                stats["sets"] += 1
+                results.append(bool(value))
+            elif command == "delete":
+                stats["deletes"] += 1
+                results.append(value > 0)
+            else:
+                results.append(bool(value))
+
+        self.results = results
+        return results
+
 
 class RedisCache:
     """
     Async Redis cache client with graceful degradation.
 
     Features:
-    - Automatic JSON serialization
+    - Pluggable serialization (orjson, msgpack, zlib for large values)
     - TTL support
+    - Batch get/set and pipelining
     - Cache statistics
     - Connection pooling
     - Fallback to no-cache on failures
     """
 
-    def __init__(self, redis_url: str = "redis://localhost:6379/0", enabled: bool = True):
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379/0",
+        enabled: bool = True,
+        serializer: Optional[Serializer] = None
+    ):
         """
         Initialize Redis cache client.
 
         Args:
             redis_url: Redis connection URL
             enabled: Whether caching is enabled (allows runtime disable)
+            serializer: Value serializer (defaults to CACHE_SERIALIZER /
+                CACHE_COMPRESS_MIN_BYTES from config)
         """
+        if serializer is None:
+            from src.config import CACHE_COMPRESS_MIN_BYTES, CACHE_SERIALIZER
+            serializer = get_serializer(CACHE_SERIALIZER, CACHE_COMPRESS_MIN_BYTES)
+
         self.redis_url = redis_url
         self.enabled = enabled and REDIS_AVAILABLE
+        self.serializer = serializer
         self._client: Optional[Any] = None
         self._stats = {
             "hits": 0,
@@ -67,10 +226,10 @@ class RedisCache:
             return
 
         try:
+            # Values are bytes from the serializer, so responses stay undecoded
             self._client = await redis.from_url(
                 self.redis_url,
-                encoding="utf-8",
-                decode_responses=True,
+                decode_responses=False,
                 max_connections=10,
             )
             # Test connection
@@ -91,6 +250,24 @@ class RedisCache:
             except Exception as e:
                 logger.error(f"Error closing Redis connection: {e}")
 
+    def _decode(self, key: str, value: Optional[bytes]) -> Optional[Any]:
+        """Deserialize a raw GET/MGET result, counting the hit or miss."""
+        if value is None:
+            self._stats["misses"] += 1
+            logger.debug(f"Cache MISS: {key}")
+            return None
+
+        try:
+            decoded = self.serializer.loads(value)
+        except Exception as e:
+            logger.error(f"Cache decode error for key '{key}': {e}")
+            self._stats["errors"] += 1
+            return None
+
+        self._stats["hits"] += 1
+        logger.debug(f"Cache HIT: {key}")
+        return decoded
+
     async def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache.
@@ -99,41 +276,75 @@ class RedisCache:
             key: Cache key
 
         Returns:
-            Cached value (deserialized from JSON) or None if not found
+            Cached value (deserialized) or None if not found
         """
         if not self.enabled or not self._client:
             self._stats["misses"] += 1
             return None
 
+        start = time.perf_counter()
         try:
             value = await self._client.get(key)
-            if value is None:
-                self._stats["misses"] += 1
-                logger.debug(f"Cache MISS: {key}")
-                return None
-
-            self._stats["hits"] += 1
-            logger.debug(f"Cache HIT: {key}")
-
-            # Deserialize JSON
-            return json.loads(value)
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error for key '{key}': {e}")
-            self._stats["errors"] += 1
-            return None
         except Exception as e:
             logger.error(f"Redis GET error for key '{key}': {e}")
             self._stats["errors"] += 1
             return None
+        finally:
+            _observe("get", start)
+
+        return self._decode(key, value)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several values with one MGET.
+
+        Args:
+            keys: Cache keys (duplicates are fetched once)
 
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        Returns:
+            Dict of key → value for the keys that were found; misses are omitted
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        if not self.enabled or not self._client:
+            self._stats["misses"] += len(keys)
+            return {}
+
+        start = time.perf_counter()
+        try:
+            values = await self._client.mget(keys)
+        except Exception as e:
+            logger.error(f"Redis MGET error for {len(keys)} keys: {e}")
+            self._stats["errors"] += 1
+            return {}
+        finally:
+            _observe("get_many", start)
+
+        found = {}
+        for key, value in zip(keys, values):
+            decoded = self._decode(key, value)
+            if decoded is not None:
+                found[key] = decoded
+        return found
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None
+    ) -> bool:
         """
         Set value in cache.
 
         Args:
             key: Cache key
-            value: Value to cache (will be JSON serialized)
+            value: Value to cache (serialized with the configured serializer)
             ttl: Time to live in seconds (None = no expiration)
+            tags: Tags to index the key under for invalidate_tags()
+                (e.g. src.utils.cache.user_tags(user_id, "memory"))
 
         Returns:
             True if successful, False otherwise
@@ -142,10 +353,24 @@ class RedisCache:
             return False
 
         try:
-            # Serialize to JSON
-            serialized = json.dumps(value)
+            serialized = self.serializer.dumps(value)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Cache encode error for key '{key}': {e}")
+            self._stats["errors"] += 1
+            return False
 
-            if ttl:
+        start = time.perf_counter()
+        try:
+            if tags:
+                # Value and tag index in one round trip
+                pipe = self._client.pipeline(transaction=False)
+                if ttl:
+                    pipe.setex(key, ttl, serialized)
+                else:
+                    pipe.set(key, serialized)
+                _queue_tags(pipe, key, tags, ttl)
+                await pipe.execute()
+            elif ttl:
                 await self._client.setex(key, ttl, serialized)
             else:
                 await self._client.set(key, serialized)
@@ -153,14 +378,57 @@ class RedisCache:
             self._stats["sets"] += 1
             logger.debug(f"Cache SET: {key} (TTL: {ttl}s)")
             return True
+        except Exception as e:
+            logger.error(f"Redis SET error for key '{key}': {e}")
+            self._stats["errors"] += 1
+            return False
+        finally:
+            _observe("set", start)
+
+    async def set_many(self, mapping: Mapping[str, Any], ttl: Optional[int] = None) -> bool:
+        """
+        Set several values in one round trip.
+
+        Uses pipelined SETEX when a TTL is given (MSET can't set expiry),
+        MSET otherwise.
+
+        Args:
+            mapping: Key → value to cache
+            ttl: Time to live in seconds for every key (None = no expiration)
+
+        Returns:
+            True if every value was stored, False otherwise
+        """
+        if not mapping or not self.enabled or not self._client:
+            return False
+
+        try:
+            serialized = {key: self.serializer.dumps(value) for key, value in mapping.items()}
         except (TypeError, ValueError) as e:
-            logger.error(f"JSON encode error for key '{key}': {e}")
+            logger.error(f"Cache encode error in batch of {len(mapping)} keys: {e}")
             self._stats["errors"] += 1
             return False
+
+        start = time.perf_counter()
+        try:
+            if ttl:
+                pipe = self._client.pipeline(transaction=False)
+                for key, value in serialized.items():
+                    pipe.setex(key, ttl, value)
+                results = await pipe.execute()
+                stored = all(results)
+            else:
+                stored = bool(await self._client.mset(serialized))
+
+            self._stats["sets"] += len(serialized)
+            logger.debug(f"Cache SET batch: {len(serialized)} keys (TTL: {ttl}s)")
+            return stored
         except Exception as e:
-            logger.error(f"Redis SET error for key '{key}': {e}")
+            logger.error(f"Redis batch SET error for {len(serialized)} keys: {e}")
             self._stats["errors"] += 1
             return False
+        finally:
+            _observe("set_many", start)
 
     async def delete(self, key: str) -> bool:
         """
@@ -175,6 +443,7 @@ class RedisCache:
         if not self.enabled or not self._client:
             return False
 
+        start = time.perf_counter()
         try:
             result = await self._client.delete(key)
             self._stats["deletes"] += 1
@@ -184,11 +453,57 @@ class RedisCache:
             logger.error(f"Redis DELETE error for key '{key}': {e}")
             self._stats["errors"] += 1
             return False
+        finally:
+            _observe("delete", start)
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Delete every key indexed under any of the given tags.
+
+        Each tag set is read and removed atomically (MULTI/EXEC), so keys
+        tagged while this runs land in a fresh set instead of being lost;
+        then the keys are deleted. Two round trips in total, however many
+        tags and keys, and no keyspace scan.
+
+        Args:
+            tags: Tags used with set(..., tags=...)
+
+        Returns:
+            Number of keys deleted
+        """
+        if not tags or not self.enabled or not self._client:
+            return 0
+
+        start = time.perf_counter()
+        try:
+            pipe = self._client.pipeline(transaction=True)
+            for tag in tags:
+                pipe.smembers(_tag_key(tag))
+            pipe.delete(*(_tag_key(tag) for tag in tags))
+            *members, _ = await pipe.execute()
+
+            keys = set().union(*members)
+            if not keys:
+                return 0
+
+            deleted = await self._client.delete(*keys)
+            self._stats["deletes"] += deleted
+            logger.debug(f"Cache invalidated tags {tags}: {deleted} keys")
+            return deleted
+        except Exception as e:
+            logger.error(f"Redis tag invalidation error for {tags}: {e}")
+            self._stats["errors"] += 1
+            return 0
+        finally:
+            _observe("invalidate_tags", start)
 
     async def delete_pattern(self, pattern: str) -> int:
         """
         Delete all keys matching a pattern.
 
+        Walks the whole keyspace with SCAN; prefer tagging keys on set()
+        and calling invalidate_tags().
+
         Args:
             pattern: Redis key pattern (e.g., "user:*")
 
@@ -304,6 +619,8 @@ class RedisCache:
 
         return {
             "enabled": self.enabled,
+            "serializer": self.serializer.name,
+            "compress_min_bytes": self.serializer.compress_min_bytes,
             "hits": self._stats["hits"],
             "misses": self._stats["misses"],
             "hit_rate_percent": round(hit_rate, 2),
@@ -329,21 +646,24 @@ class RedisCache:
         """
         Context manager for pipelined operations.
 
+        Queued commands are sent in one round trip when the block exits
+        (or earlier via `await pipe.execute()`); nothing is sent if the
+        block raises. Yields None when caching is disabled.
+
         Example:
             async with cache.pipeline() as pipe:
-                await pipe.set("key1", "value1")
-                await pipe.set("key2", "value2")
-                await pipe.execute()
+                pipe.set("key1", {"a": 1}, ttl=60)
+                pipe.get("key2")
+            value1_stored, value2 = pipe.results
         """
         if not self.enabled or not self._client:
             yield None
             return
 
-        pipe = self._client.pipeline()
-        try:
-            yield pipe
-        finally:
-            pass
+        pipe = CachePipeline(self, self._client.pipeline(transaction=False))
+        yield pipe
+        if pipe.results is None and len(pipe):
+            await pipe.execute()
 
 
 # Global cache instance (initialized by config)
@@ -352,7 +672,8 @@ cache: Optional[RedisCache] = None
 
 async def init_cache(redis_url: str, enabled: bool = True) -> RedisCache:
     """
-    Initialize global Redis cache instance.
+    Initialize global Redis cache instance and subscribe to cross-process
+    cache invalidations.
 
     Args:
         redis_url: Redis connection URL
@@ -366,6 +687,13 @@ async def init_cache(redis_url: str, enabled: bool = True) -> RedisCache:
     cache = RedisCache(redis_url=redis_url, enabled=enabled)
     await cache.connect()
 
+    if cache.enabled and cache._client:
+        from src.cache.invalidation import invalidation_bus
+        try:
+            await invalidation_bus.start(cache._client)
+        except Exception as e:
+            logger.error(f"Cache invalidation bus failed to start: {e}")
+
     return cache
 
 
@@ -373,6 +701,9 @@ async def close_cache():
     """Close global cache connection."""
     global cache
 
+    from src.cache.invalidation import invalidation_bus
+    await invalidation_bus.stop()
+
     if cache:
         await cache.close()
         cache = None
@@ -0,0 +1,159 @@
+"""
+Value serializers for RedisCache.
+
+Every value is stored as one header byte followed by the payload:
+
+    header = format id (low bits) | FLAG_COMPRESSED (0x80) when zlib'd
+
+Formats:
+- json:    orjson when installed, stdlib json otherwise (same bytes on the wire)
+- msgpack: smaller and faster for numeric-heavy payloads (needs msgpack)
+
+Payloads of at least `compress_min_bytes` are zlib-compressed when that
+actually makes them smaller; USDA search responses typically shrink 5-8x.
+
+Values written before serializers existed are plain JSON text with no
+header. JSON text can't start with a header byte, so those are still read
+as JSON. Readers decode any format regardless of the configured one,
+which makes switching CACHE_SERIALIZER safe on a warm cache.
+"""
+
+import json
+import logging
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+FORMAT_JSON = 0x01
+FORMAT_MSGPACK = 0x02
+FLAG_COMPRESSED = 0x80
+COMPRESSION_LEVEL = 6
+
+
+class Serializer(ABC):
+    """Encodes values to bytes for Redis and back."""
+
+    name = "json"
+    format_id = FORMAT_JSON
+
+    def __init__(self, compress_min_bytes: int = 0):
+        """
+        Args:
+            compress_min_bytes: Compress payloads at least this large (0 = never)
+        """
+        self.compress_min_bytes = compress_min_bytes
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        """Payload bytes of a value (before the header and compression)."""
+
+    def dumps(self, value: Any) -> bytes:
+        """Serialize a value, compressing it if large enough."""
+        payload = self.encode(value)
+        header = self.format_id
+
+        if self.compress_min_bytes and len(payload) >= self.compress_min_bytes:
+            compressed = zlib.compress(payload, COMPRESSION_LEVEL)
+            if len(compressed) < len(payload):
+                payload = compressed
+                header |= FLAG_COMPRESSED
+
+        return bytes((header,)) + payload
+
+    def loads(self, data: Any) -> Any:
+        """Deserialize a value written by any serializer (or legacy JSON text)."""
+        if isinstance(data, str):
+            return json.loads(data)
+
+        header = data[0] if data else 0
+        format_id = header & ~FLAG_COMPRESSED
+        if format_id not in _DECODERS:
+            # Legacy value: bare JSON text
+            return json.loads(data)
+
+        payload = memoryview(data)[1:]
+        if header & FLAG_COMPRESSED:
+            payload = zlib.decompress(payload)
+        return _DECODERS[format_id](payload)
+
+
+class JsonSerializer(Serializer):
+    """JSON via orjson when installed, stdlib json otherwise."""
+
+    name = "json"
+    format_id = FORMAT_JSON
+
+    def encode(self, value: Any) -> bytes:
+        if ORJSON_AVAILABLE:
+            try:
+                return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # e.g. integers beyond 64 bits; json handles them
+                pass
+        return json.dumps(value).encode()
+
+
+class MsgpackSerializer(Serializer):
+    """MessagePack (binary, no schema)."""
+
+    name = "msgpack"
+    format_id = FORMAT_MSGPACK
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+
+def _decode_json(payload: Any) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(bytes(payload))
+
+
+def _decode_msgpack(payload: Any) -> Any:
+    if not MSGPACK_AVAILABLE:
+        raise ValueError("msgpack value found in cache but msgpack is not installed")
+    return msgpack.unpackb(payload, raw=False)
+
+
+_DECODERS = {
+    FORMAT_JSON: _decode_json,
+    FORMAT_MSGPACK: _decode_msgpack,
+}
+
+SERIALIZERS: Dict[str, type] = {
+    "json": JsonSerializer,
+    "orjson": JsonSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+
+def get_serializer(name: str = "json", compress_min_bytes: int = 0) -> Serializer:
+    """
+    Build a serializer by name ("json", "orjson" or "msgpack").
+
+    Falls back to JSON, with a warning, for unknown names or when msgpack
+    isn't installed.
+    """
+    serializer_class = SERIALIZERS.get(name.lower())
+    if serializer_class is None:
+        logger.warning(f"Unknown cache serializer '{name}', using json")
+        serializer_class = JsonSerializer
+    elif serializer_class is MsgpackSerializer and not MSGPACK_AVAILABLE:
+        logger.warning("msgpack not installed - cache serializer falling back to json")
+        serializer_class = JsonSerializer
+
+    return serializer_class(compress_min_bytes=compress_min_bytes)
@@ -50,6 +50,23 @@ class Settings(BaseSettings):
         description="PostgreSQL connection URL",
     )
 
+    database_replica_url: str = Field(
+        default="",
+        description="Read-only replica for analytics/dashboard reads (empty = everything on the primary)",
+    )
+
+    db_replica_staleness_seconds: float = Field(
+        default=5.0,
+        ge=0.0,
+        description="After a user's write, their replica reads go to the primary for this long",
+    )
+
+    health_events_retention_months: int = Field(
+        default=0,
+        ge=0,
+        description="Archive health_events partitions older than this many months in the daily maintenance job (0 = keep everything)",
+    )
+
     # AI Models
     openai_api_key: str = Field(
         default="",
@@ -71,6 +88,12 @@ class Settings(BaseSettings):
         description="Agent model: 'openai:gpt-4o' or 'anthropic:claude-3-5-sonnet-latest'",
     )
 
+    summary_model: str = Field(
+        default="",
+        description="Small model that folds old messages into the rolling conversation summary "
+        "(default: the small model of AGENT_MODEL's provider)",
+    )
+
     # Storage
     data_path: Path = Field(
         default=Path("./data"),
@@ -163,6 +186,71 @@ class Settings(BaseSettings):
         description="Prometheus metrics port (1-65535)",
     )
 
+    # Database statement instrumentation
+    db_statement_metrics: bool = Field(
+        default=True,
+        description="Record fingerprint, rows and duration of every SQL statement (opt-out)",
+    )
+
+    db_slow_query_ms: float = Field(
+        default=200.0,
+        ge=0.0,
+        description="Statements slower than this are logged as slow queries (ms)",
+    )
+
+    db_explain_sample_rate: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of slow SELECTs re-run under EXPLAIN (ANALYZE, BUFFERS) (0.0-1.0)",
+    )
+
+    # Server-side prepared statements
+    db_prepared_statements: bool = Field(
+        default=True,
+        description="Use server-side prepared statements (disable behind poolers that can't track them)",
+    )
+
+    # Event loop monitoring
+    loop_monitor_enabled: bool = Field(
+        default=True,
+        description="Sample event loop lag and log slow callbacks (opt-out)",
+    )
+
+    loop_lag_sample_interval_ms: float = Field(
+        default=500.0,
+        gt=0.0,
+        description="How often the event loop lag is sampled (ms)",
+    )
+
+    loop_slow_callback_ms: float = Field(
+        default=100.0,
+        gt=0.0,
+        description="Callbacks/task steps holding the event loop longer than this are logged (ms)",
+    )
+
+    # Redis Cache
+    redis_url: str = Field(
+        default="redis://localhost:6379/0",
+        description="Redis URL for the response cache",
+    )
+
+    enable_cache: bool = Field(
+        default=True,
+        description="Cache API responses and lookups in Redis (opt-out)",
+    )
+
+    cache_serializer: Literal["json", "orjson", "msgpack"] = Field(
+        default="orjson",
+        description="Serializer for new cache values (values written by any of them stay readable)",
+    )
+
+    cache_compress_min_bytes: int = Field(
+        default=1024,
+        ge=0,
+        description="zlib-compress cached values at least this large (0 = never)",
+    )
+
     # OpenTelemetry Tracing
     enable_tracing: bool = Field(
         default=True,
@@ -262,6 +350,14 @@ class Settings(BaseSettings):
         """Validate that required API keys are present for selected models"""
         errors = []
 
+        # Summaries default to the agent's provider, whose key is checked below
+        if not self.summary_model:
+            self.summary_model = (
+                "openai:gpt-4o-mini"
+                if self.agent_model.startswith("openai:")
+                else "anthropic:claude-3-5-haiku-latest"
+            )
+
         # Check vision model
         if self.vision_model.startswith("openai:") and not self.openai_api_key:
             errors.append(
@@ -288,6 +384,19 @@ class Settings(BaseSettings):
                 "   Get your API key at: https://console.anthropic.com/"
             )
 
+        # Check summary model
+        if self.summary_model.startswith("openai:") and not self.openai_api_key:
+            errors.append(
+                f"❌ SUMMARY_MODEL is set to '{self.summary_model}' but OPENAI_API_KEY is not set.\n"
+                "   Get your API key at: https://platform.openai.com/api-keys"
+            )
+
+        if self.summary_model.startswith("anthropic:") and not self.anthropic_api_key:
+            errors.append(
+                f"❌ SUMMARY_MODEL is set to '{self.summary_model}' but ANTHROPIC_API_KEY is not set.\n"
+                "   Get your API key at: https://console.anthropic.com/"
+            )
+
         if errors:
             raise ValueError("\n\n".join(errors))
 
@@ -326,10 +435,14 @@ TELEGRAM_BOT_TOKEN = settings.telegram_bot_token
 ALLOWED_TELEGRAM_IDS = settings.allowed_telegram_ids
 TELEGRAM_TOPIC_FILTER = settings.telegram_topic_filter
 DATABASE_URL = settings.database_url
+DATABASE_REPLICA_URL = settings.database_replica_url
+DB_REPLICA_STALENESS_SECONDS = settings.db_replica_staleness_seconds
+HEALTH_EVENTS_RETENTION_MONTHS = settings.health_events_retention_months
 OPENAI_API_KEY = settings.openai_api_key
 ANTHROPIC_API_KEY = settings.anthropic_api_key
 VISION_MODEL = settings.vision_model
 AGENT_MODEL = settings.agent_model
+SUMMARY_MODEL = settings.summary_model
 DATA_PATH = settings.data_path
 LOG_LEVEL = settings.log_level
 USDA_API_KEY = settings.usda_api_key
@@ -344,6 +457,17 @@ SENTRY_TRACES_SAMPLE_RATE = settings.sentry_traces_sample_rate
 ENABLE_PROMETHEUS = settings.enable_prometheus
 PROMETHEUS_PORT = settings.prometheus_port
 
+# Database instrumentation
+DB_STATEMENT_METRICS = settings.db_statement_metrics
+DB_SLOW_QUERY_MS = settings.db_slow_query_ms
+DB_EXPLAIN_SAMPLE_RATE = settings.db_explain_sample_rate
+DB_PREPARED_STATEMENTS = settings.db_prepared_statements
+
+# Event loop monitoring
+LOOP_MONITOR_ENABLED = settings.loop_monitor_enabled
+LOOP_LAG_SAMPLE_INTERVAL_MS = settings.loop_lag_sample_interval_ms
+LOOP_SLOW_CALLBACK_MS = settings.loop_slow_callback_ms
+
 # Tracing
 ENABLE_TRACING = settings.enable_tracing
 OTEL_SERVICE_NAME = settings.otel_service_name
@@ -351,8 +475,10 @@ OTEL_EXPORTER_OTLP_ENDPOINT = settings.otel_exporter_otlp_endpoint
 
 
 # Redis Cache
-REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-ENABLE_CACHE: bool = os.getenv("ENABLE_CACHE", "true").lower() == "true"
+REDIS_URL = settings.redis_url
+ENABLE_CACHE = settings.enable_cache
+CACHE_SERIALIZER = settings.cache_serializer
+CACHE_COMPRESS_MIN_BYTES = settings.cache_compress_min_bytes
 
 
 def validate_config() -> None:
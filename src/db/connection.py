@@ -1,16 +1,104 @@
-"""Database connection management with dynamic pool sizing"""
+"""
+Database connection management with bulkheaded, dynamically sized pools
+
+Work is split across named pools so a burst in one class of work can't
+starve another:
+
+- interactive: Telegram/API handlers (the default)
+- background: fire-and-forget writes, reminders, metrics collection,
+  write-behind flushes, maintenance jobs
+- analytics: nightly pattern mining and other long scans
+
+Pick a pool per call with db.connection(kind=...), or for a whole code
+path (including the tasks it spawns) with `with db.use_pool(...)` or the
+@uses_pool(...) decorator. Each
+pool's max_size is adjusted by a supervisor task based on observed
+checkout waits, and its saturation is exported to Prometheus.
+
+With DATABASE_REPLICA_URL set, a fourth, read-only pool points at a
+replica. Reads opt in with db.connection(read_only=True, user_id=...), or
+for a whole code path with `with db.use_replica(user_id)` or the
+@uses_replica decorator (writes inside such a path pass read_only=False).
+Replica reads go to the primary instead when:
+
+- the same user wrote within DB_REPLICA_STALENESS_SECONDS (writers call
+  db.record_write(user_id)); this only sees writes made by this process
+- a replica checkout failed within the last REPLICA_RETRY_SECONDS
+"""
+import asyncio
+import functools
+import inspect
+import itertools
 import logging
 import os
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Optional
+import time
+from collections import OrderedDict
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Dict, Iterator, Optional, Sequence
 import psycopg
-from psycopg.rows import dict_row
+from psycopg.rows import RowFactory, dict_row, tuple_row
 from psycopg_pool import AsyncConnectionPool
-from src.config import DATABASE_URL, ENABLE_PROMETHEUS
+from src.config import (
+    DATABASE_REPLICA_URL,
+    DATABASE_URL,
+    DB_PREPARED_STATEMENTS,
+    DB_REPLICA_STALENESS_SECONDS,
+    DB_STATEMENT_METRICS,
+)
+from src.db.instrumentation import InstrumentedAsyncCursor, record_pool_wait
+from src.db.vector import register_vector_loader
 from src.exceptions import ConnectionError as DBConnectionError, wrap_external_exception
+from src.observability.metrics import (
+    db_pool_connections,
+    db_pool_resizes_total,
+    db_pool_timeouts_total,
+    db_read_only_routes_total,
+)
 
 logger = logging.getLogger(__name__)
 
+# Default rows per round trip for server-side cursors (Database.stream)
+STREAM_FETCH_SIZE = 2000
+
+# Pool names
+POOL_INTERACTIVE = "interactive"
+POOL_BACKGROUND = "background"
+POOL_ANALYTICS = "analytics"
+POOL_REPLICA = "replica"
+
+# Replica routing: after a failed replica checkout, read from the primary
+# for this long; remember this many users' last write for the staleness guard
+REPLICA_RETRY_SECONDS = 30.0
+RECENT_WRITES_MAX_USERS = 10000
+
+# Adaptive sizing: every interval, grow a pool whose queued checkouts
+# waited longer than POOL_GROW_WAIT_MS on average (or timed out), and
+# shrink it back one step after POOL_SHRINK_AFTER idle intervals
+POOL_SUPERVISE_INTERVAL = 15.0
+POOL_GROW_WAIT_MS = 50.0
+POOL_GROW_STEP = 2
+POOL_SHRINK_AFTER = 4
+
+_cursor_ids = itertools.count(1)
+
+# Pool used when connection() is called without kind
+_current_pool: ContextVar[str] = ContextVar("db_pool_kind", default=POOL_INTERACTIVE)
+
+# Set inside use_replica()/@uses_replica: (user_id,) whose reads may go to the replica
+_replica_scope: ContextVar[Optional[tuple]] = ContextVar("db_replica_scope", default=None)
+
+
+@dataclass
+class PoolConfig:
+    """Sizing and timeouts of one named pool"""
+    name: str
+    min_size: int
+    max_size: int
+    max_size_ceiling: int  # Adaptive sizing never grows past this
+    timeout: float  # Seconds to wait for a connection before failing
+
 
 def calculate_pool_size() -> tuple[int, int]:
     """
@@ -33,27 +121,191 @@ def calculate_pool_size() -> tuple[int, int]:
     return min_size, max_size
 
 
+def calculate_pool_configs() -> Dict[str, PoolConfig]:
+    """
+    Size each named pool.
+
+    Interactive keeps the CPU-based sizing and fails fast; background and
+    analytics are small and patient, so their bursts queue instead of
+    taking connections from user requests.
+    """
+    min_size, max_size = calculate_pool_size()
+    cpu_count = os.cpu_count() or 2
+
+    background_max = max(2, cpu_count // 2)
+    return {
+        POOL_INTERACTIVE: PoolConfig(
+            name=POOL_INTERACTIVE,
+            min_size=min_size,
+            max_size=max_size,
+            max_size_ceiling=max_size * 2,
+            timeout=5.0,
+        ),
+        POOL_BACKGROUND: PoolConfig(
+            name=POOL_BACKGROUND,
+            min_size=1,
+            max_size=background_max,
+            max_size_ceiling=background_max * 2,
+            timeout=30.0,
+        ),
+        POOL_ANALYTICS: PoolConfig(
+            name=POOL_ANALYTICS,
+            min_size=0,
+            max_size=2,
+            max_size_ceiling=4,
+            timeout=120.0,
+        ),
+    }
+
+
+def calculate_replica_config() -> PoolConfig:
+    """
+    Size the read-only replica pool.
+
+    Checkouts fail fast (and fall back to the primary) so a slow or
+    unreachable replica never holds up a dashboard.
+    """
+    cpu_count = os.cpu_count() or 2
+    return PoolConfig(
+        name=POOL_REPLICA,
+        min_size=1,
+        max_size=cpu_count + 2,
+        max_size_ceiling=(cpu_count + 2) * 2,
+        timeout=2.0,
+    )
+
+
+async def _configure_connection(conn: psycopg.AsyncConnection) -> None:
+    """Set up a new pooled connection once, instead of on every checkout"""
+    conn.row_factory = dict_row
+    await register_vector_loader(conn)
+
+
+async def _configure_replica_connection(conn: psycopg.AsyncConnection) -> None:
+    """Replica connections: dict rows, and read-only so a stray write fails loudly"""
+    conn.row_factory = dict_row
+    await register_vector_loader(conn)
+    await conn.set_read_only(True)
+
+
+def uses_pool(kind: str) -> Callable:
+    """
+    Decorator: run an async function (job callback, background task) with
+    connection() defaulting to the given pool.
+
+    Example:
+        @uses_pool(POOL_ANALYTICS)
+        async def _run_nightly_pattern_mining(self, context): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            token = _current_pool.set(kind)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _current_pool.reset(token)
+        return wrapper
+    return decorator
+
+
+# (target, reason) → labelled db_read_only_routes_total child
+_read_only_routes: Dict[tuple, Any] = {}
+
+
+def _count_read_only_route(target: str, reason: str) -> None:
+    counter = _read_only_routes.get((target, reason))
+    if counter is None:
+        counter = _read_only_routes[(target, reason)] = db_read_only_routes_total.labels(target=target, reason=reason)
+    counter.inc()
+
+
+def uses_replica(func: Callable) -> Callable:
+    """
+    Decorator: reads made by an async function go to the replica (see
+    Database.use_replica), keyed on its user_id argument if it has one.
+
+    Example:
+        @uses_replica
+        async def get_weekly_overview(user_id: str) -> str: ...
+    """
+    signature = inspect.signature(func)
+    takes_user_id = "user_id" in signature.parameters
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        user_id = signature.bind_partial(*args, **kwargs).arguments.get("user_id") if takes_user_id else None
+        token = _replica_scope.set((user_id,))
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _replica_scope.reset(token)
+    return wrapper
+
+
 class Database:
-    """Database connection pool manager with dynamic sizing"""
+    """Database connection pool manager with named, dynamically sized pools"""
 
-    def __init__(self, connection_string: str = DATABASE_URL):
+    def __init__(
+        self,
+        connection_string: str = DATABASE_URL,
+        instrument: bool = DB_STATEMENT_METRICS,
+        replica_connection_string: str = DATABASE_REPLICA_URL,
+        replica_staleness: float = DB_REPLICA_STALENESS_SECONDS
+    ):
         self.connection_string = connection_string
-        self._pool: Optional[AsyncConnectionPool] = None
+        self.instrument = instrument
+        self.replica_connection_string = replica_connection_string
+        self.replica_staleness = replica_staleness
+        self._replica_down_until = 0.0
+        self._recent_writes: "OrderedDict[str, float]" = OrderedDict()
+        self._pools: Dict[str, AsyncConnectionPool] = {}
+        self._configs: Dict[str, PoolConfig] = {}
+        self._idle_intervals: Dict[str, int] = {}
+        self._supervisor: Optional[asyncio.Task] = None
+
+    @property
+    def _pool(self) -> Optional[AsyncConnectionPool]:
+        """The interactive pool"""
+        return self._pools.get(POOL_INTERACTIVE)
 
-    async def init_pool(self) -> None:
-        """Initialize connection pool with dynamic sizing"""
+    async def init_pool(self, configs: Optional[Dict[str, PoolConfig]] = None) -> None:
+        """Initialize the named connection pools and start the pool supervisor"""
         try:
-            min_size, max_size = calculate_pool_size()
-
-            logger.info(f"Initializing database connection pool (min={min_size}, max={max_size})")
-            self._pool = AsyncConnectionPool(
-                self.connection_string,
-                min_size=min_size,
-                max_size=max_size,
-                open=False
-            )
-            await self._pool.open()
-            logger.info("✅ Database connection pool initialized")
+            self._configs = configs or calculate_pool_configs()
+            if self.replica_connection_string and POOL_REPLICA not in self._configs:
+                self._configs[POOL_REPLICA] = calculate_replica_config()
+
+            # Statement metrics are recorded by the cursor class (src/db/instrumentation.py).
+            # Queries are prepared server-side after psycopg's default of 5 runs on
+            # a connection (hot queries immediately, see src/db/prepared.py)
+            kwargs: Dict[str, Any] = {}
+            if not DB_PREPARED_STATEMENTS:
+                kwargs["prepare_threshold"] = None
+            if self.instrument:
+                kwargs["cursor_factory"] = InstrumentedAsyncCursor
+            for config in self._configs.values():
+                logger.info(
+                    f"Initializing {config.name} database pool "
+                    f"(min={config.min_size}, max={config.max_size}, timeout={config.timeout}s)"
+                )
+                replica = config.name == POOL_REPLICA
+                pool = AsyncConnectionPool(
+                    self.replica_connection_string if replica else self.connection_string,
+                    min_size=config.min_size,
+                    max_size=config.max_size,
+                    timeout=config.timeout,
+                    name=config.name,
+                    kwargs=kwargs,
+                    configure=_configure_replica_connection if replica else _configure_connection,
+                    open=False
+                )
+                await pool.open()
+                self._pools[config.name] = pool
+                self._idle_intervals[config.name] = 0
+
+            self._supervisor = asyncio.create_task(self._supervise_pools())
+            logger.info("✅ Database connection pools initialized")
         except psycopg.OperationalError as e:
             raise DBConnectionError(
                 message=f"Failed to initialize database pool: {str(e)}",
@@ -67,39 +319,128 @@ class Database:
             )
 
     async def close_pool(self) -> None:
-        """Close connection pool"""
-        if self._pool:
+        """Stop the supervisor and close all pools"""
+        if self._supervisor:
+            self._supervisor.cancel()
             try:
-                logger.info("Closing database connection pool")
-                await self._pool.close()
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+            self._supervisor = None
+
+        for name, pool in list(self._pools.items()):
+            try:
+                logger.info(f"Closing {name} database pool")
+                await pool.close()
             except Exception as e:
-                logger.error(f"Error closing database pool: {e}", exc_info=True)
+                logger.error(f"Error closing {name} database pool: {e}", exc_info=True)
                 # Don't raise on close, just log
+        self._pools.clear()
+
+    @contextmanager
+    def use_pool(self, kind: str) -> Iterator[None]:
+        """
+        Route connection() calls without an explicit kind to this pool for
+        the rest of the block, including tasks created inside it.
+
+        Example:
+            with db.use_pool(POOL_BACKGROUND):
+                await send_scheduled_reminder(...)
+        """
+        token = _current_pool.set(kind)
+        try:
+            yield
+        finally:
+            _current_pool.reset(token)
+
+    @contextmanager
+    def use_replica(self, user_id: Optional[str] = None) -> Iterator[None]:
+        """
+        Send connection() calls without an explicit read_only to the replica
+        for the rest of the block, subject to the staleness guard for
+        user_id. Code that writes inside the block must pass read_only=False.
+
+        Example:
+            with db.use_replica(user_id):
+                events = await get_health_events(user_id, start, end)
+        """
+        token = _replica_scope.set((user_id,))
+        try:
+            yield
+        finally:
+            _replica_scope.reset(token)
+
+    def record_write(self, user_id: Optional[str]) -> None:
+        """
+        Note that user_id's data just changed, so their replica reads use the
+        primary for the next replica_staleness seconds. No-op without a replica.
+        """
+        if not user_id or POOL_REPLICA not in self._pools:
+            return
+        self._recent_writes[user_id] = time.monotonic()
+        self._recent_writes.move_to_end(user_id)
+        if len(self._recent_writes) > RECENT_WRITES_MAX_USERS:
+            self._recent_writes.popitem(last=False)
+
+    def _replica_route(self, user_id: Optional[str]) -> str:
+        """Why a read-only checkout should (replica) or shouldn't use the replica"""
+        now = time.monotonic()
+        if now < self._replica_down_until:
+            return "replica_down"
+        if user_id is not None:
+            written_at = self._recent_writes.get(user_id)
+            if written_at is not None and now - written_at < self.replica_staleness:
+                return "recent_write"
+        return "replica"
 
     @asynccontextmanager
-    async def connection(self) -> AsyncGenerator[psycopg.AsyncConnection, None]:
-        """Get database connection from pool"""
-        if not self._pool:
+    async def connection(
+        self,
+        kind: Optional[str] = None,
+        read_only: Optional[bool] = None,
+        user_id: Optional[str] = None
+    ) -> AsyncGenerator[psycopg.AsyncConnection, None]:
+        """
+        Get database connection from a pool
+
+        This is the hottest function in the app, so it does no per-checkout
+        setup: connections get dict rows once in _configure_connection, and
+        pool gauges are sampled by the pool supervisor (adjust_pool).
+
+        Args:
+            kind: Pool name (interactive, background, analytics). Defaults to
+                the pool selected with use_pool(), else interactive.
+            read_only: True to read from the replica (when configured),
+                False to force the primary. Defaults to use_replica() scope.
+            user_id: Whose data is read, for the replica staleness guard.
+                Defaults to the use_replica() user.
+        """
+        if read_only is not False and POOL_REPLICA in self._pools:
+            scope = _replica_scope.get()
+            if read_only or scope is not None:
+                reason = self._replica_route(user_id if user_id is not None else scope and scope[0])
+                if reason == "replica":
+                    async with self._replica_connection(kind) as conn:
+                        yield conn
+                    return
+                _count_read_only_route("primary", reason)
+
+        kind = kind or _current_pool.get()
+        pool = self._pools.get(kind)
+        if pool is None:
             raise DBConnectionError(
-                message="Database pool not initialized. Call init_pool() first.",
+                message=(
+                    "Database pool not initialized. Call init_pool() first."
+                    if not self._pools else f"Unknown database pool: {kind}"
+                ),
                 operation="get_connection"
             )
 
-        # Update pool metrics
-        if ENABLE_PROMETHEUS:
-            try:
-                from src.monitoring import update_pool_metrics
-                pool_stats = self._pool.get_stats()
-                update_pool_metrics(
-                    total=pool_stats.get('pool_size', 0),
-                    available=pool_stats.get('pool_available', 0)
-                )
-            except Exception as e:
-                logger.debug(f"Failed to update pool metrics: {e}")
-
         try:
-            async with self._pool.connection() as conn:
-                conn.row_factory = dict_row
+            checkout_started = time.perf_counter()
+            async with pool.connection() as conn:
+                if self.instrument:
+                    record_pool_wait(time.perf_counter() - checkout_started, kind)
                 yield conn
         except psycopg.OperationalError as e:
             raise DBConnectionError(
@@ -113,24 +454,191 @@ class Database:
                 operation="get_connection"
             )
 
+    @asynccontextmanager
+    async def pipeline(self, kind: Optional[str] = None) -> AsyncGenerator[psycopg.AsyncConnection, None]:
+        """
+        Get a connection in pipeline mode.
+
+        Statements are sent without waiting for each result; the server is
+        only waited on when a result is fetched, on commit(), or when the
+        block exits. A multi-statement write followed by commit() therefore
+        costs one round trip instead of one per statement.
+
+        If a statement fails, the rest of the batch is skipped and the error
+        is raised at the next sync point.
+
+        Example:
+            async with db.pipeline() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute("UPDATE ...", params)
+                    await cur.execute("INSERT ...", params)
+                await conn.commit()
+        """
+        async with self.connection(kind) as conn:
+            async with conn.pipeline():
+                yield conn
+
+    @asynccontextmanager
+    async def _replica_connection(self, kind: Optional[str]) -> AsyncGenerator[psycopg.AsyncConnection, None]:
+        """Replica connection, or a primary one (kind) if the replica can't be reached"""
+        stack = AsyncExitStack()
+        try:
+            checkout_started = time.perf_counter()
+            conn = await stack.enter_async_context(self._pools[POOL_REPLICA].connection())
+        except psycopg.OperationalError as e:  # includes PoolTimeout
+            self._replica_down_until = time.monotonic() + REPLICA_RETRY_SECONDS
+            logger.warning(f"Replica unavailable, reading from the primary for {REPLICA_RETRY_SECONDS:.0f}s: {e}")
+            _count_read_only_route("primary", "replica_down")
+            async with self.connection(kind, read_only=False) as conn:
+                yield conn
+            return
+
+        _count_read_only_route("replica", "replica")
+        async with stack:
+            if self.instrument:
+                record_pool_wait(time.perf_counter() - checkout_started, POOL_REPLICA)
+            try:
+                yield conn
+            except psycopg.OperationalError as e:
+                raise DBConnectionError(
+                    message=f"Failed to get database connection: {str(e)}",
+                    operation="get_connection",
+                    cause=e
+                )
+            except Exception as e:
+                raise wrap_external_exception(
+                    e,
+                    operation="get_connection"
+                )
+
+    async def stream(
+        self,
+        query: str,
+        params: Optional[Sequence[Any]] = None,
+        fetch_size: int = STREAM_FETCH_SIZE,
+        row_factory: RowFactory = dict_row,
+        kind: Optional[str] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Yield query rows through a server-side (named) cursor.
+
+        Rows are fetched fetch_size at a time, so memory stays bounded no
+        matter how large the result is. The connection and its transaction
+        are held until the generator is exhausted or closed.
+
+        Args:
+            query: SELECT statement
+            params: Query parameters
+            fetch_size: Rows per fetch from the server
+            row_factory: psycopg row factory (dict_row, tuple_row, class_row(...))
+            kind: Pool to use (see connection())
+        """
+        async with self.connection(kind) as conn:
+            async with conn.cursor(name=f"stream_{next(_cursor_ids)}", row_factory=row_factory) as cur:
+                cur.itersize = fetch_size
+                await cur.execute(query, params)
+                async for row in cur:
+                    yield row
+
+    async def fetchval(self, query: str, params: Optional[Sequence[Any]] = None, kind: Optional[str] = None) -> Any:
+        """
+        First column of the first row (None if no rows).
+
+        Reads tuple rows, skipping the per-row dict; meant for internal
+        counts and aggregates. For several such statements on one
+        connection use conn.cursor(row_factory=tuple_row) directly.
+        """
+        async with self.connection(kind) as conn:
+            async with conn.cursor(row_factory=tuple_row) as cur:
+                await cur.execute(query, params)
+                row = await cur.fetchone()
+                return row[0] if row else None
+
+    async def _supervise_pools(self) -> None:
+        """Periodically resize pools and export their saturation"""
+        while True:
+            await asyncio.sleep(POOL_SUPERVISE_INTERVAL)
+            for name in list(self._pools):
+                try:
+                    await self.adjust_pool(name)
+                except Exception as e:
+                    logger.warning(f"Failed to adjust {name} database pool: {e}")
+
+    async def adjust_pool(self, name: str) -> Optional[int]:
+        """
+        Resize one pool from the checkouts since the last call.
+
+        Grows max_size by POOL_GROW_STEP (up to the ceiling) when queued
+        checkouts waited more than POOL_GROW_WAIT_MS on average or timed
+        out; shrinks it by one (down to the configured size) after
+        POOL_SHRINK_AFTER intervals with no queued checkouts.
+
+        Returns:
+            The new max_size if it changed, else None
+        """
+        pool = self._pools[name]
+        config = self._configs[name]
+        stats = pool.pop_stats()
+
+        queued = stats.get("requests_queued", 0)
+        timeouts = stats.get("requests_errors", 0)
+        mean_wait_ms = stats.get("requests_wait_ms", 0) / queued if queued else 0.0
+
+        db_pool_connections.labels(pool=name, state="size").set(stats.get("pool_size", 0))
+        db_pool_connections.labels(pool=name, state="available").set(stats.get("pool_available", 0))
+        db_pool_connections.labels(pool=name, state="waiting").set(stats.get("requests_waiting", 0))
+        db_pool_connections.labels(pool=name, state="max").set(pool.max_size)
+        if timeouts:
+            db_pool_timeouts_total.labels(pool=name).inc(timeouts)
+
+        new_max = pool.max_size
+        if timeouts or mean_wait_ms > POOL_GROW_WAIT_MS:
+            self._idle_intervals[name] = 0
+            new_max = min(pool.max_size + POOL_GROW_STEP, config.max_size_ceiling)
+        elif queued == 0:
+            self._idle_intervals[name] += 1
+            if self._idle_intervals[name] >= POOL_SHRINK_AFTER:
+                self._idle_intervals[name] = 0
+                new_max = max(pool.max_size - 1, config.max_size)
+
+        if new_max == pool.max_size:
+            return None
+
+        direction = "grow" if new_max > pool.max_size else "shrink"
+        logger.info(
+            f"Resizing {name} database pool max_size {pool.max_size} → {new_max} "
+            f"(queued={queued}, mean wait={mean_wait_ms:.1f}ms, timeouts={timeouts})"
+        )
+        await pool.resize(config.min_size, new_max)
+        db_pool_resizes_total.labels(pool=name, direction=direction).inc()
+        return new_max
+
     def get_pool_stats(self) -> dict:
         """
         Get connection pool statistics.
 
         Returns:
-            Dictionary with pool size, available connections, etc.
+            Dictionary with the interactive pool's size, available
+            connections, etc., plus every pool under "pools"
         """
-        if not self._pool:
+        if not self._pools:
             return {"error": "Pool not initialized"}
 
         try:
-            return {
-                "size": self._pool.size,
-                "available": self._pool.available,
-                "active": self._pool.size - self._pool.available,
-                "min_size": self._pool.min_size,
-                "max_size": self._pool.max_size,
-            }
+            pools = {}
+            for name, pool in self._pools.items():
+                stats = pool.get_stats()
+                size = stats.get("pool_size", 0)
+                available = stats.get("pool_available", 0)
+                pools[name] = {
+                    "size": size,
+                    "available": available,
+                    "active": size - available,
+                    "waiting": stats.get("requests_waiting", 0),
+                    "min_size": pool.min_size,
+                    "max_size": pool.max_size,
+                }
+            return {**pools.get(POOL_INTERACTIVE, {}), "pools": pools}
         except Exception as e:
             logger.error(f"Error getting pool stats: {e}")
             return {"error": str(e)}
@@ -139,10 +647,12 @@ class Database:
         """Log current pool statistics"""
         stats = self.get_pool_stats()
         if "error" not in stats:
-            logger.info(
-                f"DB Pool: {stats['active']}/{stats['size']} active "
-                f"({stats['available']} available, max={stats['max_size']})"
-            )
+            for name, pool_stats in stats["pools"].items():
+                logger.info(
+                    f"DB Pool {name}: {pool_stats['active']}/{pool_stats['size']} active "
+                    f"({pool_stats['available']} available, {pool_stats['waiting']} waiting, "
+                    f"max={pool_stats['max_size']})"
+                )
 
 
 # Global database instance
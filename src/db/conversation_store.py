@@ -0,0 +1,272 @@
+"""Write-through conversation history store
+
+Keeps the last N messages per user in a bounded in-process ring buffer so
+the agent's history lookup before every call doesn't need a query. Saves go
+to PostgreSQL first and are then appended to the buffer; on a miss the
+buffer is filled from conversation_history using the covering
+(user_id, timestamp DESC) index from migration 017.
+
+The rolling summary of older turns (conversation_summaries) is cached next
+to the buffer, so building the agent's context window needs no query on a
+hit either.
+
+The bot and API processes each keep their own store. Writes publish the
+user's conversation tag on the cache invalidation bus, and every other
+process drops that user's buffer and summary. Cached entries also expire
+after DEFAULT_TTL_SECONDS, which bounds staleness without Redis or when a
+message is missed.
+"""
+
+import logging
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Optional
+
+from src.cache.invalidation import invalidation_bus
+from src.utils.cache import invalidate_tags, user_family_tag
+from src.db.queries.conversation import (
+    get_conversation_history,
+    save_conversation_messages,
+    clear_conversation_history,
+    get_conversation_summary,
+    save_conversation_summary,
+)
+
+logger = logging.getLogger(__name__)
+
+# Messages kept per user (must cover the largest history limit used by callers)
+DEFAULT_BUFFER_SIZE = 50
+
+# Users kept in memory before the least recently used buffer is dropped
+DEFAULT_MAX_USERS = 5_000
+
+# Seconds a loaded buffer or summary is served before it is read again
+DEFAULT_TTL_SECONDS = 60
+
+# Invalidation tag family: user:{id}:conversation
+CACHE_FAMILY = "conversation"
+
+_MISSING = object()
+
+
+class _UserBuffer:
+    """Ring buffer of one user's most recent messages (oldest first)"""
+
+    __slots__ = ("messages", "complete", "expires_at")
+
+    def __init__(self, messages: list[dict], size: int, complete: bool, expires_at: float):
+        self.messages: deque = deque(messages, maxlen=size)
+        # True when the buffer holds the user's entire history
+        self.complete = complete
+        self.expires_at = expires_at
+
+
+class ConversationStore:
+    """Bounded per-user cache of recent conversation messages"""
+
+    def __init__(
+        self,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        max_users: int = DEFAULT_MAX_USERS,
+        ttl: float = DEFAULT_TTL_SECONDS
+    ):
+        self.buffer_size = buffer_size
+        self.max_users = max_users
+        self.ttl = ttl
+        self._buffers: "OrderedDict[str, _UserBuffer]" = OrderedDict()
+        # Cached (summary row, expiry); a None row means no summary yet
+        self._summaries: "OrderedDict[str, tuple[Optional[dict], float]]" = OrderedDict()
+        # In-flight loads per user; set to False when a write races the load
+        self._loading: dict[str, bool] = {}
+        self._stats = {"hits": 0, "misses": 0}
+
+    async def get_history(self, user_id: str, limit: int = 20) -> list[dict]:
+        """
+        Get the user's most recent messages, oldest first
+
+        Same row shape as get_conversation_history: id, role, content,
+        timestamp, message_type.
+        """
+        buffer = self._buffers.get(user_id)
+        if buffer is not None and buffer.expires_at <= time.monotonic():
+            del self._buffers[user_id]
+            buffer = None
+        if buffer is not None and (buffer.complete or limit <= len(buffer.messages)):
+            self._buffers.move_to_end(user_id)
+            self._stats["hits"] += 1
+            return [_public(message) for message in list(buffer.messages)[-limit:]]
+
+        self._stats["misses"] += 1
+
+        if limit > self.buffer_size:
+            # Larger than the buffer can hold, go straight to the database
+            return await get_conversation_history(user_id, limit=limit)
+
+        self._loading[user_id] = True
+        expires_at = time.monotonic() + self.ttl
+        try:
+            rows = await get_conversation_history(
+                user_id, limit=self.buffer_size, include_metadata=True
+            )
+        finally:
+            fresh = self._loading.pop(user_id, False)
+
+        if fresh:
+            self._put(user_id, _UserBuffer(
+                rows, self.buffer_size, len(rows) < self.buffer_size, expires_at
+            ))
+        return [_public(message) for message in rows[-limit:]]
+
+    async def save_turn(
+        self,
+        user_id: str,
+        user_content: str,
+        assistant_content: str,
+        user_message_type: str = "text",
+        assistant_message_type: str = "text",
+        user_metadata: Optional[dict] = None
+    ) -> None:
+        """Save a user message and the assistant reply with one INSERT"""
+        await self.save_messages(user_id, [
+            {
+                "role": "user",
+                "content": user_content,
+                "message_type": user_message_type,
+                "metadata": user_metadata,
+            },
+            {
+                "role": "assistant",
+                "content": assistant_content,
+                "message_type": assistant_message_type,
+            },
+        ])
+
+    async def save_messages(self, user_id: str, messages: list[dict]) -> None:
+        """Persist messages, then append them to the user's buffer if loaded"""
+        if user_id in self._loading:
+            self._loading[user_id] = False
+        try:
+            rows = await save_conversation_messages(user_id, messages)
+        except Exception:
+            # The buffer may now disagree with the database, reload on next read
+            self.invalidate(user_id)
+            raise
+
+        buffer = self._buffers.get(user_id)
+        if buffer is not None:
+            if len(buffer.messages) + len(rows) > self.buffer_size:
+                buffer.complete = False
+            buffer.messages.extend(rows)
+        self._publish(user_id)
+
+    async def get_summary(self, user_id: str) -> Optional[dict]:
+        """
+        Get the user's rolling summary row (summary, summarized_through,
+        message_count), or None if nothing has been summarized yet
+        """
+        cached = self._cached_summary(user_id)
+        if cached is not _MISSING:
+            return cached
+
+        expires_at = time.monotonic() + self.ttl
+        row = await get_conversation_summary(user_id)
+        self._put_summary(user_id, row, expires_at)
+        return row
+
+    async def save_summary(
+        self,
+        user_id: str,
+        summary: str,
+        summarized_through: datetime,
+        messages_added: int
+    ) -> None:
+        """Persist an updated rolling summary, then cache it"""
+        stored = await save_conversation_summary(
+            user_id, summary, summarized_through, messages_added
+        )
+        previous = self._cached_summary(user_id)
+        if not stored or previous is _MISSING:
+            # A newer summary was written concurrently, or the stored count
+            # isn't known here: reload on next read
+            self._summaries.pop(user_id, None)
+        else:
+            self._put_summary(user_id, {
+                "summary": summary,
+                "summarized_through": summarized_through,
+                "message_count": (previous["message_count"] if previous else 0) + messages_added,
+            }, time.monotonic() + self.ttl)
+        if stored:
+            self._publish(user_id)
+
+    async def clear(self, user_id: str) -> None:
+        """Clear the user's history and summary in the database and in memory"""
+        if user_id in self._loading:
+            self._loading[user_id] = False
+        await clear_conversation_history(user_id)
+        expires_at = time.monotonic() + self.ttl
+        self._put(user_id, _UserBuffer([], self.buffer_size, True, expires_at))
+        self._put_summary(user_id, None, expires_at)
+        self._publish(user_id)
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop one user's buffer and summary, or everything when user_id is None"""
+        if user_id is None:
+            self._buffers.clear()
+            self._summaries.clear()
+            for loading in self._loading:
+                self._loading[loading] = False
+        else:
+            self._buffers.pop(user_id, None)
+            self._summaries.pop(user_id, None)
+            if user_id in self._loading:
+                self._loading[user_id] = False
+
+    def handle_invalidation(self, tags: list[str]) -> None:
+        """Drop the users whose conversation another process wrote (invalidation bus)"""
+        suffix = f":{CACHE_FAMILY}"
+        for tag in tags:
+            if tag.startswith("user:") and tag.endswith(suffix):
+                self.invalidate(tag[len("user:"):-len(suffix)])
+
+    def _publish(self, user_id: str) -> None:
+        """Tell other processes to drop this user's buffer and summary"""
+        invalidate_tags(user_family_tag(user_id, CACHE_FAMILY))
+
+    def _cached_summary(self, user_id: str):
+        """Cached summary row (None if the user has none), or _MISSING"""
+        cached = self._summaries.get(user_id)
+        if cached is None:
+            return _MISSING
+        row, expires_at = cached
+        if expires_at <= time.monotonic():
+            del self._summaries[user_id]
+            return _MISSING
+        self._summaries.move_to_end(user_id)
+        return row
+
+    def get_stats(self) -> dict:
+        """Get buffer statistics"""
+        return {**self._stats, "users": len(self._buffers), "summaries": len(self._summaries)}
+
+    def _put(self, user_id: str, buffer: _UserBuffer) -> None:
+        self._buffers[user_id] = buffer
+        self._buffers.move_to_end(user_id)
+        while len(self._buffers) > self.max_users:
+            self._buffers.popitem(last=False)
+
+    def _put_summary(self, user_id: str, row: Optional[dict], expires_at: float) -> None:
+        self._summaries[user_id] = (row, expires_at)
+        self._summaries.move_to_end(user_id)
+        while len(self._summaries) > self.max_users:
+            self._summaries.popitem(last=False)
+
+
+def _public(message: dict) -> dict:
+    """Return a message without metadata, matching get_conversation_history's default"""
+    return {key: value for key, value in message.items() if key != "metadata"}
+
+
+# Global store instance
+conversation_store = ConversationStore()
+invalidation_bus.add_listener(conversation_store.handle_invalidation)
@@ -0,0 +1,317 @@
+"""
+Statement-level database instrumentation
+
+Every statement run through a pooled connection goes through
+InstrumentedAsyncCursor (installed as the pool's cursor_factory), which
+records:
+
+- the statement fingerprint (literals and parameters replaced by ?, so
+  every call site maps to one fingerprint)
+- rows returned / affected
+- duration
+
+Results go to Prometheus (db_statement_duration_seconds and friends in
+src/observability/metrics.py, plus db_query_duration_seconds and
+db_queries_total) and to an in-process per-fingerprint summary shown by
+/api/v1/metrics.
+Statements slower than DB_SLOW_QUERY_MS are logged, and a sample of slow
+SELECTs (DB_EXPLAIN_SAMPLE_RATE) is re-run in the background under
+EXPLAIN (ANALYZE, BUFFERS) with the plan logged next to it. The re-run is
+a read-only transaction that is rolled back. SELECTs that write (e.g.
+SELECT record_meal_group(...)) fail there, and for those only the plan is
+logged, from EXPLAIN without ANALYZE.
+
+Pool checkout wait is recorded separately by Database.connection() via
+record_pool_wait().
+"""
+import asyncio
+import hashlib
+import logging
+import random
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Set
+
+import psycopg
+from psycopg import AsyncCursor
+
+from src.config import DB_EXPLAIN_SAMPLE_RATE, DB_SLOW_QUERY_MS
+from src.observability.metrics import (
+    db_pool_wait_seconds,
+    db_queries_total,
+    db_query_duration_seconds,
+    db_slow_queries_total,
+    db_statement_duration_seconds,
+    db_statement_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bounds on everything keyed by statement
+FINGERPRINT_CACHE_SIZE = 2000  # query text → Statement
+MAX_STATEMENT_LABELS = 250  # distinct statement label values exported to Prometheus
+MAX_TRACKED_STATEMENTS = 500  # per-fingerprint summaries kept in process
+SLOW_QUERY_LOG_SIZE = 50
+MAX_LOGGED_QUERY_CHARS = 500
+
+OTHER_LABEL = "other"
+_OPERATIONS = {"select", "insert", "update", "delete", "with", "copy", "explain"}
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+_TABLE_RE = re.compile(r"\b(?:from|into|update|join)\s+([a-z_][a-z0-9_.]*)")
+
+
+class Statement:
+    """Normalized form of one query text and its metric labels"""
+
+    __slots__ = ("fingerprint", "statement_id", "operation", "table", "metrics")
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.statement_id = hashlib.sha1(fingerprint.encode()).hexdigest()[:12]
+        words = fingerprint.split(" ", 1)
+        self.operation = words[0] if words[0] in _OPERATIONS else OTHER_LABEL
+        match = _TABLE_RE.search(fingerprint)
+        self.table = match.group(1) if match else ""
+        # Labelled Prometheus children, bound on first execution so labels()
+        # isn't looked up on every statement
+        self.metrics: Optional[tuple] = None
+
+
+def fingerprint(query: str) -> str:
+    """
+    Normalize a query so executions that differ only in literals or
+    parameters share one fingerprint.
+    """
+    text = _COMMENT_RE.sub(" ", query)
+    text = _STRING_RE.sub("?", text)
+    text = _PLACEHOLDER_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    text = _WHITESPACE_RE.sub(" ", text).strip().lower()
+    return _IN_LIST_RE.sub("(?)", text)
+
+
+class StatementRegistry:
+    """
+    Caches query text → Statement, caps exported label values and keeps a
+    per-fingerprint summary (calls, total/max ms, rows) for /api/v1/metrics.
+    """
+
+    def __init__(self):
+        self._statements: "OrderedDict[str, Statement]" = OrderedDict()
+        self._labels: Set[str] = set()
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self.slow_queries: deque = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+
+    def statement(self, query: str) -> Statement:
+        statement = self._statements.get(query)
+        if statement is None:
+            statement = Statement(fingerprint(query))
+            self._statements[query] = statement
+            if len(self._statements) > FINGERPRINT_CACHE_SIZE:
+                self._statements.popitem(last=False)
+        return statement
+
+    def label(self, statement: Statement) -> str:
+        """statement_id, or 'other' once MAX_STATEMENT_LABELS ids are in use"""
+        if statement.statement_id in self._labels:
+            return statement.statement_id
+        if len(self._labels) >= MAX_STATEMENT_LABELS:
+            return OTHER_LABEL
+        self._labels.add(statement.statement_id)
+        return statement.statement_id
+
+    def record(self, statement: Statement, duration_ms: float, rows: int) -> None:
+        summary = self._summaries.get(statement.statement_id)
+        if summary is None:
+            if len(self._summaries) >= MAX_TRACKED_STATEMENTS:
+                return
+            summary = self._summaries[statement.statement_id] = {
+                "statement": statement.statement_id,
+                "fingerprint": statement.fingerprint[:MAX_LOGGED_QUERY_CHARS],
+                "calls": 0,
+                "rows": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+            }
+        summary["calls"] += 1
+        summary["rows"] += max(rows, 0)
+        summary["total_ms"] += duration_ms
+        summary["max_ms"] = max(summary["max_ms"], duration_ms)
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Summaries with the most total time first"""
+        ranked = sorted(self._summaries.values(), key=lambda s: s["total_ms"], reverse=True)
+        return [
+            {**s, "mean_ms": s["total_ms"] / s["calls"] if s["calls"] else 0.0}
+            for s in ranked[:limit]
+        ]
+
+    def get_stats(self, limit: int = 10) -> Dict[str, Any]:
+        return {
+            "statements_tracked": len(self._summaries),
+            "top_statements": self.top(limit),
+            "slow_queries": list(self.slow_queries),
+            "pool_wait": db_pool_wait_seconds.summary(),
+        }
+
+    def reset(self) -> None:
+        self._statements.clear()
+        self._labels.clear()
+        self._summaries.clear()
+        self.slow_queries.clear()
+        db_pool_wait_seconds.clear()
+
+
+# Global registry
+statement_registry = StatementRegistry()
+
+# Keep references to background EXPLAIN tasks until they finish
+_explain_tasks: Set[asyncio.Task] = set()
+
+
+def record_pool_wait(seconds: float, pool: str) -> None:
+    """
+    Record time spent waiting for a connection from the named pool
+
+    Feeds db_pool_wait_seconds, which also backs the pool_wait summary in
+    get_stats().
+    """
+    db_pool_wait_seconds.observe(pool, seconds)
+
+
+def _bind_metrics(statement: Statement) -> tuple:
+    operation, table = statement.operation, statement.table
+    statement.metrics = (
+        db_statement_duration_seconds.labels(
+            operation=operation,
+            table=table,
+            statement=statement_registry.label(statement)
+        ),
+        db_statement_rows.labels(operation=operation, table=table),
+        db_query_duration_seconds.labels(query_type=operation),
+        db_queries_total.labels(query_type=operation, status="success"),
+        db_queries_total.labels(query_type=operation, status="error"),
+    )
+    return statement.metrics
+
+
+def record_statement(
+    statement: Statement,
+    duration: float,
+    rows: int,
+    query: str,
+    params: Any,
+    failed: bool = False
+) -> None:
+    """Record one execution: metrics, summary, slow-query log and EXPLAIN sampling"""
+    duration_ms = duration * 1000
+    statement_registry.record(statement, duration_ms, rows)
+
+    statement_seconds, statement_rows, query_seconds, succeeded, errored = (
+        statement.metrics or _bind_metrics(statement)
+    )
+    statement_seconds.observe(duration)
+    statement_rows.observe(max(rows, 0))
+    query_seconds.observe(duration)
+    (errored if failed else succeeded).inc()
+
+    if duration_ms < DB_SLOW_QUERY_MS:
+        return
+
+    db_slow_queries_total.labels(operation=statement.operation, table=statement.table).inc()
+
+    logger.warning(
+        f"🐌 Slow query {statement.statement_id} ({duration_ms:.1f}ms, {rows} rows): "
+        f"{statement.fingerprint[:MAX_LOGGED_QUERY_CHARS]}"
+    )
+    statement_registry.slow_queries.append({
+        "statement": statement.statement_id,
+        "fingerprint": statement.fingerprint[:MAX_LOGGED_QUERY_CHARS],
+        "duration_ms": duration_ms,
+        "rows": rows,
+        "at": time.time(),
+    })
+
+    # Only SELECTs are re-run, read-only (see explain_statement)
+    if statement.operation == "select" and random.random() < DB_EXPLAIN_SAMPLE_RATE:
+        task = asyncio.create_task(explain_statement(statement, query, params))
+        _explain_tasks.add(task)
+        task.add_done_callback(_explain_tasks.discard)
+
+
+async def explain_statement(statement: Statement, query: str, params: Any) -> Optional[str]:
+    """
+    Re-run a slow SELECT under EXPLAIN (ANALYZE, BUFFERS) and log the plan.
+
+    ANALYZE executes the query, so it runs in a read-only transaction
+    that is rolled back. A SELECT with side effects (a function that
+    writes, nextval()) fails there and is explained without ANALYZE.
+    Runs on the background pool so diagnostics never take connections
+    from user-facing traffic.
+    """
+    from src.db.connection import POOL_BACKGROUND, db
+
+    try:
+        async with db.connection(kind=POOL_BACKGROUND) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("SET TRANSACTION READ ONLY")
+                try:
+                    await cur.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params)
+                except psycopg.errors.ReadOnlySqlTransaction:
+                    await conn.rollback()
+                    await cur.execute(f"EXPLAIN {query}", params)
+                rows = await cur.fetchall()
+            await conn.rollback()
+
+        plan = "\n".join(str(next(iter(row.values()))) for row in rows)
+        logger.warning(f"EXPLAIN for slow query {statement.statement_id}:\n{plan}")
+        return plan
+    except Exception as e:
+        logger.debug(f"EXPLAIN of slow query {statement.statement_id} failed: {e}")
+        return None
+
+
+class InstrumentedAsyncCursor(AsyncCursor):
+    """AsyncCursor that records every execute()/executemany()"""
+
+    def _query_text(self, query: Any) -> str:
+        if isinstance(query, str):
+            return query
+        if isinstance(query, bytes):
+            return query.decode()
+        return query.as_string(self)
+
+    async def execute(self, query, params=None, **kwargs):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = await super().execute(query, params, **kwargs)
+            failed = False
+            return result
+        finally:
+            self._record(query, params, time.perf_counter() - start, failed)
+
+    async def executemany(self, query, params_seq, **kwargs):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = await super().executemany(query, params_seq, **kwargs)
+            failed = False
+            return result
+        finally:
+            self._record(query, None, time.perf_counter() - start, failed)
+
+    def _record(self, query: Any, params: Any, duration: float, failed: bool) -> None:
+        try:
+            text = self._query_text(query)
+            rows = -1 if failed else self.rowcount
+            record_statement(statement_registry.statement(text), duration, rows, text, params, failed)
+        except Exception as e:
+            logger.debug(f"Failed to record statement: {e}")
@@ -0,0 +1,93 @@
+"""
+Prepared statements for hot queries
+
+psycopg prepares a query server-side once it has run prepare_threshold
+times on the same connection (psycopg's default, 5, on pool connections).
+The queries registered here run on almost every message (conversation
+history, session state, XP lookups, health event ranges, reminder
+completion checks), so they skip the threshold and are prepared on their
+first execution on each connection. After that, each call sends
+only the statement handle and parameters. The server does no further
+parsing or planning.
+
+psycopg names the server-side statements itself (_pg3_N). Names here
+identify the query in code and in /api/v1/metrics.
+
+Set DB_PREPARED_STATEMENTS=false when connecting through a pooler that
+can't track prepared statements (e.g. PgBouncer < 1.21 in transaction
+mode). Queries then run as plain text.
+
+Example:
+    HISTORY = prepared_statements.register("conversation_history", "SELECT ...")
+
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await prepared_statements.execute(cur, HISTORY, (user_id, limit))
+"""
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+from psycopg import AsyncCursor
+
+from src.config import DB_PREPARED_STATEMENTS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PreparedQuery:
+    """A registered hot query"""
+    name: str
+    sql: str
+
+
+class PreparedStatementRegistry:
+    """Named hot queries and how often each has run in this process"""
+
+    def __init__(self, enabled: bool = DB_PREPARED_STATEMENTS):
+        self.enabled = enabled
+        self._queries: Dict[str, PreparedQuery] = {}
+        self._executions: Dict[str, int] = {}
+
+    def register(self, name: str, sql: str) -> PreparedQuery:
+        """
+        Register a query under a unique name.
+
+        Registering the same name twice with the same SQL returns the
+        existing query (modules may be reloaded); different SQL raises
+        ValueError.
+        """
+        existing = self._queries.get(name)
+        if existing is not None:
+            if existing.sql != sql:
+                raise ValueError(f"Prepared statement {name!r} is already registered with different SQL")
+            return existing
+
+        query = PreparedQuery(name, sql)
+        self._queries[name] = query
+        self._executions[name] = 0
+        return query
+
+    def get(self, name: str) -> Optional[PreparedQuery]:
+        return self._queries.get(name)
+
+    async def execute(
+        self,
+        cur: AsyncCursor,
+        query: PreparedQuery,
+        params: Optional[Sequence[Any]] = None
+    ) -> AsyncCursor:
+        """Execute a registered query, preparing it on first use per connection"""
+        self._executions[query.name] += 1
+        return await cur.execute(query.sql, params, prepare=self.enabled)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "statements": dict(sorted(self._executions.items())),
+        }
+
+
+# Global registry
+prepared_statements = PreparedStatementRegistry()
@@ -23,6 +23,7 @@ from src.db.queries.user import (
     validate_invite_code,
     use_invite_code,
     get_user_subscription_status,
+    get_session_state_row,
     get_master_codes,
     deactivate_invite_code,
     get_onboarding_state,
@@ -33,6 +34,8 @@ from src.db.queries.user import (
     log_feature_usage,
     audit_profile_update,
     audit_preference_update,
+    get_user_timezones,
+    set_user_timezone,
 )
 
 # Food operations
@@ -90,6 +93,7 @@ from src.db.queries.gamification import (
     get_user_xp_data,
     update_user_xp,
     add_xp_transaction,
+    award_user_xp,
     get_xp_transactions,
     get_user_xp_level,
     get_user_streak,
@@ -115,8 +119,11 @@ from src.db.queries.gamification import (
 # Conversation operations
 from src.db.queries.conversation import (
     save_conversation_message,
+    save_conversation_messages,
     get_conversation_history,
     clear_conversation_history,
+    get_conversation_summary,
+    save_conversation_summary,
 )
 
 # Dynamic tool operations
@@ -124,6 +131,7 @@ from src.db.queries.dynamic_tools import (
     save_dynamic_tool,
     get_all_enabled_tools,
     get_tool_by_name,
+    get_tool_by_id,
     update_tool_version,
     disable_tool,
     enable_tool,
@@ -136,13 +144,14 @@ from src.db.queries.dynamic_tools import (
 
 # Re-export for 'from src.db import queries' pattern
 __all__ = [
-    # User (16 functions)
+    # User (19 functions)
     "create_user",
     "user_exists",
     "create_invite_code",
     "validate_invite_code",
     "use_invite_code",
     "get_user_subscription_status",
+    "get_session_state_row",
     "get_master_codes",
     "deactivate_invite_code",
     "get_onboarding_state",
@@ -153,6 +162,8 @@ __all__ = [
     "log_feature_usage",
     "audit_profile_update",
     "audit_preference_update",
+    "get_user_timezones",
+    "set_user_timezone",
 
     # Food (5 functions)
     "save_food_entry",
@@ -197,10 +208,11 @@ __all__ = [
     "save_sleep_quiz_submission",
     "get_submission_patterns",
 
-    # Gamification (23 functions)
+    # Gamification (24 functions)
     "get_user_xp_data",
     "update_user_xp",
     "add_xp_transaction",
+    "award_user_xp",
     "get_xp_transactions",
     "get_user_xp_level",
     "get_user_streak",
@@ -222,15 +234,19 @@ __all__ = [
     "check_recovery_pattern",
     "count_stats_views",
 
-    # Conversation (3 functions)
+    # Conversation (6 functions)
     "save_conversation_message",
+    "save_conversation_messages",
     "get_conversation_history",
     "clear_conversation_history",
+    "get_conversation_summary",
+    "save_conversation_summary",
 
-    # Dynamic Tools (11 functions)
+    # Dynamic Tools (12 functions)
     "save_dynamic_tool",
     "get_all_enabled_tools",
     "get_tool_by_name",
+    "get_tool_by_id",
     "update_tool_version",
     "disable_tool",
     "enable_tool",
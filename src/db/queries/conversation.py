@@ -4,9 +4,33 @@ import logging
 from typing import Optional
 from datetime import datetime
 from src.db.connection import db
+from src.db.prepared import prepared_statements
 
 logger = logging.getLogger(__name__)
 
+# History reads (the agent's context window) run on every message
+_HISTORY_SQL = """
+    SELECT id, role, content, timestamp, message_type{metadata}
+    FROM conversation_history
+    WHERE user_id = %s{type_filter}
+    ORDER BY timestamp DESC
+    LIMIT %s OFFSET %s
+"""
+# (include_metadata, filtered by message type) → query
+_HISTORY_QUERIES = {
+    (include_metadata, filtered): prepared_statements.register(
+        "conversation_history"
+        + ("_with_metadata" if include_metadata else "")
+        + ("_by_type" if filtered else ""),
+        _HISTORY_SQL.format(
+            metadata=", metadata" if include_metadata else "",
+            type_filter=" AND message_type = ANY(%s)" if filtered else ""
+        )
+    )
+    for include_metadata in (False, True)
+    for filtered in (False, True)
+}
+
 
 async def save_conversation_message(
     user_id: str,
@@ -39,6 +63,58 @@ async def save_conversation_message(
     logger.debug(f"Saved {role} message for user {user_id}")
 
 
+async def save_conversation_messages(
+    user_id: str,
+    messages: list[dict]
+) -> list[dict]:
+    """
+    Save several messages (e.g. a user/assistant turn) in one multi-row INSERT
+
+    Each row gets clock_timestamp() so the messages keep their order when
+    read back with ORDER BY timestamp.
+
+    Args:
+        user_id: Telegram user ID
+        messages: List of dicts with keys role, content and optional
+                  message_type (default 'text') and metadata
+
+    Returns:
+        Saved rows in input order with keys: id, role, content, timestamp,
+        message_type, metadata
+    """
+    if not messages:
+        return []
+
+    values_sql = ", ".join(["(%s, %s, %s, %s, %s, clock_timestamp())"] * len(messages))
+    params: list = []
+    for message in messages:
+        metadata = message.get("metadata")
+        params.extend([
+            user_id,
+            message["role"],
+            message["content"],
+            message.get("message_type", "text"),
+            json.dumps(metadata) if metadata else None,
+        ])
+
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                f"""
+                INSERT INTO conversation_history
+                (user_id, role, content, message_type, metadata, timestamp)
+                VALUES {values_sql}
+                RETURNING id, role, content, timestamp, message_type, metadata
+                """,
+                params
+            )
+            rows = await cur.fetchall()
+            await conn.commit()
+
+    logger.debug(f"Saved {len(rows)} messages for user {user_id}")
+    return sorted(rows, key=lambda row: row["timestamp"])
+
+
 async def get_conversation_history(
     user_id: str,
     limit: int = 20,
@@ -61,32 +137,9 @@ async def get_conversation_history(
     """
     async with db.connection() as conn:
         async with conn.cursor() as cur:
-            # Build query dynamically based on parameters
-            query = """
-                SELECT id, role, content, timestamp, message_type
-            """
-            if include_metadata:
-                query += ", metadata"
-
-            query += """
-                FROM conversation_history
-                WHERE user_id = %s
-            """
-
-            params = [user_id]
-
-            if message_types:
-                placeholders = ", ".join(["%s"] * len(message_types))
-                query += f" AND message_type IN ({placeholders})"
-                params.extend(message_types)
-
-            query += """
-                ORDER BY timestamp DESC
-                LIMIT %s OFFSET %s
-            """
-            params.extend([limit, offset])
-
-            await cur.execute(query, params)
+            query = _HISTORY_QUERIES[(bool(include_metadata), bool(message_types))]
+            params = (user_id, message_types, limit, offset) if message_types else (user_id, limit, offset)
+            await prepared_statements.execute(cur, query, params)
             messages = await cur.fetchall()
 
             # Reverse to get chronological order (oldest first)
@@ -95,7 +148,7 @@ async def get_conversation_history(
 
 async def clear_conversation_history(user_id: str) -> None:
     """
-    Clear all conversation history for a user
+    Clear all conversation history for a user, including the rolling summary
 
     Args:
         user_id: Telegram user ID
@@ -106,5 +159,74 @@ async def clear_conversation_history(user_id: str) -> None:
                 "DELETE FROM conversation_history WHERE user_id = %s",
                 (user_id,)
             )
+            await cur.execute(
+                "DELETE FROM conversation_summaries WHERE user_id = %s",
+                (user_id,)
+            )
             await conn.commit()
     logger.info(f"Cleared conversation history for user {user_id}")
+
+
+async def get_conversation_summary(user_id: str) -> Optional[dict]:
+    """
+    Get the rolling summary of messages older than the agent's history window
+
+    Args:
+        user_id: Telegram user ID
+
+    Returns:
+        Dict with keys: summary, summarized_through, message_count, or None
+    """
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                SELECT summary, summarized_through, message_count
+                FROM conversation_summaries
+                WHERE user_id = %s
+                """,
+                (user_id,)
+            )
+            return await cur.fetchone()
+
+
+async def save_conversation_summary(
+    user_id: str,
+    summary: str,
+    summarized_through: datetime,
+    messages_added: int
+) -> bool:
+    """
+    Store an updated rolling summary
+
+    The write only applies if it moves summarized_through forward, so a
+    slower concurrent update can't overwrite a newer summary.
+
+    Args:
+        user_id: Telegram user ID
+        summary: New summary text
+        summarized_through: Timestamp of the newest message folded in
+        messages_added: Number of messages folded in by this update
+
+    Returns:
+        True if the summary was stored
+    """
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                INSERT INTO conversation_summaries
+                (user_id, summary, summarized_through, message_count, updated_at)
+                VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    summary = EXCLUDED.summary,
+                    summarized_through = EXCLUDED.summarized_through,
+                    message_count = conversation_summaries.message_count + EXCLUDED.message_count,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE conversation_summaries.summarized_through < EXCLUDED.summarized_through
+                """,
+                (user_id, summary, summarized_through, messages_added)
+            )
+            stored = cur.rowcount > 0
+            await conn.commit()
+    return stored
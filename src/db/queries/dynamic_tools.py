@@ -4,6 +4,7 @@ import logging
 from typing import Optional
 from datetime import datetime
 from src.db.connection import db
+from src.db.write_behind import execute_write_behind
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +110,20 @@ async def get_tool_by_name(tool_name: str) -> Optional[dict]:
             return await cur.fetchone()
 
 
+async def get_tool_by_id(tool_id: str) -> Optional[dict]:
+    """Get specific tool by id"""
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                SELECT * FROM dynamic_tools
+                WHERE id = %s
+                """,
+                (tool_id,)
+            )
+            return await cur.fetchone()
+
+
 async def update_tool_version(
     tool_id: str,
     new_function_code: str,
@@ -192,50 +207,40 @@ async def log_tool_execution(
     error_message: Optional[str] = None,
     execution_time_ms: int = 0
 ) -> None:
-    """Log tool execution for audit trail"""
-    async with db.connection() as conn:
-        async with conn.cursor() as cur:
-            # Log execution
-            await cur.execute(
-                """
-                INSERT INTO dynamic_tool_executions
-                (tool_id, user_id, parameters, result, success,
-                 error_message, execution_time_ms)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    tool_id,
-                    user_id,
-                    json.dumps(parameters),
-                    json.dumps(result) if success else None,
-                    success,
-                    error_message,
-                    execution_time_ms
-                )
-            )
-
-            # Update tool usage stats
-            if success:
-                await cur.execute(
-                    """
-                    UPDATE dynamic_tools
-                    SET usage_count = usage_count + 1,
-                        last_used_at = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                    """,
-                    (tool_id,)
-                )
-            else:
-                await cur.execute(
-                    """
-                    UPDATE dynamic_tools
-                    SET error_count = error_count + 1
-                    WHERE id = %s
-                    """,
-                    (tool_id,)
-                )
+    """
+    Log tool execution for audit trail and update the tool's usage stats
 
-            await conn.commit()
+    Both writes are one statement so executions from the write-behind sink
+    batch into a single executemany() (see src.db.write_behind).
+    """
+    await execute_write_behind(
+        """
+        WITH execution AS (
+            INSERT INTO dynamic_tool_executions
+            (tool_id, user_id, parameters, result, success,
+             error_message, execution_time_ms)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        )
+        UPDATE dynamic_tools
+        SET usage_count = usage_count + CASE WHEN %s THEN 1 ELSE 0 END,
+            error_count = error_count + CASE WHEN %s THEN 0 ELSE 1 END,
+            last_used_at = CASE WHEN %s THEN CURRENT_TIMESTAMP ELSE last_used_at END
+        WHERE id = %s
+        """,
+        (
+            tool_id,
+            user_id,
+            json.dumps(parameters),
+            json.dumps(result) if success else None,
+            success,
+            error_message,
+            execution_time_ms,
+            success,
+            success,
+            success,
+            tool_id,
+        )
+    )
 
 
 async def create_tool_approval_request(
@@ -266,8 +271,13 @@ async def create_tool_approval_request(
 async def approve_tool(
     approval_id: str,
     admin_user_id: str
-) -> None:
-    """Approve a pending tool creation"""
+) -> Optional[str]:
+    """
+    Approve a pending tool creation
+
+    Returns:
+        UUID of the approved tool, or None if the approval doesn't exist
+    """
     async with db.connection() as conn:
         async with conn.cursor() as cur:
             await cur.execute(
@@ -277,11 +287,14 @@ async def approve_tool(
                     admin_user_id = %s,
                     admin_response_at = CURRENT_TIMESTAMP
                 WHERE id = %s
+                RETURNING tool_id
                 """,
                 (admin_user_id, approval_id)
             )
+            row = await cur.fetchone()
             await conn.commit()
     logger.info(f"Approved tool creation request {approval_id}")
+    return str(row["tool_id"]) if row else None
 
 
 async def reject_tool(
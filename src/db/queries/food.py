@@ -7,6 +7,7 @@ from datetime import datetime
 from uuid import UUID
 from src.db.connection import db
 from src.models.food import FoodEntry
+from src.utils.meal_grouping import meal_group_key
 
 logger = logging.getLogger(__name__)
 
@@ -16,28 +17,42 @@ async def save_food_entry(entry: FoodEntry) -> None:
     """Save food entry to database and create health_event"""
     food_entry_id = None
 
-    async with db.connection() as conn:
+    # Pipelined: the insert and the commit go out in one round trip
+    async with db.pipeline() as conn:
         async with conn.cursor() as cur:
+            foods = [f.model_dump() for f in entry.foods]
+
+            # Insert and add the entry to its meal group (formula detection index)
+            # in one statement
             await cur.execute(
                 """
-                INSERT INTO food_entries
-                (id, user_id, timestamp, photo_path, foods, total_calories, total_macros, meal_type, notes)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                WITH inserted AS (
+                    INSERT INTO food_entries
+                    (id, user_id, timestamp, photo_path, foods, total_calories, total_macros,
+                     meal_type, notes, meal_group_key)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    RETURNING user_id, timestamp, total_calories, meal_group_key
+                )
+                SELECT record_meal_group(user_id, meal_group_key, total_calories, timestamp)
+                FROM inserted
+                WHERE meal_group_key <> ''
                 """,
                 (
                     str(entry.id),  # Include the UUID from the entry
                     entry.user_id,
                     entry.timestamp,
                     entry.photo_path,
-                    json.dumps([f.model_dump() for f in entry.foods]),
+                    json.dumps(foods),
                     entry.total_calories,
                     json.dumps(entry.total_macros.model_dump()),
                     entry.meal_type,
-                    entry.notes
+                    entry.notes,
+                    meal_group_key(foods)
                 )
             )
             food_entry_id = entry.id  # Use the entry.id since we're inserting it
             await conn.commit()
+            db.record_write(entry.user_id)
 
     logger.info(f"Saved food entry {entry.id} for user {entry.user_id}")
 
@@ -55,7 +70,7 @@ async def _create_food_health_event(entry: FoodEntry, food_entry_id: UUID):
     but doesn't affect the main flow.
     """
     try:
-        from src.services.health_events import create_health_event
+        from src.services.health_events import health_event_batcher
 
         metadata = {
             "meal_type": entry.meal_type,
@@ -66,7 +81,7 @@ async def _create_food_health_event(entry: FoodEntry, food_entry_id: UUID):
             "notes": entry.notes
         }
 
-        await create_health_event(
+        health_event_batcher.add(
             user_id=entry.user_id,
             event_type="meal",
             timestamp=entry.timestamp,
@@ -74,7 +89,7 @@ async def _create_food_health_event(entry: FoodEntry, food_entry_id: UUID):
             source_table="food_entries",
             source_id=food_entry_id
         )
-        logger.debug(f"Created health_event for food_entry {food_entry_id}")
+        logger.debug(f"Queued health_event for food_entry {food_entry_id}")
 
     except Exception as e:
         logger.error(
@@ -112,7 +127,8 @@ async def update_food_entry(
             # First, get the current entry to verify ownership and for audit
             await cur.execute(
                 """
-                SELECT id, user_id, total_calories, total_macros, foods
+                SELECT id, user_id, timestamp, total_calories, total_macros, foods,
+                       meal_group_key
                 FROM food_entries
                 WHERE id = %s AND user_id = %s
                 """,
@@ -138,52 +154,72 @@ async def update_food_entry(
             new_calories = total_calories if total_calories is not None else current_entry["total_calories"]
             new_macros = total_macros if total_macros is not None else current_entry["total_macros"]
             new_foods = foods if foods is not None else current_entry["foods"]
+            old_group_key = current_entry.get("meal_group_key")
+            new_group_key = meal_group_key(new_foods)
 
-            # Update the entry
-            await cur.execute(
-                """
-                UPDATE food_entries
-                SET total_calories = %s,
-                    total_macros = %s,
-                    foods = %s,
-                    correction_note = %s,
-                    corrected_by = %s,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s AND user_id = %s
-                """,
-                (
-                    new_calories,
-                    json.dumps(new_macros) if isinstance(new_macros, dict) else new_macros,
-                    json.dumps(new_foods) if isinstance(new_foods, list) else new_foods,
-                    correction_note,
-                    corrected_by,
-                    entry_id,
-                    user_id
+            # Send the writes and the commit as one pipeline (one round trip)
+            async with conn.pipeline():
+                # Update the entry
+                await cur.execute(
+                    """
+                    UPDATE food_entries
+                    SET total_calories = %s,
+                        total_macros = %s,
+                        foods = %s,
+                        correction_note = %s,
+                        corrected_by = %s,
+                        meal_group_key = %s,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s AND user_id = %s
+                    """,
+                    (
+                        new_calories,
+                        json.dumps(new_macros) if isinstance(new_macros, dict) else new_macros,
+                        json.dumps(new_foods) if isinstance(new_foods, list) else new_foods,
+                        correction_note,
+                        corrected_by,
+                        new_group_key,
+                        entry_id,
+                        user_id
+                    )
                 )
-            )
 
-            # Log to audit table
-            await cur.execute(
-                """
-                INSERT INTO food_entry_audit
-                (food_entry_id, user_id, action, old_values, new_values, correction_note)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    entry_id,
-                    user_id,
-                    "updated",
-                    json.dumps(old_values),
-                    json.dumps({
-                        "total_calories": new_calories,
-                        "total_macros": new_macros,
-                        "foods": new_foods
-                    }),
-                    correction_note
+                # Move the entry between meal groups / update its calories there
+                if old_group_key != new_group_key or new_calories != current_entry["total_calories"]:
+                    if old_group_key:
+                        await cur.execute(
+                            "SELECT forget_meal_group(%s, %s, %s)",
+                            (user_id, old_group_key, current_entry["total_calories"])
+                        )
+                    if new_group_key:
+                        await cur.execute(
+                            "SELECT record_meal_group(%s, %s, %s, %s)",
+                            (user_id, new_group_key, new_calories, current_entry["timestamp"])
+                        )
+
+                # Log to audit table
+                await cur.execute(
+                    """
+                    INSERT INTO food_entry_audit
+                    (food_entry_id, user_id, action, old_values, new_values, correction_note)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    """,
+                    (
+                        entry_id,
+                        user_id,
+                        "updated",
+                        json.dumps(old_values),
+                        json.dumps({
+                            "total_calories": new_calories,
+                            "total_macros": new_macros,
+                            "foods": new_foods
+                        }),
+                        correction_note
+                    )
                 )
-            )
 
-            await conn.commit()
+                await conn.commit()
+                db.record_write(user_id)
 
             logger.info(
                 f"Updated food entry {entry_id} for user {user_id}: "
@@ -4,9 +4,21 @@ import logging
 from typing import Optional
 from datetime import datetime, timedelta
 from src.db.connection import db
+from src.db.prepared import prepared_statements
+from src.utils.cache import CacheConfig, cache_with_ttl, invalidate, user_family_tag
 
 logger = logging.getLogger(__name__)
 
+# Read before every XP award and on every /stats-style view
+USER_XP = prepared_statements.register(
+    "user_xp",
+    """
+    SELECT user_id, total_xp, current_level, xp_to_next_level, level_tier, created_at, updated_at
+    FROM user_xp
+    WHERE user_id = %s
+    """
+)
+
 
 # ==========================================
 # XP System Functions
@@ -27,16 +39,10 @@ async def get_user_xp_data(user_id: str) -> dict:
             'updated_at': datetime
         }
     """
-    async with db.connection() as conn:
+    # Primary even inside dashboards' replica scope: may create the row
+    async with db.connection(read_only=False) as conn:
         async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                SELECT user_id, total_xp, current_level, xp_to_next_level, level_tier, created_at, updated_at
-                FROM user_xp
-                WHERE user_id = %s
-                """,
-                (user_id,)
-            )
+            await prepared_statements.execute(cur, USER_XP, (user_id,))
             row = await cur.fetchone()
 
             if not row:
@@ -85,6 +91,9 @@ async def update_user_xp(user_id: str, xp_data: dict) -> None:
                 )
             )
             await conn.commit()
+            db.record_write(user_id)
+
+    await invalidate(user_family_tag(user_id, "user_xp"))
 
 
 async def add_xp_transaction(
@@ -119,9 +128,71 @@ async def add_xp_transaction(
             )
             result = await cur.fetchone()
             await conn.commit()
+            db.record_write(user_id)
             return str(result['id']) if result else None
 
 
+async def award_user_xp(
+    user_id: str,
+    xp_data: dict,
+    amount: int,
+    source_type: str,
+    source_id: Optional[str],
+    reason: str
+) -> Optional[str]:
+    """
+    Store a user's new XP totals and the transaction that produced them
+
+    Same writes as update_user_xp() + add_xp_transaction(), but in one
+    transaction sent as a single pipeline (one round trip instead of four).
+
+    Args:
+        user_id: User's Telegram ID
+        xp_data: Dict with total_xp, current_level, xp_to_next_level, level_tier
+        amount: XP amount
+        source_type: See add_xp_transaction()
+        source_id: Optional UUID of source activity
+        reason: Human-readable description
+
+    Returns:
+        Transaction ID (UUID string)
+    """
+    async with db.pipeline() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                UPDATE user_xp
+                SET total_xp = %s,
+                    current_level = %s,
+                    xp_to_next_level = %s,
+                    level_tier = %s,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE user_id = %s
+                """,
+                (
+                    xp_data['total_xp'],
+                    xp_data['current_level'],
+                    xp_data['xp_to_next_level'],
+                    xp_data['level_tier'],
+                    user_id
+                )
+            )
+            await cur.execute(
+                """
+                INSERT INTO xp_transactions (user_id, amount, source_type, source_id, reason)
+                VALUES (%s, %s, %s, %s, %s)
+                RETURNING id
+                """,
+                (user_id, amount, source_type, source_id, reason)
+            )
+            await conn.commit()
+            db.record_write(user_id)
+            result = await cur.fetchone()
+
+    await invalidate(user_family_tag(user_id, "user_xp"))
+    return str(result['id']) if result else None
+
+
 async def get_xp_transactions(user_id: str, limit: int = 50) -> list[dict]:
     """
     Get recent XP transactions for user
@@ -149,11 +220,13 @@ async def get_xp_transactions(user_id: str, limit: int = 50) -> list[dict]:
             return [dict(row) for row in rows]
 
 
+@cache_with_ttl(ttl=CacheConfig.GAMIFICATION_TTL, key_prefix="user_xp", shared=True)
 async def get_user_xp_level(user_id: str) -> dict:
     """
     Wrapper for API compatibility - returns XP data in expected format
 
     Converts get_user_xp_data() output to match API endpoint expectations.
+    Cached (L1 + Redis); invalidated by the XP writers below.
 
     Returns:
         {
@@ -253,8 +326,13 @@ async def update_user_streak(user_id: str, streak_type: str, streak_data: dict,
                 )
             )
             await conn.commit()
+            db.record_write(user_id)
+
+    await invalidate(user_family_tag(user_id, "user_streaks"))
 
 
+# In-process only: rows carry dates that wouldn't survive serialization
+@cache_with_ttl(ttl=CacheConfig.GAMIFICATION_TTL, key_prefix="user_streaks")
 async def get_all_user_streaks(user_id: str) -> list[dict]:
     """
     Get all streaks for user
@@ -338,6 +416,7 @@ async def get_achievement_by_key(key: str) -> Optional[dict]:
             return dict(row) if row else None
 
 
+@cache_with_ttl(ttl=CacheConfig.GAMIFICATION_TTL, key_prefix="user_achievements")
 async def get_user_achievement_unlocks(user_id: str) -> list[dict]:
     """
     Get user's unlocked achievements
@@ -389,11 +468,13 @@ async def add_user_achievement(user_id: str, achievement_id: str, progress: Opti
             )
             result = await cur.fetchone()
             await conn.commit()
+            db.record_write(user_id)
 
-            if result:
-                logger.info(f"User {user_id} unlocked achievement {achievement_id}")
-                return True
-            return False
+    await invalidate(user_family_tag(user_id, "user_achievements"))
+    if result:
+        logger.info(f"User {user_id} unlocked achievement {achievement_id}")
+        return True
+    return False
 
 
 async def has_user_unlocked_achievement(user_id: str, achievement_id: str) -> bool:
@@ -456,8 +537,10 @@ async def unlock_achievement(
 
             result = await cur.fetchone()
             await conn.commit()
+            db.record_write(user_id)
 
-            return result is not None  # True if inserted, False if already existed
+    await invalidate(user_family_tag(user_id, "user_achievements"))
+    return result is not None  # True if inserted, False if already existed
 
 
 # ==========================================
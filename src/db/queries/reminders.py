@@ -3,12 +3,33 @@ import json
 import logging
 from typing import Optional
 from datetime import datetime, timedelta
-from src.db.connection import db
+from src.db.connection import db, uses_replica
+from src.db.prepared import prepared_statements
 from src.models.reminder import Reminder
 from src.models.sleep_settings import SleepQuizSettings, SleepQuizSubmission
 
 logger = logging.getLogger(__name__)
 
+# Completion checks run for every scheduled reminder delivery
+COMPLETED_SINCE = prepared_statements.register(
+    "reminder_completed_since",
+    """
+    SELECT EXISTS (
+        SELECT 1 FROM reminder_completions
+        WHERE user_id = %s AND reminder_id = %s AND completed_at >= %s
+    ) AS completed
+    """
+)
+COMPLETED_FOR_SCHEDULE = prepared_statements.register(
+    "reminder_completed_for_schedule",
+    """
+    SELECT EXISTS (
+        SELECT 1 FROM reminder_completions
+        WHERE user_id = %s AND reminder_id = %s AND scheduled_time = %s
+    ) AS completed
+    """
+)
+
 
 # ==========================================
 # Reminder CRUD Operations
@@ -331,6 +352,7 @@ async def save_reminder_completion(
                 (reminder_id, user_id, scheduled_datetime, notes)
             )
             await conn.commit()
+            db.record_write(user_id)
 
     logger.info(f"Saved reminder completion for user {user_id}, reminder {reminder_id}")
 
@@ -404,25 +426,17 @@ async def has_completed_reminder_today(
     Returns:
         True if reminder was completed today, False otherwise
     """
-    from src.utils.datetime_helpers import now_user_timezone
+    from src.utils.datetime_helpers import get_user_timezone_async
 
     # Get today's date in user's timezone
-    now = now_user_timezone(user_id)
+    now = datetime.now(await get_user_timezone_async(user_id))
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
     async with db.connection() as conn:
         async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                SELECT COUNT(*) FROM reminder_completions
-                WHERE user_id = %s AND reminder_id = %s AND completed_at >= %s
-                """,
-                (user_id, reminder_id, today_start)
-            )
-
+            await prepared_statements.execute(cur, COMPLETED_SINCE, (user_id, reminder_id, today_start))
             row = await cur.fetchone()
-            count = row[0] if row else 0
-            return count > 0
+            return bool(row and row["completed"])
 
 
 async def update_completion_note(
@@ -467,18 +481,10 @@ async def check_missed_reminder_grace_period(user_id: str, reminder_id: str, sch
     async with db.connection() as conn:
         async with conn.cursor() as cur:
             # Check if completion exists
-            await cur.execute(
-                """
-                SELECT COUNT(*)
-                FROM reminder_completions
-                WHERE user_id = %s
-                AND reminder_id = %s
-                AND scheduled_time = %s
-                """,
-                (user_id, reminder_id, scheduled_time)
+            await prepared_statements.execute(
+                cur, COMPLETED_FOR_SCHEDULE, (user_id, reminder_id, scheduled_time)
             )
-
-            completion_exists = (await cur.fetchone())[0] > 0
+            completion_exists = (await cur.fetchone())["completed"]
 
             if completion_exists:
                 return False
@@ -645,6 +651,7 @@ async def save_reminder_skip(
                 (reminder_id, user_id, scheduled_datetime, reason, notes)
             )
             await conn.commit()
+            db.record_write(user_id)
 
     logger.info(f"Saved reminder skip for user {user_id}, reminder {reminder_id}, reason={reason}")
 
@@ -773,6 +780,7 @@ async def calculate_best_streak(user_id: str, reminder_id: str) -> int:
 # Reminder Analytics Functions (Week 2)
 # ============================================
 
+@uses_replica
 async def get_reminder_analytics(
     user_id: str,
     reminder_id: str,
@@ -904,6 +912,7 @@ async def get_reminder_analytics(
             }
 
 
+@uses_replica
 async def analyze_day_of_week_patterns(
     user_id: str,
     reminder_id: str,
@@ -1012,6 +1021,7 @@ async def analyze_day_of_week_patterns(
             return patterns
 
 
+@uses_replica
 async def get_multi_reminder_comparison(
     user_id: str,
     days: int = 30
@@ -1077,6 +1087,7 @@ async def get_multi_reminder_comparison(
 # Phase 3: Adaptive Intelligence Functions
 # ========================================
 
+@uses_replica
 async def detect_timing_patterns(user_id: str, reminder_id: str, days: int = 30) -> dict:
     """
     Detect timing patterns in reminder completions
@@ -1162,6 +1173,7 @@ async def detect_timing_patterns(user_id: str, reminder_id: str, days: int = 30)
             }
 
 
+@uses_replica
 async def detect_difficult_days(user_id: str, reminder_id: str, days: int = 30) -> dict:
     """
     Detect days of week with low completion rates
@@ -91,7 +91,7 @@ async def _create_tracker_health_event(entry: TrackerEntry, category_name: str):
     This runs asynchronously after the main tracking_entry is saved.
     """
     try:
-        from src.services.health_events import create_health_event
+        from src.services.health_events import health_event_batcher
 
         metadata = {
             "category_name": category_name,
@@ -100,7 +100,7 @@ async def _create_tracker_health_event(entry: TrackerEntry, category_name: str):
             "notes": entry.notes
         }
 
-        await create_health_event(
+        health_event_batcher.add(
             user_id=entry.user_id,
             event_type="tracker",
             timestamp=entry.timestamp,
@@ -108,7 +108,7 @@ async def _create_tracker_health_event(entry: TrackerEntry, category_name: str):
             source_table="tracking_entries",
             source_id=entry.id
         )
-        logger.debug(f"Created health_event for tracking_entry {entry.id}")
+        logger.debug(f"Queued health_event for tracking_entry {entry.id}")
 
     except Exception as e:
         logger.error(
@@ -187,7 +187,7 @@ async def _create_sleep_health_event(entry: SleepEntry):
     This runs asynchronously after the main sleep_entry is saved.
     """
     try:
-        from src.services.health_events import create_health_event
+        from src.services.health_events import health_event_batcher
 
         metadata = {
             "bedtime": str(entry.bedtime),
@@ -205,7 +205,7 @@ async def _create_sleep_health_event(entry: SleepEntry):
         # Parse entry.id to UUID if it's a string
         entry_id = UUID(entry.id) if isinstance(entry.id, str) else entry.id
 
-        await create_health_event(
+        health_event_batcher.add(
             user_id=entry.user_id,
             event_type="sleep",
             timestamp=entry.logged_at,
@@ -213,7 +213,7 @@ async def _create_sleep_health_event(entry: SleepEntry):
             source_table="sleep_entries",
             source_id=entry_id
         )
-        logger.debug(f"Created health_event for sleep_entry {entry.id}")
+        logger.debug(f"Queued health_event for sleep_entry {entry.id}")
 
     except Exception as e:
         logger.error(
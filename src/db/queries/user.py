@@ -4,10 +4,31 @@ import logging
 from typing import Optional
 from datetime import datetime
 from src.db.connection import db
+from src.db.prepared import prepared_statements
+from src.db.write_behind import execute_write_behind
 from src.models.user import UserProfile
+from src.utils.cache import CacheConfig, cache_with_ttl, invalidate, user_family_tag
+from src.utils.session_state import invalidate_session_state
 
 logger = logging.getLogger(__name__)
 
+# Backs is_authorized() and the session state cache, checked on every update
+SESSION_STATE = prepared_statements.register(
+    "session_state",
+    """
+    SELECT u.subscription_status, u.subscription_tier,
+           u.subscription_start_date, u.subscription_end_date,
+           u.activated_at, u.invite_code_used,
+           o.user_id AS onboarding_user_id,
+           o.onboarding_path, o.current_step, o.step_data,
+           o.completed_steps, o.started_at, o.completed_at,
+           o.last_interaction_at
+    FROM users u
+    LEFT JOIN user_onboarding_state o ON o.user_id = u.telegram_id
+    WHERE u.telegram_id = %s
+    """
+)
+
 
 # User operations
 async def create_user(telegram_id: str) -> None:
@@ -34,6 +55,8 @@ async def create_user(telegram_id: str) -> None:
             result = await cur.fetchone()
             await conn.commit()
 
+    invalidate_session_state(telegram_id)
+
     if result:
         logger.info(f"Ensured user exists: {telegram_id}")
     else:
@@ -204,6 +227,7 @@ async def use_invite_code(code: str, telegram_id: str) -> bool:
                 )
 
             await conn.commit()
+            invalidate_session_state(telegram_id)
             logger.info(f"User {telegram_id} activated with code {code}")
             return True
 
@@ -238,6 +262,22 @@ async def get_user_subscription_status(telegram_id: str) -> Optional[dict]:
             }
 
 
+async def get_session_state_row(telegram_id: str) -> Optional[dict]:
+    """
+    Get subscription and onboarding state for a user in one query
+
+    Returns:
+        Dict with subscription columns and onboarding columns (onboarding
+        columns are None if the user has no onboarding row), or None if the
+        user doesn't exist
+    """
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await prepared_statements.execute(cur, SESSION_STATE, (telegram_id,))
+            row = await cur.fetchone()
+            return dict(row) if row else None
+
+
 async def get_master_codes() -> list:
     """Get all active master codes"""
     async with db.connection() as conn:
@@ -344,6 +384,7 @@ async def start_onboarding(user_id: str, path: str) -> None:
                     (user_id, path)
                 )
             await conn.commit()
+    invalidate_session_state(user_id)
     logger.info(f"Started onboarding for {user_id} on path: {path}")
 
 
@@ -382,6 +423,7 @@ async def update_onboarding_step(
                     (new_step, json.dumps(step_data or {}), user_id)
                 )
             await conn.commit()
+    invalidate_session_state(user_id)
     logger.info(f"Updated onboarding step for {user_id}: {new_step}")
 
 
@@ -400,6 +442,7 @@ async def complete_onboarding(user_id: str) -> None:
                 (user_id,)
             )
             await conn.commit()
+    invalidate_session_state(user_id)
     logger.info(f"Completed onboarding for {user_id}")
 
 
@@ -408,40 +451,34 @@ async def log_feature_discovery(
     feature_name: str,
     discovery_method: str = "contextual"
 ) -> None:
-    """Log when a user discovers a feature"""
-    async with db.connection() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                INSERT INTO feature_discovery_log
-                (user_id, feature_name, discovery_method)
-                VALUES (%s, %s, %s)
-                ON CONFLICT (user_id, feature_name) DO NOTHING
-                """,
-                (user_id, feature_name, discovery_method)
-            )
-            await conn.commit()
+    """Log when a user discovers a feature (written behind, see src.db.write_behind)"""
+    await execute_write_behind(
+        """
+        INSERT INTO feature_discovery_log
+        (user_id, feature_name, discovery_method)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (user_id, feature_name) DO NOTHING
+        """,
+        (user_id, feature_name, discovery_method)
+    )
     logger.info(f"Logged feature discovery: {user_id} -> {feature_name}")
 
 
 async def log_feature_usage(user_id: str, feature_name: str) -> None:
-    """Log when a user actually uses a feature"""
-    async with db.connection() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                INSERT INTO feature_discovery_log
-                (user_id, feature_name, first_used_at, usage_count, last_used_at)
-                VALUES (%s, %s, CURRENT_TIMESTAMP, 1, CURRENT_TIMESTAMP)
-                ON CONFLICT (user_id, feature_name)
-                DO UPDATE SET
-                    first_used_at = COALESCE(feature_discovery_log.first_used_at, CURRENT_TIMESTAMP),
-                    usage_count = feature_discovery_log.usage_count + 1,
-                    last_used_at = CURRENT_TIMESTAMP
-                """,
-                (user_id, feature_name)
-            )
-            await conn.commit()
+    """Log when a user actually uses a feature (written behind, see src.db.write_behind)"""
+    await execute_write_behind(
+        """
+        INSERT INTO feature_discovery_log
+        (user_id, feature_name, first_used_at, usage_count, last_used_at)
+        VALUES (%s, %s, CURRENT_TIMESTAMP, 1, CURRENT_TIMESTAMP)
+        ON CONFLICT (user_id, feature_name)
+        DO UPDATE SET
+            first_used_at = COALESCE(feature_discovery_log.first_used_at, CURRENT_TIMESTAMP),
+            usage_count = feature_discovery_log.usage_count + 1,
+            last_used_at = CURRENT_TIMESTAMP
+        """,
+        (user_id, feature_name)
+    )
     logger.info(f"Logged feature usage: {user_id} used {feature_name}")
 
 
@@ -466,17 +503,16 @@ async def audit_profile_update(
     Purpose:
         Creates audit trail for profile changes to track data modifications
         and help debug issues where user data changes unexpectedly.
+        Written behind (see src.db.write_behind), so the row may land up
+        to a flush interval after this returns.
     """
-    async with db.connection() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                INSERT INTO profile_update_audit (user_id, field_name, old_value, new_value, updated_by)
-                VALUES (%s, %s, %s, %s, %s)
-                """,
-                (user_id, field_name, old_value, new_value, updated_by)
-            )
-            await conn.commit()
+    await execute_write_behind(
+        """
+        INSERT INTO profile_update_audit (user_id, field_name, old_value, new_value, updated_by)
+        VALUES (%s, %s, %s, %s, %s)
+        """,
+        (user_id, field_name, old_value, new_value, updated_by)
+    )
     logger.info(f"Audited profile update for user {user_id}: {field_name}")
 
 
@@ -500,21 +536,29 @@ async def audit_preference_update(
     Purpose:
         Creates audit trail for preference changes to track modifications
         and understand user behavior patterns.
+        Written behind (see src.db.write_behind), so the row may land up
+        to a flush interval after this returns.
     """
-    async with db.connection() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                INSERT INTO preference_update_audit (user_id, preference_name, old_value, new_value, updated_by)
-                VALUES (%s, %s, %s, %s, %s)
-                """,
-                (user_id, preference_name, old_value, new_value, updated_by)
-            )
-            await conn.commit()
+    await execute_write_behind(
+        """
+        INSERT INTO preference_update_audit (user_id, preference_name, old_value, new_value, updated_by)
+        VALUES (%s, %s, %s, %s, %s)
+        """,
+        (user_id, preference_name, old_value, new_value, updated_by)
+    )
     logger.info(f"Audited preference update for user {user_id}: {preference_name}")
 
 
 # User Profile Operations (PostgreSQL-based memory)
+async def _invalidate_profile_cache(telegram_id: str) -> None:
+    """Drop cached get_user_profile/get_user_preferences results in every process"""
+    await invalidate(
+        user_family_tag(telegram_id, "user_profile"),
+        user_family_tag(telegram_id, "user_preferences")
+    )
+
+
+@cache_with_ttl(ttl=CacheConfig.USER_PROFILE_TTL, key_prefix="user_profile", shared=True)
 async def get_user_profile(telegram_id: str) -> Optional[dict]:
     """
     Get user profile from database
@@ -538,8 +582,8 @@ async def get_user_profile(telegram_id: str) -> Optional[dict]:
             row = await cur.fetchone()
             if row:
                 return {
-                    "profile_data": row[0],
-                    "timezone": row[1]
+                    "profile_data": row["profile_data"],
+                    "timezone": row["timezone"]
                 }
             return None
 
@@ -578,6 +622,7 @@ async def update_user_profile(
                     (json.dumps(profile_data), telegram_id)
                 )
             await conn.commit()
+    await _invalidate_profile_cache(telegram_id)
     logger.info(f"Updated profile for user {telegram_id}")
 
 
@@ -598,9 +643,9 @@ async def get_user_profile_field(telegram_id: str, field_path: str) -> Optional[
             if '.' in field_path:
                 parts = field_path.split('.')
                 json_path = '->' + '->'.join(f"'{p}'" for p in parts[:-1]) + f"->>'{parts[-1]}'"
-                query = f"SELECT profile_data{json_path} FROM user_profiles WHERE telegram_id = %s"
+                query = f"SELECT profile_data{json_path} AS value FROM user_profiles WHERE telegram_id = %s"
             else:
-                query = f"SELECT profile_data->>%s FROM user_profiles WHERE telegram_id = %s"
+                query = f"SELECT profile_data->>%s AS value FROM user_profiles WHERE telegram_id = %s"
 
             if '.' in field_path:
                 await cur.execute(query, (telegram_id,))
@@ -608,7 +653,7 @@ async def get_user_profile_field(telegram_id: str, field_path: str) -> Optional[
                 await cur.execute(query, (field_path, telegram_id))
 
             row = await cur.fetchone()
-            return row[0] if row else None
+            return row["value"] if row else None
 
 
 async def set_user_profile_field(
@@ -664,12 +709,14 @@ async def set_user_profile_field(
                     ([field_path], str(value), telegram_id)
                 )
             await conn.commit()
+    await _invalidate_profile_cache(telegram_id)
 
     # Audit the change
     await audit_profile_update(telegram_id, field_path, str(old_value) if old_value else None, str(value), updated_by)
     logger.info(f"Updated profile field {field_path} for user {telegram_id}")
 
 
+@cache_with_ttl(ttl=CacheConfig.USER_PREFERENCES_TTL, key_prefix="user_preferences", shared=True)
 async def get_user_preferences(telegram_id: str) -> dict:
     """
     Get user communication preferences from profile
@@ -684,14 +731,14 @@ async def get_user_preferences(telegram_id: str) -> dict:
         async with conn.cursor() as cur:
             await cur.execute(
                 """
-                SELECT profile_data->'communication_preferences'
+                SELECT profile_data->'communication_preferences' AS preferences
                 FROM user_profiles
                 WHERE telegram_id = %s
                 """,
                 (telegram_id,)
             )
             row = await cur.fetchone()
-            return row[0] if row and row[0] else {}
+            return row["preferences"] if row and row["preferences"] else {}
 
 
 async def update_user_preference(
@@ -728,6 +775,7 @@ async def update_user_preference(
                 (['communication_preferences', pref_name], str(value), telegram_id)
             )
             await conn.commit()
+    await _invalidate_profile_cache(telegram_id)
 
     # Audit the change
     await audit_preference_update(telegram_id, pref_name, str(old_value) if old_value else None, str(value), updated_by)
@@ -763,9 +811,61 @@ async def create_user_profile(telegram_id: str, timezone: str = "UTC") -> None:
                 (telegram_id, json.dumps(default_profile), timezone)
             )
             await conn.commit()
+    await _invalidate_profile_cache(telegram_id)
     logger.info(f"Created profile for user {telegram_id}")
 
 
+async def get_user_timezones(telegram_ids: list[str]) -> dict[str, str]:
+    """
+    Get timezones for many users in one query
+
+    Args:
+        telegram_ids: List of Telegram IDs
+
+    Returns:
+        Dict mapping telegram_id to IANA timezone (users without a profile are omitted)
+    """
+    if not telegram_ids:
+        return {}
+
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                SELECT telegram_id, timezone
+                FROM user_profiles
+                WHERE telegram_id = ANY(%s)
+                """,
+                (list(telegram_ids),)
+            )
+            rows = await cur.fetchall()
+            return {row["telegram_id"]: row["timezone"] for row in rows}
+
+
+async def set_user_timezone(telegram_id: str, timezone: str) -> None:
+    """
+    Set user's timezone in user_profiles (creates the profile row if missing)
+
+    Args:
+        telegram_id: User's Telegram ID
+        timezone: IANA timezone string (e.g., 'America/New_York')
+    """
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                INSERT INTO user_profiles (telegram_id, timezone)
+                VALUES (%s, %s)
+                ON CONFLICT (telegram_id) DO UPDATE
+                SET timezone = EXCLUDED.timezone
+                """,
+                (telegram_id, timezone)
+            )
+            await conn.commit()
+    await _invalidate_profile_cache(telegram_id)
+    logger.info(f"Set timezone for user {telegram_id} to {timezone}")
+
+
 async def migrate_profile_from_dict(
     telegram_id: str,
     profile_dict: dict,
@@ -799,4 +899,5 @@ async def migrate_profile_from_dict(
                 (telegram_id, json.dumps(combined_profile), timezone)
             )
             await conn.commit()
+    await _invalidate_profile_cache(telegram_id)
     logger.info(f"Migrated profile for user {telegram_id} from markdown to database")
@@ -0,0 +1,91 @@
+"""pgvector binary decoding
+
+Loads pgvector `vector` columns straight from the binary wire format into
+float32 NumPy arrays, instead of parsing their '[0.1,0.2,...]' text form in
+Python. Pooled connections get the loader in their configure hook
+(register_vector_loader); execute with binary=True where it is registered:
+
+    async with conn.cursor() as cur:
+        binary = await use_binary_vectors(cur)
+        await cur.execute(query, params, binary=binary)
+"""
+import logging
+import struct
+from typing import Sequence
+
+import numpy as np
+import psycopg
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">HH")  # dimensions, unused
+
+
+class VectorBinaryLoader(psycopg.adapt.Loader):
+    """Binary `vector` → np.ndarray[float32]"""
+
+    format = psycopg.pq.Format.BINARY
+
+    def load(self, data) -> np.ndarray:
+        dim, _ = _HEADER.unpack_from(data)
+        return np.frombuffer(data, dtype=">f4", count=dim, offset=_HEADER.size).astype(np.float32)
+
+
+def to_vector_literal(embedding: Sequence[float]) -> str:
+    """Text form of an embedding for a %s::vector parameter"""
+    return f"[{','.join(str(x) for x in embedding)}]"
+
+
+async def _fetch_vector_type(conn: psycopg.AsyncConnection):
+    """TypeInfo of `vector` on this database, or None if pgvector isn't installed"""
+    info = await psycopg.types.TypeInfo.fetch(conn, "vector")
+    if info is None:
+        logger.warning("pgvector 'vector' type not found; vectors will load as text")
+    return info
+
+
+def _register(context, info) -> None:
+    info.register(context)
+    context.adapters.register_loader(info.oid, VectorBinaryLoader)
+
+
+async def register_vector_loader(conn: psycopg.AsyncConnection) -> bool:
+    """
+    Register the binary vector loader on a connection.
+
+    Extension types get a database-specific OID, so it is looked up on
+    each connection. Returns False (vectors stay text) if pgvector isn't
+    installed.
+    """
+    info = await _fetch_vector_type(conn)
+    if info is None:
+        return False
+    _register(conn, info)
+    return True
+
+
+async def use_binary_vectors(cur: psycopg.AsyncCursor) -> bool:
+    """
+    Whether vectors on this cursor's connection load from binary.
+
+    Connections the pool didn't configure (e.g. plain
+    psycopg.AsyncConnection.connect()) get the loader registered here.
+    """
+    if cur.adapters.types.get("vector") is not None:
+        return True
+    info = await _fetch_vector_type(cur.connection)
+    if info is None:
+        return False
+    # The cursor copied the connection's adapters when it was created
+    _register(cur.connection, info)
+    _register(cur, info)
+    return True
+
+
+def parse_vector(value) -> np.ndarray:
+    """Embedding column value (array from the binary loader, or text/list) → np.ndarray"""
+    if isinstance(value, np.ndarray):
+        return value
+    if isinstance(value, str):
+        return np.array(value.strip("[]").split(","), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
@@ -0,0 +1,234 @@
+"""
+Write-behind sink for telemetry-style writes
+
+Feature usage logs, audit rows, tool execution logs and pattern surfacing
+counters don't need to be committed before the user gets a reply. Instead
+of taking a pool connection for one INSERT each on the request path, they
+are queued in memory and written in batches: every FLUSH_INTERVAL seconds,
+or as soon as BATCH_SIZE records are waiting.
+
+Records keep their order. Consecutive records for the same statement are
+sent with one executemany(), and each batch is committed in one
+transaction. If the sink isn't running (scripts, tests, after shutdown) or
+the queue is full, callers fall back to a direct write, so nothing is
+dropped.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Optional, Sequence
+
+from src.db.connection import POOL_BACKGROUND, db
+from src.observability.metrics import (
+    write_behind_queue_depth,
+    write_behind_lag_seconds,
+    write_behind_records_total,
+    write_behind_flush_duration_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindConfig:
+    """Write-behind sink configuration constants"""
+    BATCH_SIZE = 200
+    FLUSH_INTERVAL = 1.0  # seconds
+    MAX_QUEUE_SIZE = 10_000
+
+    # Enable/disable batching globally (useful for testing)
+    ENABLED = True
+
+
+# Queued record: (query, params, enqueued_at)
+_Record = tuple[str, Sequence, float]
+
+
+class WriteBehindSink:
+    """Queues write statements and flushes them in batches"""
+
+    def __init__(
+        self,
+        batch_size: int = WriteBehindConfig.BATCH_SIZE,
+        flush_interval: float = WriteBehindConfig.FLUSH_INTERVAL,
+        max_queue_size: int = WriteBehindConfig.MAX_QUEUE_SIZE
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self._queue: deque[_Record] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+        self._stats = {
+            "enqueued": 0, "batched": 0, "direct": 0, "overflow": 0,
+            "failed": 0, "flushes": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        """True while the background flusher is accepting records"""
+        return self._task is not None and not self._stopping
+
+    def start(self) -> None:
+        """Start the background flusher (call from the running event loop)"""
+        if self.running:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Write-behind sink started (batch={self.batch_size}, "
+            f"interval={self.flush_interval}s, max_queue={self.max_queue_size})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the flusher and write everything still queued"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await self._task
+        finally:
+            self._task = None
+        await self.flush()
+        logger.info(f"Write-behind sink stopped: {self.get_stats()}")
+
+    def enqueue(self, query: str, params: Sequence) -> bool:
+        """
+        Queue a write statement
+
+        Returns:
+            False if the record was not queued (sink not running or queue
+            full); the caller must write it directly
+        """
+        if not WriteBehindConfig.ENABLED or not self.running:
+            return False
+        if len(self._queue) >= self.max_queue_size:
+            self._stats["overflow"] += 1
+            return False
+
+        self._queue.append((query, params, time.monotonic()))
+        self._stats["enqueued"] += 1
+        write_behind_queue_depth.set(len(self._queue))
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> int:
+        """Write all queued records now; returns the number written"""
+        if not self._queue:
+            return 0
+        lock = self._flush_lock or asyncio.Lock()
+        written = 0
+        async with lock:
+            while self._queue:
+                count = min(self.batch_size, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(count)]
+                write_behind_queue_depth.set(len(self._queue))
+                await self._write_batch(batch)
+                written += count
+        return written
+
+    def get_stats(self) -> dict:
+        """Get sink statistics, including the age of the oldest queued record"""
+        oldest = time.monotonic() - self._queue[0][2] if self._queue else 0.0
+        return {
+            **self._stats,
+            "queued": len(self._queue),
+            "oldest_lag_seconds": round(oldest, 3),
+            "running": self.running,
+        }
+
+    def record_direct(self) -> None:
+        """Count a write that bypassed the queue"""
+        self._stats["direct"] += 1
+        write_behind_records_total.labels(outcome="direct").inc()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"[WRITE_BEHIND] Flush failed: {e}", exc_info=True)
+
+    async def _write_batch(self, batch: list[_Record]) -> None:
+        start = time.monotonic()
+        try:
+            async with db.connection(POOL_BACKGROUND) as conn:
+                async with conn.cursor() as cur:
+                    for query, params_seq in _consecutive_runs(batch):
+                        await cur.executemany(query, params_seq)
+                await conn.commit()
+        except Exception as e:
+            logger.warning(
+                f"[WRITE_BEHIND] Batch of {len(batch)} failed, retrying one by one: {e}"
+            )
+            await self._write_one_by_one(batch)
+            return
+
+        now = time.monotonic()
+        write_behind_flush_duration_seconds.observe(now - start)
+        for _, _, enqueued_at in batch:
+            write_behind_lag_seconds.observe(now - enqueued_at)
+        write_behind_records_total.labels(outcome="batched").inc(len(batch))
+        self._stats["batched"] += len(batch)
+        self._stats["flushes"] += 1
+
+    async def _write_one_by_one(self, batch: list[_Record]) -> None:
+        """Write records individually so one bad row doesn't lose the batch"""
+        for query, params, enqueued_at in batch:
+            try:
+                await _execute(query, params)
+            except Exception as e:
+                self._stats["failed"] += 1
+                write_behind_records_total.labels(outcome="failed").inc()
+                logger.error(f"[WRITE_BEHIND] Dropped record after retry: {e}")
+                continue
+            write_behind_lag_seconds.observe(time.monotonic() - enqueued_at)
+            write_behind_records_total.labels(outcome="batched").inc()
+            self._stats["batched"] += 1
+
+
+def _consecutive_runs(batch: list[_Record]) -> list[tuple[str, list[Sequence]]]:
+    """Group consecutive records for the same statement, keeping order"""
+    runs: list[tuple[str, list[Sequence]]] = []
+    for query, params, _ in batch:
+        if runs and runs[-1][0] == query:
+            runs[-1][1].append(params)
+        else:
+            runs.append((query, [params]))
+    return runs
+
+
+async def _execute(query: str, params: Sequence) -> None:
+    async with db.connection(POOL_BACKGROUND) as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(query, params)
+            await conn.commit()
+
+
+async def execute_write_behind(query: str, params: Sequence) -> None:
+    """
+    Queue a write on the global sink, or execute it directly if it can't be queued
+
+    Args:
+        query: SQL statement (no RETURNING; results are not available)
+        params: Statement parameters
+    """
+    if write_behind_sink.enqueue(query, params):
+        return
+    write_behind_sink.record_direct()
+    await _execute(query, params)
+
+
+# Global sink instance
+write_behind_sink = WriteBehindSink()
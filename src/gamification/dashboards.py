@@ -14,10 +14,12 @@ from src.gamification.streak_system import get_user_streaks, format_streak_displ
 from src.gamification.achievement_system import get_user_achievements, format_achievement_display
 from src.gamification.xp_system import get_xp_history
 from src.db import queries
+from src.db.connection import uses_replica
 
 logger = logging.getLogger(__name__)
 
 
+@uses_replica
 async def get_daily_snapshot(user_id: str) -> str:
     """
     Generate daily health snapshot dashboard
@@ -120,6 +122,7 @@ async def get_daily_snapshot(user_id: str) -> str:
         return "Sorry, I couldn't generate your daily snapshot. Please try again later."
 
 
+@uses_replica
 async def get_weekly_overview(user_id: str) -> str:
     """
     Generate weekly health overview
@@ -142,7 +145,7 @@ async def get_weekly_overview(user_id: str) -> str:
         xp_data = await get_user_xp(user_id)
 
         # Get this week's transactions
-        all_transactions = mock_store.get_xp_transactions(user_id, limit=500)
+        all_transactions = await queries.get_xp_transactions(user_id, limit=500)
         week_transactions = [
             tx for tx in all_transactions
             if week_start <= tx['awarded_at'].date() <= week_end
@@ -242,6 +245,7 @@ async def get_weekly_overview(user_id: str) -> str:
         return "Sorry, I couldn't generate your weekly overview. Please try again later."
 
 
+@uses_replica
 async def get_monthly_report(user_id: str, month: Optional[date] = None) -> str:
     """
     Generate comprehensive monthly report
@@ -272,7 +276,7 @@ async def get_monthly_report(user_id: str, month: Optional[date] = None) -> str:
         xp_data = await get_user_xp(user_id)
 
         # Get month's transactions
-        all_transactions = mock_store.get_xp_transactions(user_id, limit=1000)
+        all_transactions = await queries.get_xp_transactions(user_id, limit=1000)
         month_transactions = [
             tx for tx in all_transactions
             if month_start <= tx['awarded_at'].date() <= month_end
@@ -415,6 +419,7 @@ async def get_monthly_report(user_id: str, month: Optional[date] = None) -> str:
         return "Sorry, I couldn't generate your monthly report. Please try again later."
 
 
+@uses_replica
 async def get_progress_chart(user_id: str, days: int = 30) -> str:
     """
     Generate text-based progress chart showing XP earned over time
@@ -428,7 +433,7 @@ async def get_progress_chart(user_id: str, days: int = 30) -> str:
     """
     try:
         # Get transactions for the period
-        all_transactions = mock_store.get_xp_transactions(user_id, limit=1000)
+        all_transactions = await queries.get_xp_transactions(user_id, limit=1000)
 
         today = date.today()
         start_date = today - timedelta(days=days - 1)
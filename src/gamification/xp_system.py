@@ -139,17 +139,14 @@ async def award_xp(
     leveled_up = new_level > old_level
     tier_changed = new_tier != old_tier
 
-    # Update user XP in database
+    # Update user XP and log the transaction in one round trip
     updated_xp_data = {
         "total_xp": new_total_xp,
         "current_level": new_level,
         "xp_to_next_level": level_info["xp_to_next_level"],
         "level_tier": new_tier,
     }
-    await queries.update_user_xp(user_id, updated_xp_data)
-
-    # Log transaction to database
-    await queries.add_xp_transaction(user_id, amount, source_type, source_id, reason)
+    await queries.award_user_xp(user_id, updated_xp_data, amount, source_type, source_id, reason)
 
     # Determine unlocked features (if tier changed)
     unlocked_features = []
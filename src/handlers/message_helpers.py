@@ -45,8 +45,8 @@ async def extract_message_context(
     Extract user context needed for message routing.
 
     Fetches:
-    - Subscription status
-    - Onboarding state
+    - Subscription status and onboarding state (one cached session state
+      lookup, usually already warm from validate_message_input)
     - User conversation state (custom note entry)
 
     Returns:
@@ -57,13 +57,12 @@ async def extract_message_context(
     container = get_container()
     user_service = container.user_service
 
-    subscription = await user_service.get_subscription_status(user_id)
-    onboarding = await user_service.get_onboarding_state(user_id)
+    session = await user_service.get_session_state(user_id)
 
     return MessageContext(
         user_id=user_id,
-        subscription=subscription,
-        onboarding=onboarding,
+        subscription=session.subscription if session else None,
+        onboarding=session.onboarding if session else None,
         awaiting_custom_note=context.user_data.get('awaiting_custom_note', False),
         pending_note=context.user_data.get('pending_note')
     )
@@ -7,11 +7,9 @@ from telegram.ext import ContextTypes
 from src.models.message_context import MessageContext
 from src.handlers.onboarding import handle_onboarding_message
 from src.handlers.message_helpers import format_response
-from src.db.queries import (
-    save_conversation_message,
-    get_conversation_history,
-    update_completion_note
-)
+from src.db.queries import update_completion_note
+from src.db.conversation_store import conversation_store
+from src.db.connection import POOL_BACKGROUND, uses_pool
 from src.memory.file_manager import memory_manager
 from src.memory.mem0_manager import mem0_manager
 from src.agent import get_agent_response
@@ -149,7 +147,7 @@ async def _handle_ai_message(
 
         async with PersistentTypingIndicator(update.message.chat):
             # Load conversation history
-            message_history = await get_conversation_history(user_id, limit=20)
+            message_history = await conversation_store.get_history(user_id, limit=20)
 
             # Route query to appropriate model
             from src.utils.query_router import query_router
@@ -170,11 +168,11 @@ async def _handle_ai_message(
                 model_override=model_override
             )
 
-        # Save conversation
-        await save_conversation_message(user_id, "user", text, message_type="text")
-        await save_conversation_message(user_id, "assistant", response, message_type="text")
+        # Save conversation (one INSERT for the turn)
+        await conversation_store.save_turn(user_id, text, response)
 
         # Background memory tasks
+        @uses_pool(POOL_BACKGROUND)
         async def background_memory_tasks():
             mem0_manager.add_message(user_id, text, role="user", metadata={"message_type": "text"})
             mem0_manager.add_message(user_id, response, role="assistant", metadata={"message_type": "text"})
@@ -1,4 +1,5 @@
 """Onboarding handlers for dual-path progressive onboarding"""
+import asyncio
 import logging
 from telegram import Update, ReplyKeyboardMarkup, KeyboardButton, ReplyKeyboardRemove, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes, CallbackQueryHandler
@@ -183,7 +184,7 @@ async def quick_start_timezone_callback(update: Update, context: ContextTypes.DE
 
     # Check if user already has timezone
     from src.utils.timezone_helper import get_timezone_from_profile
-    existing_tz = get_timezone_from_profile(user_id)
+    existing_tz = await asyncio.to_thread(get_timezone_from_profile, user_id)
 
     if existing_tz:
         # Already has timezone, go to language question
@@ -214,7 +215,7 @@ async def quick_start_timezone(update: Update, context: ContextTypes.DEFAULT_TYP
 
     # Check if user already has timezone
     from src.utils.timezone_helper import get_timezone_from_profile
-    existing_tz = get_timezone_from_profile(user_id)
+    existing_tz = await asyncio.to_thread(get_timezone_from_profile, user_id)
 
     if existing_tz:
         # Already has timezone, go to language question
@@ -620,8 +621,17 @@ async def handle_onboarding_message(update: Update, context: ContextTypes.DEFAUL
             from src.utils.timezone_helper import get_timezone_from_coordinates, update_timezone_in_profile
             lat = update.message.location.latitude
             lon = update.message.location.longitude
-            tz = get_timezone_from_coordinates(lat, lon)
-            update_timezone_in_profile(user_id, tz)
+            try:
+                tz = await asyncio.to_thread(get_timezone_from_coordinates, lat, lon)
+                await asyncio.to_thread(update_timezone_in_profile, user_id, tz)
+                await memory_manager.set_timezone(user_id, tz)
+            except Exception as e:
+                logger.error(f"Failed to save timezone '{tz}' from location for user {user_id}: {e}", exc_info=True)
+                await update.message.reply_text(
+                    "❌ Couldn't save the timezone for that location. "
+                    "Please type it instead, e.g. \"America/New_York\"."
+                )
+                return
 
             await update.message.reply_text(
                 f"✅ Got it! Your timezone is **{tz}**",
@@ -635,7 +645,8 @@ async def handle_onboarding_message(update: Update, context: ContextTypes.DEFAUL
             try:
                 tz_input = update.message.text.strip()
                 pytz.timezone(tz_input)  # Validate
-                update_timezone_in_profile(user_id, tz_input)
+                await asyncio.to_thread(update_timezone_in_profile, user_id, tz_input)
+                await memory_manager.set_timezone(user_id, tz_input)
                 await update.message.reply_text(
                     f"✅ Great! Your timezone is now **{tz_input}**",
                     parse_mode="Markdown"
@@ -3,6 +3,7 @@ import logging
 from datetime import datetime, timedelta
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CallbackQueryHandler, ContextTypes
+from src.db.connection import POOL_BACKGROUND, uses_pool
 from src.db.queries import save_reminder_completion, get_reminder_by_id
 from src.utils.auth import is_authorized
 from src.utils.note_templates import get_note_templates
@@ -491,6 +492,7 @@ async def handle_reminder_snooze(update: Update, context: ContextTypes.DEFAULT_T
         logger.error(f"Error handling snooze: {e}", exc_info=True)
 
 
+@uses_pool(POOL_BACKGROUND)
 async def _send_snoozed_reminder(context: ContextTypes.DEFAULT_TYPE) -> None:
     """Send snoozed reminder with original callback data"""
     data = context.job.data
@@ -57,6 +57,10 @@ async def run_telegram_bot() -> None:
         pattern_scheduler = PatternMiningScheduler(app)
         await pattern_scheduler.schedule_pattern_mining()
 
+        # Keep health_events monthly partitions ahead of time and archive old ones
+        from src.scheduler.partition_maintenance import PartitionMaintenanceScheduler
+        await PartitionMaintenanceScheduler(app).schedule_partition_maintenance()
+
         await app.updater.start_polling()
 
         # Keep running until interrupted
@@ -115,10 +119,20 @@ async def main() -> None:
         logger.info("Validating configuration...")
         validate_config()
 
+        # Measure event loop lag and report callbacks that block the loop
+        from src.config import LOOP_MONITOR_ENABLED
+        if LOOP_MONITOR_ENABLED:
+            from src.observability.loop_monitor import loop_monitor
+            loop_monitor.start()
+
         # Initialize database
         logger.info("Initializing database connection pool...")
         await db.init_pool()
 
+        # Start write-behind sink for telemetry/audit writes
+        from src.db.write_behind import write_behind_sink
+        write_behind_sink.start()
+
         # Initialize service container
         logger.info("Initializing service container...")
         container = init_container(
@@ -195,6 +209,15 @@ async def main() -> None:
         logger.error(f"Fatal error: {e}", exc_info=True)
         raise
     finally:
+        # Flush queued telemetry/audit writes while the pool is still open
+        from src.db.write_behind import write_behind_sink
+        await write_behind_sink.stop()
+        from src.services.health_events import health_event_batcher
+        await health_event_batcher.drain()
+
+        from src.cache.redis_client import close_cache
+        await close_cache()
+
         logger.info("Closing database connection...")
         await db.close_pool()
 
@@ -202,6 +225,9 @@ async def main() -> None:
         from src.observability.metrics_collector import stop_metrics_collector
         await stop_metrics_collector()
 
+        from src.observability.loop_monitor import loop_monitor
+        await loop_monitor.stop()
+
         # Shutdown observability (flush any pending events)
         from src.observability.tracing import shutdown_tracing
         shutdown_tracing()
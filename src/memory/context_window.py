@@ -0,0 +1,284 @@
+"""
+Token-budgeted conversation window with a rolling summary
+
+The agent used to receive the raw last-20 messages on every call, so a few
+long assistant answers (dashboards, reminder statistics) inflated every
+following prompt. build_context_window() keeps only the newest messages
+that fit ContextWindowConfig.TOKEN_BUDGET and replaces everything older
+with a per-user rolling summary.
+
+The summary is maintained incrementally: messages that fall out of the
+window are folded into the existing summary by a small model in a
+background task, so the user's reply is never waiting on it. Each update
+only looks at messages newer than summarized_through; the summary is never
+recomputed from the full history.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+from src.config import settings
+from src.db.connection import POOL_BACKGROUND, uses_pool
+from src.db.conversation_store import conversation_store
+
+logger = logging.getLogger(__name__)
+
+
+class ContextWindowConfig:
+    """Context window configuration constants"""
+    # Tokens available for history plus summary (system prompt not included)
+    TOKEN_BUDGET = 3_000
+
+    # Message cap for the raw window. Callers fetch 20 messages, so at least
+    # the oldest 8 always spill into the summary and nothing is skipped as
+    # the window slides forward by one turn (2 messages) at a time.
+    MAX_MESSAGES = 12
+
+    # Single messages are truncated to this many tokens (long dashboards)
+    MESSAGE_TOKEN_CAP = 600
+
+    SUMMARY_MODEL = settings.summary_model
+    SUMMARY_MAX_WORDS = 200
+
+    # Enable/disable trimming and summaries globally (useful for testing)
+    ENABLED = True
+
+
+# Rough token estimate; good enough for budgeting without a tokenizer
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a conversation between a user and "
+    "their health coaching assistant. You are given the current summary and "
+    "the next messages in order. Return the updated summary only. Keep facts "
+    "the assistant will need later: goals, logged meals and workouts, "
+    "preferences, decisions, open questions and promises made. Drop "
+    "greetings, formatting and numbers that are only of passing interest. "
+    "Write in the third person, at most {max_words} words."
+)
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Estimate the number of tokens in a piece of text"""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def message_tokens(message: dict) -> int:
+    """Estimate the tokens a history message adds to the prompt"""
+    return estimate_tokens(message.get("content")) + MESSAGE_OVERHEAD_TOKENS
+
+
+def truncate_message(message: dict, max_tokens: int) -> dict:
+    """Return the message with its content cut to max_tokens (copied if changed)"""
+    content = message.get("content") or ""
+    max_chars = max(max_tokens - MESSAGE_OVERHEAD_TOKENS, 1) * CHARS_PER_TOKEN
+    if len(content) <= max_chars:
+        return message
+    return {**message, "content": content[:max_chars].rstrip() + " [...]"}
+
+
+def fit_to_budget(
+    messages: list[dict],
+    budget: int,
+    max_messages: int
+) -> tuple[list[dict], list[dict]]:
+    """
+    Split history into the newest messages that fit the budget and the rest
+
+    Walks from the newest message backwards. The newest message is always
+    kept (truncated if needed) and the window never starts with an
+    assistant message.
+
+    Args:
+        messages: History, oldest first
+        budget: Token budget for the kept messages
+        max_messages: Maximum number of messages to keep
+
+    Returns:
+        (kept, dropped), both oldest first; dropped messages are unmodified
+    """
+    kept: list[dict] = []
+    used = 0
+    index = len(messages)
+
+    while index > 0 and len(kept) < max_messages:
+        message = truncate_message(messages[index - 1], ContextWindowConfig.MESSAGE_TOKEN_CAP)
+        tokens = message_tokens(message)
+        if used + tokens > budget:
+            if kept:
+                break
+            message = truncate_message(message, budget)
+            tokens = message_tokens(message)
+        kept.append(message)
+        used += tokens
+        index -= 1
+
+    kept.reverse()
+    while kept and kept[0].get("role") == "assistant":
+        kept.pop(0)
+        index += 1
+
+    return kept, messages[:index]
+
+
+@dataclass
+class ContextWindow:
+    """History to send to the agent, plus the summary of older turns"""
+    messages: list[dict]
+    summary: Optional[str] = None
+    tokens: int = 0
+    dropped: list[dict] = field(default_factory=list)
+
+
+async def build_context_window(user_id: str, history: list[dict]) -> ContextWindow:
+    """
+    Trim history to the token budget and attach the rolling summary
+
+    Messages that don't fit are scheduled to be folded into the summary in
+    the background.
+
+    Args:
+        user_id: Telegram user ID
+        history: Conversation history, oldest first (get_history() rows)
+
+    Returns:
+        ContextWindow with the kept messages and the current summary
+    """
+    if not ContextWindowConfig.ENABLED or not history:
+        return ContextWindow(
+            messages=list(history or []),
+            tokens=sum(message_tokens(m) for m in history or [])
+        )
+
+    summary_row = None
+    try:
+        summary_row = await conversation_store.get_summary(user_id)
+    except Exception as e:
+        logger.warning(f"[CONTEXT] Failed to load summary for {user_id}: {e}")
+
+    summary = summary_row["summary"] if summary_row else None
+    summarized_through = summary_row["summarized_through"] if summary_row else None
+
+    # Messages already folded into the summary don't need to be sent again
+    if summarized_through is not None:
+        history = [
+            m for m in history
+            if m.get("timestamp") is None or m["timestamp"] > summarized_through
+        ]
+
+    summary_tokens = estimate_tokens(summary)
+    budget = max(ContextWindowConfig.TOKEN_BUDGET - summary_tokens, 0)
+    kept, dropped = fit_to_budget(history, budget, ContextWindowConfig.MAX_MESSAGES)
+
+    if dropped:
+        schedule_summary_update(user_id, dropped)
+
+    return ContextWindow(
+        messages=kept,
+        summary=summary,
+        tokens=summary_tokens + sum(message_tokens(m) for m in kept),
+        dropped=dropped,
+    )
+
+
+def format_summary_for_prompt(summary: str) -> str:
+    """Format the rolling summary as a system prompt section"""
+    return (
+        "\n\n## Earlier in this conversation\n"
+        "Summary of older messages that are no longer shown in full:\n"
+        f"{summary}"
+    )
+
+
+# Users with a summary update in flight, and strong refs to their tasks
+_updating: set[str] = set()
+_background_tasks: set[asyncio.Task] = set()
+
+
+def schedule_summary_update(user_id: str, dropped: list[dict]) -> Optional[asyncio.Task]:
+    """
+    Fold dropped messages into the user's summary in a background task
+
+    Only messages with a timestamp (i.e. read from conversation_history) are
+    folded in. At most one update runs per user; messages skipped because an
+    update is in flight are still in the history and get picked up on the
+    next turn.
+    """
+    pending = [m for m in dropped if m.get("timestamp") is not None and m.get("content")]
+    if not pending or user_id in _updating:
+        return None
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+    _updating.add(user_id)
+    task = loop.create_task(_update_summary(user_id, pending))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+@uses_pool(POOL_BACKGROUND)
+async def _update_summary(user_id: str, pending: list[dict]) -> None:
+    try:
+        # Re-read so an update that finished since the window was built isn't lost
+        row = await conversation_store.get_summary(user_id)
+        if row:
+            pending = [m for m in pending if m["timestamp"] > row["summarized_through"]]
+            if not pending:
+                return
+
+        summary = await summarize_incremental(row["summary"] if row else None, pending)
+        if not summary:
+            return
+        await conversation_store.save_summary(
+            user_id, summary, pending[-1]["timestamp"], len(pending)
+        )
+        logger.info(
+            f"[CONTEXT] Folded {len(pending)} messages into summary for {user_id} "
+            f"({estimate_tokens(summary)} tokens)"
+        )
+    except Exception as e:
+        logger.warning(f"[CONTEXT] Summary update failed for {user_id}: {e}")
+    finally:
+        _updating.discard(user_id)
+
+
+async def summarize_incremental(
+    current_summary: Optional[str],
+    new_messages: list[dict]
+) -> str:
+    """
+    Merge new messages into an existing summary with a small model
+
+    Args:
+        current_summary: Summary so far (None for the first update)
+        new_messages: Messages to fold in, oldest first
+
+    Returns:
+        Updated summary text
+    """
+    from pydantic_ai import Agent
+
+    transcript = "\n".join(
+        f"{m.get('role', 'user')}: {m['content']}" for m in new_messages
+    )
+    prompt = (
+        f"Current summary:\n{current_summary or '(none yet)'}\n\n"
+        f"Next messages:\n{transcript}"
+    )
+
+    agent = Agent(
+        model=ContextWindowConfig.SUMMARY_MODEL,
+        system_prompt=SUMMARY_SYSTEM_PROMPT.format(
+            max_words=ContextWindowConfig.SUMMARY_MAX_WORDS
+        ),
+    )
+    result = await agent.run(prompt)
+    return result.output.strip()
@@ -7,13 +7,14 @@ import logging
 from typing import Optional
 from src.db.queries.user import (
     get_user_profile,
-    update_user_profile,
     create_user_profile as db_create_user_profile,
     get_user_profile_field,
     set_user_profile_field,
     get_user_preferences,
     update_user_preference,
+    set_user_timezone,
 )
+from src.utils.timezone_resolver import timezone_resolver
 
 logger = logging.getLogger(__name__)
 
@@ -171,10 +172,9 @@ class DatabaseMemoryManager:
             telegram_id: User's Telegram ID
             timezone: IANA timezone string (e.g., 'America/New_York')
         """
-        profile_data = await get_user_profile(telegram_id)
-        if profile_data:
-            await update_user_profile(telegram_id, profile_data['profile_data'], timezone)
-            logger.info(f"Updated timezone for user {telegram_id} to {timezone}")
+        await set_user_timezone(telegram_id, timezone)
+        timezone_resolver.prime(telegram_id, timezone)
+        logger.info(f"Updated timezone for user {telegram_id} to {timezone}")
 
 
 # Global instance
@@ -7,8 +7,9 @@ MEMORY ARCHITECTURE:
 - Redis: Cache layer for user preferences (1hr TTL)
 
 CACHING:
-- User profiles and preferences are cached for 5 minutes to reduce disk I/O
-- Cache is automatically invalidated on updates
+- User profiles and preferences are cached for 1 hour (in-process, then Redis)
+  to reduce disk I/O
+- Cache is automatically invalidated on updates, in every process
 """
 import logging
 from pathlib import Path
@@ -18,7 +19,7 @@ from src.memory.templates import (
     PROFILE_TEMPLATE,
     PREFERENCES_TEMPLATE
 )
-from src.utils.cache import cache_with_ttl, CacheConfig, invalidate_user_cache
+from src.utils.cache import cache_with_ttl, CacheConfig, invalidate, user_tags
 
 logger = logging.getLogger(__name__)
 
@@ -73,37 +74,21 @@ class MemoryFileManager:
         logger.info(f"Updated {filename} for user {telegram_id}")
 
     @cache_with_ttl(
-        ttl=CacheConfig.USER_PROFILE_TTL,
+        ttl=CacheConfig.MEMORY_TTL,
         key_prefix="user_memory",
-        include_args=True
+        include_args=True,
+        shared=True
     )
     async def load_user_memory(self, telegram_id: str) -> UserMemory:
-        """Load all memory files for user (cached for 5 minutes)
+        """Load all memory files for user (cached for 1 hour)
 
         Only loads profile and preferences from markdown files.
         Food history comes from PostgreSQL, patterns from Mem0.
 
-        With Redis caching (1hr TTL):
-        - Check cache first
-        - Load from files on cache miss
-        - Update cache for future requests
-
-        This method is cached to reduce disk I/O on frequent profile/preference reads.
-        Cache is automatically invalidated when profile or preferences are updated.
+        Cached in-process and in Redis (see src/utils/cache.py) to reduce
+        disk I/O on frequent profile/preference reads. Cache is invalidated
+        in every process when profile or preferences are updated.
         """
-        from src.cache.redis_client import get_cache
-
-        cache = get_cache()
-        cache_key = f"user_memory:{telegram_id}"
-
-        # Try cache first
-        if cache:
-            cached = await cache.get(cache_key)
-            if cached:
-                logger.debug(f"User memory loaded from cache: {telegram_id}")
-                return cached
-
-        # Cache miss - load from files
         user_dir = self.get_user_dir(telegram_id)
         if not user_dir.exists():
             await self.create_user_files(telegram_id)
@@ -113,11 +98,6 @@ class MemoryFileManager:
             "preferences": await self.read_file(telegram_id, "preferences.md")
         }
 
-        # Cache for 1 hour
-        if cache:
-            await cache.set(cache_key, memory, ttl=3600)
-            logger.debug(f"User memory cached (1hr TTL): {telegram_id}")
-
         return memory
 
     async def update_profile(self, telegram_id: str, field: str, value: str) -> None:
@@ -126,7 +106,6 @@ class MemoryFileManager:
         Invalidates cache on update to ensure fresh data.
         """
         from src.db.queries import audit_profile_update
-        from src.cache.redis_client import get_cache
 
         content = await self.read_file(telegram_id, "profile.md")
 
@@ -157,18 +136,13 @@ class MemoryFileManager:
 
         await self.write_file(telegram_id, "profile.md", "\n".join(lines))
 
-        # Invalidate cache
-        cache = get_cache()
-        if cache:
-            await cache.delete(f"user_memory:{telegram_id}")
-            logger.debug(f"Cache invalidated for user: {telegram_id}")
+        # Invalidate this user's cached data in every process and in Redis
+        await invalidate(*user_tags(telegram_id))
+        logger.debug(f"Cache invalidated for user: {telegram_id}")
 
         # Audit the change
         await audit_profile_update(telegram_id, field, old_value, value)
 
-        # Invalidate cache for this user
-        invalidate_user_cache(telegram_id)
-
         logger.info(f"Updated profile field {field} for user {telegram_id}")
 
     async def update_preferences(self, telegram_id: str, preference: str, value: str) -> None:
@@ -177,7 +151,6 @@ class MemoryFileManager:
         Invalidates cache on update to ensure fresh data.
         """
         from src.db.queries import audit_preference_update
-        from src.cache.redis_client import get_cache
 
         content = await self.read_file(telegram_id, "preferences.md")
 
@@ -212,18 +185,13 @@ class MemoryFileManager:
 
         await self.write_file(telegram_id, "preferences.md", "\n".join(lines))
 
-        # Invalidate cache
-        cache = get_cache()
-        if cache:
-            await cache.delete(f"user_memory:{telegram_id}")
-            logger.debug(f"Cache invalidated for user: {telegram_id}")
+        # Invalidate this user's cached data in every process and in Redis
+        await invalidate(*user_tags(telegram_id))
+        logger.debug(f"Cache invalidated for user: {telegram_id}")
 
         # Audit the change
         await audit_preference_update(telegram_id, preference, old_value, value)
 
-        # Invalidate cache for this user
-        invalidate_user_cache(telegram_id)
-
         logger.info(f"Updated preference {preference} for user {telegram_id}")
 
 
@@ -97,6 +97,12 @@ class PrometheusMetrics:
                 ['agent_type', 'token_type']
             )
 
+            self.agent_history_tokens = Histogram(
+                'agent_history_tokens',
+                'Estimated tokens of conversation history and summary sent per agent call',
+                buckets=[250, 500, 1000, 2000, 3000, 5000, 10000]
+            )
+
             self._enabled = True
             logger.info("Prometheus metrics initialized")
 
@@ -0,0 +1,289 @@
+"""
+Event loop lag and slow callback monitoring.
+
+The Telegram bot, its JobQueue and the FastAPI server share one asyncio
+loop (src/main.py), so synchronous work in any handler (Mem0, PIL,
+SQLite, file reads, exec in dynamic tools) stalls all of them. The
+monitor measures that:
+
+- Lag: a task sleeps LOOP_LAG_SAMPLE_INTERVAL_MS and records how late it
+  woke up. Samples go to event_loop_lag_seconds, and p50/p90/p99/max over
+  the last LAG_WINDOW samples to event_loop_lag_quantile_seconds.
+- Slow callbacks: asyncio.Handle._run is wrapped to time every callback
+  and task step on the monitored loop. Those longer than
+  LOOP_SLOW_CALLBACK_MS are logged with their task and coroutine name and
+  counted in event_loop_slow_callbacks_total. A watchdog thread grabs the
+  loop thread's stack while such a callback is still running, so the log
+  shows the code that blocked, not where the task suspended afterwards.
+
+Timing costs two perf_counter() calls per callback. Loops that don't run
+callbacks through asyncio.Handle (uvloop) get lag sampling only.
+
+/api/debug/loop serves get_stats(), the recent slow callbacks and
+dump_tasks().
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import LOOP_LAG_SAMPLE_INTERVAL_MS, LOOP_SLOW_CALLBACK_MS
+from src.observability.metrics import (
+    event_loop_lag_quantile_seconds,
+    event_loop_lag_seconds,
+    event_loop_slow_callbacks_total,
+    event_loop_tasks,
+)
+
+logger = logging.getLogger(__name__)
+
+LAG_WINDOW = 600  # lag samples kept for percentiles (5 minutes at 500ms)
+SLOW_CALLBACK_LOG_SIZE = 50
+MAX_STACK_FRAMES = 20
+QUANTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))
+
+_original_handle_run = asyncio.Handle._run
+
+# The monitor whose loop is being timed (one per process)
+_active_monitor: Optional["LoopMonitor"] = None
+
+
+def _timed_handle_run(handle: asyncio.Handle) -> None:
+    """asyncio.Handle._run that times callbacks on the monitored loop"""
+    monitor = _active_monitor
+    if monitor is None or handle._loop is not monitor.loop:
+        return _original_handle_run(handle)
+
+    start = time.perf_counter()
+    monitor._current = (handle, start)
+    try:
+        return _original_handle_run(handle)
+    finally:
+        monitor._current = None
+        duration = time.perf_counter() - start
+        if duration >= monitor.slow_callback_seconds:
+            monitor._report(handle, duration, start)
+
+
+def _coroutine_name(task: asyncio.Task) -> str:
+    coro = task.get_coro()
+    return getattr(coro, "__qualname__", type(coro).__name__)
+
+
+def _describe(handle: asyncio.Handle) -> Dict[str, str]:
+    """Kind, task name and coroutine (or callback) name of a handle"""
+    callback = handle._callback
+    task = getattr(callback, "__self__", None)
+    if isinstance(task, asyncio.Task):
+        return {"kind": "task", "task": task.get_name(), "coroutine": _coroutine_name(task)}
+    name = getattr(callback, "__qualname__", None) or repr(callback)
+    return {"kind": "callback", "task": "", "coroutine": name}
+
+
+def _format_frames(frames: List[Any]) -> List[str]:
+    return [
+        f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+        for frame in frames
+    ]
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+class LoopMonitor:
+    """Samples event loop lag and reports callbacks that block the loop"""
+
+    def __init__(self, sample_interval_ms: float = 500.0, slow_callback_ms: float = 100.0):
+        """
+        Args:
+            sample_interval_ms: How often lag is sampled
+            slow_callback_ms: Report callbacks/task steps running longer than this
+        """
+        self.sample_interval = sample_interval_ms / 1000
+        self.slow_callback_seconds = slow_callback_ms / 1000
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_watchdog = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+
+        # Set by _timed_handle_run while a callback runs, read by the watchdog
+        self._current: Optional[Tuple[asyncio.Handle, float]] = None
+        # (callback start, stack) captured by the watchdog for the running callback
+        self._captured: Optional[Tuple[float, List[str]]] = None
+
+        self._lag_samples: deque = deque(maxlen=LAG_WINDOW)
+        self._slow_callbacks: deque = deque(maxlen=SLOW_CALLBACK_LOG_SIZE)
+        self._stats = {"samples": 0, "slow_callbacks": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop (call from that loop)"""
+        global _active_monitor
+        if self.running:
+            return
+        if _active_monitor is not None and _active_monitor is not self:
+            logger.warning("Another event loop monitor is already running")
+            return
+
+        self.loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        _active_monitor = self
+        asyncio.Handle._run = _timed_handle_run
+
+        self._task = self.loop.create_task(self._sample_lag(), name="event-loop-monitor")
+        self._stop_watchdog.clear()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="event-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info(
+            f"Event loop monitor started (sample every {self.sample_interval * 1000:.0f}ms, "
+            f"slow callback {self.slow_callback_seconds * 1000:.0f}ms)"
+        )
+
+    async def stop(self) -> None:
+        global _active_monitor
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        self._stop_watchdog.set()
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+
+        if _active_monitor is self:
+            _active_monitor = None
+            asyncio.Handle._run = _original_handle_run
+        self.loop = None
+        logger.info("Event loop monitor stopped")
+
+    async def _sample_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + self.sample_interval
+            await asyncio.sleep(self.sample_interval)
+            self.record_lag(max(0.0, loop.time() - due))
+            event_loop_tasks.set(len(asyncio.all_tasks(loop)))
+
+    def record_lag(self, lag: float) -> None:
+        """Record one lag sample (seconds) and refresh the percentile gauges"""
+        self._stats["samples"] += 1
+        self._lag_samples.append(lag)
+        event_loop_lag_seconds.observe(lag)
+        for label, value in self.lag_percentiles().items():
+            event_loop_lag_quantile_seconds.labels(quantile=label).set(value)
+
+    def lag_percentiles(self) -> Dict[str, float]:
+        """p50/p90/p99/max lag in seconds over the recent samples"""
+        if not self._lag_samples:
+            return {}
+        ordered = sorted(self._lag_samples)
+        return {label: _percentile(ordered, fraction) for label, fraction in QUANTILES}
+
+    def _watch(self) -> None:
+        """Watchdog thread: capture the loop thread's stack during a slow callback"""
+        interval = max(0.01, self.slow_callback_seconds / 2)
+        while not self._stop_watchdog.wait(interval):
+            current = self._current
+            if current is None:
+                continue
+            _, start = current
+            if time.perf_counter() - start < self.slow_callback_seconds:
+                continue
+            if self._captured is not None and self._captured[0] == start:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                stack = traceback.format_stack(frame, limit=MAX_STACK_FRAMES)
+                self._captured = (start, [line.rstrip() for line in stack])
+
+    def _report(self, handle: asyncio.Handle, duration: float, start: float) -> None:
+        """Log and count a callback that held the loop for `duration` seconds"""
+        info = _describe(handle)
+        captured = self._captured
+        if captured is not None and captured[0] == start:
+            stack = captured[1]
+        else:
+            # Finished before the watchdog looked: show where the task is now
+            task = getattr(handle._callback, "__self__", None)
+            stack = (
+                _format_frames(task.get_stack(limit=MAX_STACK_FRAMES))
+                if isinstance(task, asyncio.Task) else []
+            )
+
+        self._stats["slow_callbacks"] += 1
+        event_loop_slow_callbacks_total.labels(kind=info["kind"]).inc()
+        self._slow_callbacks.append({
+            **info,
+            "duration_ms": round(duration * 1000, 1),
+            "at": datetime.now().isoformat(),
+            "stack": stack,
+        })
+
+        name = f"task '{info['task']}' ({info['coroutine']})" if info["task"] else info["coroutine"]
+        logger.warning(
+            f"Event loop blocked for {duration * 1000:.0f}ms by {name}"
+            + ("\n" + "\n".join(stack) if stack else "")
+        )
+
+    def recent_slow_callbacks(self) -> List[Dict[str, Any]]:
+        """Most recent slow callbacks, newest first"""
+        return list(reversed(self._slow_callbacks))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Monitor settings, lag percentiles (ms) and slow callback count"""
+        return {
+            "running": self.running,
+            "callbacks_timed": _active_monitor is self and asyncio.Handle._run is _timed_handle_run,
+            "sample_interval_ms": self.sample_interval * 1000,
+            "slow_callback_ms": self.slow_callback_seconds * 1000,
+            "lag_ms": {
+                label: round(value * 1000, 2) for label, value in self.lag_percentiles().items()
+            },
+            **self._stats,
+        }
+
+
+def dump_tasks(max_frames: int = 10) -> List[Dict[str, Any]]:
+    """
+    Describe every unfinished task on the running loop.
+
+    Returns:
+        One dict per task: name, coroutine, whether it is being cancelled,
+        and the stack where it is suspended (innermost frame last)
+    """
+    current = asyncio.current_task()
+    tasks = []
+    for task in asyncio.all_tasks():
+        tasks.append({
+            "name": task.get_name(),
+            "coroutine": _coroutine_name(task),
+            "cancelling": bool(task.cancelling()),
+            "current": task is current,
+            "stack": _format_frames(task.get_stack(limit=max_frames)) if max_frames else [],
+        })
+    return sorted(tasks, key=lambda task: task["name"])
+
+
+# Global monitor (started by main.py, or by the API lifespan when run on its own)
+loop_monitor = LoopMonitor(LOOP_LAG_SAMPLE_INTERVAL_MS, LOOP_SLOW_CALLBACK_MS)
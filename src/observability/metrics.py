@@ -6,6 +6,8 @@ This module defines all metrics collected by the application, organized by categ
 - Telegram bot metrics: Message processing, response times
 - AI/Agent metrics: Token usage, response generation time
 - Database metrics: Query performance, connection pool
+- Cache metrics: Redis operation latency, hit rates per tier, invalidations
+- Event loop metrics: scheduling lag, slow callbacks, task count
 - User activity metrics: Active users, engagement
 - Food tracking metrics: Photo analysis, nutrition lookups
 - External API metrics: Third-party service calls
@@ -14,7 +16,12 @@ Metrics are exposed at the /metrics endpoint for Prometheus scraping.
 """
 
 import logging
-from prometheus_client import Counter, Gauge, Histogram, Info
+from bisect import bisect_left
+from typing import Dict, Sequence
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram, Info
+from prometheus_client.core import HistogramMetricFamily
+from prometheus_client.utils import floatToGoString
 
 logger = logging.getLogger(__name__)
 
@@ -134,6 +141,18 @@ nutrition_lookups_total = Counter(
     ["source", "status"],  # source: usda/cache, status: success/error
 )
 
+nutrition_cross_validation_total = Counter(
+    "nutrition_cross_validation_total",
+    "Adaptive cross-model validation decisions",
+    ["decision", "reason"],  # decision: run/skip
+)
+
+nutrition_cross_validation_outcome_total = Counter(
+    "nutrition_cross_validation_outcome_total",
+    "Cross-model validation outcomes by why it ran",
+    ["reason", "outcome"],  # outcome: agreed/disagreed/error
+)
+
 # =============================================================================
 # AI/Agent Metrics
 # =============================================================================
@@ -191,6 +210,123 @@ db_queries_total = Counter(
     ["query_type", "status"],  # status: success/error
 )
 
+# Statement-level metrics recorded by the instrumented cursor
+# (src/db/instrumentation.py). The statement label is a fingerprint hash,
+# capped at MAX_STATEMENT_LABELS values so cardinality stays bounded.
+db_statement_duration_seconds = Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time in seconds by normalized statement",
+    ["operation", "table", "statement"],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+)
+
+db_statement_rows = Histogram(
+    "db_statement_rows",
+    "Rows returned or affected per SQL statement",
+    ["operation", "table"],
+    buckets=[0, 1, 10, 100, 1000, 10000],
+)
+
+db_slow_queries_total = Counter(
+    "db_slow_queries_total",
+    "SQL statements slower than DB_SLOW_QUERY_MS",
+    ["operation", "table"],
+)
+
+class _PoolWaits:
+    __slots__ = ("counts", "sum", "max")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * (buckets + 1)  # per bucket, not cumulative; last is +Inf
+        self.sum = 0.0
+        self.max = 0.0
+
+
+class PoolWaitHistogram:
+    """
+    Per-pool histogram kept as plain counts and exported at scrape time.
+
+    Observed on every connection checkout, where prometheus_client's
+    Histogram.observe() (a lock plus Value updates, ~1.5µs) was most of
+    the checkout overhead. Also keeps the max for the in-process summary.
+    Observed from the event loop thread only.
+    """
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = list(buckets)
+        self._pools: Dict[str, _PoolWaits] = {}
+
+    def observe(self, pool: str, seconds: float) -> None:
+        waits = self._pools.get(pool)
+        if waits is None:
+            waits = self._pools[pool] = _PoolWaits(len(self.buckets))
+        waits.counts[bisect_left(self.buckets, seconds)] += 1
+        waits.sum += seconds
+        if seconds > waits.max:
+            waits.max = seconds
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per pool: count, total_ms, max_ms, mean_ms"""
+        result = {}
+        for pool, waits in list(self._pools.items()):
+            count = sum(waits.counts)
+            result[pool] = {
+                "count": count,
+                "total_ms": waits.sum * 1000,
+                "max_ms": waits.max * 1000,
+                "mean_ms": waits.sum * 1000 / count if count else 0.0,
+            }
+        return result
+
+    def clear(self) -> None:
+        self._pools.clear()
+
+    def collect(self):
+        family = HistogramMetricFamily(self.name, self.documentation, labels=["pool"])
+        bounds = [floatToGoString(bound) for bound in self.buckets] + ["+Inf"]
+        for pool, waits in list(self._pools.items()):
+            cumulative, buckets = 0, []
+            for bound, count in zip(bounds, waits.counts):
+                cumulative += count
+                buckets.append((bound, cumulative))
+            family.add_metric([pool], buckets, waits.sum)
+        yield family
+
+
+db_pool_wait_seconds = PoolWaitHistogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    # pool label: interactive/background/analytics/replica
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+)
+REGISTRY.register(db_pool_wait_seconds)
+
+db_pool_connections = Gauge(
+    "db_pool_connections",
+    "Named connection pool saturation, sampled by the pool supervisor",
+    ["pool", "state"],  # state: size/available/waiting/max
+)
+
+db_pool_timeouts_total = Counter(
+    "db_pool_timeouts_total",
+    "Connection checkouts that timed out, by pool",
+    ["pool"],
+)
+
+db_pool_resizes_total = Counter(
+    "db_pool_resizes_total",
+    "Adaptive pool max_size changes",
+    ["pool", "direction"],  # direction: grow/shrink
+)
+
+db_read_only_routes_total = Counter(
+    "db_read_only_routes_total",
+    "Where read-only checkouts were served when a replica is configured",
+    ["target", "reason"],  # target: replica/primary; reason: replica/recent_write/replica_down
+)
+
 db_transactions_total = Counter(
     "db_transactions_total",
     "Total database transactions",
@@ -202,6 +338,79 @@ db_pool_exhausted_total = Counter(
     "Total times connection pool was exhausted",
 )
 
+write_behind_queue_depth = Gauge(
+    "write_behind_queue_depth",
+    "Records waiting in the write-behind sink",
+)
+
+write_behind_lag_seconds = Histogram(
+    "write_behind_lag_seconds",
+    "Time from enqueue to commit for write-behind records",
+    buckets=[0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
+)
+
+write_behind_records_total = Counter(
+    "write_behind_records_total",
+    "Write-behind records by outcome",
+    ["outcome"],  # outcome: batched/direct/failed
+)
+
+write_behind_flush_duration_seconds = Histogram(
+    "write_behind_flush_duration_seconds",
+    "Time to write one write-behind batch in seconds",
+    buckets=[0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+)
+
+# =============================================================================
+# Cache Metrics
+# =============================================================================
+
+cache_operation_duration_seconds = Histogram(
+    "cache_operation_duration_seconds",
+    "Redis cache operation latency in seconds",
+    ["operation"],  # get/set/get_many/set_many/pipeline/delete/...
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5],
+)
+
+cache_lookups_total = Counter(
+    "cache_lookups_total",
+    "cache_with_ttl lookups by tier and key family",
+    ["tier", "family", "result"],  # tier: l1/l2, result: hit/miss
+)
+
+cache_invalidation_messages_total = Counter(
+    "cache_invalidation_messages_total",
+    "Cross-process cache invalidation messages",
+    ["direction"],  # published/received
+)
+
+# =============================================================================
+# Event Loop Metrics
+# =============================================================================
+
+event_loop_lag_seconds = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between when the loop monitor's timer was due and when it ran",
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+)
+
+event_loop_lag_quantile_seconds = Gauge(
+    "event_loop_lag_quantile_seconds",
+    "Event loop lag percentiles over the loop monitor's recent samples",
+    ["quantile"],  # p50/p90/p99/max
+)
+
+event_loop_slow_callbacks_total = Counter(
+    "event_loop_slow_callbacks_total",
+    "Callbacks and task steps that held the event loop longer than LOOP_SLOW_CALLBACK_MS",
+    ["kind"],  # task/callback
+)
+
+event_loop_tasks = Gauge(
+    "event_loop_tasks",
+    "Tasks not yet finished on the event loop",
+)
+
 # =============================================================================
 # External API Metrics
 # =============================================================================
@@ -16,6 +16,9 @@ import logging
 import asyncio
 from datetime import datetime, timedelta
 
+from psycopg.rows import tuple_row
+
+from src.db.connection import POOL_BACKGROUND, uses_pool
 from src.observability.metrics import (
     active_users,
     db_connections_active,
@@ -84,6 +87,7 @@ class MetricsCollector:
             # Wait for next collection interval
             await asyncio.sleep(self.collection_interval)
 
+    @uses_pool(POOL_BACKGROUND)
     async def _collect_metrics(self):
         """Collect all gauge metrics."""
         try:
@@ -108,8 +112,9 @@ class MetricsCollector:
             one_day_ago = now - timedelta(days=1)
             one_week_ago = now - timedelta(days=7)
 
-            async with db.connection() as conn:
-                async with conn.cursor() as cur:
+            # Full scans of conversation_history: read from the replica if there is one
+            async with db.connection(read_only=True) as conn:
+                async with conn.cursor(row_factory=tuple_row) as cur:
                     # Users active in last hour
                     await cur.execute(
                         """
@@ -156,30 +161,22 @@ class MetricsCollector:
             logger.error(f"Error collecting active user metrics: {e}")
 
     async def _collect_database_metrics(self):
-        """Collect database connection pool metrics."""
+        """Collect database connection pool metrics (interactive pool)."""
         try:
             from src.db.connection import db
 
-            if not db.pool:
+            pool_stats = db.get_pool_stats()
+            if "error" in pool_stats:
                 return
 
-            # Get pool statistics
-            pool_stats = db.pool.get_stats()
-
-            # Total connections
-            total = pool_stats.get("pool_size", 0)
-            db_pool_size.labels(state="total").set(total)
+            db_pool_size.labels(state="total").set(pool_stats["size"])
+            db_pool_size.labels(state="available").set(pool_stats["available"])
+            db_pool_size.labels(state="in_use").set(pool_stats["active"])
 
-            # Available connections
-            available = pool_stats.get("pool_available", 0)
-            db_pool_size.labels(state="available").set(available)
-
-            # In-use connections
-            in_use = total - available
-            db_pool_size.labels(state="in_use").set(in_use)
-
-            # Active connections (same as in_use for now)
-            db_connections_active.set(in_use)
+            # Active connections across all pools
+            db_connections_active.set(
+                sum(stats["active"] for stats in pool_stats["pools"].values())
+            )
 
         except Exception as e:
             logger.error(f"Error collecting database metrics: {e}")
@@ -190,7 +187,7 @@ class MetricsCollector:
             from src.db.connection import db
 
             async with db.connection() as conn:
-                async with conn.cursor() as cur:
+                async with conn.cursor(row_factory=tuple_row) as cur:
                     # Count memory entries (if table exists)
                     await cur.execute(
                         """
@@ -218,7 +215,7 @@ class MetricsCollector:
             from src.db.connection import db
 
             async with db.connection() as conn:
-                async with conn.cursor() as cur:
+                async with conn.cursor(row_factory=tuple_row) as cur:
                     # Check if gamification tables exist
                     await cur.execute(
                         """
@@ -0,0 +1,125 @@
+"""
+health_events Partition Maintenance Job
+
+health_events is range-partitioned by month on timestamp (migration 030).
+This job runs daily to:
+
+- Create the monthly partitions for the next few months ahead of time, so
+  new events never fall into the default partition (rows already there for
+  a new month are moved into it)
+- Detach partitions older than HEALTH_EVENTS_RETENTION_MONTHS and move them
+  to the health_events_archive schema (still queryable, can be dumped and
+  dropped). Off by default (0), and never done by the startup run, which
+  only creates partitions.
+- Warn if rows have landed in the default partition
+
+The retention window must stay well above the 90 days read by pattern mining.
+"""
+
+import logging
+from datetime import time, timezone
+from typing import Any, Dict
+
+from telegram.ext import Application, ContextTypes
+
+from src.config import HEALTH_EVENTS_RETENTION_MONTHS
+from src.db.connection import POOL_BACKGROUND, db, uses_pool
+
+logger = logging.getLogger(__name__)
+
+# Partition maintenance configuration
+PARTITION_MONTHS_AHEAD = 3  # Pre-create partitions this many months ahead
+MAINTENANCE_TIME = time(hour=2, minute=30, tzinfo=timezone.utc)
+
+
+async def run_partition_maintenance(
+    months_ahead: int = PARTITION_MONTHS_AHEAD,
+    retain_months: int = 0
+) -> Dict[str, Any]:
+    """
+    Create upcoming partitions and archive expired ones.
+
+    Args:
+        months_ahead: Make sure partitions exist this many months ahead
+        retain_months: Archive partitions older than this many months
+            (0 = archive nothing)
+
+    Returns:
+        Dict with created (int), archived (list of partition names) and
+        default_rows (rows sitting in health_events_default)
+    """
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "SELECT ensure_health_events_partitions(%s) AS created",
+                (months_ahead,)
+            )
+            created = (await cur.fetchone())["created"]
+
+            archived = []
+            if retain_months > 0:
+                await cur.execute(
+                    "SELECT archive_health_events_partitions(%s) AS name",
+                    (retain_months,)
+                )
+                archived = [row["name"] for row in await cur.fetchall()]
+
+            await cur.execute("SELECT COUNT(*) AS count FROM health_events_default")
+            default_rows = (await cur.fetchone())["count"]
+
+            await conn.commit()
+
+    if archived:
+        logger.info(f"Archived health_events partitions: {', '.join(archived)}")
+    if default_rows:
+        logger.warning(
+            f"{default_rows} health_events rows are in the default partition "
+            f"(timestamps outside the pre-created months)"
+        )
+    logger.info(
+        f"health_events partition maintenance: {created} created, "
+        f"{len(archived)} archived"
+    )
+    return {"created": created, "archived": archived, "default_rows": default_rows}
+
+
+class PartitionMaintenanceScheduler:
+    """
+    Schedules the daily health_events partition maintenance job.
+    """
+
+    def __init__(self, application: Application):
+        self.application = application
+        self.job_queue = application.job_queue
+
+    async def schedule_partition_maintenance(self) -> None:
+        """
+        Schedule the daily maintenance job and create partitions now.
+
+        This is called once during application startup. The startup run
+        never archives; that is left to the daily job.
+        """
+        self.job_queue.run_daily(
+            callback=self._run_partition_maintenance,
+            time=MAINTENANCE_TIME,
+            data={"retain_months": HEALTH_EVENTS_RETENTION_MONTHS},
+            name="health_events_partition_maintenance"
+        )
+        self.job_queue.run_once(
+            callback=self._run_partition_maintenance,
+            when=0,
+            data={"retain_months": 0},
+            name="health_events_partition_maintenance_startup"
+        )
+        logger.info(f"Scheduled health_events partition maintenance daily at {MAINTENANCE_TIME}")
+
+    @uses_pool(POOL_BACKGROUND)
+    async def _run_partition_maintenance(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """
+        Args:
+            context: Telegram job context with retain_months in context.job.data
+        """
+        try:
+            await run_partition_maintenance(retain_months=context.job.data["retain_months"])
+        except Exception as e:
+            logger.error(f"health_events partition maintenance failed: {e}", exc_info=True)
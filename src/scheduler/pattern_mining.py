@@ -33,8 +33,8 @@ from src.services.pattern_detection import (
     evaluate_pattern_against_new_events,
     update_pattern_confidence
 )
-from src.services.health_events import get_health_events
-from src.db.connection import db
+from src.services.health_events import get_health_events, get_event_count_by_type
+from src.db.connection import POOL_ANALYTICS, db, uses_pool
 
 logger = logging.getLogger(__name__)
 
@@ -114,12 +114,13 @@ class PatternMiningScheduler:
                 rows = await cur.fetchall()
                 return [dict(row) for row in rows]
 
+    @uses_pool(POOL_ANALYTICS)
     async def _run_nightly_pattern_mining(self, context: ContextTypes.DEFAULT_TYPE) -> None:
         """
         Nightly pattern mining job callback.
 
         Workflow:
-        1. Fetch health_events from last 90 days
+        1. Count health_events from last 90 days (detectors stream the rows)
         2. Run all 5 pattern detection algorithms
         3. Save new patterns to discovered_patterns table
         4. Update confidence of existing patterns
@@ -139,14 +140,14 @@ class PatternMiningScheduler:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=ANALYSIS_PERIOD_DAYS)
 
-            # Fetch health events
-            events = await get_health_events(user_id, start_date, end_date)
+            # Count health events (the detectors stream the rows themselves)
+            event_count = sum((await get_event_count_by_type(user_id, start_date, end_date)).values())
 
-            if len(events) < 50:
-                logger.info(f"User {user_id} has only {len(events)} events, skipping pattern mining")
+            if event_count < 50:
+                logger.info(f"User {user_id} has only {event_count} events, skipping pattern mining")
                 return
 
-            logger.info(f"Mining patterns from {len(events)} events for user {user_id}")
+            logger.info(f"Mining patterns from {event_count} events for user {user_id}")
 
             # ================================================================
             # Phase 1: Discover New Patterns
@@ -312,8 +313,8 @@ async def run_pattern_mining_now(user_id: str) -> Dict[str, Any]:
     end_date = datetime.now()
     start_date = end_date - timedelta(days=ANALYSIS_PERIOD_DAYS)
 
-    # Fetch events
-    events = await get_health_events(user_id, start_date, end_date)
+    # Count events (the detectors stream the rows themselves)
+    event_count = sum((await get_event_count_by_type(user_id, start_date, end_date)).values())
 
     # Run discovery
     new_patterns = []
@@ -364,7 +365,7 @@ async def run_pattern_mining_now(user_id: str) -> Dict[str, Any]:
 
     return {
         "user_id": user_id,
-        "events_analyzed": len(events),
+        "events_analyzed": event_count,
         "new_patterns": saved_count,
         "duration_seconds": round(duration, 2),
         "analysis_period_days": ANALYSIS_PERIOD_DAYS
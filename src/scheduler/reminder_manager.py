@@ -4,6 +4,7 @@ from datetime import time, datetime
 from zoneinfo import ZoneInfo
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, ContextTypes
+from src.db.connection import POOL_BACKGROUND, uses_pool
 from src.db.queries import get_active_reminders, get_tracking_categories
 from src.utils.datetime_helpers import now_utc
 
@@ -39,6 +40,10 @@ class ReminderManager:
             # Get reminders for all users
             all_reminders = await get_active_reminders_all()
 
+            # Warm the timezone cache for every reminder owner in one query
+            from src.utils.timezone_resolver import timezone_resolver
+            await timezone_resolver.resolve_many(r["user_id"] for r in all_reminders if r["user_id"])
+
             scheduled_count = 0
             for reminder in all_reminders:
                 user_id = reminder["user_id"]
@@ -313,6 +318,7 @@ class ReminderManager:
         except Exception as e:
             logger.error(f"Failed to schedule sleep quiz: {e}", exc_info=True)
 
+    @uses_pool(POOL_BACKGROUND)
     async def _send_sleep_quiz(self, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Send automated sleep quiz to user"""
         data = context.job.data
@@ -384,6 +390,7 @@ class ReminderManager:
         except Exception as e:
             logger.error(f"Failed to load sleep quiz schedules: {e}", exc_info=True)
 
+    @uses_pool(POOL_BACKGROUND)
     async def _send_tracking_reminder(self, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Send a tracking reminder to user"""
         data = context.job.data
@@ -404,6 +411,7 @@ class ReminderManager:
         except Exception as e:
             logger.error(f"Failed to send tracking reminder: {e}", exc_info=True)
 
+    @uses_pool(POOL_BACKGROUND)
     async def _send_custom_reminder(self, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Send a custom reminder to user with completion tracking buttons"""
         data = context.job.data
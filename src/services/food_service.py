@@ -118,7 +118,8 @@ class FoodService:
                 caption=caption,
                 visual_patterns=visual_patterns,
                 usda_verified_items=verified_foods,
-                enable_cross_validation=True
+                enable_cross_validation=True,
+                user_id=user_id
             )
 
             # 8. Calculate totals from validated data
@@ -8,15 +8,16 @@ from __future__ import annotations
 
 import logging
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass
 from collections import defaultdict
 import json
-import re
 
 from src.db.connection import db
 from src.exceptions import ServiceError
+from src.services.formula_name_index import formula_name_index
 from src.services.visual_food_search import get_visual_search_service
+from src.utils.meal_grouping import meal_group_key, normalize_quantity
 
 logger = logging.getLogger(__name__)
 
@@ -84,38 +85,59 @@ class FormulaDetectionService:
             min_occurrences = self.MIN_OCCURRENCES_FOR_FORMULA
 
         try:
-            # Fetch food entries from recent history
-            cutoff_date = datetime.now() - timedelta(days=days_back)
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_back)
 
+            # Meal groups seen in the window, from the incremental index
+            # (meal_group_stats, maintained on food entry save/update)
             async with db.connection() as conn:
                 async with conn.cursor() as cur:
                     await cur.execute(
                         """
-                        SELECT id, foods, total_calories, total_macros,
-                               photo_path, timestamp, notes
-                        FROM food_entries
+                        SELECT group_key, occurrence_count, calorie_count,
+                               calorie_mean, calorie_m2, last_seen_at
+                        FROM meal_group_stats
                         WHERE user_id = %s
-                        AND timestamp >= %s
-                        ORDER BY timestamp DESC
+                        AND last_seen_at >= %s
+                        AND occurrence_count >= %s
                         """,
-                        (user_id, cutoff_date)
+                        (user_id, cutoff_date, min_occurrences)
                     )
-                    entries = await cur.fetchall()
+                    groups = await cur.fetchall()
 
-            if len(entries) < min_occurrences:
-                logger.info(f"Not enough entries ({len(entries)}) to detect patterns")
-                return []
+                    if not groups:
+                        logger.info(f"No meal groups with {min_occurrences}+ occurrences")
+                        return []
 
-            # Group similar meals together
-            meal_groups = self._group_similar_meals(entries)
+                    # Most recent entry of each group (the template) and the
+                    # group's entry ids, newest first
+                    await cur.execute(
+                        """
+                        SELECT DISTINCT ON (meal_group_key)
+                               id, foods, total_calories, total_macros,
+                               photo_path, timestamp, notes, meal_group_key,
+                               array_agg(id) OVER group_entries AS entry_ids
+                        FROM food_entries
+                        WHERE user_id = %s
+                        AND meal_group_key = ANY(%s)
+                        WINDOW group_entries AS (
+                            PARTITION BY meal_group_key ORDER BY timestamp DESC
+                            ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+                        )
+                        ORDER BY meal_group_key, timestamp DESC
+                        """,
+                        (user_id, [g["group_key"] for g in groups])
+                    )
+                    templates = {row["meal_group_key"]: row for row in await cur.fetchall()}
 
             # Convert groups to formula candidates
             candidates = []
-            for group_key, group_entries in meal_groups.items():
-                if len(group_entries) >= min_occurrences:
-                    candidate = self._create_candidate_from_group(group_entries)
-                    if candidate.confidence_score >= self.MIN_CONFIDENCE_SCORE:
-                        candidates.append(candidate)
+            for stats in groups:
+                template = templates.get(stats["group_key"])
+                if template is None:
+                    continue
+                candidate = self._create_candidate_from_stats(stats, template)
+                if candidate.confidence_score >= self.MIN_CONFIDENCE_SCORE:
+                    candidates.append(candidate)
 
             # Sort by confidence and occurrence count
             candidates.sort(
@@ -124,7 +146,7 @@ class FormulaDetectionService:
             )
 
             logger.info(
-                f"Detected {len(candidates)} formula candidates from {len(entries)} entries "
+                f"Detected {len(candidates)} formula candidates from {len(groups)} meal groups "
                 f"(min_occurrences={min_occurrences})"
             )
 
@@ -147,18 +169,7 @@ class FormulaDetectionService:
         groups: Dict[str, List[Dict]] = defaultdict(list)
 
         for entry in entries:
-            # Create a normalized key from food items
-            foods = entry["foods"]
-            if isinstance(foods, str):
-                foods = json.loads(foods)
-
-            # Sort foods by name for consistent comparison
-            sorted_foods = sorted(foods, key=lambda f: f.get("name", ""))
-
-            # Create group key from food names and approximate quantities
-            group_key = self._create_group_key(sorted_foods)
-
-            groups[group_key].append(entry)
+            groups[meal_group_key(entry["foods"])].append(entry)
 
         return groups
 
@@ -168,38 +179,11 @@ class FormulaDetectionService:
 
         Uses food names and rounded quantities to allow minor variations
         """
-        key_parts = []
-        for food in foods:
-            name = food.get("name", "").lower().strip()
-            quantity = food.get("quantity", "")
-
-            # Normalize quantity (round to nearest 10g/ml for grouping)
-            # This allows minor variations like "250g" and "255g" to match
-            normalized_qty = self._normalize_quantity(quantity)
-
-            key_parts.append(f"{name}:{normalized_qty}")
-
-        return "|".join(key_parts)
+        return meal_group_key(foods)
 
     def _normalize_quantity(self, quantity: str) -> str:
         """Normalize quantity for grouping (allow ~10% variation)"""
-        if not quantity:
-            return ""
-
-        # Extract number from quantity string
-        match = re.search(r'(\d+(?:\.\d+)?)', str(quantity))
-        if not match:
-            return str(quantity).lower()
-
-        value = float(match.group(1))
-
-        # Round to nearest 10 for grouping (allows small variations)
-        rounded = round(value / 10) * 10
-
-        # Preserve unit
-        unit = str(quantity).replace(match.group(1), "").strip()
-
-        return f"{int(rounded)}{unit}"
+        return normalize_quantity(quantity)
 
     def _create_candidate_from_group(
         self,
@@ -210,9 +194,42 @@ class FormulaDetectionService:
 
         Uses the most recent entry as the template
         """
-        # Use most recent entry as template
-        template = group_entries[0]
+        return self._build_candidate(
+            group_entries[0],
+            entry_ids=[str(e["id"]) for e in group_entries],
+            occurrence_count=len(group_entries),
+            consistency_score=self._calculate_consistency(group_entries),
+            recency_score=self._calculate_recency(group_entries)
+        )
+
+    def _create_candidate_from_stats(
+        self,
+        stats: Dict[str, Any],
+        template: Dict
+    ) -> FormulaCandidate:
+        """
+        Create a formula candidate from a meal_group_stats row
+
+        template is the group's most recent entry, with the ids of all of
+        the group's entries (newest first) in entry_ids
+        """
+        return self._build_candidate(
+            template,
+            entry_ids=[str(entry_id) for entry_id in template["entry_ids"]],
+            occurrence_count=stats["occurrence_count"],
+            consistency_score=self._consistency_from_stats(stats),
+            recency_score=self._recency_score(stats["last_seen_at"])
+        )
 
+    def _build_candidate(
+        self,
+        template: Dict,
+        entry_ids: List[str],
+        occurrence_count: int,
+        consistency_score: float,
+        recency_score: float
+    ) -> FormulaCandidate:
+        """Build a candidate from the group's most recent entry (the template)"""
         foods = template["foods"]
         if isinstance(foods, str):
             foods = json.loads(foods)
@@ -226,10 +243,6 @@ class FormulaDetectionService:
         # 2. Consistency of calories/macros across occurrences
         # 3. Recency (recent patterns = higher confidence)
 
-        occurrence_count = len(group_entries)
-        consistency_score = self._calculate_consistency(group_entries)
-        recency_score = self._calculate_recency(group_entries)
-
         # Weighted confidence score
         confidence_score = (
             0.5 * min(occurrence_count / 10.0, 1.0) +  # Occurrences (capped at 10)
@@ -246,7 +259,7 @@ class FormulaDetectionService:
             total_calories=template["total_calories"],
             total_macros=total_macros,
             occurrence_count=occurrence_count,
-            entry_ids=[str(e["id"]) for e in group_entries],
+            entry_ids=entry_ids,
             confidence_score=confidence_score,
             suggested_name=suggested_name,
             suggested_keywords=suggested_keywords
@@ -262,13 +275,27 @@ class FormulaDetectionService:
             return 0.5
 
         avg_calories = sum(calories) / len(calories)
+        variance = sum((c - avg_calories) ** 2 for c in calories) / len(calories)
+
+        return self._consistency_score(avg_calories, variance)
+
+    def _consistency_from_stats(self, stats: Dict[str, Any]) -> float:
+        """Consistency score from Welford accumulators (count, mean, M2)"""
+        if stats["occurrence_count"] < 2:
+            return 1.0
+
+        if not stats["calorie_count"]:
+            return 0.5
+
+        variance = stats["calorie_m2"] / stats["calorie_count"]
+        return self._consistency_score(stats["calorie_mean"], variance)
 
+    def _consistency_score(self, avg_calories: float, variance: float) -> float:
         # Calculate coefficient of variation
         if avg_calories == 0:
             return 0.5
 
-        variance = sum((c - avg_calories) ** 2 for c in calories) / len(calories)
-        std_dev = variance ** 0.5
+        std_dev = max(variance, 0.0) ** 0.5
         cv = std_dev / avg_calories
 
         # Convert to 0-1 score (lower variation = higher score)
@@ -284,10 +311,11 @@ class FormulaDetectionService:
 
         # Get most recent entry timestamp
         timestamps = [e["timestamp"] for e in entries]
-        most_recent = max(timestamps)
+        return self._recency_score(max(timestamps))
 
-        # Days since last occurrence
-        days_ago = (datetime.now() - most_recent).days
+    def _recency_score(self, most_recent: datetime) -> float:
+        # Days since last occurrence (timestamps from TIMESTAMPTZ columns are aware)
+        days_ago = (datetime.now(most_recent.tzinfo) - most_recent).days
 
         # Score: 1.0 if used today, decays over 90 days
         recency_score = max(0.0, min(1.0, 1.0 - (days_ago / 90.0)))
@@ -418,9 +446,15 @@ class FormulaDetectionService:
         Find best matching formula from natural language text
 
         Uses fuzzy matching to handle variations like:
-        - "protein shake" -> "Morning Protein Shake"
-        - "usual breakfast" -> "Usual Breakfast"
-        - "the shake" -> "Protein Shake"
+        - "protein shake" -> "Morning Protein Shake" (similarity 0.64)
+        - "protein shakes" -> "Protein Shake" (similarity 0.81)
+        - "the shake" -> "Protein Shake" only through a "shake" keyword; on
+          the name alone it scores 0.33, below the default threshold
+
+        A keyword contained in the text scores 1.0; otherwise the score is
+        the best trigram similarity against the name and keywords. Matching
+        runs against the in-process formula name index; users whose formulas
+        don't fit in it are matched in SQL (match_formulas_fuzzy).
 
         Args:
             user_id: Telegram user ID
@@ -433,97 +467,94 @@ class FormulaDetectionService:
         Raises:
             FormulaDetectionError: If matching fails
         """
-        from difflib import SequenceMatcher
-
         try:
-            # Get all user's formulas
-            async with db.connection() as conn:
-                async with conn.cursor() as cur:
-                    await cur.execute(
-                        """
-                        SELECT id, name, keywords, foods, total_calories,
-                               total_macros, times_used
-                        FROM food_formulas
-                        WHERE user_id = %s
-                        ORDER BY times_used DESC, last_used_at DESC
-                        """,
-                        (user_id,)
-                    )
-                    formulas = await cur.fetchall()
+            entries = formula_name_index.get(user_id)
+            if entries is None:
+                entries = formula_name_index.put(
+                    user_id, await self._load_formulas_for_index(user_id)
+                )
 
-            if not formulas:
-                return None
+            if entries is not None:
+                match = formula_name_index.match(entries, text, threshold)
+            else:
+                match = await self._match_formula_sql(user_id, text, threshold)
 
-            # Normalize input text
-            text_lower = text.lower().strip()
-
-            # Calculate match scores
-            best_match = None
-            best_score = 0.0
-
-            for formula in formulas:
-                score = 0.0
-
-                # Check exact keyword match (highest priority)
-                keywords = formula["keywords"] or []
-                for keyword in keywords:
-                    if keyword.lower() in text_lower:
-                        score = max(score, 1.0)
-                        break
-
-                # Check fuzzy match against name
-                name_similarity = SequenceMatcher(
-                    None,
-                    text_lower,
-                    formula["name"].lower()
-                ).ratio()
-                score = max(score, name_similarity)
-
-                # Check fuzzy match against keywords
-                for keyword in keywords:
-                    keyword_similarity = SequenceMatcher(
-                        None,
-                        text_lower,
-                        keyword.lower()
-                    ).ratio()
-                    score = max(score, keyword_similarity)
-
-                # Update best match
-                if score > best_score:
-                    best_score = score
-                    best_match = formula
-
-            # Return if above threshold
-            if best_score >= threshold:
-                logger.info(
-                    f"Fuzzy matched '{text}' to '{best_match['name']}' "
-                    f"(score: {best_score:.2f})"
-                )
+            if match is None:
+                return None
 
-                # Handle JSONB columns
-                foods = best_match["foods"]
-                if isinstance(foods, str):
-                    foods = json.loads(foods)
+            best_match, best_score = match
+            logger.info(
+                f"Fuzzy matched '{text}' to '{best_match['name']}' "
+                f"(score: {best_score:.2f})"
+            )
 
-                total_macros = best_match["total_macros"]
-                if isinstance(total_macros, str):
-                    total_macros = json.loads(total_macros)
+            # Handle JSONB columns
+            foods = best_match["foods"]
+            if isinstance(foods, str):
+                foods = json.loads(foods)
 
-                return {
-                    "id": str(best_match["id"]),
-                    "name": best_match["name"],
-                    "foods": foods,
-                    "total_calories": best_match["total_calories"],
-                    "total_macros": total_macros,
-                    "match_score": best_score
-                }
+            total_macros = best_match["total_macros"]
+            if isinstance(total_macros, str):
+                total_macros = json.loads(total_macros)
 
-            return None
+            return {
+                "id": str(best_match["id"]),
+                "name": best_match["name"],
+                "foods": foods,
+                "total_calories": best_match["total_calories"],
+                "total_macros": total_macros,
+                "match_score": best_score
+            }
 
         except Exception as e:
             logger.error(f"Fuzzy matching failed: {e}", exc_info=True)
             raise FormulaDetectionError(f"Fuzzy matching failed: {e}")
 
+    async def _load_formulas_for_index(self, user_id: str) -> List[Dict[str, Any]]:
+        """
+        Load a user's formulas for the name index, most used first.
+
+        Fetches one row past the index limit so oversized users can be
+        detected without loading all of their formulas.
+        """
+        async with db.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    SELECT id, name, keywords, foods, total_calories,
+                           total_macros, times_used
+                    FROM food_formulas
+                    WHERE user_id = %s
+                    ORDER BY times_used DESC, last_used_at DESC
+                    LIMIT %s
+                    """,
+                    (user_id, formula_name_index.max_formulas + 1)
+                )
+                return await cur.fetchall()
+
+    async def _match_formula_sql(
+        self,
+        user_id: str,
+        text: str,
+        threshold: float
+    ) -> Optional[tuple[Dict[str, Any], float]]:
+        """Best (row, score) from match_formulas_fuzzy(), or None"""
+        async with db.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    SELECT formula_id AS id, name, foods, total_calories,
+                           total_macros, match_score
+                    FROM match_formulas_fuzzy(%s, %s, %s, 1)
+                    """,
+                    (user_id, text.strip(), threshold)
+                )
+                row = await cur.fetchone()
+
+        if not row:
+            return None
+        return row, row["match_score"]
+
     async def find_formulas_by_image(
         self,
         user_id: str,
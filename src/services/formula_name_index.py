@@ -0,0 +1,168 @@
+"""
+In-process formula name index
+
+Keeps each active user's formulas (name, keywords, precomputed trigram sets)
+in memory so fuzzy_match_formula() can score free text against them without
+a database round trip. Scoring mirrors the SQL fallback
+(match_formulas_fuzzy, migration 031):
+
+- 1.0 if any keyword appears in the text
+- otherwise the best pg_trgm-style trigram similarity of the text against
+  the name and each keyword
+
+Entries are dropped on create/update/delete through the /api/formulas
+routes and the agent tools, and expire after a TTL so changes made by
+another process (bot vs API server) are picked up.
+"""
+
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Index configuration
+INDEX_MAX_USERS = 1000  # LRU bound on cached users
+INDEX_MAX_FORMULAS = 2000  # Users with more formulas are matched in SQL instead
+INDEX_TTL_SECONDS = 300
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """
+    Trigram set of text, computed the way pg_trgm does: lowercased, split
+    into alphanumeric words, each padded with two leading and one trailing
+    space.
+    """
+    grams = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return frozenset(grams)
+
+
+def trigram_similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """pg_trgm similarity(): shared trigrams over the union of both sets"""
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+class IndexedFormula:
+    """One formula with its normalized keywords and trigram sets"""
+
+    __slots__ = ("row", "keywords", "name_trigrams", "keyword_trigrams")
+
+    def __init__(self, row: Dict[str, Any]):
+        self.row = row
+        self.keywords = tuple(k.lower() for k in (row.get("keywords") or []) if k)
+        self.name_trigrams = trigrams(row["name"])
+        self.keyword_trigrams = tuple(trigrams(k) for k in self.keywords)
+
+    def score(self, text_lower: str, text_trigrams: FrozenSet[str]) -> float:
+        """Match score of already-lowercased text against this formula"""
+        for keyword in self.keywords:
+            if keyword in text_lower:
+                return 1.0
+
+        score = trigram_similarity(text_trigrams, self.name_trigrams)
+        for keyword_trigrams in self.keyword_trigrams:
+            score = max(score, trigram_similarity(text_trigrams, keyword_trigrams))
+        return score
+
+
+class FormulaNameIndex:
+    """
+    LRU cache of per-user formula lists, ordered like the user's formulas
+    (times_used DESC, last_used_at DESC) so ties go to the most used formula.
+    """
+
+    def __init__(
+        self,
+        max_users: int = INDEX_MAX_USERS,
+        max_formulas: int = INDEX_MAX_FORMULAS,
+        ttl_seconds: float = INDEX_TTL_SECONDS
+    ):
+        self.max_users = max_users
+        self.max_formulas = max_formulas
+        self.ttl_seconds = ttl_seconds
+        self._users: "OrderedDict[str, Tuple[float, List[IndexedFormula]]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, user_id: str) -> Optional[List[IndexedFormula]]:
+        """Cached formulas for a user, or None if not loaded / expired"""
+        cached = self._users.get(user_id)
+        if cached is None or time.monotonic() - cached[0] > self.ttl_seconds:
+            self._users.pop(user_id, None)
+            self._misses += 1
+            return None
+
+        self._users.move_to_end(user_id)
+        self._hits += 1
+        return cached[1]
+
+    def put(self, user_id: str, rows: List[Dict[str, Any]]) -> Optional[List[IndexedFormula]]:
+        """
+        Index a user's formula rows.
+
+        Returns the indexed list, or None if the user has more than
+        max_formulas (those users are matched in SQL).
+        """
+        if len(rows) > self.max_formulas:
+            self._users.pop(user_id, None)
+            return None
+
+        entries = [IndexedFormula(row) for row in rows]
+        self._users[user_id] = (time.monotonic(), entries)
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+        return entries
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's formulas (call after any create/update/delete)"""
+        self._users.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._users.clear()
+
+    @staticmethod
+    def match(
+        entries: List[IndexedFormula],
+        text: str,
+        threshold: float
+    ) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Best (row, score) at or above threshold, or None"""
+        text_lower = text.lower().strip()
+        text_trigrams = trigrams(text_lower)
+
+        best: Optional[IndexedFormula] = None
+        best_score = 0.0
+        for entry in entries:
+            score = entry.score(text_lower, text_trigrams)
+            if score > best_score:
+                best, best_score = entry, score
+                if score >= 1.0:
+                    break
+
+        if best is None or best_score < threshold:
+            return None
+        return best.row, best_score
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "users": len(self._users),
+            "formulas": sum(len(entries) for _, entries in self._users.values()),
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+
+# Global instance
+formula_name_index = FormulaNameIndex()
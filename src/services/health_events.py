@@ -10,14 +10,21 @@ Key Features:
 - Unified event creation with JSONB metadata
 - Event type validation
 - Deduplication logic for idempotent migrations
-- Temporal queries optimized for <50ms performance
+- Temporal queries optimized for <50ms performance (monthly partitions on
+  timestamp since migration 030, so a date range only scans its months)
 - Background async processing support
+- Bulk ingestion via binary COPY, idempotent on (source_table, source_id)
+- Live events batched within a short flush window (health_event_batcher)
+- Streaming reads via a server-side cursor (iter_health_events)
 """
+import asyncio
 import logging
-from typing import Any, Dict, Optional, Literal, List
-from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Literal, List, Sequence, Tuple
+from datetime import datetime, timezone
 from uuid import UUID, uuid4
-from src.db.connection import db
+from psycopg.rows import class_row, dict_row, tuple_row
+from src.db.connection import db, uses_pool, uses_replica, POOL_BACKGROUND, STREAM_FETCH_SIZE
+from src.db.prepared import PreparedQuery, prepared_statements
 import json
 
 logger = logging.getLogger(__name__)
@@ -47,6 +54,29 @@ VALID_EVENT_TYPES = {
 }
 
 
+def _validate_event(event_type: str, metadata: Dict[str, Any]) -> None:
+    """Raise ValueError for an unknown event type or empty metadata"""
+    if event_type not in VALID_EVENT_TYPES:
+        raise ValueError(
+            f"Invalid event_type '{event_type}'. "
+            f"Must be one of: {', '.join(sorted(VALID_EVENT_TYPES))}"
+        )
+    if not metadata:
+        raise ValueError("metadata cannot be empty")
+
+
+def _utc_naive(timestamp: datetime) -> datetime:
+    """
+    health_events.timestamp is TIMESTAMP holding UTC. Binary COPY sends
+    values as-is (no server-side timestamptz cast) and a plain INSERT casts
+    aware values in the session time zone, so aware datetimes are converted
+    to naive UTC first; naive ones are taken as UTC already.
+    """
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 async def create_health_event(
     user_id: str,
     event_type: EventType,
@@ -54,7 +84,7 @@ async def create_health_event(
     metadata: Dict[str, Any],
     source_table: Optional[str] = None,
     source_id: Optional[UUID] = None
-) -> UUID:
+) -> Optional[UUID]:
     """
     Create a health event in the unified timeline.
 
@@ -65,13 +95,14 @@ async def create_health_event(
     Args:
         user_id: Telegram user ID (references users.telegram_id)
         event_type: Type of event (meal, sleep, exercise, symptom, mood, stress, tracker, custom)
-        timestamp: When the event occurred (should be UTC)
+        timestamp: When the event occurred (naive UTC or aware)
         metadata: Event-specific data (flexible JSONB schema per event type)
         source_table: Original table name for backfill tracking (e.g., 'food_entries')
         source_id: Original record UUID for backfill verification (enables idempotent migrations)
 
     Returns:
-        UUID of the created health_event
+        UUID of the created health_event, or None if an event already exists
+        for (source_table, source_id) and nothing was inserted.
 
     Raises:
         ValueError: If event_type is invalid or metadata is empty
@@ -89,16 +120,7 @@ async def create_health_event(
         ...     }
         ... )
     """
-    # Validation: Event type
-    if event_type not in VALID_EVENT_TYPES:
-        raise ValueError(
-            f"Invalid event_type '{event_type}'. "
-            f"Must be one of: {', '.join(sorted(VALID_EVENT_TYPES))}"
-        )
-
-    # Validation: Metadata cannot be empty
-    if not metadata:
-        raise ValueError("metadata cannot be empty")
+    _validate_event(event_type, metadata)
 
     event_id = uuid4()
 
@@ -110,24 +132,33 @@ async def create_health_event(
                     INSERT INTO health_events
                     (id, user_id, event_type, timestamp, metadata, source_table, source_id)
                     VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    RETURNING id
                     """,
                     (
                         event_id,
                         user_id,
                         event_type,
-                        timestamp,
+                        _utc_naive(timestamp),
                         json.dumps(metadata),
                         source_table,
                         source_id
                     )
                 )
+                # The health_event_sources trigger skips already ingested sources
+                row = await cur.fetchone()
                 await conn.commit()
 
+        if row is None:
+            logger.debug(
+                f"Skipped health_event for {source_table} {source_id}: already ingested"
+            )
+            return None
+
         logger.info(
             f"Created health_event: {event_type} for user {user_id} "
             f"at {timestamp.isoformat()} (id: {event_id})"
         )
-        return event_id
+        return row["id"]
 
     except Exception as e:
         logger.error(
@@ -137,6 +168,279 @@ async def create_health_event(
         raise
 
 
+async def create_health_events_bulk(events: Sequence[Dict[str, Any]]) -> int:
+    """
+    Insert many health events with one binary COPY and one INSERT.
+
+    Rows are copied into a temporary staging table, then moved into
+    health_events. Events whose (source_table, source_id) was already
+    ingested are skipped by the health_event_sources trigger (migration
+    034), so re-ingesting the same source records is a no-op. Events
+    without a source_id are always inserted.
+
+    Args:
+        events: Dicts with keys user_id, event_type, timestamp (naive UTC or
+            aware), metadata and optional source_table, source_id
+
+    Returns:
+        Number of events inserted (duplicates are not counted)
+
+    Raises:
+        ValueError: If any event has an invalid event_type or empty metadata
+        psycopg.DatabaseError: If the copy or insert fails (nothing is inserted)
+
+    Example:
+        >>> inserted = await create_health_events_bulk([
+        ...     {"user_id": "123", "event_type": "meal", "timestamp": datetime.now(),
+        ...      "metadata": {"total_calories": 650},
+        ...      "source_table": "food_entries", "source_id": entry_id},
+        ... ])
+    """
+    if not events:
+        return 0
+
+    for event in events:
+        _validate_event(event["event_type"], event["metadata"])
+
+    async with db.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                CREATE TEMP TABLE health_events_staging (
+                    id UUID,
+                    user_id VARCHAR(255),
+                    event_type VARCHAR(50),
+                    timestamp TIMESTAMP,
+                    metadata JSONB,
+                    source_table VARCHAR(50),
+                    source_id UUID
+                ) ON COMMIT DROP
+                """
+            )
+
+            async with cur.copy(
+                """
+                COPY health_events_staging
+                (id, user_id, event_type, timestamp, metadata, source_table, source_id)
+                FROM STDIN (FORMAT BINARY)
+                """
+            ) as copy:
+                copy.set_types(["uuid", "varchar", "varchar", "timestamp", "jsonb", "varchar", "uuid"])
+                for event in events:
+                    await copy.write_row((
+                        uuid4(),
+                        event["user_id"],
+                        event["event_type"],
+                        _utc_naive(event["timestamp"]),
+                        event["metadata"],
+                        event.get("source_table"),
+                        event.get("source_id"),
+                    ))
+
+            await cur.execute(
+                """
+                INSERT INTO health_events
+                (id, user_id, event_type, timestamp, metadata, source_table, source_id)
+                SELECT id, user_id, event_type, timestamp, metadata, source_table, source_id
+                FROM health_events_staging
+                """
+            )
+            inserted = cur.rowcount
+            await conn.commit()
+
+    logger.info(
+        f"Bulk inserted {inserted}/{len(events)} health_events "
+        f"({len(events) - inserted} duplicates skipped)"
+    )
+    return inserted
+
+
+class HealthEventBatcher:
+    """
+    Collects live health events and writes them with create_health_events_bulk.
+
+    Events saved from food, tracking and sleep entries are queued and
+    flushed together after a short window (or once max_batch are waiting)
+    instead of each taking a connection for its own INSERT.
+    """
+
+    def __init__(self, flush_window: float = 0.1, max_batch: int = 500):
+        self.flush_window = flush_window
+        self.max_batch = max_batch
+        self._pending: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def add(
+        self,
+        user_id: str,
+        event_type: EventType,
+        timestamp: datetime,
+        metadata: Dict[str, Any],
+        source_table: Optional[str] = None,
+        source_id: Optional[UUID] = None
+    ) -> None:
+        """
+        Queue an event for the next flush (call from the event loop).
+
+        Raises:
+            ValueError: If event_type is invalid or metadata is empty
+        """
+        _validate_event(event_type, metadata)
+        self._pending.append({
+            "user_id": user_id,
+            "event_type": event_type,
+            "timestamp": timestamp,
+            "metadata": metadata,
+            "source_table": source_table,
+            "source_id": source_id,
+        })
+
+        if len(self._pending) >= self.max_batch:
+            self._spawn(self.flush())
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = self._spawn(self._flush_after_window())
+
+    @uses_pool(POOL_BACKGROUND)
+    async def flush(self) -> int:
+        """Write all queued events now; returns the number inserted"""
+        events, self._pending = self._pending, []
+        if not events:
+            return 0
+
+        try:
+            return await create_health_events_bulk(events)
+        except Exception:
+            logger.error(
+                f"Failed to bulk insert {len(events)} health_events, "
+                f"falling back to single inserts",
+                exc_info=True
+            )
+
+        inserted = 0
+        for event in events:
+            try:
+                if await create_health_event(**event) is not None:
+                    inserted += 1
+            except Exception:
+                logger.error(
+                    f"Failed to create health_event for {event.get('source_table')} "
+                    f"{event.get('source_id')}",
+                    exc_info=True
+                )
+        return inserted
+
+    async def drain(self) -> None:
+        """Write queued events and wait for in-flight flushes (call before closing the pool)"""
+        await self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    @property
+    def pending(self) -> int:
+        """Number of events waiting for the next flush"""
+        return len(self._pending)
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.flush_window)
+        await self.flush()
+
+
+# Global batcher for the live ingestion path
+health_event_batcher = HealthEventBatcher()
+
+
+# Column order of health_events rows (tuple rows from iter_health_events)
+HEALTH_EVENT_COLUMNS = (
+    "id", "user_id", "event_type", "timestamp", "metadata",
+    "source_table", "source_id", "created_at",
+)
+
+
+class HealthEventRecord:
+    """
+    Compact health event row (no per-row dict).
+
+    Attribute access is the fast path; event["key"] and event.get("key")
+    also work so code written against dict rows can take records unchanged.
+    """
+
+    __slots__ = HEALTH_EVENT_COLUMNS
+
+    def __init__(self, id, user_id, event_type, timestamp, metadata,
+                 source_table=None, source_id=None, created_at=None):
+        self.id = id
+        self.user_id = user_id
+        self.event_type = event_type
+        self.timestamp = timestamp
+        self.metadata = metadata
+        self.source_table = source_table
+        self.source_id = source_id
+        self.created_at = created_at
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __repr__(self) -> str:
+        return f"HealthEventRecord({self.event_type} {self.timestamp} id={self.id})"
+
+
+_ROW_FACTORIES = {
+    "dict": dict_row,
+    "record": class_row(HealthEventRecord),
+    "tuple": tuple_row,
+}
+
+
+# User/time-range reads back the timeline, insights and pattern mining;
+# (filtered by event type, ascending) → query
+_HEALTH_EVENTS_SQL = """
+    SELECT id, user_id, event_type, timestamp, metadata,
+           source_table, source_id, created_at
+    FROM health_events
+    WHERE user_id = %s
+      AND timestamp >= %s
+      AND timestamp <= %s
+      {type_filter}
+    ORDER BY timestamp {order}
+"""
+_HEALTH_EVENTS_QUERIES = {
+    (filtered, ascending): prepared_statements.register(
+        f"health_events{'_by_type' if filtered else ''}_{'asc' if ascending else 'desc'}",
+        _HEALTH_EVENTS_SQL.format(
+            type_filter="AND event_type = ANY(%s)" if filtered else "",
+            order="ASC" if ascending else "DESC"
+        )
+    )
+    for filtered in (False, True)
+    for ascending in (False, True)
+}
+
+
+def _health_events_query(
+    user_id: str,
+    start_date: datetime,
+    end_date: datetime,
+    event_types: Optional[List[EventType]] = None,
+    ascending: bool = False
+) -> Tuple[PreparedQuery, tuple]:
+    """Pick the user/time-range query shared by get_ and iter_health_events"""
+    params = (user_id, start_date, end_date, event_types) if event_types else (user_id, start_date, end_date)
+    return _HEALTH_EVENTS_QUERIES[(bool(event_types), ascending)], params
+
+
 async def get_health_events(
     user_id: str,
     start_date: datetime,
@@ -174,42 +478,50 @@ async def get_health_events(
         ...     event_types=["meal"]
         ... )
     """
+    query, params = _health_events_query(user_id, start_date, end_date, event_types)
     async with db.connection() as conn:
         async with conn.cursor() as cur:
-            if event_types:
-                # Query with event type filter
-                await cur.execute(
-                    """
-                    SELECT id, user_id, event_type, timestamp, metadata,
-                           source_table, source_id, created_at
-                    FROM health_events
-                    WHERE user_id = %s
-                      AND timestamp >= %s
-                      AND timestamp <= %s
-                      AND event_type = ANY(%s)
-                    ORDER BY timestamp DESC
-                    """,
-                    (user_id, start_date, end_date, event_types)
-                )
-            else:
-                # Query all event types
-                await cur.execute(
-                    """
-                    SELECT id, user_id, event_type, timestamp, metadata,
-                           source_table, source_id, created_at
-                    FROM health_events
-                    WHERE user_id = %s
-                      AND timestamp >= %s
-                      AND timestamp <= %s
-                    ORDER BY timestamp DESC
-                    """,
-                    (user_id, start_date, end_date)
-                )
-
+            await prepared_statements.execute(cur, query, params)
             rows = await cur.fetchall()
             return [dict(row) for row in rows]
 
 
+async def iter_health_events(
+    user_id: str,
+    start_date: datetime,
+    end_date: datetime,
+    event_types: Optional[List[EventType]] = None,
+    row_format: Literal["dict", "record", "tuple"] = "dict",
+    ascending: bool = False,
+    fetch_size: int = STREAM_FETCH_SIZE
+) -> AsyncIterator[Any]:
+    """
+    Stream health events for a user within a date range.
+
+    Same filter as get_health_events(), but rows come from a server-side
+    cursor fetch_size at a time instead of being materialized at once, so
+    long ranges (the 90-day mining window, exports) use bounded memory.
+
+    Args:
+        user_id: Telegram user ID
+        start_date: Start of time range (inclusive)
+        end_date: End of time range (inclusive)
+        event_types: Optional filter by event types
+        row_format: "dict" (same rows as get_health_events), "record"
+            (HealthEventRecord, supports event["key"] too) or "tuple"
+            (HEALTH_EVENT_COLUMNS order)
+        ascending: Oldest first instead of most recent first
+        fetch_size: Rows fetched per round trip
+
+    Example:
+        >>> async for event in iter_health_events(user_id, start, end, row_format="record"):
+        ...     totals[event.event_type] += 1
+    """
+    query, params = _health_events_query(user_id, start_date, end_date, event_types, ascending)
+    async for row in db.stream(query.sql, params, fetch_size, _ROW_FACTORIES[row_format]):
+        yield row
+
+
 async def check_duplicate_event(
     source_table: str,
     source_id: UUID
@@ -220,7 +532,8 @@ async def check_duplicate_event(
     This function is used during historical migration to prevent duplicate
     events when the migration script is run multiple times (idempotent migrations).
 
-    Uses the idx_health_events_source index for fast lookups.
+    Looks the key up in health_event_sources (one row per ingested source
+    record), so no health_events partition is scanned.
 
     Args:
         source_table: Original table name (e.g., 'food_entries')
@@ -238,16 +551,15 @@ async def check_duplicate_event(
         async with conn.cursor() as cur:
             await cur.execute(
                 """
-                SELECT COUNT(*) FROM health_events
+                SELECT 1 FROM health_event_sources
                 WHERE source_table = %s AND source_id = %s
                 """,
                 (source_table, source_id)
             )
-            row = await cur.fetchone()
-            count = row[0] if row else 0
-            return count > 0
+            return await cur.fetchone() is not None
 
 
+@uses_replica
 async def get_event_count_by_type(
     user_id: str,
     start_date: datetime,
@@ -318,6 +630,11 @@ async def delete_health_event(event_id: UUID) -> bool:
                 (event_id,)
             )
             deleted_count = cur.rowcount
+            # Release the source key so the record can be ingested again
+            await cur.execute(
+                "DELETE FROM health_event_sources WHERE event_id = %s",
+                (event_id,)
+            )
             await conn.commit()
 
             if deleted_count > 0:
@@ -7,6 +7,11 @@ Combines multiple search modalities for optimal results:
 2. Visual search (CLIP embeddings)
 3. Structured search (SQL keyword matching)
 
+By default the whole search runs as one SQL statement (see _search_fused):
+the image embedding is computed once, each modality is a CTE and RRF
+fusion happens in the database, so a search costs one connection checkout
+and one round trip. The per-modality parallel path is kept as a fallback.
+
 Target performance: <100ms total latency
 """
 from __future__ import annotations
@@ -18,6 +23,7 @@ from dataclasses import dataclass
 from collections import defaultdict
 from datetime import datetime
 
+from src.db.connection import db
 from src.services.visual_food_search import get_visual_search_service
 from src.services.formula_detection import get_formula_detection_service
 from src.services.pattern_detection import get_user_patterns
@@ -34,6 +40,117 @@ class HybridSearchError(ServiceError):
 SearchDomain = Literal["formulas", "foods", "patterns"]
 
 
+# ----------------------------------------------------------------
+# Fused single-statement search
+# Each enabled modality contributes a CTE producing (id, rank); the
+# fused CTE sums 1 / (k + rank) per item and keeps the top-k.
+# ----------------------------------------------------------------
+
+# pgvector HNSW nearest neighbours, shared by both visual branches
+_VISUAL_CANDIDATES_CTE = """
+visual_candidates AS (
+    SELECT fir.food_entry_id, fir.photo_path, fir.created_at,
+           1 - (fir.embedding <=> %(embedding)s::vector) AS similarity
+    FROM food_image_references fir
+    WHERE fir.user_id = %(user_id)s
+    ORDER BY fir.embedding <=> %(embedding)s::vector
+    LIMIT %(visual_candidates)s
+)"""
+
+_FOODS_VISUAL_CTE = """
+foods_visual AS (
+    SELECT food_entry_id::text AS id, photo_path, created_at, similarity,
+           ROW_NUMBER() OVER (ORDER BY similarity DESC) AS rank
+    FROM visual_candidates
+    WHERE similarity >= %(food_min_similarity)s
+    ORDER BY similarity DESC
+    LIMIT %(candidates)s
+)"""
+
+_FORMULAS_VISUAL_CTE = """
+formulas_visual AS (
+    SELECT ff.id::text AS id, MAX(vc.similarity) AS similarity,
+           ROW_NUMBER() OVER (ORDER BY MAX(ff.times_used) DESC, MAX(ff.last_used_at) DESC) AS rank
+    FROM visual_candidates vc
+    JOIN formula_usage_log ful ON ful.food_entry_id = vc.food_entry_id
+    JOIN food_formulas ff ON ff.id = ful.formula_id AND ff.user_id = %(user_id)s
+    WHERE vc.similarity >= %(formula_min_similarity)s
+    GROUP BY ff.id
+    ORDER BY rank
+    LIMIT %(candidates)s
+)"""
+
+_FORMULAS_TEXT_CTE = """
+formulas_text AS (
+    SELECT kw.formula_id::text AS id, kw.match_score, kw.rank
+    FROM search_formulas_by_keyword(%(user_id)s, %(text)s, %(candidates)s)
+         WITH ORDINALITY AS kw(formula_id, name, keywords, foods, total_calories,
+                               total_macros, times_used, match_score, rank)
+)"""
+
+# Word overlap between the query and actionable_insight, like the
+# Python keyword matcher in _search_patterns_text
+_PATTERNS_TEXT_CTE = """
+patterns_text AS (
+    SELECT id, match_score,
+           ROW_NUMBER() OVER (
+               ORDER BY match_score DESC, impact_score DESC NULLS LAST, confidence DESC
+           ) AS rank
+    FROM (
+        SELECT dp.id::text AS id, dp.impact_score, dp.confidence,
+               COUNT(DISTINCT w.word)::float / %(word_count)s AS match_score
+        FROM discovered_patterns dp
+        JOIN unnest(%(words)s::text[]) AS w(word)
+          ON w.word = ANY(regexp_split_to_array(lower(COALESCE(dp.actionable_insight, '')), '\\s+'))
+        WHERE dp.user_id = %(user_id)s
+          AND dp.confidence >= %(pattern_min_confidence)s
+          AND (dp.impact_score >= %(pattern_min_impact)s OR dp.impact_score IS NULL)
+          AND (dp.pattern_rule->>'archived' IS NULL OR dp.pattern_rule->>'archived' != 'true')
+        GROUP BY dp.id
+    ) scored
+    ORDER BY rank
+    LIMIT %(candidates)s
+)"""
+
+# (cte name, result type, source key used for component ranks)
+_FUSED_SOURCES = {
+    "formulas_text": ("formulas", "formulas_semantic"),
+    "patterns_text": ("patterns", "patterns_semantic"),
+    "foods_visual": ("foods", "foods_visual"),
+    "formulas_visual": ("formulas", "formulas_visual"),
+}
+
+_FUSED_SELECT = """
+ranked AS (
+    {union}
+),
+fused AS (
+    SELECT id, type, SUM(1.0 / (%(rrf_k)s + rank)) AS score, jsonb_object_agg(source, rank) AS ranks
+    FROM ranked
+    GROUP BY id, type
+    ORDER BY score DESC
+    LIMIT %(limit)s
+)
+SELECT
+    f.id, f.type, f.score, f.ranks,
+    COALESCE(ff.name, f.id) AS name,
+    COALESCE({confidence}, 0.0) AS confidence,
+    CASE f.type
+        WHEN 'formulas' THEN jsonb_build_object(
+            'id', ff.id, 'name', ff.name, 'keywords', ff.keywords, 'foods', ff.foods,
+            'total_calories', ff.total_calories, 'total_macros', ff.total_macros,
+            'times_used', ff.times_used{formula_extras})
+        WHEN 'patterns' THEN to_jsonb(dp){pattern_extras}
+        ELSE {food_data}
+    END AS data
+FROM fused f
+LEFT JOIN food_formulas ff ON f.type = 'formulas' AND ff.id = f.id::uuid
+LEFT JOIN discovered_patterns dp ON f.type = 'patterns' AND dp.id = f.id::uuid
+{joins}
+ORDER BY f.score DESC
+"""
+
+
 @dataclass
 class HybridResult:
     """Unified result from hybrid search"""
@@ -67,11 +184,24 @@ class HybridSearchService:
     - Structured search: ~15ms (SQL indexed query)
     - Fusion: ~10ms (in-memory RRF calculation)
     - Total: ~80ms ✅
+
+    Fused mode (default) replaces the four queries and the in-memory fusion
+    with one statement: one embedding, one connection, one round trip.
     """
 
     # RRF constant (standard value from literature)
     RRF_K = 60
 
+    # Run the whole search as one fused SQL statement (falls back to the
+    # per-modality parallel searches if the fused query fails)
+    USE_FUSED_QUERY = True
+
+    # Thresholds (same as the services used by the parallel path)
+    FOOD_MIN_SIMILARITY = 0.70  # visual search default (distance 0.30)
+    FORMULA_MIN_SIMILARITY = 0.75  # find_formulas_by_image default
+    PATTERN_MIN_CONFIDENCE = 0.60
+    PATTERN_MIN_IMPACT = 30.0
+
     def __init__(self) -> None:
         """Initialize hybrid search service"""
         self.visual_service = get_visual_search_service()
@@ -121,6 +251,41 @@ class HybridSearchService:
 
         start_time = datetime.now()
 
+        fused_results = None
+        if self.USE_FUSED_QUERY:
+            try:
+                fused_results = await self._search_fused(
+                    user_id, text, image_path, search_domains, limit
+                )
+            except Exception as e:
+                logger.warning(f"Fused hybrid search failed, using parallel search: {e}")
+
+        if fused_results is None:
+            fused_results = await self._search_parallel(
+                user_id, text, image_path, search_domains, limit
+            )
+
+        # Performance logging
+        elapsed_ms = (datetime.now() - start_time).total_seconds() * 1000
+        logger.info(
+            f"Hybrid search completed in {elapsed_ms:.1f}ms "
+            f"({len(fused_results)} results)"
+        )
+
+        if elapsed_ms > 100:
+            logger.warning(f"Hybrid search exceeded 100ms target: {elapsed_ms:.1f}ms")
+
+        return fused_results
+
+    async def _search_parallel(
+        self,
+        user_id: str,
+        text: Optional[str],
+        image_path: Optional[str],
+        search_domains: List[SearchDomain],
+        limit: int
+    ) -> List[HybridResult]:
+        """Run each modality as its own query concurrently and fuse in Python"""
         # Parallel execution of search components
         tasks = []
         task_types = []
@@ -161,19 +326,133 @@ class HybridSearchService:
                 search_results[f"{domain}_{search_type}"] = result
 
         # Apply RRF fusion
-        fused_results = self._apply_rrf_fusion(search_results, limit)
+        return self._apply_rrf_fusion(search_results, limit)
 
-        # Performance logging
-        elapsed_ms = (datetime.now() - start_time).total_seconds() * 1000
-        logger.info(
-            f"Hybrid search completed in {elapsed_ms:.1f}ms "
-            f"({len(fused_results)} results)"
-        )
+    async def _search_fused(
+        self,
+        user_id: str,
+        text: Optional[str],
+        image_path: Optional[str],
+        search_domains: List[SearchDomain],
+        limit: int
+    ) -> List[HybridResult]:
+        """
+        Run every modality and the RRF fusion as a single SQL statement
 
-        if elapsed_ms > 100:
-            logger.warning(f"Hybrid search exceeded 100ms target: {elapsed_ms:.1f}ms")
+        The image embedding is generated once and shared by the food and
+        formula visual branches (one HNSW scan). Only the CTEs for the
+        enabled modalities are included. Returns the top-k directly.
+        """
+        candidates = limit * 2  # Same candidate depth as the parallel path
+        params: Dict[str, Any] = {
+            "user_id": user_id,
+            "rrf_k": self.RRF_K,
+            "limit": limit,
+            "candidates": candidates,
+        }
+        ctes: List[str] = []
+        sources: List[str] = []
 
-        return fused_results
+        if text:
+            words = sorted(set(text.lower().split()))
+            params.update(
+                text=text,
+                words=words,
+                word_count=max(len(words), 1),
+                pattern_min_confidence=self.PATTERN_MIN_CONFIDENCE,
+                pattern_min_impact=self.PATTERN_MIN_IMPACT,
+            )
+            if "formulas" in search_domains:
+                ctes.append(_FORMULAS_TEXT_CTE)
+                sources.append("formulas_text")
+            if "patterns" in search_domains and words:
+                ctes.append(_PATTERNS_TEXT_CTE)
+                sources.append("patterns_text")
+
+        if image_path and ("foods" in search_domains or "formulas" in search_domains):
+            embedding = await self.visual_service.embedding_service.generate_embedding(image_path)
+            params.update(
+                embedding=f"[{','.join(str(x) for x in embedding)}]",
+                visual_candidates=candidates * 2,
+                food_min_similarity=self.FOOD_MIN_SIMILARITY,
+                formula_min_similarity=self.FORMULA_MIN_SIMILARITY,
+            )
+            ctes.append(_VISUAL_CANDIDATES_CTE)
+            if "foods" in search_domains:
+                ctes.append(_FOODS_VISUAL_CTE)
+                sources.append("foods_visual")
+            if "formulas" in search_domains:
+                ctes.append(_FORMULAS_VISUAL_CTE)
+                sources.append("formulas_visual")
+
+        if not sources:
+            return []
+
+        query = "WITH" + ",".join(ctes) + "," + self._build_fused_select(sources)
+
+        async with db.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                rows = await cur.fetchall()
+
+        results = []
+        for row in rows:
+            ranks = row["ranks"]
+            results.append(HybridResult(
+                id=row["id"],
+                type=row["type"],
+                name=row["name"],
+                score=float(row["score"]),
+                confidence=float(row["confidence"]),
+                data=row["data"],
+                semantic_rank=ranks.get("formulas_semantic") or ranks.get("patterns_semantic"),
+                visual_rank=ranks.get("formulas_visual") or ranks.get("foods_visual"),
+                structured_rank=ranks.get("formulas_semantic")  # Keyword search
+            ))
+        return results
+
+    def _build_fused_select(self, sources: List[str]) -> str:
+        """Assemble the fusion/projection part of the fused query for the enabled CTEs"""
+        union = "\n    UNION ALL\n    ".join(
+            f"SELECT id, '{_FUSED_SOURCES[cte][0]}' AS type, '{_FUSED_SOURCES[cte][1]}' AS source, rank FROM {cte}"
+            for cte in sources
+        )
+        joins = "\n".join(
+            f"LEFT JOIN {cte} ON {cte}.id = f.id AND f.type = '{_FUSED_SOURCES[cte][0]}'"
+            for cte in sources
+        )
+        score_columns = {
+            "formulas_text": "formulas_text.match_score",
+            "patterns_text": "patterns_text.match_score",
+            "foods_visual": "foods_visual.similarity",
+            "formulas_visual": "formulas_visual.similarity",
+        }
+        confidence = ", ".join(score_columns[cte] for cte in sources)
+
+        formula_extras = ""
+        if "formulas_text" in sources:
+            formula_extras += ", 'match_score', formulas_text.match_score"
+        if "formulas_visual" in sources:
+            formula_extras += ", 'visual_similarity', formulas_visual.similarity"
+        pattern_extras = (
+            " || jsonb_build_object('match_score', patterns_text.match_score)"
+            if "patterns_text" in sources else ""
+        )
+        food_data = (
+            "jsonb_build_object('id', f.id, 'type', 'food', "
+            "'similarity_score', foods_visual.similarity, "
+            "'photo_path', foods_visual.photo_path, 'created_at', foods_visual.created_at)"
+            if "foods_visual" in sources else "NULL::jsonb"
+        )
+
+        return _FUSED_SELECT.format(
+            union=union,
+            joins=joins,
+            confidence=confidence,
+            formula_extras=formula_extras,
+            pattern_extras=pattern_extras,
+            food_data=food_data,
+        )
 
     async def _search_formulas_text(
         self,
@@ -250,8 +529,8 @@ class HybridSearchService:
         try:
             patterns = await get_user_patterns(
                 user_id=user_id,
-                min_confidence=0.60,  # Lower threshold for search
-                min_impact=30.0,
+                min_confidence=self.PATTERN_MIN_CONFIDENCE,  # Lower threshold for search
+                min_impact=self.PATTERN_MIN_IMPACT,
                 include_archived=False
             )
 
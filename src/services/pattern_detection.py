@@ -22,7 +22,7 @@ from collections import defaultdict
 import json
 from uuid import UUID
 
-from src.services.health_events import get_health_events, EventType
+from src.services.health_events import iter_health_events, EventType
 from src.services.statistical_analysis import (
     chi_square_test,
     pearson_correlation,
@@ -30,7 +30,7 @@ from src.services.statistical_analysis import (
     calculate_effect_size_cohens_d,
     calculate_confidence_interval
 )
-from src.db.connection import db
+from src.db.connection import db, uses_replica
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +66,7 @@ class EventFilter:
 # Algorithm 1: Temporal Correlation Detection
 # ================================================================
 
+@uses_replica
 async def detect_temporal_correlations(
     user_id: str,
     start_date: datetime,
@@ -110,17 +111,21 @@ async def detect_temporal_correlations(
     """
     patterns = []
 
-    # Get all events in the date range
-    events = await get_health_events(user_id, start_date, end_date)
-
-    if len(events) < min_occurrences * 2:
-        logger.info(f"Not enough events for correlation analysis (have {len(events)}, need {min_occurrences * 2})")
+    # Stream the date range, keeping only trigger and outcome events
+    total_events = 0
+    trigger_events = []
+    outcome_events = []
+    async for event in iter_health_events(user_id, start_date, end_date, row_format="record"):
+        total_events += 1
+        if event.event_type == trigger_event_type:
+            trigger_events.append(event)
+        if event.event_type == outcome_event_type:
+            outcome_events.append(event)
+
+    if total_events < min_occurrences * 2:
+        logger.info(f"Not enough events for correlation analysis (have {total_events}, need {min_occurrences * 2})")
         return patterns
 
-    # Separate trigger and outcome events
-    trigger_events = [e for e in events if e["event_type"] == trigger_event_type]
-    outcome_events = [e for e in events if e["event_type"] == outcome_event_type]
-
     if not trigger_events or not outcome_events:
         return patterns
 
@@ -286,6 +291,7 @@ def _group_events_by_characteristics(events: List[Dict], event_type: EventType)
 # Algorithm 2: Multi-Factor Pattern Analyzer
 # ================================================================
 
+@uses_replica
 async def detect_multifactor_patterns(
     user_id: str,
     start_date: datetime,
@@ -323,17 +329,20 @@ async def detect_multifactor_patterns(
 
     patterns = []
 
-    # Get all events
-    events = await get_health_events(user_id, start_date, end_date)
+    # Stream only the event types the factors and outcome refer to
+    relevant_types = list({factor.event_type for factor in factors} | {outcome.event_type})
 
     # Find time windows where all factors are present
     factor_windows = []
 
     # Group events by date (day-level granularity)
+    events = []
     events_by_day = defaultdict(list)
-    for event in events:
-        day_key = event["timestamp"].date()
-        events_by_day[day_key].append(event)
+    async for event in iter_health_events(
+        user_id, start_date, end_date, event_types=relevant_types, row_format="record"
+    ):
+        events.append(event)
+        events_by_day[event.timestamp.date()].append(event)
 
     # Check each day for factor co-occurrence
     for day, day_events in events_by_day.items():
@@ -463,6 +472,7 @@ def _matches_metadata_conditions(metadata: Dict[str, Any], conditions: Dict[str,
 # Algorithm 3: Temporal Sequence Detection
 # ================================================================
 
+@uses_replica
 async def detect_behavioral_sequences(
     user_id: str,
     start_date: datetime,
@@ -496,15 +506,16 @@ async def detect_behavioral_sequences(
     """
     patterns = []
 
-    # Get all events
-    events = await get_health_events(user_id, start_date, end_date)
+    # Stream all events, oldest first
+    events_sorted = [
+        event async for event in iter_health_events(
+            user_id, start_date, end_date, row_format="record", ascending=True
+        )
+    ]
 
-    if len(events) < min_sequence_length * min_occurrences:
+    if len(events_sorted) < min_sequence_length * min_occurrences:
         return patterns
 
-    # Sort events by timestamp
-    events_sorted = sorted(events, key=lambda e: e["timestamp"])
-
     # Extract sequences
     sequences = []
     for i in range(len(events_sorted)):
@@ -594,6 +605,7 @@ def _get_sequence_signature(sequence: List[Dict]) -> str:
 # Algorithm 4: Cyclical Pattern Finder
 # ================================================================
 
+@uses_replica
 async def detect_cyclical_patterns(
     user_id: str,
     start_date: datetime,
@@ -621,8 +633,10 @@ async def detect_cyclical_patterns(
     """
     patterns = []
 
-    # Get all events
-    events = await get_health_events(user_id, start_date, end_date)
+    # Stream all events as compact records
+    events = [
+        event async for event in iter_health_events(user_id, start_date, end_date, row_format="record")
+    ]
 
     if "weekly" in cycle_types:
         weekly_patterns = await _detect_weekly_patterns(events, min_occurrences)
@@ -1322,6 +1336,7 @@ async def save_pattern_to_database(
                 result = await cur.fetchone()
                 pattern_id = result["id"]
                 await conn.commit()
+                db.record_write(user_id)
 
                 logger.info(f"Saved pattern {pattern_id}: {pattern.pattern_type} for user {user_id}")
                 return pattern_id
@@ -1352,7 +1367,7 @@ async def get_user_patterns(
     Example:
         >>> patterns = await get_user_patterns("123", min_confidence=0.70, min_impact=50)
     """
-    async with db.connection() as conn:
+    async with db.connection(read_only=True, user_id=user_id) as conn:
         async with conn.cursor() as cur:
             query = """
                 SELECT id, user_id, pattern_type, pattern_rule, confidence,
@@ -20,6 +20,7 @@ from dataclasses import dataclass
 from src.services.pattern_detection import get_user_patterns
 from src.services.health_events import get_health_events
 from src.db.connection import db
+from src.db.write_behind import execute_write_behind
 
 logger = logging.getLogger(__name__)
 
@@ -516,26 +517,23 @@ class PatternSurfacingService:
         """
         Record that a pattern was surfaced to the user
 
-        Updates pattern metadata with surfacing timestamp
+        Updates pattern metadata with surfacing timestamp (written behind)
         """
         try:
-            async with db.connection() as conn:
-                async with conn.cursor() as cur:
-                    await cur.execute(
-                        """
-                        UPDATE discovered_patterns
-                        SET metadata = COALESCE(metadata, '{}'::jsonb) ||
-                            jsonb_build_object(
-                                'last_surfaced', %s,
-                                'surface_count', COALESCE((metadata->>'surface_count')::int, 0) + 1
-                            )
-                        WHERE id = %s AND user_id = %s
-                        """,
-                        (datetime.now().isoformat(), pattern_id, user_id)
+            await execute_write_behind(
+                """
+                UPDATE discovered_patterns
+                SET metadata = COALESCE(metadata, '{}'::jsonb) ||
+                    jsonb_build_object(
+                        'last_surfaced', %s,
+                        'surface_count', COALESCE((metadata->>'surface_count')::int, 0) + 1
                     )
-                    await conn.commit()
+                WHERE id = %s AND user_id = %s
+                """,
+                (datetime.now().isoformat(), pattern_id, user_id)
+            )
 
-                    logger.info(f"Recorded pattern {pattern_id} surfaced to user {user_id}")
+            logger.info(f"Recorded pattern {pattern_id} surfaced to user {user_id}")
 
         except Exception as e:
             logger.error(f"Failed to record pattern surfaced: {e}")
@@ -6,11 +6,16 @@ Epic 009 - Phase 2: Plate Recognition & Calibration
 """
 import logging
 import asyncio
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
 
+import numpy as np
+
 from src.db.connection import db
+from src.db.vector import parse_vector, to_vector_literal, use_binary_vectors
 from src.services.image_embedding import get_embedding_service, ImageEmbeddingError
 from src.models.plate import (
     DetectedPlate,
@@ -43,6 +48,152 @@ class PlateRecognitionError(ServiceError):
     pass
 
 
+# Per-user plate cache configuration
+PLATE_CACHE_MAX_USERS = 500
+PLATE_CACHE_MAX_PLATES = 200  # Users with more plates are matched in SQL
+PLATE_CACHE_TTL_SECONDS = 300  # Picks up changes made by other processes
+
+PLATE_COLUMNS = """
+    id, user_id, plate_name, embedding, plate_type,
+    color, shape, estimated_diameter_cm, estimated_capacity_ml,
+    times_recognized, first_seen_at, last_seen_at,
+    is_calibrated, calibration_confidence, calibration_method,
+    model_version, created_at, updated_at
+"""
+
+
+def _row_to_plate(row: dict, embedding: np.ndarray) -> RecognizedPlate:
+    return RecognizedPlate(
+        id=str(row["id"]),
+        user_id=row["user_id"],
+        plate_name=row["plate_name"],
+        embedding=embedding.tolist(),
+        plate_type=row["plate_type"],
+        color=row["color"],
+        shape=row["shape"],
+        estimated_diameter_cm=row["estimated_diameter_cm"],
+        estimated_capacity_ml=row["estimated_capacity_ml"],
+        times_recognized=row["times_recognized"],
+        first_seen_at=row["first_seen_at"],
+        last_seen_at=row["last_seen_at"],
+        is_calibrated=row["is_calibrated"],
+        calibration_confidence=row["calibration_confidence"],
+        calibration_method=row["calibration_method"],
+        model_version=row["model_version"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"]
+    )
+
+
+class UserPlates:
+    """
+    One user's plates with a row-normalized embedding matrix, so cosine
+    similarity against all of them is a single matrix-vector product.
+
+    plates is None for users with too many plates to cache (matched in SQL).
+    """
+
+    __slots__ = ("plates", "matrix", "loaded_at")
+
+    def __init__(self, plates: Optional[list[RecognizedPlate]], embeddings: Optional[list[np.ndarray]] = None):
+        self.plates = plates
+        self.loaded_at = time.monotonic()
+        self.matrix = None
+        if plates:
+            matrix = np.vstack(embeddings).astype(np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = np.nan  # zero vectors never match (NaN distance, as in pgvector)
+            self.matrix = matrix / norms
+
+    def search(
+        self,
+        query_embedding: list[float],
+        limit: int,
+        distance_threshold: float
+    ) -> list[RecognizedPlate]:
+        """Plates within cosine distance_threshold, most similar first"""
+        if self.matrix is None:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+
+        similarities = self.matrix @ (query / norm)
+        order = np.argsort(-similarities, kind="stable")[:limit]
+        return [
+            self.plates[i] for i in order
+            if similarities[i] >= 1.0 - distance_threshold
+        ]
+
+
+class PlateCache:
+    """LRU cache of UserPlates keyed by user id"""
+
+    def __init__(
+        self,
+        max_users: int = PLATE_CACHE_MAX_USERS,
+        max_plates: int = PLATE_CACHE_MAX_PLATES,
+        ttl_seconds: float = PLATE_CACHE_TTL_SECONDS
+    ):
+        self.max_users = max_users
+        self.max_plates = max_plates
+        self.ttl_seconds = ttl_seconds
+        self._users: "OrderedDict[str, UserPlates]" = OrderedDict()
+        self._plate_owners: dict[str, str] = {}
+
+    def get(self, user_id: str) -> Optional[UserPlates]:
+        entry = self._users.get(user_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.loaded_at > self.ttl_seconds:
+            self.invalidate(user_id)
+            return None
+        self._users.move_to_end(user_id)
+        return entry
+
+    def put(self, user_id: str, entry: UserPlates) -> UserPlates:
+        self.invalidate(user_id)
+        self._users[user_id] = entry
+        for plate in entry.plates or []:
+            self._plate_owners[plate.id] = user_id
+        while len(self._users) > self.max_users:
+            oldest, _ = next(iter(self._users.items()))
+            self.invalidate(oldest)
+        return entry
+
+    def get_plate(self, plate_id: str) -> Optional[RecognizedPlate]:
+        user_id = self._plate_owners.get(plate_id)
+        entry = self.get(user_id) if user_id else None
+        if entry is None or not entry.plates:
+            return None
+        return next((p for p in entry.plates if p.id == plate_id), None)
+
+    def record_usage(self, plate_id: str) -> None:
+        """Mirror update_plate_usage() on the cached plate"""
+        plate = self.get_plate(plate_id)
+        if plate is not None:
+            plate.times_recognized += 1
+            plate.last_seen_at = datetime.now()
+
+    def invalidate(self, user_id: str) -> None:
+        entry = self._users.pop(user_id, None)
+        if entry is not None:
+            for plate in entry.plates or []:
+                if self._plate_owners.get(plate.id) == user_id:
+                    del self._plate_owners[plate.id]
+
+    def invalidate_plate(self, plate_id: str) -> None:
+        user_id = self._plate_owners.get(plate_id)
+        if user_id:
+            self.invalidate(user_id)
+
+    def clear(self) -> None:
+        self._users.clear()
+        self._plate_owners.clear()
+
+
 class PlateRecognitionService:
     """
     Service for plate/container recognition and calibration
@@ -73,6 +224,7 @@ class PlateRecognitionService:
     def __init__(self) -> None:
         """Initialize the plate recognition service"""
         self.embedding_service = get_embedding_service()
+        self.plate_cache = PlateCache()
 
     async def detect_plate_from_image(
         self,
@@ -238,7 +390,7 @@ class PlateRecognitionService:
             async with db.connection() as conn:
                 async with conn.cursor() as cur:
                     # Convert embedding to pgvector format
-                    embedding_str = f"[{','.join(str(x) for x in embedding)}]"
+                    embedding_str = to_vector_literal(embedding)
 
                     await cur.execute(
                         """
@@ -268,6 +420,8 @@ class PlateRecognitionService:
 
                     await conn.commit()
 
+            self.plate_cache.invalidate(user_id)
+
             # Build RecognizedPlate object
             recognized_plate = RecognizedPlate(
                 id=plate_id,
@@ -517,6 +671,8 @@ class PlateRecognitionService:
 
                     await conn.commit()
 
+            self.plate_cache.record_usage(recognized_plate_id)
+
             link = FoodEntryPlateLink(
                 id=link_id,
                 food_entry_id=food_entry_id,
@@ -538,51 +694,29 @@ class PlateRecognitionService:
 
     async def get_plate_by_id(self, plate_id: str) -> Optional[RecognizedPlate]:
         """Get plate by ID"""
+        cached = self.plate_cache.get_plate(plate_id)
+        if cached is not None:
+            return cached
+
         try:
             async with db.connection() as conn:
                 async with conn.cursor() as cur:
+                    binary = await use_binary_vectors(cur)
                     await cur.execute(
-                        """
-                        SELECT id, user_id, plate_name, embedding, plate_type,
-                               color, shape, estimated_diameter_cm, estimated_capacity_ml,
-                               times_recognized, first_seen_at, last_seen_at,
-                               is_calibrated, calibration_confidence, calibration_method,
-                               model_version, created_at, updated_at
+                        f"""
+                        SELECT {PLATE_COLUMNS}
                         FROM recognized_plates
                         WHERE id = %s
                         """,
-                        (plate_id,)
+                        (plate_id,),
+                        binary=binary
                     )
 
                     row = await cur.fetchone()
                     if not row:
                         return None
 
-                    # Parse embedding
-                    embedding = row["embedding"]
-                    if isinstance(embedding, str):
-                        embedding = [float(x) for x in embedding.strip("[]").split(",")]
-
-                    return RecognizedPlate(
-                        id=str(row["id"]),
-                        user_id=row["user_id"],
-                        plate_name=row["plate_name"],
-                        embedding=embedding,
-                        plate_type=row["plate_type"],
-                        color=row["color"],
-                        shape=row["shape"],
-                        estimated_diameter_cm=row["estimated_diameter_cm"],
-                        estimated_capacity_ml=row["estimated_capacity_ml"],
-                        times_recognized=row["times_recognized"],
-                        first_seen_at=row["first_seen_at"],
-                        last_seen_at=row["last_seen_at"],
-                        is_calibrated=row["is_calibrated"],
-                        calibration_confidence=row["calibration_confidence"],
-                        calibration_method=row["calibration_method"],
-                        model_version=row["model_version"],
-                        created_at=row["created_at"],
-                        updated_at=row["updated_at"]
-                    )
+                    return _row_to_plate(row, parse_vector(row["embedding"]))
 
         except Exception as e:
             logger.error(f"Failed to get plate: {e}", exc_info=True)
@@ -647,32 +781,86 @@ class PlateRecognitionService:
         limit: int,
         distance_threshold: float
     ) -> list[RecognizedPlate]:
-        """Search for similar plates using pgvector"""
+        """
+        Search for similar plates
+
+        Matches in-process against the user's cached plates; a cache miss
+        costs one query loading them. Users with more plates than the cache
+        holds are searched with pgvector instead (also one query).
+        """
+        entry = self.plate_cache.get(user_id)
+        if entry is None:
+            entry = await self._load_user_plates(user_id)
+
+        if entry.plates is not None:
+            return entry.search(query_embedding, limit, distance_threshold)
+
+        return await self._search_similar_plates_sql(
+            user_id, query_embedding, limit, distance_threshold
+        )
+
+    async def _load_user_plates(self, user_id: str) -> UserPlates:
+        """Load and cache all of a user's plates (plates=None if too many)"""
+        max_plates = self.plate_cache.max_plates
         async with db.connection() as conn:
             async with conn.cursor() as cur:
-                # Convert embedding to pgvector format
-                embedding_str = f"[{','.join(str(x) for x in query_embedding)}]"
-
+                binary = await use_binary_vectors(cur)
                 await cur.execute(
-                    """
-                    SELECT plate_id, plate_name, plate_type, similarity_score,
-                           times_recognized, is_calibrated, estimated_diameter_cm,
-                           estimated_capacity_ml
-                    FROM find_similar_plates(%s, %s::vector, %s, %s)
+                    f"""
+                    SELECT {PLATE_COLUMNS}
+                    FROM recognized_plates
+                    WHERE user_id = %s
+                    ORDER BY times_recognized DESC
+                    LIMIT %s
                     """,
-                    (user_id, embedding_str, limit, distance_threshold)
+                    (user_id, max_plates + 1),
+                    binary=binary
                 )
-
                 rows = await cur.fetchall()
 
-                matches = []
-                for row in rows:
-                    # Get full plate data
-                    plate = await self.get_plate_by_id(str(row["plate_id"]))
-                    if plate:
-                        matches.append(plate)
+        if len(rows) > max_plates:
+            return self.plate_cache.put(user_id, UserPlates(None))
 
-                return matches
+        embeddings = [parse_vector(row["embedding"]) for row in rows]
+        plates = [_row_to_plate(row, emb) for row, emb in zip(rows, embeddings)]
+        return self.plate_cache.put(user_id, UserPlates(plates, embeddings))
+
+    async def _search_similar_plates_sql(
+        self,
+        user_id: str,
+        query_embedding: list[float],
+        limit: int,
+        distance_threshold: float
+    ) -> list[RecognizedPlate]:
+        """
+        pgvector search returning fully hydrated plates in one statement
+
+        Same filter and ordering as find_similar_plates(), which only
+        returns a subset of the columns.
+        """
+        async with db.connection() as conn:
+            async with conn.cursor() as cur:
+                binary = await use_binary_vectors(cur)
+                await cur.execute(
+                    f"""
+                    SELECT {PLATE_COLUMNS}
+                    FROM recognized_plates
+                    WHERE user_id = %(user_id)s
+                      AND (embedding <=> %(embedding)s::vector) <= %(max_distance)s
+                    ORDER BY embedding <=> %(embedding)s::vector
+                    LIMIT %(limit)s
+                    """,
+                    {
+                        "user_id": user_id,
+                        "embedding": to_vector_literal(query_embedding),
+                        "max_distance": distance_threshold,
+                        "limit": limit
+                    },
+                    binary=binary
+                )
+                rows = await cur.fetchall()
+
+        return [_row_to_plate(row, parse_vector(row["embedding"])) for row in rows]
 
     async def _generate_plate_name(
         self,
@@ -822,6 +1010,8 @@ class PlateRecognitionService:
 
                 await conn.commit()
 
+        self.plate_cache.invalidate_plate(result.plate_id)
+
 
 # Global service instance
 _plate_recognition_service: Optional[PlateRecognitionService] = None
@@ -10,6 +10,7 @@ from typing import Optional, Dict, Any
 from datetime import datetime
 
 from src.db import queries
+from src.utils.session_state import SessionState, get_session_state
 
 logger = logging.getLogger(__name__)
 
@@ -201,20 +202,36 @@ class UserService:
             True if authorized, False otherwise
         """
         try:
-            subscription = await queries.get_user_subscription_status(telegram_id)
+            state = await get_session_state(telegram_id)
 
-            if not subscription:
+            if not state.subscription:
                 return False
 
-            status = subscription.get('status')
-
             # User is authorized if status is 'active' or 'trial'
-            return status in ('active', 'trial')
+            return state.subscription.get('status') in ('active', 'trial')
 
         except Exception as e:
             logger.error(f"Error checking authorization for {telegram_id}: {e}", exc_info=True)
             return False
 
+    async def get_session_state(self, telegram_id: str) -> Optional[SessionState]:
+        """
+        Get subscription, authorization and onboarding state in one lookup.
+
+        Uses the short-TTL session state cache (one query on a miss).
+
+        Args:
+            telegram_id: Telegram user ID
+
+        Returns:
+            SessionState, or None on error
+        """
+        try:
+            return await get_session_state(telegram_id)
+        except Exception as e:
+            logger.error(f"Error getting session state for {telegram_id}: {e}", exc_info=True)
+            return None
+
     async def get_onboarding_state(
         self,
         telegram_id: str
@@ -362,6 +379,16 @@ class UserService:
         Returns:
             True if successful, False otherwise
         """
+        from src.utils.timezone_resolver import timezone_resolver
+
+        try:
+            await queries.set_user_timezone(telegram_id, timezone)
+        except Exception as e:
+            logger.error(f"Error setting timezone for {telegram_id}: {e}", exc_info=True)
+            timezone_resolver.invalidate(telegram_id)
+            return False
+
+        timezone_resolver.prime(telegram_id, timezone)
         return await self.update_preferences(telegram_id, 'timezone', timezone)
 
     async def get_timezone(self, telegram_id: str) -> Optional[str]:
@@ -375,8 +402,9 @@ class UserService:
             Timezone string if set, None otherwise
         """
         try:
-            from src.utils.timezone_helper import get_timezone_from_profile
-            return get_timezone_from_profile(telegram_id)
+            from src.utils.timezone_resolver import timezone_resolver
+            tz = await timezone_resolver.resolve(telegram_id)
+            return tz.key
         except Exception as e:
             logger.error(f"Error getting timezone for {telegram_id}: {e}", exc_info=True)
             return None
@@ -1,6 +1,6 @@
 """Telegram authentication utilities"""
 import logging
-from src.db.connection import db
+from src.utils.session_state import get_session_state
 
 logger = logging.getLogger(__name__)
 
@@ -11,38 +11,13 @@ async def is_authorized(telegram_id: str) -> bool:
 
     Returns True if user has active, trial, or cancelled (but not expired) subscription
     Returns False if user is pending, expired, or doesn't exist
+
+    Backed by the short-TTL session state cache, so repeated checks for the
+    same user within a few seconds don't hit the database.
     """
     try:
-        async with db.connection() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute(
-                    """
-                    SELECT subscription_status, subscription_end_date
-                    FROM users
-                    WHERE telegram_id = %s
-                    """,
-                    (telegram_id,)
-                )
-                result = await cur.fetchone()
-
-                if not result:
-                    return False
-
-                status = result['subscription_status']
-                end_date = result.get('subscription_end_date')
-
-                # Allow active and trial users
-                if status in ('active', 'trial'):
-                    return True
-
-                # Allow cancelled users if they still have time left
-                if status == 'cancelled' and end_date:
-                    from datetime import datetime
-                    if datetime.now() < end_date:
-                        return True
-
-                # pending and expired users cannot use bot
-                return False
+        state = await get_session_state(telegram_id)
+        return state.is_authorized
 
     except Exception as e:
         logger.error(f"Error checking authorization for {telegram_id}: {e}")
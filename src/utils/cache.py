@@ -4,27 +4,144 @@ Caching utilities for API endpoints
 Implements TTL-based in-memory caching with user-specific cache keys.
 Designed to reduce database load by caching frequently accessed data.
 
+Every entry is indexed under tags so invalidation touches only the keys
+involved instead of scanning the whole cache:
+- family:{key_prefix}          every entry of one cached function/family
+- user:{user_id}               every entry for a user
+- user:{user_id}:{key_prefix}  one family for one user
+
+The user tags are added when the cached function takes a `user_id` or
+`telegram_id` argument. The same tag names are used for Redis entries
+(RedisCache.set(..., tags=user_tags(...))).
+
+Two tiers:
+- L1: this process's LRU, bounded to CacheConfig.MAX_ENTRIES. Keys are
+  tuples of the function and its (frozen) arguments, without self/cls.
+- L2: Redis, for functions decorated with shared=True (results must
+  survive JSON/msgpack: no datetimes). A miss in one process can then be
+  served from another process's result.
+
+Stampede protection:
+- Concurrent misses for the same key share one load (single-flight)
+- TTLs are shortened by up to CacheConfig.TTL_JITTER so entries cached
+  together don't all expire together
+- With stale_ttl, an entry past its TTL is still served for up to
+  stale_ttl seconds while one background load refreshes it
+- Expired entries are swept from a heap ordered by expiry, a few per
+  store, so no full scan is needed
+
+Invalidation drops L1 entries locally, deletes the tagged Redis keys and
+publishes the tags on the invalidation bus (src/cache/invalidation.py) so
+the bot, API and every API replica drop their L1 entries too. Writers
+should `await invalidate(...)`. The synchronous invalidate_* helpers
+schedule the Redis/broadcast part in the background. Loads in flight for
+an invalidated tag still return their result but don't cache it.
+
 Target: 30% load reduction on user preferences, profiles, and gamification data.
 """
+import asyncio
+import heapq
+import inspect
+import itertools
 import logging
+import random
 import time
+from collections import OrderedDict
 from functools import wraps
-from typing import Any, Callable, Dict, Tuple, Optional
-from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Set, Tuple, Optional
+
+from src.observability.metrics import cache_lookups_total
 
 logger = logging.getLogger(__name__)
 
-# Cache storage: {cache_key: (value, expiry_timestamp)}
-_cache: Dict[str, Tuple[Any, float]] = {}
+# Expired entries removed per store; clear_expired_entries() removes all
+SWEEP_BATCH = 100
+
+
+class _LRUStore(OrderedDict):
+    """
+    L1 storage: {cache_key: (value, expiry_timestamp)}, least recently used first.
+
+    Every assignment also pushes (expiry, seq, key) onto `expiries`. Entries
+    are not removed from the heap when replaced or dropped; the sweep skips
+    heap items whose expiry no longer matches the stored entry.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.expiries: List[Tuple[float, int, Hashable]] = []
+        self._seq = itertools.count()
+
+    def __setitem__(self, key, entry):
+        super().__setitem__(key, entry)
+        heapq.heappush(self.expiries, (entry[1], next(self._seq), key))
+
+    def clear(self):
+        """Remove every entry, with its tags and refresh time"""
+        super().clear()
+        self.expiries.clear()
+        _refresh_at.clear()
+        _tag_index.clear()
+        _key_tags.clear()
+
+    def compact(self) -> None:
+        """Rebuild the expiry heap from the live entries"""
+        self.expiries = [(entry[1], next(self._seq), key) for key, entry in self.items()]
+        heapq.heapify(self.expiries)
+
+
+# Cache storage (L1)
+_cache = _LRUStore()
+
+# Stale-while-revalidate entries: cache key → time after which to refresh
+_refresh_at: Dict[Hashable, float] = {}
+
+# Tag index: tag → cache keys, and cache key → tags (to unindex on delete)
+_tag_index: Dict[str, Set[Hashable]] = {}
+_key_tags: Dict[Hashable, Set[str]] = {}
+
+# Argument names that identify the user a cached result belongs to
+USER_ARGUMENTS = ("user_id", "telegram_id")
 
 # Cache statistics for monitoring
 _cache_stats = {
     "hits": 0,
+    "l2_hits": 0,
+    "stale_hits": 0,
     "misses": 0,
+    "coalesced": 0,
+    "refreshes": 0,
     "invalidations": 0,
+    "evictions": 0,
     "total_queries": 0
 }
 
+# Per key family: {family: {"l1_hits", "l2_hits", "misses"}}
+_family_stats: Dict[str, Dict[str, int]] = {}
+
+# (tier, family, result) → labelled cache_lookups_total child
+_lookup_counters: Dict[Tuple[str, str, str], Any] = {}
+
+# Keep references to background invalidation tasks until they finish
+_propagation_tasks: Set[asyncio.Task] = set()
+
+
+class _Flight:
+    """One load in progress; callers missing the same key await its task"""
+
+    __slots__ = ("task", "tags", "valid", "background")
+
+    def __init__(self, tags: List[str], background: bool = False):
+        self.task: Optional[asyncio.Future] = None
+        self.tags = tags
+        # Cleared when one of the tags is invalidated: the result is then not cached
+        self.valid = True
+        self.background = background
+
+
+# Loads in progress by cache key
+_flights: Dict[Hashable, _Flight] = {}
+
 
 class CacheConfig:
     """Cache configuration constants"""
@@ -32,23 +149,203 @@ class CacheConfig:
     USER_PREFERENCES_TTL = 300  # 5 minutes
     USER_PROFILE_TTL = 300  # 5 minutes
     GAMIFICATION_TTL = 300  # 5 minutes (XP, streaks, achievements)
+    MEMORY_TTL = 3600  # 1 hour (profile/preferences markdown files)
+
+    # L1 entries kept per process before the least recently used are evicted
+    MAX_ENTRIES = 10_000
+
+    # Decorated functions cache for ttl * (1 - random() * TTL_JITTER) seconds
+    TTL_JITTER = 0.1
 
     # Enable/disable caching globally (useful for testing)
     ENABLED = True
 
 
+def family_tag(family: str) -> str:
+    return f"family:{family}"
+
+
+def user_family_tag(user_id: Any, family: str) -> str:
+    """Tag for one key family of one user: user:{id}:{family}"""
+    return f"user:{user_id}:{family}"
+
+
+def user_tags(user_id: Any, family: Optional[str] = None) -> List[str]:
+    """Tags for a user's entry: user:{id}, plus user:{id}:{family} if given"""
+    tags = [f"user:{user_id}"]
+    if family:
+        tags.append(user_family_tag(user_id, family))
+    return tags
+
+
+def _store(
+    cache_key: Hashable,
+    value: Any,
+    expiry: float,
+    tags: Iterable[str],
+    refresh_at: Optional[float] = None
+) -> None:
+    """
+    Store an entry, index it under its tags, sweep some expired entries and
+    evict the least recently used if over MAX_ENTRIES.
+
+    refresh_at: for stale-while-revalidate, when hits should start a refresh
+    """
+    _cache[cache_key] = (value, expiry)
+    _cache.move_to_end(cache_key)
+    if refresh_at is not None:
+        _refresh_at[cache_key] = refresh_at
+    else:
+        _refresh_at.pop(cache_key, None)
+
+    key_tags = _key_tags.setdefault(cache_key, set())
+    for tag in tags:
+        if tag not in key_tags:
+            key_tags.add(tag)
+            _tag_index.setdefault(tag, set()).add(cache_key)
+
+    _sweep(time.time(), SWEEP_BATCH)
+
+    while len(_cache) > CacheConfig.MAX_ENTRIES:
+        _drop(next(iter(_cache)))
+        _cache_stats["evictions"] += 1
+
+
+def _drop(cache_key: Hashable) -> bool:
+    """Remove an entry and its index entries; True if the entry was cached"""
+    _refresh_at.pop(cache_key, None)
+    for tag in _key_tags.pop(cache_key, ()):
+        keys = _tag_index.get(tag)
+        if keys is not None:
+            keys.discard(cache_key)
+            if not keys:
+                del _tag_index[tag]
+    return _cache.pop(cache_key, None) is not None
+
+
+def _sweep(now: float, limit: Optional[int] = None) -> int:
+    """
+    Drop entries that expired by `now`, soonest expiry first.
+
+    Looks at no more than `limit` heap items (all expired ones if None), so
+    the cost doesn't depend on how many live entries there are.
+
+    Returns:
+        Number of entries dropped
+    """
+    heap = _cache.expiries
+    popped = dropped = 0
+    while heap and heap[0][0] <= now and (limit is None or popped < limit):
+        expiry, _, cache_key = heapq.heappop(heap)
+        popped += 1
+        entry = _cache.get(cache_key)
+        # Skip heap items for entries that were replaced or dropped since
+        if entry is not None and entry[1] == expiry:
+            _drop(cache_key)
+            dropped += 1
+
+    if len(heap) > 2 * len(_cache) + 1024:
+        _cache.compact()
+    return dropped
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable form of an argument for L1 keys (lists, dicts and sets included)"""
+    if isinstance(value, (str, int, float, bytes, type(None))):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _jittered(ttl: float) -> float:
+    return ttl * (1 - random.random() * CacheConfig.TTL_JITTER)
+
+
+def _record_lookup(tier: str, family: str, result: str) -> None:
+    counter = _lookup_counters.get((tier, family, result))
+    if counter is None:
+        counter = _lookup_counters[(tier, family, result)] = cache_lookups_total.labels(
+            tier=tier, family=family, result=result
+        )
+    counter.inc()
+
+
+def _l2():
+    """The Redis cache when it is connected, else None"""
+    from src.cache.redis_client import get_cache
+
+    redis_cache = get_cache()
+    if redis_cache is None or not redis_cache.enabled:
+        return None
+    return redis_cache
+
+
+def _user_argument(func: Callable) -> Tuple[Optional[str], Optional[int]]:
+    """Name and position of the user id parameter of func, if it has one"""
+    try:
+        params = list(inspect.signature(func).parameters)
+    except (TypeError, ValueError):
+        return None, None
+    for name in USER_ARGUMENTS:
+        if name in params:
+            return name, params.index(name)
+    return None, None
+
+
+def _start_flight(
+    cache_key: Hashable,
+    tags: List[str],
+    load: Callable[[_Flight], Any],
+    background: bool = False
+) -> _Flight:
+    """Run load(flight) as the single load for cache_key"""
+    flight = _Flight(tags, background)
+    flight.task = asyncio.ensure_future(load(flight))
+    _flights[cache_key] = flight
+
+    def finish(task: asyncio.Future) -> None:
+        if _flights.get(cache_key) is flight:
+            del _flights[cache_key]
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None and background:
+            logger.warning(f"Background cache refresh failed for {cache_key}: {error}")
+
+    flight.task.add_done_callback(finish)
+    return flight
+
+
 def cache_with_ttl(
     ttl: int = CacheConfig.DEFAULT_TTL,
     key_prefix: str = "",
-    include_args: bool = True
+    include_args: bool = True,
+    shared: bool = False,
+    stale_ttl: int = 0
 ):
     """
     Decorator to cache function results with TTL (Time To Live).
 
+    Concurrent calls that miss the same key share a single call of the
+    function. The TTL is jittered down by up to CacheConfig.TTL_JITTER.
+
     Args:
         ttl: Time to live in seconds (default: 5 minutes)
         key_prefix: Prefix for cache key (helps organize cache entries)
         include_args: Whether to include function arguments in cache key
+        shared: Also cache in Redis (L2) so other processes can reuse the
+            result. Only for results that serialize losslessly (no datetimes).
+        stale_ttl: Keep serving a result for this many seconds after its TTL
+            while it is refreshed in the background (0 = off)
 
     Usage:
         @cache_with_ttl(ttl=300, key_prefix="user_profile")
@@ -57,6 +354,68 @@ def cache_with_ttl(
             return profile_data
     """
     def decorator(func: Callable) -> Callable:
+        family = key_prefix or func.__name__
+        func_id = f"{func.__module__}.{func.__qualname__}"
+        base_tags = [family_tag(family)]
+        user_param, user_index = _user_argument(func)
+        family_stats = _family_stats.setdefault(family, {"l1_hits": 0, "l2_hits": 0, "misses": 0})
+
+        # Methods: leave self out of the key so it is the same in every process
+        params = list(inspect.signature(func).parameters)
+        skip_args = 1 if params and params[0] in ("self", "cls") else 0
+
+        def l2_key(args: tuple, kwargs: dict) -> str:
+            if include_args:
+                args_key = "_".join(str(arg) for arg in args[skip_args:])
+                kwargs_key = "_".join(f"{k}={v}" for k, v in sorted(kwargs.items()))
+                return f"{key_prefix}:{func.__name__}:{args_key}:{kwargs_key}"
+            return f"{key_prefix}:{func.__name__}"
+
+        async def load(flight: _Flight, cache_key: Hashable, args: tuple, kwargs: dict) -> Any:
+            # L2: another process may already have computed it
+            redis_cache = _l2() if shared else None
+            if redis_cache is not None:
+                redis_key = l2_key(args, kwargs)
+                cached_value = await redis_cache.get(redis_key)
+                if cached_value is not None:
+                    _cache_stats["hits"] += 1
+                    _cache_stats["l2_hits"] += 1
+                    family_stats["l2_hits"] += 1
+                    _record_lookup("l2", family, "hit")
+                    if flight.valid:
+                        lifetime = _jittered(ttl)
+                        now = time.time()
+                        _store(
+                            cache_key, cached_value, now + lifetime + stale_ttl, flight.tags,
+                            now + lifetime if stale_ttl else None
+                        )
+                    return cached_value
+                _record_lookup("l2", family, "miss")
+
+            # Cache miss - execute function
+            _cache_stats["misses"] += 1
+            family_stats["misses"] += 1
+            logger.debug(f"Cache MISS: {cache_key}")
+
+            result = await func(*args, **kwargs)
+
+            if not flight.valid:
+                logger.debug(f"Cache NOT STORED (invalidated during load): {cache_key}")
+                return result
+
+            # Store in cache with expiry timestamp, tagged by family and user
+            lifetime = _jittered(ttl)
+            now = time.time()
+            _store(
+                cache_key, result, now + lifetime + stale_ttl, flight.tags,
+                now + lifetime if stale_ttl else None
+            )
+            if redis_cache is not None and result is not None:
+                await redis_cache.set(redis_key, result, ttl=max(1, int(lifetime)), tags=flight.tags)
+            logger.debug(f"Cache STORED: {cache_key} (TTL: {lifetime:.0f}s)")
+
+            return result
+
         @wraps(func)
         async def wrapper(*args, **kwargs) -> Any:
             global _cache_stats
@@ -68,51 +427,151 @@ def cache_with_ttl(
 
             # Build cache key
             if include_args:
-                # Convert args and kwargs to a hashable key
-                args_key = "_".join(str(arg) for arg in args)
-                kwargs_key = "_".join(f"{k}={v}" for k, v in sorted(kwargs.items()))
-                cache_key = f"{key_prefix}:{func.__name__}:{args_key}:{kwargs_key}"
+                cache_key = (
+                    family,
+                    func_id,
+                    _freeze(args[skip_args:]),
+                    frozenset((k, _freeze(v)) for k, v in kwargs.items())
+                )
             else:
-                cache_key = f"{key_prefix}:{func.__name__}"
+                cache_key = (family, func_id)
 
             # Check if value exists in cache and is not expired
             current_time = time.time()
-            if cache_key in _cache:
-                cached_value, expiry = _cache[cache_key]
+            entry = _cache.get(cache_key)
+            if entry is not None:
+                cached_value, expiry = entry
                 if current_time < expiry:
+                    _cache.move_to_end(cache_key)
                     _cache_stats["hits"] += 1
-                    logger.debug(
-                        f"Cache HIT: {cache_key} "
-                        f"(expires in {int(expiry - current_time)}s)"
-                    )
+                    family_stats["l1_hits"] += 1
+                    _record_lookup("l1", family, "hit")
+
+                    refresh_at = _refresh_at.get(cache_key)
+                    if refresh_at is not None and current_time >= refresh_at:
+                        # Stale: serve it and refresh in the background (once)
+                        _cache_stats["stale_hits"] += 1
+                        if cache_key not in _flights:
+                            _cache_stats["refreshes"] += 1
+                            _start_flight(
+                                cache_key,
+                                list(_key_tags.get(cache_key, base_tags)),
+                                lambda flight: load(flight, cache_key, args, kwargs),
+                                background=True
+                            )
+                        logger.debug(f"Cache STALE HIT: {cache_key}")
+                    else:
+                        logger.debug(
+                            f"Cache HIT: {cache_key} "
+                            f"(expires in {int(expiry - current_time)}s)"
+                        )
                     return cached_value
                 else:
                     # Expired entry, remove it
-                    del _cache[cache_key]
+                    _drop(cache_key)
                     logger.debug(f"Cache EXPIRED: {cache_key}")
 
-            # Cache miss - execute function
-            _cache_stats["misses"] += 1
-            logger.debug(f"Cache MISS: {cache_key}")
-
-            result = await func(*args, **kwargs)
-
-            # Store in cache with expiry timestamp
-            _cache[cache_key] = (result, current_time + ttl)
-            logger.debug(f"Cache STORED: {cache_key} (TTL: {ttl}s)")
+            _record_lookup("l1", family, "miss")
 
-            return result
+            # Another caller is already loading this key: wait for its result
+            flight = _flights.get(cache_key)
+            if flight is not None:
+                _cache_stats["coalesced"] += 1
+                logger.debug(f"Cache COALESCED: {cache_key}")
+            else:
+                tags = base_tags
+                if user_param is not None:
+                    user_id = args[user_index] if len(args) > user_index else kwargs.get(user_param)
+                    if user_id is not None:
+                        tags = base_tags + user_tags(user_id, family)
+                flight = _start_flight(
+                    cache_key, tags, lambda flight: load(flight, cache_key, args, kwargs)
+                )
+
+            # Shielded: a cancelled caller doesn't cancel the load for the others
+            return await asyncio.shield(flight.task)
 
         return wrapper
     return decorator
 
 
+def _drop_tags(tags: Iterable[str]) -> int:
+    tags = set(tags)
+    keys: Set[Hashable] = set()
+    for tag in tags:
+        keys.update(_tag_index.get(tag, ()))
+
+    # Loads already running may have read the old data: don't cache their results
+    for cache_key, flight in list(_flights.items()):
+        if not tags.isdisjoint(flight.tags):
+            flight.valid = False
+            del _flights[cache_key]
+
+    count = sum(1 for key in keys if _drop(key))
+    _cache_stats["invalidations"] += count
+    return count
+
+
+async def _propagate(tags: Tuple[str, ...]) -> None:
+    """Delete the tagged Redis (L2) entries and tell other processes to drop theirs"""
+    redis_cache = _l2()
+    if redis_cache is None:
+        return
+
+    from src.cache.invalidation import invalidation_bus
+
+    await redis_cache.invalidate_tags(*tags)
+    await invalidation_bus.publish(tags)
+
+
+def invalidate_tags(*tags: str, broadcast: bool = True) -> int:
+    """
+    Invalidate every cache entry indexed under any of the given tags.
+
+    Costs O(entries under those tags), independent of total cache size.
+    With broadcast, the Redis entries and other processes' L1 entries are
+    invalidated in the background (use `await invalidate(...)` to wait).
+
+    Returns:
+        Number of L1 entries invalidated in this process
+    """
+    count = _drop_tags(tags)
+
+    if broadcast and tags and _l2() is not None:
+        try:
+            task = asyncio.get_running_loop().create_task(_propagate(tags))
+        except RuntimeError:
+            logger.warning(f"No event loop: cache tags {tags} invalidated in this process only")
+        else:
+            _propagation_tasks.add(task)
+            task.add_done_callback(_propagation_tasks.discard)
+
+    return count
+
+
+async def invalidate(*tags: str) -> int:
+    """
+    Invalidate tags in this process, in Redis and in every other process.
+
+    Returns once Redis is updated and the invalidation is published.
+
+    Returns:
+        Number of L1 entries invalidated in this process
+    """
+    count = _drop_tags(tags)
+    if tags:
+        await _propagate(tags)
+    return count
+
+
 def invalidate_cache(pattern: Optional[str] = None, user_id: Optional[str] = None) -> int:
     """
-    Invalidate cache entries matching a pattern or user_id.
+    Invalidate cache entries for a key family (key_prefix) and/or user_id.
+
+    Matching is exact, by tag: user "12" never matches user "123".
 
     Args:
-        pattern: String pattern to match in cache keys (e.g., "user_profile")
+        pattern: Key family, i.e. the cache_with_ttl key_prefix (e.g., "user_profile")
         user_id: User ID to invalidate all cache entries for
 
     Returns:
@@ -129,27 +588,19 @@ def invalidate_cache(pattern: Optional[str] = None, user_id: Optional[str] = Non
         # Clear entire cache
         count = len(_cache)
         _cache.clear()
+        for flight in _flights.values():
+            flight.valid = False
+        _flights.clear()
         _cache_stats["invalidations"] += count
         logger.info(f"Cleared entire cache ({count} entries)")
         return count
 
-    # Find matching keys
-    keys_to_delete = []
-    for key in _cache.keys():
-        match = True
-        if pattern and pattern not in key:
-            match = False
-        if user_id and user_id not in key:
-            match = False
-        if match:
-            keys_to_delete.append(key)
-
-    # Delete matching keys
-    for key in keys_to_delete:
-        del _cache[key]
-
-    count = len(keys_to_delete)
-    _cache_stats["invalidations"] += count
+    if user_id:
+        tag = user_family_tag(user_id, pattern) if pattern else user_tags(user_id)[0]
+    else:
+        tag = family_tag(pattern)
+
+    count = invalidate_tags(tag)
 
     if count > 0:
         logger.info(
@@ -179,8 +630,12 @@ def get_cache_stats() -> dict:
     Get cache performance statistics.
 
     Returns:
-        dict with hits, misses, hit_rate, invalidations, total_queries
+        dict with hits (L1 + L2), l2_hits, stale_hits, misses, coalesced
+        waits, background refreshes, hit_rate, invalidations, total_queries,
+        per-family hits and invalidation bus status
     """
+    from src.cache.invalidation import invalidation_bus
+
     hits = _cache_stats["hits"]
     total = _cache_stats["total_queries"]
 
@@ -188,11 +643,21 @@ def get_cache_stats() -> dict:
 
     return {
         "hits": hits,
+        "l2_hits": _cache_stats["l2_hits"],
+        "stale_hits": _cache_stats["stale_hits"],
         "misses": _cache_stats["misses"],
+        "coalesced": _cache_stats["coalesced"],
+        "refreshes": _cache_stats["refreshes"],
+        "in_flight": len(_flights),
         "hit_rate_percent": round(hit_rate, 2),
         "invalidations": _cache_stats["invalidations"],
         "total_queries": total,
         "cache_size": len(_cache),
+        "max_entries": CacheConfig.MAX_ENTRIES,
+        "evictions": _cache_stats["evictions"],
+        "tags": len(_tag_index),
+        "families": {family: dict(stats) for family, stats in _family_stats.items()},
+        "invalidation_bus": invalidation_bus.get_stats(),
         "load_reduction_percent": round(hit_rate, 2)  # Hit rate = load reduction
     }
 
@@ -202,10 +667,19 @@ def reset_cache_stats():
     global _cache_stats
     _cache_stats = {
         "hits": 0,
+        "l2_hits": 0,
+        "stale_hits": 0,
         "misses": 0,
+        "coalesced": 0,
+        "refreshes": 0,
         "invalidations": 0,
+        "evictions": 0,
         "total_queries": 0
     }
+    # Wrappers hold their family's dict, so reset in place
+    for stats in _family_stats.values():
+        for name in stats:
+            stats[name] = 0
     logger.info("Cache statistics reset")
 
 
@@ -213,25 +687,18 @@ def clear_expired_entries() -> int:
     """
     Manually clear expired cache entries.
 
-    This is automatically done on cache access, but can be called
-    explicitly for cleanup.
+    Expired entries are also dropped on access and, a few at a time, on
+    every store. Walks the expiry heap, so it only touches expired entries.
 
     Returns:
         Number of expired entries removed
     """
-    current_time = time.time()
-    expired_keys = [
-        key for key, (_, expiry) in _cache.items()
-        if current_time >= expiry
-    ]
+    count = _sweep(time.time())
 
-    for key in expired_keys:
-        del _cache[key]
+    if count:
+        logger.info(f"Cleared {count} expired cache entries")
 
-    if expired_keys:
-        logger.info(f"Cleared {len(expired_keys)} expired cache entries")
-
-    return len(expired_keys)
+    return count
 
 
 def warm_user_cache(user_id: str, data: Dict[str, Any]) -> None:
@@ -260,7 +727,12 @@ def warm_user_cache(user_id: str, data: Dict[str, Any]) -> None:
             ttl = CacheConfig.DEFAULT_TTL
 
         cache_key = f"{key_suffix}:{user_id}"
-        _cache[cache_key] = (value, current_time + ttl)
+        _store(
+            cache_key,
+            value,
+            current_time + ttl,
+            [family_tag(key_suffix)] + user_tags(user_id, key_suffix)
+        )
         count += 1
 
     logger.info(f"Warmed cache for user {user_id} with {count} entries")
@@ -20,17 +20,18 @@ from typing import Optional, Union
 from zoneinfo import ZoneInfo
 import pytz
 
-from src.utils.timezone_helper import get_timezone_from_profile
+from src.utils.timezone_resolver import DEFAULT_TIMEZONE, timezone_resolver
 
 logger = logging.getLogger(__name__)
 
-# Default timezone if user hasn't set one
-DEFAULT_TIMEZONE = "UTC"
-
 
 def get_user_timezone(user_id: str) -> ZoneInfo:
     """
-    Get user's timezone from profile, or return default
+    Get user's timezone from the resolver cache, or return default
+
+    This never does I/O. Async callers should ``await
+    timezone_resolver.resolve(user_id)`` first; on a cold miss the cache is
+    warmed in the background and the default timezone is returned.
 
     Args:
         user_id: User's Telegram ID
@@ -38,16 +39,26 @@ def get_user_timezone(user_id: str) -> ZoneInfo:
     Returns:
         ZoneInfo object for user's timezone
     """
-    tz_str = get_timezone_from_profile(user_id)
-    if not tz_str:
-        tz_str = DEFAULT_TIMEZONE
-        logger.debug(f"No timezone set for user {user_id}, using {DEFAULT_TIMEZONE}")
+    tz = timezone_resolver.get_cached(user_id)
+    if tz is not None:
+        return tz
 
-    try:
-        return ZoneInfo(tz_str)
-    except Exception as e:
-        logger.error(f"Invalid timezone '{tz_str}' for user {user_id}: {e}")
-        return ZoneInfo(DEFAULT_TIMEZONE)
+    logger.debug(f"Timezone for user {user_id} not resolved yet, using {DEFAULT_TIMEZONE}")
+    timezone_resolver.schedule_resolve(user_id)
+    return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+async def get_user_timezone_async(user_id: str) -> ZoneInfo:
+    """
+    Get user's timezone, loading it from the database if not cached
+
+    Args:
+        user_id: User's Telegram ID
+
+    Returns:
+        ZoneInfo object for user's timezone
+    """
+    return await timezone_resolver.resolve(user_id)
 
 
 def now_utc() -> datetime:
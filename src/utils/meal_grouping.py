@@ -0,0 +1,62 @@
+"""Normalized meal-group keys for formula detection
+
+Two food entries belong to the same meal group when they contain the same
+foods in roughly the same quantities. The key is stored on each food entry
+(food_entries.meal_group_key) and aggregated per user in meal_group_stats,
+so it must stay stable: changing it requires re-running
+scripts/backfill_meal_groups.py.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Union
+
+
+def normalize_quantity(quantity: Any) -> str:
+    """Normalize quantity for grouping (allow ~10% variation)"""
+    if not quantity:
+        return ""
+
+    # Extract number from quantity string
+    match = re.search(r'(\d+(?:\.\d+)?)', str(quantity))
+    if not match:
+        return str(quantity).lower()
+
+    value = float(match.group(1))
+
+    # Round to nearest 10 for grouping (allows small variations)
+    rounded = round(value / 10) * 10
+
+    # Preserve unit
+    unit = str(quantity).replace(match.group(1), "").strip()
+
+    return f"{int(rounded)}{unit}"
+
+
+def group_key_for_sorted_foods(foods: List[Dict]) -> str:
+    """
+    Key for foods that are already sorted by name
+
+    Uses food names and rounded quantities to allow minor variations
+    """
+    key_parts = []
+    for food in foods:
+        name = food.get("name", "").lower().strip()
+        normalized_qty = normalize_quantity(food.get("quantity", ""))
+        key_parts.append(f"{name}:{normalized_qty}")
+
+    return "|".join(key_parts)
+
+
+def meal_group_key(foods: Union[str, List[Dict]]) -> str:
+    """
+    Meal-group key for a food entry's foods (JSON string or list of dicts)
+
+    Example: [{"name": "Banana", "quantity": "118g"}, {"name": "Oats", "quantity": "40g"}]
+    -> "banana:120g|oats:40g"
+    """
+    if isinstance(foods, str):
+        foods = json.loads(foods)
+
+    # Sort foods by name for consistent comparison
+    return group_key_for_sorted_foods(sorted(foods or [], key=lambda f: f.get("name", "")))
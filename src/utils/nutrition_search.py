@@ -203,7 +203,7 @@ async def search_usda(
     from src.cache.redis_client import get_cache
 
     redis_cache = get_cache()
-    redis_cache_key = f"usda:{food_name}:{max_results}"
+    redis_cache_key = _usda_cache_key(food_name, max_results)
 
     # Check Redis cache first
     if redis_cache:
@@ -266,6 +266,54 @@ async def search_usda(
         raise  # Re-raise for circuit breaker and retry logic
 
 
+def _usda_cache_key(food_name: str, max_results: int) -> str:
+    return f"usda:{food_name}:{max_results}"
+
+
+async def prefetch_usda(
+    food_names: List[str],
+    max_results: int = 3
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Look up cached USDA results for a whole plate in one Redis round trip.
+
+    Names with a fresh in-memory entry are skipped; the rest are fetched
+    with a single MGET. Names that aren't cached are left out, so callers
+    fall back to search_usda() for those.
+
+    Args:
+        food_names: Normalized food names
+        max_results: Must match the max_results later passed to search_usda
+
+    Returns:
+        Dict of food name → cached USDA response
+    """
+    if not ENABLE_NUTRITION_VERIFICATION:
+        return {}
+
+    from src.cache.redis_client import get_cache
+
+    redis_cache = get_cache()
+    if not redis_cache:
+        return {}
+
+    now = datetime.now()
+    keys = {}
+    for name in food_names:
+        cached = _cache.get(f"{name}:{max_results}")
+        if cached and now - cached[1] < CACHE_DURATION:
+            continue
+        keys[_usda_cache_key(name, max_results)] = name
+
+    if not keys:
+        return {}
+
+    found = await redis_cache.get_many(keys)
+    if found:
+        logger.info(f"Redis cache hit for {len(found)}/{len(keys)} foods")
+    return {keys[key]: data for key, data in found.items() if data}
+
+
 def scale_nutrients(
     usda_food: Dict[str, Any],
     target_amount: float,
@@ -365,6 +413,13 @@ async def verify_food_items(food_items: List[FoodItem]) -> List[FoodItem]:
 
     verified_items = []
 
+    # Resolve every cached food on the plate in one round trip
+    try:
+        prefetched = await prefetch_usda([normalize_food_name(item.name) for item in food_items])
+    except Exception as e:
+        logger.warning(f"USDA cache prefetch failed: {e}")
+        prefetched = {}
+
     for item in food_items:
         try:
             # Normalize food name
@@ -373,8 +428,8 @@ async def verify_food_items(food_items: List[FoodItem]) -> List[FoodItem]:
             # Parse quantity
             amount, unit = parse_quantity(item.quantity)
 
-            # Search USDA
-            usda_results = await search_usda(normalized_name)
+            # Search USDA (cached results were prefetched above)
+            usda_results = prefetched.get(normalized_name) or await search_usda(normalized_name)
 
             if not usda_results or not usda_results.get('foods'):
                 logger.info(f"No USDA match for '{item.name}', using AI estimate")
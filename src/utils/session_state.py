@@ -0,0 +1,152 @@
+"""
+Per-message session state with a short-TTL cache
+
+Every incoming message needs the user's subscription (for authorization and
+activation routing) and onboarding state. SessionState loads both with a
+single query and keeps the result for a few seconds, so back-to-back
+messages skip the database entirely.
+
+Writes that change subscription or onboarding state call
+invalidate_session_state() so the next message sees fresh data.
+"""
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStateConfig:
+    """Session state cache configuration constants"""
+    TTL = 5  # seconds
+    MAX_SIZE = 10_000
+
+    # Enable/disable caching globally (useful for testing)
+    ENABLED = True
+
+
+_SUBSCRIPTION_COLUMNS = {
+    'subscription_status': 'status',
+    'subscription_tier': 'tier',
+    'subscription_start_date': 'start_date',
+    'subscription_end_date': 'end_date',
+    'activated_at': 'activated_at',
+    'invite_code_used': 'invite_code_used',
+}
+
+_ONBOARDING_COLUMNS = (
+    'onboarding_path', 'current_step', 'step_data', 'completed_steps',
+    'started_at', 'completed_at', 'last_interaction_at',
+)
+
+
+def is_subscription_authorized(status: Optional[str], end_date: Optional[datetime]) -> bool:
+    """
+    Decide whether a subscription grants access to the bot
+
+    Active and trial users are allowed, cancelled users are allowed until
+    their end date, pending and expired users are not.
+    """
+    if status in ('active', 'trial'):
+        return True
+    if status == 'cancelled' and end_date:
+        return datetime.now() < end_date
+    return False
+
+
+@dataclass(frozen=True)
+class SessionState:
+    """Subscription and onboarding state for a user"""
+    user_id: str
+    subscription: Optional[dict]
+    onboarding: Optional[dict]
+
+    @property
+    def is_authorized(self) -> bool:
+        """Check if the user may use the bot (evaluated at call time)"""
+        if not self.subscription:
+            return False
+        return is_subscription_authorized(
+            self.subscription.get('status'),
+            self.subscription.get('end_date')
+        )
+
+    @classmethod
+    def from_row(cls, user_id: str, row: Optional[dict]) -> "SessionState":
+        """Build from a get_session_state_row() result"""
+        if not row:
+            return cls(user_id=user_id, subscription=None, onboarding=None)
+
+        subscription = {key: row[column] for column, key in _SUBSCRIPTION_COLUMNS.items()}
+        onboarding = None
+        if row.get('onboarding_user_id') is not None:
+            onboarding = {column: row[column] for column in _ONBOARDING_COLUMNS}
+
+        return cls(user_id=user_id, subscription=subscription, onboarding=onboarding)
+
+
+# Cache storage: {user_id: (state, expiry_timestamp)}
+_session_cache: "OrderedDict[str, tuple[SessionState, float]]" = OrderedDict()
+
+_session_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+async def get_session_state(user_id: str) -> SessionState:
+    """
+    Get session state for a user, loading it with one query on a miss
+
+    Args:
+        user_id: Telegram user ID
+
+    Returns:
+        SessionState (subscription and onboarding are None if not found)
+    """
+    now = time.monotonic()
+
+    if SessionStateConfig.ENABLED:
+        cached = _session_cache.get(user_id)
+        if cached is not None:
+            state, expiry = cached
+            if now < expiry:
+                _session_cache.move_to_end(user_id)
+                _session_stats["hits"] += 1
+                return state
+            del _session_cache[user_id]
+
+    _session_stats["misses"] += 1
+
+    from src.db.queries import get_session_state_row
+
+    row = await get_session_state_row(user_id)
+    state = SessionState.from_row(user_id, row)
+
+    if SessionStateConfig.ENABLED:
+        _session_cache[user_id] = (state, now + SessionStateConfig.TTL)
+        while len(_session_cache) > SessionStateConfig.MAX_SIZE:
+            _session_cache.popitem(last=False)
+
+    return state
+
+
+def invalidate_session_state(user_id: Optional[str] = None) -> None:
+    """
+    Drop cached session state for a user (or everyone when user_id is None)
+
+    Call after activation, subscription changes and onboarding updates.
+    """
+    if user_id is None:
+        _session_stats["invalidations"] += len(_session_cache)
+        _session_cache.clear()
+        return
+
+    if _session_cache.pop(user_id, None) is not None:
+        _session_stats["invalidations"] += 1
+        logger.debug(f"Invalidated session state for {user_id}")
+
+
+def get_session_stats() -> dict:
+    """Get session state cache statistics"""
+    return {**_session_stats, "size": len(_session_cache)}
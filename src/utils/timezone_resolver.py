@@ -0,0 +1,134 @@
+"""
+Cached user timezone resolution
+
+Resolves a user's timezone from ``user_profiles.timezone`` (the source of
+truth since migration 010) and keeps the resulting ZoneInfo objects in a
+bounded in-process LRU. The synchronous helpers in datetime_helpers only
+read from this cache, so no disk or database I/O happens on the event loop
+when converting times.
+
+Async code paths should call ``await timezone_resolver.resolve(user_id)``
+(or ``resolve_many`` for the scheduler) before using the sync helpers.
+"""
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+# Default timezone if user hasn't set one
+DEFAULT_TIMEZONE = "UTC"
+
+# Maximum number of users kept in the in-process cache
+TIMEZONE_CACHE_MAX_SIZE = 10_000
+
+
+def _to_zoneinfo(tz_name: Optional[str], user_id: str) -> ZoneInfo:
+    """Build a ZoneInfo, falling back to the default on invalid names"""
+    if not tz_name:
+        return ZoneInfo(DEFAULT_TIMEZONE)
+    try:
+        # ZoneInfo keeps its own cache, so repeated names share one object
+        return ZoneInfo(tz_name)
+    except Exception as e:
+        logger.error(f"Invalid timezone '{tz_name}' for user {user_id}: {e}")
+        return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+class TimezoneResolver:
+    """LRU cache of user_id -> ZoneInfo backed by the user_profiles table"""
+
+    def __init__(self, max_size: int = TIMEZONE_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._cache: "OrderedDict[str, ZoneInfo]" = OrderedDict()
+        self._pending: set[asyncio.Task] = set()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get_cached(self, user_id: str) -> Optional[ZoneInfo]:
+        """Return the cached timezone without doing any I/O"""
+        tz = self._cache.get(user_id)
+        if tz is None:
+            self._stats["misses"] += 1
+            return None
+        self._cache.move_to_end(user_id)
+        self._stats["hits"] += 1
+        return tz
+
+    def prime(self, user_id: str, tz_name: Optional[str]) -> ZoneInfo:
+        """Store a timezone for a user (e.g. after a write) and return it"""
+        tz = _to_zoneinfo(tz_name, user_id)
+        self._cache[user_id] = tz
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+        return tz
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop one user's entry, or the whole cache when user_id is None"""
+        if user_id is None:
+            self._stats["invalidations"] += len(self._cache)
+            self._cache.clear()
+            return
+        if self._cache.pop(user_id, None) is not None:
+            self._stats["invalidations"] += 1
+
+    async def resolve(self, user_id: str) -> ZoneInfo:
+        """Get a user's timezone, loading it from the database on a miss"""
+        tz = self.get_cached(user_id)
+        if tz is not None:
+            return tz
+        resolved = await self.resolve_many([user_id])
+        return resolved[user_id]
+
+    async def resolve_many(self, user_ids: Iterable[str]) -> dict[str, ZoneInfo]:
+        """
+        Resolve timezones for many users with a single query for the misses.
+
+        Users without a profile row are cached with the default timezone so
+        they don't trigger a query on every call.
+        """
+        result: dict[str, ZoneInfo] = {}
+        missing: list[str] = []
+        for user_id in dict.fromkeys(user_ids):
+            tz = self.get_cached(user_id)
+            if tz is None:
+                missing.append(user_id)
+            else:
+                result[user_id] = tz
+
+        if missing:
+            from src.db.queries import get_user_timezones
+
+            try:
+                names = await get_user_timezones(missing)
+            except Exception as e:
+                logger.error(f"Failed to load timezones for {len(missing)} users: {e}")
+                # Don't cache on failure so the next call retries
+                for user_id in missing:
+                    result[user_id] = ZoneInfo(DEFAULT_TIMEZONE)
+                return result
+
+            for user_id in missing:
+                result[user_id] = self.prime(user_id, names.get(user_id))
+
+        return result
+
+    def schedule_resolve(self, user_id: str) -> None:
+        """Warm the cache in the background when called from sync code on a loop"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.resolve(user_id))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        return {**self._stats, "size": len(self._cache), "max_size": self.max_size}
+
+
+# Global resolver instance
+timezone_resolver = TimezoneResolver()
@@ -1,4 +1,5 @@
 """Vision AI integration for food photo analysis"""
+import asyncio
 import logging
 import base64
 import json
@@ -10,6 +11,12 @@ from src.models.food import VisionAnalysisResult, FoodItem, FoodMacros
 logger = logging.getLogger(__name__)
 
 
+def encode_image(photo_path: str) -> str:
+    """Read a photo and return it base64 encoded (blocking, run via asyncio.to_thread)"""
+    with open(photo_path, "rb") as f:
+        return base64.b64encode(f.read()).decode('utf-8')
+
+
 async def analyze_food_photo(
     photo_path: str,
     caption: Optional[str] = None,
@@ -40,9 +47,8 @@ async def analyze_food_photo(
     if caption:
         logger.info(f"User caption: {caption}")
 
-    # Read and encode image
-    with open(photo_path, "rb") as f:
-        image_data = base64.b64encode(f.read()).decode('utf-8')
+    # Read and encode image (off the event loop)
+    image_data = await asyncio.to_thread(encode_image, photo_path)
 
     # Route to appropriate vision API
     if VISION_MODEL.startswith("openai:"):
@@ -1,4 +1,7 @@
 """Global test fixtures and utilities for health-agent tests"""
+import os
+import uuid
+from contextlib import asynccontextmanager
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, Mock, MagicMock, patch
@@ -42,6 +45,54 @@ def mock_db_pool():
     return pool
 
 
+# PostgreSQL-backed tests: set TEST_DATABASE_URL (e.g.
+# postgresql://postgres@localhost/postgres). Each test runs in its own
+# throwaway schema, so it is safe to point at a development database.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+@pytest.fixture
+async def pg_conn():
+    """
+    Connection to TEST_DATABASE_URL with search_path set to a new schema
+
+    db.connection() is patched to hand out this connection, so query
+    functions run against it. Create tables with apply_migration() or
+    plain DDL; the schema is dropped afterwards.
+    """
+    if not TEST_DATABASE_URL:
+        pytest.skip("Set TEST_DATABASE_URL to run database-backed tests")
+
+    import psycopg
+    from psycopg.rows import dict_row
+    from src.db.connection import db
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    conn = await psycopg.AsyncConnection.connect(TEST_DATABASE_URL, row_factory=dict_row)
+    await conn.execute(f"CREATE SCHEMA {schema}")
+    await conn.execute(f"SET search_path TO {schema}, public")
+    await conn.commit()
+
+    @asynccontextmanager
+    async def connection(*args, **kwargs):
+        yield conn
+
+    try:
+        with patch.object(db, "connection", connection):
+            yield conn
+    finally:
+        await conn.rollback()
+        await conn.execute(f"DROP SCHEMA {schema} CASCADE")
+        await conn.commit()
+        await conn.close()
+
+
+async def apply_migration(conn, filename: str) -> None:
+    """Run a file from migrations/ on a pg_conn connection and commit"""
+    await conn.execute((MIGRATIONS_DIR / filename).read_text())
+    await conn.commit()
+
+
 # ============================================================================
 # User & Auth Fixtures
 # ============================================================================
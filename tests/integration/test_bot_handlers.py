@@ -190,7 +190,7 @@ async def test_clear_command(mock_telegram_update, mock_telegram_context, test_u
     mock_telegram_update.effective_user.id = int(test_user_id)
 
     with patch('src.bot.is_authorized', return_value=True):
-        with patch('src.bot.clear_conversation_history', AsyncMock()) as mock_clear:
+        with patch('src.bot.conversation_store.clear', AsyncMock()) as mock_clear:
             await clear_command(mock_telegram_update, mock_telegram_context)
 
             mock_clear.assert_called_once_with(test_user_id)
@@ -212,7 +212,7 @@ async def test_handle_message_authorized(mock_telegram_update, mock_telegram_con
     with patch('src.bot.should_process_message', return_value=True):
         with patch('src.bot.is_authorized', return_value=True):
             with patch('src.bot.get_agent_response', AsyncMock(return_value=mock_response)):
-                with patch('src.bot.save_conversation_message', AsyncMock()):
+                with patch('src.bot.conversation_store.save_turn', AsyncMock()):
                     await handle_message(mock_telegram_update, mock_telegram_context)
 
                     mock_telegram_update.message.reply_text.assert_called()
@@ -250,11 +250,11 @@ async def test_handle_message_saves_conversation(mock_telegram_update, mock_tele
     with patch('src.bot.should_process_message', return_value=True):
         with patch('src.bot.is_authorized', return_value=True):
             with patch('src.bot.get_agent_response', AsyncMock(return_value=agent_response)):
-                with patch('src.bot.save_conversation_message', AsyncMock()) as mock_save:
+                with patch('src.bot.conversation_store.save_turn', AsyncMock()) as mock_save:
                     await handle_message(mock_telegram_update, mock_telegram_context)
 
-                    # Should save both user message and agent response
-                    assert mock_save.call_count == 2
+                    # Should save user message and agent response as one turn
+                    mock_save.assert_called_once()
 
 
 # ============================================================================
@@ -330,7 +330,7 @@ async def test_handle_voice_authorized(mock_telegram_update, mock_telegram_conte
         with patch('src.bot.is_authorized', return_value=True):
             with patch('src.bot.transcribe_voice', AsyncMock(return_value=transcription)):
                 with patch('src.bot.get_agent_response', AsyncMock(return_value="Got it!")):
-                    with patch('src.bot.save_conversation_message', AsyncMock()):
+                    with patch('src.bot.conversation_store.save_turn', AsyncMock()):
                         await handle_voice(mock_telegram_update, mock_telegram_context)
 
                         # Should process transcribed message
@@ -0,0 +1,109 @@
+"""
+Food entry queries and the meal-group index against a real PostgreSQL
+(set TEST_DATABASE_URL)
+
+Kept apart from test_postgres_queries.py because formula detection
+imports src.services.
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from src.db.queries.food import save_food_entry, update_food_entry
+from src.models.food import FoodEntry, FoodItem, FoodMacros
+from src.services.formula_detection import FormulaDetectionService
+from tests.conftest import apply_migration
+
+USER_ID = "12345"
+
+
+@pytest.fixture
+async def food_db(pg_conn):
+    """food_entries as migrated up to the meal-group index (032)"""
+    await apply_migration(pg_conn, "001_initial_schema.sql")
+    await apply_migration(pg_conn, "009_food_entry_corrections.sql")
+    # What migration 011 does to food_entries
+    await pg_conn.execute(
+        "ALTER TABLE food_entries ALTER COLUMN timestamp TYPE TIMESTAMPTZ "
+        "USING timestamp AT TIME ZONE 'UTC'"
+    )
+    await pg_conn.commit()
+    await apply_migration(pg_conn, "032_meal_group_stats.sql")
+    await pg_conn.execute("INSERT INTO users (telegram_id) VALUES (%s)", (USER_ID,))
+    await pg_conn.commit()
+
+    with patch("src.db.queries.food._create_food_health_event", new=AsyncMock()):
+        yield pg_conn
+
+
+def _shake(timestamp: datetime, calories: int = 265) -> FoodEntry:
+    return FoodEntry(
+        user_id=USER_ID,
+        timestamp=timestamp,
+        foods=[
+            FoodItem(name="Protein Powder", quantity="30g", calories=120,
+                     macros=FoodMacros(protein=25, carbs=3, fat=2)),
+            FoodItem(name="Banana", quantity="1 medium", calories=calories - 120,
+                     macros=FoodMacros(protein=1, carbs=27, fat=0)),
+        ],
+        total_calories=calories,
+        total_macros=FoodMacros(protein=26, carbs=30, fat=2),
+        notes="morning protein shake",
+    )
+
+
+class TestMealGroupIndex:
+    """meal_group_stats maintained by save/update (migration 032)"""
+
+    @pytest.mark.asyncio
+    async def test_save_records_aware_timestamps(self, food_db):
+        seen = datetime.now(timezone(timedelta(hours=2))).replace(microsecond=0)
+        for days in (2, 0, 1):
+            await save_food_entry(_shake(seen - timedelta(days=days)))
+
+        async with food_db.cursor() as cur:
+            await cur.execute("SELECT * FROM meal_group_stats")
+            stats = await cur.fetchall()
+
+        assert len(stats) == 1
+        assert stats[0]["occurrence_count"] == 3
+        assert stats[0]["calorie_mean"] == 265
+        assert stats[0]["first_seen_at"] == seen - timedelta(days=2)
+        assert stats[0]["last_seen_at"] == seen
+
+    @pytest.mark.asyncio
+    async def test_correction_moves_entry_between_groups(self, food_db):
+        seen = datetime.now(timezone.utc).replace(microsecond=0)
+        entry = _shake(seen)
+        await save_food_entry(entry)
+
+        result = await update_food_entry(
+            str(entry.id), USER_ID,
+            total_calories=120,
+            foods=[{"name": "Protein Powder", "quantity": "30g", "calories": 120}],
+        )
+        assert result["success"]
+
+        async with food_db.cursor() as cur:
+            await cur.execute("SELECT group_key, occurrence_count, last_seen_at FROM meal_group_stats")
+            stats = await cur.fetchall()
+
+        assert [row["group_key"] for row in stats] == ["protein powder:30g"]
+        assert stats[0]["occurrence_count"] == 1
+        assert stats[0]["last_seen_at"] == seen
+
+    @pytest.mark.asyncio
+    async def test_detects_candidate_from_index(self, food_db):
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        entries = [_shake(now - timedelta(days=days)) for days in range(4)]
+        for entry in entries:
+            await save_food_entry(entry)
+
+        candidates = await FormulaDetectionService().detect_formula_candidates(
+            USER_ID, min_occurrences=3
+        )
+
+        assert len(candidates) == 1
+        assert candidates[0].occurrence_count == 4
+        # Newest first, one id per entry
+        assert candidates[0].entry_ids == [str(entry.id) for entry in entries]
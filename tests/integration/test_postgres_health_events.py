@@ -0,0 +1,151 @@
+"""
+health_events ingestion against a real PostgreSQL (set TEST_DATABASE_URL)
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from src.services.health_events import (
+    check_duplicate_event,
+    create_health_event,
+    create_health_events_bulk,
+    delete_health_event,
+)
+from tests.conftest import apply_migration
+
+USER_ID = "12345"
+
+
+async def _create_health_events(conn) -> None:
+    await conn.execute("CREATE TABLE users (telegram_id VARCHAR(255) PRIMARY KEY)")
+    await conn.execute("INSERT INTO users (telegram_id) VALUES (%s)", (USER_ID,))
+    await conn.commit()
+    for filename in (
+        "021_health_events.sql",
+        "029_health_events_source_unique.sql",
+        "030_health_events_partitioning.sql",
+        "034_health_event_source_keys.sql",
+    ):
+        await apply_migration(conn, filename)
+
+
+class TestHealthEventsBulk:
+    """Binary COPY ingestion into health_events"""
+
+    @pytest.mark.asyncio
+    async def test_aware_timestamps_are_stored_as_utc(self, pg_conn):
+        await _create_health_events(pg_conn)
+
+        stockholm = timezone(timedelta(hours=2))
+        events = [
+            {
+                "user_id": USER_ID,
+                "event_type": "meal",
+                "timestamp": datetime(2026, 6, 1, 8, 0, tzinfo=stockholm),
+                "metadata": {"total_calories": 400},
+                "source_table": "food_entries",
+                "source_id": uuid4(),
+            },
+            {
+                "user_id": USER_ID,
+                "event_type": "sleep",
+                "timestamp": datetime(2026, 6, 1, 6, 30),
+                "metadata": {"total_sleep_hours": 7},
+            },
+        ]
+
+        assert await create_health_events_bulk(events) == 2
+
+        cur = await pg_conn.execute(
+            "SELECT event_type, timestamp FROM health_events ORDER BY event_type"
+        )
+        assert await cur.fetchall() == [
+            {"event_type": "meal", "timestamp": datetime(2026, 6, 1, 6, 0)},
+            {"event_type": "sleep", "timestamp": datetime(2026, 6, 1, 6, 30)},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_single_insert_stores_aware_timestamp_as_utc(self, pg_conn):
+        await _create_health_events(pg_conn)
+        # A session outside UTC would cast an aware value to its local time
+        await pg_conn.execute("SET timezone = 'America/New_York'")
+        await pg_conn.commit()
+
+        event_id = await create_health_event(
+            USER_ID, "meal",
+            datetime(2026, 6, 1, 8, 0, tzinfo=timezone(timedelta(hours=2))),
+            {"total_calories": 400},
+        )
+
+        cur = await pg_conn.execute("SELECT id, timestamp FROM health_events")
+        assert await cur.fetchall() == [{"id": event_id, "timestamp": datetime(2026, 6, 1, 6, 0)}]
+
+
+class TestHealthEventSourceKeys:
+    """Idempotency on (source_table, source_id) across partitions (migration 034)"""
+
+    @pytest.mark.asyncio
+    async def test_reingesting_with_another_timestamp_is_skipped(self, pg_conn):
+        await _create_health_events(pg_conn)
+        source_id = uuid4()
+        event = {
+            "user_id": USER_ID,
+            "event_type": "meal",
+            "timestamp": datetime(2026, 6, 1, 8, 0),
+            "metadata": {"total_calories": 400},
+            "source_table": "food_entries",
+            "source_id": source_id,
+        }
+
+        assert await create_health_events_bulk([event]) == 1
+        # Same source record, timestamp edited into another month
+        assert await create_health_events_bulk([{**event, "timestamp": datetime(2026, 7, 2)}]) == 0
+        assert await create_health_event(
+            USER_ID, "meal", datetime(2026, 8, 3), {"total_calories": 1},
+            source_table="food_entries", source_id=source_id
+        ) is None
+
+        cur = await pg_conn.execute("SELECT COUNT(*) AS count FROM health_events")
+        assert (await cur.fetchone())["count"] == 1
+        assert await check_duplicate_event("food_entries", source_id) is True
+        assert await check_duplicate_event("sleep_entries", source_id) is False
+
+    @pytest.mark.asyncio
+    async def test_deleting_an_event_releases_its_source_key(self, pg_conn):
+        await _create_health_events(pg_conn)
+        source_id = uuid4()
+        event_id = await create_health_event(
+            USER_ID, "sleep", datetime(2026, 6, 1), {"total_sleep_hours": 7},
+            source_table="sleep_entries", source_id=source_id
+        )
+
+        assert await delete_health_event(event_id) is True
+        assert await check_duplicate_event("sleep_entries", source_id) is False
+
+    @pytest.mark.asyncio
+    async def test_new_partition_takes_rows_from_default(self, pg_conn):
+        await _create_health_events(pg_conn)
+        source_id = uuid4()
+        far_future = datetime(2099, 5, 10)
+        await create_health_event(
+            USER_ID, "mood", far_future, {"rating": 7},
+            source_table="mood_entries", source_id=source_id
+        )
+
+        cur = await pg_conn.execute(
+            "SELECT create_health_events_partition(%s) AS created", (far_future.date(),)
+        )
+        assert (await cur.fetchone())["created"] is True
+        await pg_conn.commit()
+
+        cur = await pg_conn.execute(
+            "SELECT tableoid::regclass::text AS partition FROM health_events"
+        )
+        assert await cur.fetchall() == [{"partition": "health_events_2099_05"}]
+        # The moved row keeps its source key
+        await create_health_event(
+            USER_ID, "mood", far_future, {"rating": 7},
+            source_table="mood_entries", source_id=source_id
+        )
+        cur = await pg_conn.execute("SELECT COUNT(*) AS count FROM health_events")
+        assert (await cur.fetchone())["count"] == 1
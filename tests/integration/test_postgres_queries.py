@@ -0,0 +1,149 @@
+"""
+Query functions run against a real PostgreSQL (set TEST_DATABASE_URL)
+
+Each test gets a throwaway schema from the pg_conn fixture, creates the
+minimal tables it needs and applies the migration under test.
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from src.db.conversation_store import ConversationStore
+from src.db.instrumentation import explain_statement, statement_registry
+from src.db.queries.user import (
+    get_user_preferences,
+    get_user_profile,
+    get_user_profile_field,
+    update_user_profile,
+)
+from src.db.queries.conversation import get_conversation_summary, save_conversation_summary
+from src.memory import context_window
+from src.utils.cache import _cache, reset_cache_stats
+from tests.conftest import apply_migration
+
+USER_ID = "12345"
+
+
+async def _create_users(conn) -> None:
+    await conn.execute("CREATE TABLE users (telegram_id VARCHAR(255) PRIMARY KEY)")
+    await conn.execute("INSERT INTO users (telegram_id) VALUES (%s)", (USER_ID,))
+    await conn.commit()
+
+
+class TestConversationSummaries:
+    """Rolling summary storage (migration 028)"""
+
+    @pytest.mark.asyncio
+    async def test_summary_round_trip_keeps_time_zone(self, pg_conn):
+        await _create_users(pg_conn)
+        await apply_migration(pg_conn, "028_conversation_summaries.sql")
+
+        through = datetime(2026, 3, 1, 12, 30, tzinfo=timezone(timedelta(hours=2)))
+        assert await save_conversation_summary(USER_ID, "likes oats", through, 4)
+        # Older boundary is ignored
+        assert not await save_conversation_summary(USER_ID, "stale", through - timedelta(hours=1), 2)
+
+        row = await get_conversation_summary(USER_ID)
+        assert row["summary"] == "likes oats"
+        assert row["message_count"] == 4
+        assert row["summarized_through"].tzinfo is not None
+        assert row["summarized_through"] == through
+
+    @pytest.mark.asyncio
+    async def test_context_window_compares_stored_boundary_with_history(self, pg_conn):
+        await _create_users(pg_conn)
+        await apply_migration(pg_conn, "028_conversation_summaries.sql")
+
+        base = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        history = [
+            {
+                "id": f"id-{i}",
+                "role": "user" if i % 2 == 0 else "assistant",
+                "content": f"message {i}",
+                "timestamp": base + timedelta(minutes=i),
+                "message_type": "text",
+            }
+            for i in range(6)
+        ]
+        await save_conversation_summary(USER_ID, "earlier talk", history[1]["timestamp"], 2)
+
+        with patch.object(context_window, "conversation_store", ConversationStore()):
+            window = await context_window.build_context_window(USER_ID, history)
+
+        assert window.summary == "earlier talk"
+        assert [m["id"] for m in window.messages] == ["id-2", "id-3", "id-4", "id-5"]
+
+
+class TestUserProfileCache:
+    """Cached profile reads (cache_with_ttl, shared) on dict rows (migration 010)"""
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        _cache.clear()
+        reset_cache_stats()
+        yield
+        _cache.clear()
+
+    async def _create_profile(self, conn) -> None:
+        await apply_migration(conn, "001_initial_schema.sql")
+        await apply_migration(conn, "010_user_profiles.sql")
+        await conn.execute("INSERT INTO users (telegram_id) VALUES (%s)", (USER_ID,))
+        await conn.execute(
+            """
+            INSERT INTO user_profiles (telegram_id, profile_data, timezone)
+            VALUES (%s, %s, 'Europe/Berlin')
+            ON CONFLICT (telegram_id) DO UPDATE
+            SET profile_data = EXCLUDED.profile_data, timezone = EXCLUDED.timezone
+            """,
+            (USER_ID, '{"name": "Sam", "communication_preferences": {"brevity": "brief"}}'),
+        )
+        await conn.commit()
+
+    @pytest.mark.asyncio
+    async def test_profile_is_cached_until_updated(self, pg_conn):
+        await self._create_profile(pg_conn)
+
+        profile = await get_user_profile(USER_ID)
+        assert profile == {
+            "profile_data": {"name": "Sam", "communication_preferences": {"brevity": "brief"}},
+            "timezone": "Europe/Berlin",
+        }
+        assert await get_user_preferences(USER_ID) == {"brevity": "brief"}
+        assert await get_user_profile_field(USER_ID, "communication_preferences.brevity") == "brief"
+
+        # A write that bypasses the query functions isn't seen: served from cache
+        await pg_conn.execute("UPDATE user_profiles SET timezone = 'UTC' WHERE telegram_id = %s", (USER_ID,))
+        await pg_conn.commit()
+        assert (await get_user_profile(USER_ID))["timezone"] == "Europe/Berlin"
+
+        await update_user_profile(USER_ID, {"name": "Sam"}, timezone="Asia/Tokyo")
+
+        assert await get_user_profile(USER_ID) == {"profile_data": {"name": "Sam"}, "timezone": "Asia/Tokyo"}
+        assert await get_user_preferences(USER_ID) == {}
+
+
+class TestExplainSampling:
+    """Slow SELECTs re-run under EXPLAIN (src/db/instrumentation.py)"""
+
+    @pytest.mark.asyncio
+    async def test_plain_select_is_analyzed(self, pg_conn):
+        await _create_users(pg_conn)
+        query = "SELECT * FROM users WHERE telegram_id = %s"
+
+        plan = await explain_statement(statement_registry.statement(query), query, (USER_ID,))
+
+        assert "actual time" in plan
+
+    @pytest.mark.asyncio
+    async def test_select_with_side_effects_is_not_executed(self, pg_conn):
+        # Sequences aren't rolled back, so an executed nextval() would show
+        await pg_conn.execute("CREATE SEQUENCE ids")
+        await pg_conn.commit()
+        query = "SELECT nextval('ids')"
+
+        plan = await explain_statement(statement_registry.statement(query), query, None)
+
+        assert plan and "actual time" not in plan
+        async with pg_conn.cursor() as cur:
+            await cur.execute("SELECT is_called FROM ids")
+            assert not (await cur.fetchone())["is_called"]
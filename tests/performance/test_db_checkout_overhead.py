@@ -0,0 +1,126 @@
+"""
+Micro-benchmark of Database.connection() checkout overhead
+
+Times the wrapper around the pool (not the pool itself) against a stub
+pool, for the current connection() and for the previous per-checkout
+behaviour (lazy `src.monitoring` import, pool.get_stats(), two gauge
+updates and row_factory assignment on every call), reproduced below.
+No database needed, but timings are machine dependent, so it only runs
+on request and reports through logging:
+
+    RUN_BENCHMARKS=1 pytest tests/performance/test_db_checkout_overhead.py --log-cli-level=INFO
+
+Typical medians on a dev container (µs per checkout): before 7.6,
+after 6.4, after with pool-wait instrumentation 6.9. Instrumentation is on
+by default (DB_STATEMENT_METRICS), so the default path saves ~0.7µs, not
+the ~1.2µs of the uninstrumented one. Timing the wait and recording it
+costs ~0.5µs.
+"""
+import logging
+import os
+import statistics
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+from psycopg.rows import dict_row
+
+from src.db.connection import POOL_INTERACTIVE, Database
+
+logger = logging.getLogger(__name__)
+
+CHECKOUTS = 20_000
+RUNS = 7
+
+pytestmark = [
+    pytest.mark.performance,
+    pytest.mark.skipif(
+        not os.environ.get("RUN_BENCHMARKS"),
+        reason="Set RUN_BENCHMARKS=1 to run timing benchmarks"
+    ),
+]
+
+
+class _Conn:
+    row_factory = None
+
+
+class _Pool:
+    """Stub AsyncConnectionPool: hands out one connection immediately"""
+
+    min_size = max_size = 10
+
+    def __init__(self):
+        self._conn = _Conn()
+
+    def get_stats(self):
+        return {"pool_size": 10, "pool_available": 9, "requests_waiting": 0}
+
+    @asynccontextmanager
+    async def connection(self):
+        yield self._conn
+
+
+def _database(instrument: bool) -> Database:
+    database = Database(instrument=instrument)
+    database._pools = {POOL_INTERACTIVE: _Pool()}
+    return database
+
+
+@asynccontextmanager
+async def _legacy_connection(database: Database):
+    """connection() as it was before per-checkout work was removed"""
+    pool = database._pool
+    try:
+        from src.monitoring import update_pool_metrics
+        pool_stats = pool.get_stats()
+        update_pool_metrics(
+            total=pool_stats.get('pool_size', 0),
+            available=pool_stats.get('pool_available', 0)
+        )
+    except Exception:
+        pass
+
+    async with pool.connection() as conn:
+        conn.row_factory = dict_row
+        yield conn
+
+
+async def _time(checkout) -> float:
+    """Mean microseconds per checkout over one run"""
+    for _ in range(500):  # warm up
+        async with checkout():
+            pass
+
+    start = time.perf_counter()
+    for _ in range(CHECKOUTS):
+        async with checkout():
+            pass
+    return (time.perf_counter() - start) / CHECKOUTS * 1e6
+
+
+class TestCheckoutOverhead:
+    """Per-checkout cost of the connection() wrapper"""
+
+    @pytest.mark.asyncio
+    async def test_checkout_overhead(self):
+        database = _database(instrument=False)
+        instrumented = _database(instrument=True)
+
+        runs = {"before": [], "after": [], "instrumented": []}
+        # Interleaved, so drift in machine load hits every variant alike
+        for _ in range(RUNS):
+            runs["before"].append(await _time(lambda: _legacy_connection(database)))
+            runs["after"].append(await _time(database.connection))
+            runs["instrumented"].append(await _time(instrumented.connection))
+        legacy_us, current_us, instrumented_us = (
+            statistics.median(runs[name]) for name in ("before", "after", "instrumented")
+        )
+
+        logger.info(
+            f"connection() overhead, median of {RUNS} x {CHECKOUTS:,} checkouts: "
+            f"before {legacy_us:.2f}µs, after {current_us:.2f}µs, "
+            f"after with pool-wait instrumentation {instrumented_us:.2f}µs"
+        )
+        assert current_us < legacy_us
@@ -0,0 +1,165 @@
+"""
+Benchmark of prepared statements and pipeline mode against PostgreSQL
+
+Needs a reachable database: set BENCHMARK_DATABASE_URL (e.g.
+postgresql://postgres@localhost/postgres). Works on temporary tables
+only, so it is safe to point at a development database.
+
+    BENCHMARK_DATABASE_URL=postgresql://... pytest tests/performance/test_db_round_trips.py --log-cli-level=INFO
+
+The assertions count protocol messages from a libpq trace (round trips,
+Parse messages), which don't depend on the machine. Timings are only
+logged: what pipelining saves is network latency, so it shows up against
+a database on another host. With client and server on one core nothing is
+saved, and pipeline mode costs extra event loop wakeups. Typical numbers
+on a 1-vCPU dev container against PostgreSQL on localhost:
+
+- XP award: 0.45ms sequential (6 round trips) vs 0.85ms pipelined (3).
+- Same, through a local proxy adding 0.5ms each way (~2.7ms measured per
+  round trip): 16.3ms vs 9.5ms.
+- Point lookup: 0.16ms as text vs 0.10ms prepared.
+
+The connection keeps psycopg's default prepare_threshold. With None,
+psycopg ignores prepare=True too.
+"""
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+import psycopg
+import pytest
+from psycopg.pq import Trace
+from psycopg.rows import dict_row
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_DATABASE_URL = os.environ.get("BENCHMARK_DATABASE_URL")
+ITERATIONS = 300
+
+pytestmark = [
+    pytest.mark.performance,
+    pytest.mark.skipif(
+        not BENCHMARK_DATABASE_URL,
+        reason="Set BENCHMARK_DATABASE_URL to run database benchmarks"
+    ),
+]
+
+
+@pytest.fixture
+async def conn():
+    async with await psycopg.AsyncConnection.connect(
+        BENCHMARK_DATABASE_URL, row_factory=dict_row
+    ) as conn:
+        await conn.execute(
+            """
+            CREATE TEMP TABLE bench_xp (user_id TEXT PRIMARY KEY, total_xp INT NOT NULL);
+            CREATE TEMP TABLE bench_tx (id SERIAL PRIMARY KEY, user_id TEXT, amount INT);
+            INSERT INTO bench_xp SELECT g::text, 0 FROM generate_series(1, 1000) g;
+            """
+        )
+        await conn.commit()
+        yield conn
+
+
+async def _award_sequential(conn, user_id: str) -> None:
+    """UPDATE, commit, INSERT, commit: four round trips"""
+    async with conn.cursor() as cur:
+        await cur.execute("UPDATE bench_xp SET total_xp = total_xp + 10 WHERE user_id = %s", (user_id,))
+        await conn.commit()
+        await cur.execute("INSERT INTO bench_tx (user_id, amount) VALUES (%s, 10) RETURNING id", (user_id,))
+        await cur.fetchone()
+        await conn.commit()
+
+
+async def _award_pipelined(conn, user_id: str) -> None:
+    """Same writes in one transaction and one round trip"""
+    async with conn.pipeline():
+        async with conn.cursor() as cur:
+            await cur.execute("UPDATE bench_xp SET total_xp = total_xp + 10 WHERE user_id = %s", (user_id,))
+            await cur.execute("INSERT INTO bench_tx (user_id, amount) VALUES (%s, 10) RETURNING id", (user_id,))
+            await conn.commit()
+            await cur.fetchone()
+
+
+async def _lookup(conn, user_id: str, prepare: bool) -> None:
+    async with conn.cursor() as cur:
+        await cur.execute(
+            "SELECT user_id, total_xp FROM bench_xp WHERE user_id = %s", (user_id,), prepare=prepare
+        )
+        await cur.fetchone()
+
+
+@contextmanager
+def _protocol_trace(conn) -> Iterator[List[Tuple[str, str]]]:
+    """Collect (direction, message type) of every protocol message: F client, B server"""
+    messages: List[Tuple[str, str]] = []
+    with tempfile.TemporaryFile("w+") as trace:
+        conn.pgconn.trace(trace.fileno())
+        conn.pgconn.set_trace_flags(Trace.SUPPRESS_TIMESTAMPS | Trace.REGRESS_MODE)
+        try:
+            yield messages
+        finally:
+            conn.pgconn.untrace()
+        trace.seek(0)
+        for line in trace:
+            direction, _, message = line.split("\t")[:3]
+            messages.append((direction, message.strip()))
+
+
+def _round_trips(messages: List[Tuple[str, str]]) -> int:
+    """Times the client sent something and then read the server's reply"""
+    directions = [direction for direction, _ in messages]
+    return sum(1 for sent, received in zip(directions, directions[1:]) if (sent, received) == ("F", "B"))
+
+
+async def _time(call) -> float:
+    """Mean milliseconds per call(user_id)"""
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        await call(str(i % 1000 + 1))
+    return (time.perf_counter() - start) / ITERATIONS * 1000
+
+
+class TestRoundTrips:
+    """Pipelined and prepared execution against plain text statements"""
+
+    @pytest.mark.asyncio
+    async def test_pipeline_reduces_round_trips(self, conn):
+        with _protocol_trace(conn) as sequential:
+            await _award_sequential(conn, "1")
+        with _protocol_trace(conn) as pipelined:
+            await _award_pipelined(conn, "1")
+
+        sequential_ms = await _time(lambda user_id: _award_sequential(conn, user_id))
+        pipelined_ms = await _time(lambda user_id: _award_pipelined(conn, user_id))
+        logger.info(
+            f"XP award over {ITERATIONS} calls: sequential {sequential_ms:.3f}ms "
+            f"({_round_trips(sequential)} round trips), pipelined {pipelined_ms:.3f}ms "
+            f"({_round_trips(pipelined)} round trips)"
+        )
+        # BEGIN, UPDATE, COMMIT, BEGIN, INSERT, COMMIT
+        assert _round_trips(sequential) == 6
+        # At most one per sync point (BEGIN, commit, pipeline exit) plus one
+        # if a result was read between the two writes
+        assert _round_trips(pipelined) <= 4
+
+    @pytest.mark.asyncio
+    async def test_prepared_lookup(self, conn):
+        with _protocol_trace(conn) as text:
+            for user_id in ("1", "2"):
+                await _lookup(conn, user_id, prepare=False)
+        with _protocol_trace(conn) as prepared:
+            for user_id in ("1", "2"):
+                await _lookup(conn, user_id, prepare=True)
+
+        text_ms = await _time(lambda user_id: _lookup(conn, user_id, prepare=False))
+        prepared_ms = await _time(lambda user_id: _lookup(conn, user_id, prepare=True))
+        logger.info(
+            f"Point lookup over {ITERATIONS} calls: text {text_ms:.3f}ms, prepared {prepared_ms:.3f}ms"
+        )
+        # Text statements are parsed on every call, prepared ones once per connection
+        assert [m for _, m in text].count("Parse") == 2
+        assert [m for _, m in prepared].count("Parse") == 1
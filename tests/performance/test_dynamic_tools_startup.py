@@ -0,0 +1,137 @@
+"""
+Startup benchmarks for dynamic tool loading
+
+Loads 1,000 synthetic tools the way bot startup and /approve_tool do and
+checks that reloading and per-user registration stay cheap. No database
+needed: get_all_enabled_tools / get_tool_by_id are patched. Assertions
+count compile() calls; timings are machine dependent, so they are only
+reported through logging, and the module only runs on request:
+
+    RUN_BENCHMARKS=1 pytest tests/performance/test_dynamic_tools_startup.py --log-cli-level=INFO
+"""
+import logging
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.agent.dynamic_tools import DynamicToolManager
+
+logger = logging.getLogger(__name__)
+
+TOOL_COUNT = 1000
+USERS = 50
+
+TOOL_CODE = '''async def {name}(ctx, days: int = 7) -> dict:
+    from src.db.queries import get_tool_by_name
+    total = 0
+    for day in range(days):
+        total += day * {i}
+    return {{"tool": "{name}", "total": total}}
+'''
+
+
+def _tools():
+    # 80% shared, the rest owned by individual users
+    return [
+        {
+            "id": f"id-{i}",
+            "tool_name": f"bench_tool_{i}",
+            "tool_type": "read",
+            "function_code": TOOL_CODE.format(name=f"bench_tool_{i}", i=i),
+            "created_by": "system" if i % 5 else str(i % USERS),
+            "enabled": True,
+        }
+        for i in range(TOOL_COUNT)
+    ]
+
+
+pytestmark = [
+    pytest.mark.performance,
+    pytest.mark.skipif(
+        not os.environ.get("RUN_BENCHMARKS"),
+        reason="Set RUN_BENCHMARKS=1 to run timing benchmarks"
+    ),
+]
+
+
+class _Agent:
+    """Stand-in for a PydanticAI agent that just records registered tools"""
+
+    def __init__(self):
+        self.tools = []
+
+    def tool(self, func):
+        self.tools.append(func)
+
+
+@pytest.fixture
+def manager():
+    manager = DynamicToolManager()
+    manager._base_namespace = {"get_tool_by_name": AsyncMock()}
+    return manager
+
+
+class TestDynamicToolStartup:
+    """Startup / reload / registration timings for 1k tools"""
+
+    @pytest.mark.asyncio
+    async def test_startup_load_is_metadata_only(self, manager):
+        with patch("src.db.queries.get_all_enabled_tools", AsyncMock(return_value=_tools())), \
+                patch("builtins.compile", wraps=compile) as compile_spy:
+            started = time.perf_counter()
+            names = await manager.load_all_tools()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+        logger.info("load_all_tools (%d tools): %.1fms", TOOL_COUNT, elapsed_ms)
+        assert len(names) == TOOL_COUNT
+        assert manager.loaded_tools == {}
+        assert compile_spy.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_cold_and_warm_registration(self, manager):
+        with patch("src.db.queries.get_all_enabled_tools", AsyncMock(return_value=_tools())):
+            await manager.load_all_tools()
+
+        with patch("builtins.compile", wraps=compile) as cold_spy:
+            started = time.perf_counter()
+            cold_count = manager.register_tools_on_agent(_Agent(), "5")
+            cold_ms = (time.perf_counter() - started) * 1000
+
+        with patch("builtins.compile", wraps=compile) as warm_spy:
+            started = time.perf_counter()
+            warm_count = manager.register_tools_on_agent(_Agent(), "5")
+            warm_ms = (time.perf_counter() - started) * 1000
+
+        logger.info("register for one user: cold %.1fms, warm %.1fms (%d tools)", cold_ms, warm_ms, warm_count)
+        assert cold_count == warm_count == 820  # 800 shared + 20 owned by user "5"
+        assert cold_spy.call_count == 820
+        assert warm_spy.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_reload_after_approval_does_not_recompile(self, manager):
+        tools = _tools()
+        with patch("src.db.queries.get_all_enabled_tools", AsyncMock(return_value=tools)):
+            await manager.load_all_tools()
+            manager.register_tools_on_agent(_Agent())
+
+            with patch("builtins.compile", wraps=compile) as compile_spy:
+                started = time.perf_counter()
+                await manager.load_all_tools()
+                manager.register_tools_on_agent(_Agent())
+                full_reload_ms = (time.perf_counter() - started) * 1000
+
+        approved = {**tools[0], "function_code": tools[0]["function_code"].replace("days: int = 7", "days: int = 14")}
+        with patch("src.db.queries.get_tool_by_id", AsyncMock(return_value=approved)), \
+                patch("builtins.compile", wraps=compile) as approve_spy:
+            started = time.perf_counter()
+            await manager.load_tool("id-0")
+            manager.register_tools_on_agent(_Agent())
+            approve_ms = (time.perf_counter() - started) * 1000
+
+        logger.info(
+            "full reload + register: %.1fms, single approval + register: %.1fms", full_reload_ms, approve_ms
+        )
+        assert compile_spy.call_count == 0
+        assert approve_spy.call_count == 1
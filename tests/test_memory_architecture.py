@@ -12,9 +12,9 @@ from src.config import DATA_PATH
 
 
 @pytest.mark.asyncio
-async def test_redundant_files_not_created():
+async def test_redundant_files_not_created(tmp_path):
     """Verify patterns.md, food_history.md, visual_patterns.md are not created"""
-    manager = MemoryFileManager()
+    manager = MemoryFileManager(tmp_path)
     test_user_id = "test_memory_arch_user"
 
     # Create user files
@@ -31,16 +31,11 @@ async def test_redundant_files_not_created():
     assert not (user_dir / "food_history.md").exists(), "food_history.md should NOT be created"
     assert not (user_dir / "visual_patterns.md").exists(), "visual_patterns.md should NOT be created"
 
-    # Cleanup
-    import shutil
-    if user_dir.exists():
-        shutil.rmtree(user_dir)
-
 
 @pytest.mark.asyncio
-async def test_load_user_memory_only_returns_profile_and_preferences():
+async def test_load_user_memory_only_returns_profile_and_preferences(tmp_path):
     """Verify load_user_memory only loads profile and preferences"""
-    manager = MemoryFileManager()
+    manager = MemoryFileManager(tmp_path)
     test_user_id = "test_memory_load_user"
 
     # Create user files
@@ -56,19 +51,13 @@ async def test_load_user_memory_only_returns_profile_and_preferences():
     assert "food_history" not in memory, "food_history should NOT be in memory"
     assert "visual_patterns" not in memory, "visual_patterns should NOT be in memory"
 
-    # Cleanup
-    import shutil
-    user_dir = manager.get_user_dir(test_user_id)
-    if user_dir.exists():
-        shutil.rmtree(user_dir)
-
 
 @pytest.mark.asyncio
-async def test_profile_update_calls_audit():
+async def test_profile_update_calls_audit(tmp_path):
     """Verify profile updates call audit function (integration test)"""
     from unittest.mock import AsyncMock, patch
 
-    manager = MemoryFileManager()
+    manager = MemoryFileManager(tmp_path)
     test_user_id = "test_profile_audit_user"
 
     # Create user files
@@ -86,19 +75,13 @@ async def test_profile_update_calls_audit():
         assert args[1] == "height"
         assert args[3] == "180cm"
 
-    # Cleanup
-    import shutil
-    user_dir = manager.get_user_dir(test_user_id)
-    if user_dir.exists():
-        shutil.rmtree(user_dir)
-
 
 @pytest.mark.asyncio
-async def test_preference_update_calls_audit():
+async def test_preference_update_calls_audit(tmp_path):
     """Verify preference updates call audit function (integration test)"""
     from unittest.mock import AsyncMock, patch
 
-    manager = MemoryFileManager()
+    manager = MemoryFileManager(tmp_path)
     test_user_id = "test_pref_audit_user"
 
     # Create user files
@@ -115,9 +98,3 @@ async def test_preference_update_calls_audit():
         assert args[0] == test_user_id
         assert args[1] == "Tone"
         assert args[3] == "casual"
-
-    # Cleanup
-    import shutil
-    user_dir = manager.get_user_dir(test_user_id)
-    if user_dir.exists():
-        shutil.rmtree(user_dir)
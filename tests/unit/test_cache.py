@@ -9,13 +9,16 @@ import pytest
 from src.utils.cache import (
     cache_with_ttl,
     invalidate_cache,
+    invalidate_tags,
     invalidate_user_cache,
     get_cache_stats,
     reset_cache_stats,
     clear_expired_entries,
     warm_user_cache,
     CacheConfig,
-    _cache
+    _cache,
+    _flights,
+    _sweep
 )
 
 
@@ -148,6 +151,41 @@ class TestCacheInvalidation:
         assert count == 2
         assert len(_cache) == 1
 
+    @pytest.mark.asyncio
+    async def test_invalidate_user_is_exact(self):
+        """Test that a user ID never matches users whose IDs contain it"""
+        @cache_with_ttl(ttl=300, key_prefix="user_data")
+        async def get_user_data(user_id: str):
+            return {"user_id": user_id}
+
+        await get_user_data("12")
+        await get_user_data("123")
+        await get_user_data(user_id="312")
+
+        assert invalidate_user_cache("12") == 1
+        assert len(_cache) == 2
+        assert invalidate_user_cache("312") == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_user_family(self):
+        """Test invalidating one key family for one user"""
+        @cache_with_ttl(ttl=300, key_prefix="user_profile")
+        async def get_profile(user_id: str):
+            return {"user_id": user_id}
+
+        @cache_with_ttl(ttl=300, key_prefix="user_xp")
+        async def get_xp(user_id: str):
+            return {"xp": 100}
+
+        await get_profile("user123")
+        await get_xp("user123")
+        await get_profile("user456")
+
+        assert invalidate_cache(pattern="user_profile", user_id="user123") == 1
+        assert len(_cache) == 2
+        assert invalidate_tags("user:user123:user_xp", "family:user_profile") == 2
+        assert len(_cache) == 0
+
     @pytest.mark.asyncio
     async def test_invalidate_by_pattern(self):
         """Test invalidating cache entries matching a pattern"""
@@ -303,6 +341,143 @@ class TestCacheExpiration:
         assert "valid" in _cache
 
 
+class TestStampedeProtection:
+    """Test LRU eviction, argument keys, single-flight and stale-while-revalidate"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_call(self):
+        calls = 0
+
+        @cache_with_ttl(ttl=60, key_prefix="test")
+        async def slow(user_id: str):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"user_id": user_id}
+
+        results = await asyncio.gather(*(slow("1") for _ in range(10)))
+
+        assert calls == 1
+        assert results == [{"user_id": "1"}] * 10
+        assert get_cache_stats()["coalesced"] == 9
+        assert not _flights
+
+    @pytest.mark.asyncio
+    async def test_concurrent_failure_reaches_every_caller(self):
+        calls = 0
+
+        @cache_with_ttl(ttl=60, key_prefix="test")
+        async def failing(user_id: str):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise ValueError("db down")
+
+        results = await asyncio.gather(*(failing("1") for _ in range(3)), return_exceptions=True)
+
+        assert calls == 1
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_load_is_not_overwritten(self):
+        @cache_with_ttl(ttl=60, key_prefix="test")
+        async def get_data(user_id: str):
+            await asyncio.sleep(0.05)
+            return "old"
+
+        task = asyncio.create_task(get_data("1"))
+        await asyncio.sleep(0.01)
+        invalidate_user_cache("1")
+
+        assert await task == "old"
+        assert len(_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_method_keys_skip_self(self):
+        calls = 0
+
+        class Repository:
+            @cache_with_ttl(ttl=60, key_prefix="test")
+            async def load(self, user_id: str, fields: list):
+                nonlocal calls
+                calls += 1
+                return fields
+
+        await Repository().load("1", ["a", "b"])
+        await Repository().load("1", ["a", "b"])
+
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_is_evicted(self, monkeypatch):
+        monkeypatch.setattr(CacheConfig, "MAX_ENTRIES", 2)
+
+        @cache_with_ttl(ttl=60, key_prefix="test")
+        async def get_data(user_id: str):
+            return user_id
+
+        await get_data("a")
+        await get_data("b")
+        await get_data("a")  # hit: "b" is now least recently used
+        await get_data("c")
+
+        assert [key[2] for key in _cache] == [("a",), ("c",)]
+        assert get_cache_stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_refreshing(self):
+        version = 0
+
+        @cache_with_ttl(ttl=0.05, key_prefix="test", stale_ttl=60)
+        async def get_data(user_id: str):
+            nonlocal version
+            version += 1
+            await asyncio.sleep(0.02)
+            return version
+
+        assert await get_data("1") == 1
+        await asyncio.sleep(0.06)
+
+        # Past the TTL: stale value returned at once, one refresh started
+        assert await get_data("1") == 1
+        assert await get_data("1") == 1
+        assert get_cache_stats()["refreshes"] == 1
+
+        await asyncio.gather(*(flight.task for flight in _flights.values()))
+        assert await get_data("1") == 2
+        assert version == 2
+
+    @pytest.mark.asyncio
+    async def test_ttl_is_jittered_down(self, monkeypatch):
+        monkeypatch.setattr(CacheConfig, "TTL_JITTER", 0.5)
+
+        @cache_with_ttl(ttl=100, key_prefix="test")
+        async def get_data(user_id: str):
+            return user_id
+
+        for user_id in range(20):
+            await get_data(user_id)
+
+        remaining = [expiry - time.time() for _, expiry in _cache.values()]
+        assert all(49 < ttl <= 100 for ttl in remaining)
+        assert len({round(ttl) for ttl in remaining}) > 1
+
+    def test_sweep_only_visits_expired_entries(self):
+        current_time = time.time()
+        _cache["expired"] = ("value", current_time - 1)
+        _cache["replaced"] = ("old", current_time - 1)
+        _cache["replaced"] = ("new", current_time + 300)
+        for i in range(100):
+            _cache[f"valid{i}"] = ("value", current_time + 300)
+
+        # Heap items for "expired" and the old "replaced" only
+        assert _sweep(current_time, limit=2) == 1
+        assert "expired" not in _cache
+        assert _cache["replaced"][0] == "new"
+        assert len(_cache) == 101
+
+
 class TestIntegrationScenarios:
     """Integration tests for realistic usage patterns"""
 
@@ -1,12 +1,15 @@
 """Tests for multi-agent consensus system (Phase 2)"""
+import asyncio
 import pytest
 from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from src.agent import nutrition_consensus
 from src.agent.nutrition_consensus import (
     NutritionConsensusEngine,
     AgentEstimate,
     ConsensusResult
 )
-from src.models.food import FoodItem, FoodMacros
+from src.models.food import FoodItem, FoodMacros, VisionAnalysisResult
 
 
 @pytest.mark.asyncio
@@ -418,3 +421,95 @@ async def test_zero_calorie_handling():
     assert comparison["agreement"] == "low"
     assert comparison["recommended_action"] == "favor_estimate2"
     assert "Missing data" in comparison["discrepancies"][0]
+
+
+def _estimate(agent_name, calories):
+    return AgentEstimate(
+        agent_name=agent_name,
+        foods=[FoodItem(
+            name="Oatmeal",
+            quantity="1 bowl",
+            calories=calories,
+            macros=FoodMacros(protein=10, carbs=50, fat=6)
+        )],
+        total_calories=calories,
+        confidence="high"
+    )
+
+
+@pytest.mark.asyncio
+async def test_photo_estimates_run_concurrently():
+    """Both vision estimates are in flight at the same time"""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def _slow(estimate):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return estimate
+
+    engine = NutritionConsensusEngine()
+    with patch.object(engine, "_get_openai_estimate",
+                      new=lambda *a: _slow(_estimate("openai", 300))), \
+            patch.object(engine, "_get_anthropic_estimate",
+                         new=lambda *a: _slow(_estimate("anthropic", 310))), \
+            patch.object(engine, "_validate_with_agent", AsyncMock()) as mock_validator:
+        result = await engine.get_consensus(image_data="abc", photo_path="meal.jpg")
+
+    assert max_in_flight == 2
+    assert len(result.agent_estimates) == 2
+    # Estimates within tolerance: validator agent is skipped
+    mock_validator.assert_not_awaited()
+    assert result.agreement_level == "high"
+
+
+@pytest.mark.asyncio
+async def test_validator_runs_when_estimates_disagree():
+    """Validator agent is consulted when estimates differ beyond tolerance"""
+    engine = NutritionConsensusEngine()
+    validation = engine._simple_comparison(_estimate("openai", 300), _estimate("anthropic", 600))
+
+    with patch.object(engine, "_get_openai_estimate", AsyncMock(return_value=_estimate("openai", 300))), \
+            patch.object(engine, "_get_anthropic_estimate", AsyncMock(return_value=_estimate("anthropic", 600))), \
+            patch.object(engine, "_validate_with_agent", AsyncMock(return_value=validation)) as mock_validator:
+        await engine.get_consensus(image_data="abc", photo_path="meal.jpg")
+
+    mock_validator.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_missed_deadline_uses_available_estimate(monkeypatch):
+    """A provider that misses its deadline doesn't block the result"""
+    monkeypatch.setattr(nutrition_consensus, "ANTHROPIC_ESTIMATE_TIMEOUT", 0.01)
+
+    async def _never_returns(*args):
+        await asyncio.sleep(10)
+
+    engine = NutritionConsensusEngine()
+    with patch.object(engine, "_get_openai_estimate", AsyncMock(return_value=_estimate("openai", 300))), \
+            patch.object(engine, "_get_anthropic_estimate", new=_never_returns):
+        result = await engine.get_consensus(image_data="abc", photo_path="meal.jpg")
+
+    assert [e.agent_name for e in result.agent_estimates] == ["openai"]
+    assert result.total_calories == 300
+    assert "anthropic estimate timed out after 0s" in result.consensus_explanation
+
+
+@pytest.mark.asyncio
+async def test_text_second_opinion_timeout_is_explained(monkeypatch):
+    """A timed-out text second opinion falls back with a readable reason"""
+    monkeypatch.setattr(nutrition_consensus, "ANTHROPIC_ESTIMATE_TIMEOUT", 2)
+
+    async def _times_out(*args):
+        raise asyncio.TimeoutError()
+
+    parsed = VisionAnalysisResult(foods=_estimate("openai", 300).foods, confidence="medium")
+    engine = NutritionConsensusEngine()
+    with patch.object(engine, "_get_anthropic_text_estimate", new=_times_out):
+        result = await engine.get_consensus(caption="oatmeal", parsed_text_result=parsed)
+
+    assert [e.agent_name for e in result.agent_estimates] == ["openai_text_parser"]
+    assert "anthropic estimate timed out after 2s" in result.consensus_explanation
@@ -0,0 +1,157 @@
+"""
+Tests for the token-budgeted context window and rolling summary
+"""
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from src.memory import context_window
+from src.memory.context_window import (
+    ContextWindowConfig,
+    build_context_window,
+    estimate_tokens,
+    fit_to_budget,
+)
+
+
+def _history(count, content="x" * 40, start=0):
+    """Build alternating user/assistant messages, oldest first"""
+    base = datetime(2026, 1, 1)
+    return [
+        {
+            "id": f"id-{i}",
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": content,
+            "timestamp": base + timedelta(seconds=i),
+            "message_type": "text",
+        }
+        for i in range(start, start + count)
+    ]
+
+
+@pytest.fixture
+def mock_store():
+    with patch.object(context_window, "conversation_store") as store:
+        store.get_summary = AsyncMock(return_value=None)
+        store.save_summary = AsyncMock()
+        yield store
+    context_window._updating.clear()
+
+
+class TestFitToBudget:
+    """Test splitting history into kept and dropped messages"""
+
+    def test_everything_fits(self):
+        history = _history(4)
+        kept, dropped = fit_to_budget(history, budget=1000, max_messages=10)
+        assert kept == history
+        assert dropped == []
+
+    def test_keeps_newest_within_budget(self):
+        history = _history(6)  # 14 tokens each
+        kept, dropped = fit_to_budget(history, budget=45, max_messages=10)
+        assert [m["id"] for m in kept] == ["id-4", "id-5"]
+        assert [m["id"] for m in dropped] == ["id-0", "id-1", "id-2", "id-3"]
+
+    def test_window_does_not_start_with_assistant(self):
+        history = _history(6)
+        kept, dropped = fit_to_budget(history, budget=1000, max_messages=3)
+        assert kept[0]["role"] == "user"
+        assert [m["id"] for m in kept] == ["id-4", "id-5"]
+        assert len(dropped) == 4
+
+    def test_long_messages_are_truncated(self):
+        history = _history(2, content="word " * 2000)
+        kept, dropped = fit_to_budget(history, budget=10_000, max_messages=10)
+
+        assert dropped == []
+        for message in kept:
+            assert estimate_tokens(message["content"]) <= ContextWindowConfig.MESSAGE_TOKEN_CAP + 2
+            assert message["content"].endswith("[...]")
+        # Original rows are not modified
+        assert not history[0]["content"].endswith("[...]")
+
+    def test_newest_message_always_kept(self):
+        history = _history(1, content="y" * 4000)
+        kept, dropped = fit_to_budget(history, budget=50, max_messages=10)
+        assert len(kept) == 1
+        assert dropped == []
+
+
+class TestBuildContextWindow:
+    """Test summary attachment and background updates"""
+
+    @pytest.mark.asyncio
+    async def test_short_history_is_unchanged(self, mock_store):
+        history = _history(4)
+        window = await build_context_window("123", history)
+
+        assert window.messages == history
+        assert window.summary is None
+        mock_store.save_summary.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_summarized_messages_are_not_resent(self, mock_store):
+        history = _history(6)
+        mock_store.get_summary.return_value = {
+            "summary": "User wants to lose weight.",
+            "summarized_through": history[3]["timestamp"],
+            "message_count": 4,
+        }
+
+        window = await build_context_window("123", history)
+
+        assert window.summary == "User wants to lose weight."
+        assert [m["id"] for m in window.messages] == ["id-4", "id-5"]
+        assert window.dropped == []
+
+    @pytest.mark.asyncio
+    async def test_dropped_messages_are_folded_in_background(self, mock_store, monkeypatch):
+        monkeypatch.setattr(ContextWindowConfig, "MAX_MESSAGES", 2)
+        summarize = AsyncMock(return_value="New summary")
+        monkeypatch.setattr(context_window, "summarize_incremental", summarize)
+        history = _history(6)
+
+        window = await build_context_window("123", history)
+        assert len(window.messages) == 2
+        await asyncio.gather(*context_window._background_tasks)
+
+        summarize.assert_awaited_once_with(None, history[:4])
+        mock_store.save_summary.assert_awaited_once_with(
+            "123", "New summary", history[3]["timestamp"], 4
+        )
+
+    @pytest.mark.asyncio
+    async def test_update_only_folds_messages_newer_than_summary(self, mock_store, monkeypatch):
+        monkeypatch.setattr(ContextWindowConfig, "MAX_MESSAGES", 2)
+        summarize = AsyncMock(return_value="Merged summary")
+        monkeypatch.setattr(context_window, "summarize_incremental", summarize)
+        history = _history(8)
+        # The window was built before another update moved the summary forward
+        mock_store.get_summary.side_effect = [
+            None,
+            {"summary": "Old", "summarized_through": history[1]["timestamp"], "message_count": 2},
+        ]
+
+        await build_context_window("123", history)
+        await asyncio.gather(*context_window._background_tasks)
+
+        summarize.assert_awaited_once_with("Old", history[2:6])
+
+    @pytest.mark.asyncio
+    async def test_one_update_per_user_in_flight(self, mock_store, monkeypatch):
+        monkeypatch.setattr(ContextWindowConfig, "MAX_MESSAGES", 2)
+        context_window._updating.add("123")
+
+        assert context_window.schedule_summary_update("123", _history(4)) is None
+
+    @pytest.mark.asyncio
+    async def test_summary_failure_is_not_raised(self, mock_store):
+        mock_store.get_summary.side_effect = Exception("db down")
+        history = _history(2)
+
+        window = await build_context_window("123", history)
+
+        assert window.messages == history
+        assert window.summary is None
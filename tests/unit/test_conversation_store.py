@@ -0,0 +1,188 @@
+"""
+Tests for the write-through conversation ring buffer
+"""
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from src.db.conversation_store import ConversationStore
+
+
+def _rows(count, start=0):
+    """Build conversation_history rows, oldest first"""
+    base = datetime(2026, 1, 1)
+    return [
+        {
+            "id": f"id-{i}",
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": f"message {i}",
+            "timestamp": base + timedelta(seconds=i),
+            "message_type": "text",
+            "metadata": None,
+        }
+        for i in range(start, start + count)
+    ]
+
+
+@pytest.fixture
+def mock_history():
+    with patch("src.db.conversation_store.get_conversation_history", AsyncMock()) as mock:
+        yield mock
+
+
+@pytest.fixture
+def mock_save():
+    async def _save(user_id, messages):
+        return [
+            {**m, "id": f"new-{i}", "timestamp": datetime(2027, 1, 1) + timedelta(seconds=i),
+             "message_type": m.get("message_type", "text"), "metadata": m.get("metadata")}
+            for i, m in enumerate(messages)
+        ]
+    with patch("src.db.conversation_store.save_conversation_messages", AsyncMock(side_effect=_save)) as mock:
+        yield mock
+
+
+class TestConversationStore:
+    """Test history reads, write-through and bounds"""
+
+    @pytest.mark.asyncio
+    async def test_miss_loads_from_db_then_hits(self, mock_history):
+        mock_history.return_value = _rows(5)
+        store = ConversationStore(buffer_size=10)
+
+        first = await store.get_history("123", limit=10)
+        second = await store.get_history("123", limit=3)
+
+        mock_history.assert_awaited_once_with("123", limit=10, include_metadata=True)
+        assert [m["content"] for m in first] == [f"message {i}" for i in range(5)]
+        assert [m["content"] for m in second] == ["message 2", "message 3", "message 4"]
+        assert "metadata" not in first[0]
+
+    @pytest.mark.asyncio
+    async def test_limit_larger_than_partial_buffer_goes_to_db(self, mock_history):
+        mock_history.return_value = _rows(10)
+        store = ConversationStore(buffer_size=10)
+        await store.get_history("123", limit=5)
+
+        mock_history.reset_mock()
+        mock_history.return_value = _rows(40)
+        await store.get_history("123", limit=40)
+
+        mock_history.assert_awaited_once_with("123", limit=40)
+
+    @pytest.mark.asyncio
+    async def test_save_turn_is_single_insert_and_written_through(self, mock_history, mock_save):
+        mock_history.return_value = _rows(2)
+        store = ConversationStore(buffer_size=20)
+        await store.get_history("123")
+
+        await store.save_turn("123", "hi", "hello!", user_message_type="voice",
+                              user_metadata={"duration_seconds": 3})
+
+        mock_save.assert_awaited_once()
+        saved = mock_save.call_args.args[1]
+        assert [m["role"] for m in saved] == ["user", "assistant"]
+        assert saved[0]["message_type"] == "voice"
+
+        history = await store.get_history("123")
+        assert mock_history.await_count == 1
+        assert [m["content"] for m in history][-2:] == ["hi", "hello!"]
+
+    @pytest.mark.asyncio
+    async def test_ring_buffer_drops_oldest(self, mock_history, mock_save):
+        mock_history.return_value = _rows(3)
+        store = ConversationStore(buffer_size=4)
+        await store.get_history("123", limit=4)
+
+        await store.save_turn("123", "a", "b")
+
+        history = await store.get_history("123", limit=4)
+        assert [m["content"] for m in history] == ["message 1", "message 2", "a", "b"]
+        # Served from the buffer after the write-through
+        assert store.get_stats()["hits"] == 1
+        assert mock_history.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_save_failure_invalidates_buffer(self, mock_history):
+        mock_history.return_value = _rows(2)
+        store = ConversationStore(buffer_size=20)
+        await store.get_history("123")
+
+        with patch("src.db.conversation_store.save_conversation_messages",
+                   AsyncMock(side_effect=Exception("db down"))):
+            with pytest.raises(Exception):
+                await store.save_turn("123", "a", "b")
+
+        await store.get_history("123")
+        assert mock_history.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_clear_empties_buffer(self, mock_history):
+        mock_history.return_value = _rows(4)
+        store = ConversationStore(buffer_size=20)
+        await store.get_history("123")
+
+        with patch("src.db.conversation_store.clear_conversation_history", AsyncMock()) as mock_clear:
+            await store.clear("123")
+
+        mock_clear.assert_awaited_once_with("123")
+        assert await store.get_history("123") == []
+        assert mock_history.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_other_processes(self, mock_history, mock_save):
+        mock_history.return_value = _rows(2)
+        bot, api = ConversationStore(buffer_size=20), ConversationStore(buffer_size=20)
+        await bot.get_history("123")
+
+        # Deliver the published tags to the other process's store
+        with patch("src.db.conversation_store.invalidate_tags",
+                   side_effect=lambda *tags: bot.handle_invalidation(list(tags))) as publish:
+            await api.save_turn("123", "a", "b")
+
+        publish.assert_called_once_with("user:123:conversation")
+        await bot.get_history("123")
+        assert mock_history.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self, mock_history):
+        mock_history.return_value = _rows(2)
+        store = ConversationStore(buffer_size=20, ttl=0)
+
+        with patch("src.db.conversation_store.get_conversation_summary",
+                   AsyncMock(return_value=None)) as mock_get:
+            await store.get_history("123")
+            await store.get_summary("123")
+            await store.get_history("123")
+            await store.get_summary("123")
+
+        assert mock_history.await_count == 2
+        assert mock_get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_user_count_is_bounded(self, mock_history):
+        mock_history.return_value = _rows(1)
+        store = ConversationStore(buffer_size=20, max_users=2)
+
+        for user_id in ("1", "2", "3"):
+            await store.get_history(user_id)
+
+        assert store.get_stats()["users"] == 2
+        await store.get_history("1")
+        assert mock_history.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_summary_is_cached_and_written_through(self):
+        store = ConversationStore()
+        through = datetime(2026, 1, 1)
+
+        with patch("src.db.conversation_store.get_conversation_summary",
+                   AsyncMock(return_value=None)) as mock_get, \
+                patch("src.db.conversation_store.save_conversation_summary",
+                      AsyncMock(return_value=True)):
+            assert await store.get_summary("123") is None
+            await store.save_summary("123", "Likes oats.", through, 4)
+            summary = await store.get_summary("123")
+
+        mock_get.assert_awaited_once_with("123")
+        assert summary == {"summary": "Likes oats.", "summarized_through": through, "message_count": 4}
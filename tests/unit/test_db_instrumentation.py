@@ -0,0 +1,180 @@
+"""
+Tests for statement-level database instrumentation
+"""
+import sys
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from prometheus_client import CollectorRegistry, Histogram, generate_latest
+from psycopg import AsyncCursor
+
+from src.db import instrumentation
+from src.db import connection as db_connection
+from src.db.instrumentation import (
+    InstrumentedAsyncCursor,
+    Statement,
+    StatementRegistry,
+    explain_statement,
+    fingerprint,
+    record_pool_wait,
+    record_statement,
+    statement_registry,
+)
+from src.observability.metrics import PoolWaitHistogram
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry():
+    statement_registry.reset()
+    yield
+    statement_registry.reset()
+
+
+class TestFingerprint:
+    """Test query normalization"""
+
+    def test_literals_and_parameters_collapse(self):
+        a = fingerprint("SELECT * FROM food_entries WHERE user_id = %s AND calories > 500")
+        b = fingerprint("select *\n  from food_entries  -- recent\nwhere user_id = 'abc' and calories > 12.5")
+        assert a == b == "select * from food_entries where user_id = ? and calories > ?"
+
+    def test_named_placeholders_and_in_lists(self):
+        assert fingerprint("DELETE FROM t WHERE id IN (%(a)s, %(b)s, 3)") == "delete from t where id in (?)"
+
+    def test_statement_labels(self):
+        statement = Statement(fingerprint("INSERT INTO health_events (user_id) VALUES (%s)"))
+        assert statement.operation == "insert"
+        assert statement.table == "health_events"
+        assert len(statement.statement_id) == 12
+
+        statement = Statement(fingerprint("SELECT update_plate_usage(%s)"))
+        assert statement.operation == "select"
+        assert statement.table == ""
+
+        assert Statement(fingerprint("VACUUM ANALYZE users")).operation == "other"
+
+
+class TestStatementRegistry:
+    """Test bounded labels and per-statement summaries"""
+
+    def test_query_text_is_fingerprinted_once(self):
+        registry = StatementRegistry()
+        assert registry.statement("SELECT 1") is registry.statement("SELECT 1")
+
+    def test_label_cardinality_is_capped(self):
+        registry = StatementRegistry()
+        with patch.object(instrumentation, "MAX_STATEMENT_LABELS", 2):
+            labels = [registry.label(Statement(f"select {i} from t{i}")) for i in range(4)]
+            assert labels[2:] == ["other", "other"]
+            assert registry.label(Statement("select 0 from t0")) == labels[0]
+
+    def test_summary_accumulates(self):
+        statement = statement_registry.statement("SELECT * FROM users WHERE telegram_id = %s")
+        record_statement(statement, 0.002, 1, "", None)
+        record_statement(statement, 0.004, 1, "", None)
+
+        top = statement_registry.top()[0]
+        assert top["calls"] == 2
+        assert top["rows"] == 2
+        assert top["max_ms"] == pytest.approx(4.0)
+        assert top["mean_ms"] == pytest.approx(3.0)
+
+    def test_pool_wait_recorded_separately(self):
+        record_pool_wait(0.01, "interactive")
+        record_pool_wait(0.03, "interactive")
+        record_pool_wait(0.5, "background")
+
+        stats = statement_registry.get_stats()["pool_wait"]["interactive"]
+        assert stats["count"] == 2
+        assert stats["max_ms"] == pytest.approx(30.0)
+        assert stats["mean_ms"] == pytest.approx(20.0)
+
+    def test_pool_wait_histogram_matches_prometheus_histogram(self):
+        """The lock-free pool wait histogram exports what Histogram would"""
+        buckets = [0.0005, 0.001, 0.01, 1.0]
+        reference_registry, registry = CollectorRegistry(), CollectorRegistry()
+        reference = Histogram("pool_wait", "Pool wait", ["pool"], buckets=buckets, registry=reference_registry)
+        histogram = PoolWaitHistogram("pool_wait", "Pool wait", buckets)
+        registry.register(histogram)
+
+        for pool, seconds in [("a", 0.0005), ("a", 0.0001), ("b", 0.02), ("a", 7.0), ("b", 1.0)]:
+            reference.labels(pool=pool).observe(seconds)
+            histogram.observe(pool, seconds)
+
+        expected = [
+            line for line in generate_latest(reference_registry).decode().splitlines()
+            if "_created" not in line
+        ]
+        assert generate_latest(registry).decode().splitlines() == expected
+
+
+class TestSlowQueries:
+    """Test the slow-query log and EXPLAIN sampling"""
+
+    @pytest.mark.asyncio
+    async def test_slow_select_logged_and_explained(self):
+        query = "SELECT * FROM food_entries WHERE user_id = %s"
+        statement = statement_registry.statement(query)
+
+        with patch.object(instrumentation, "DB_SLOW_QUERY_MS", 100.0), \
+                patch.object(instrumentation, "DB_EXPLAIN_SAMPLE_RATE", 1.0), \
+                patch.object(instrumentation, "explain_statement", AsyncMock()) as explain:
+            record_statement(statement, 0.5, 10, query, ("u1",))
+            for task in list(instrumentation._explain_tasks):
+                await task
+
+        explain.assert_awaited_once_with(statement, query, ("u1",))
+        slow = statement_registry.get_stats()["slow_queries"]
+        assert [s["statement"] for s in slow] == [statement.statement_id]
+
+    @pytest.mark.asyncio
+    async def test_slow_writes_are_never_explained(self):
+        statement = statement_registry.statement("UPDATE users SET name = %s")
+
+        with patch.object(instrumentation, "DB_SLOW_QUERY_MS", 100.0), \
+                patch.object(instrumentation, "DB_EXPLAIN_SAMPLE_RATE", 1.0), \
+                patch.object(instrumentation, "explain_statement", AsyncMock()) as explain:
+            record_statement(statement, 0.5, 1, "UPDATE users SET name = %s", ("x",))
+
+        explain.assert_not_called()
+        assert len(statement_registry.slow_queries) == 1
+
+    @pytest.mark.asyncio
+    async def test_explain_runs_on_background_pool(self):
+        query = "SELECT * FROM food_entries WHERE user_id = %s"
+        connection = MagicMock(side_effect=RuntimeError("no pool in unit tests"))
+
+        # Other unit tests replace src.db.connection in sys.modules
+        with patch.dict(sys.modules, {"src.db.connection": db_connection}), \
+                patch.object(db_connection.db, "connection", connection):
+            assert await explain_statement(statement_registry.statement(query), query, ("u1",)) is None
+
+        connection.assert_called_once_with(kind=db_connection.POOL_BACKGROUND)
+
+
+class TestInstrumentedCursor:
+    """Test that the cursor records each execute"""
+
+    @pytest.mark.asyncio
+    async def test_execute_records_statement(self):
+        cursor = InstrumentedAsyncCursor.__new__(InstrumentedAsyncCursor)
+        cursor._rowcount = 3
+
+        with patch.object(AsyncCursor, "execute", AsyncMock(return_value=cursor)):
+            await cursor.execute("SELECT * FROM users WHERE telegram_id = %s", ("1",))
+
+        top = statement_registry.top()[0]
+        assert top["fingerprint"] == "select * from users where telegram_id = ?"
+        assert top["rows"] == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_execute_is_recorded_and_reraised(self):
+        cursor = InstrumentedAsyncCursor.__new__(InstrumentedAsyncCursor)
+        cursor._rowcount = -1
+
+        with patch.object(AsyncCursor, "execute", AsyncMock(side_effect=RuntimeError("boom"))):
+            with pytest.raises(RuntimeError):
+                await cursor.execute("SELECT 1")
+
+        assert statement_registry.top()[0]["calls"] == 1
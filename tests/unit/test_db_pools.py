@@ -0,0 +1,233 @@
+"""
+Tests for the named (bulkheaded) connection pools
+"""
+import asyncio
+import psycopg
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+from src.db import connection
+from src.db.connection import (
+    POOL_ANALYTICS,
+    POOL_BACKGROUND,
+    POOL_INTERACTIVE,
+    POOL_REPLICA,
+    Database,
+    PoolConfig,
+    calculate_pool_configs,
+    uses_pool,
+    uses_replica,
+)
+from src.exceptions import ConnectionError as DBConnectionError
+
+
+class _FakePool:
+    """Enough of AsyncConnectionPool for routing and resizing"""
+
+    def __init__(self, name, min_size=1, max_size=4):
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.stats = {}
+        self.resize = AsyncMock(side_effect=self._resize)
+
+    async def _resize(self, min_size, max_size):
+        self.min_size, self.max_size = min_size, max_size
+
+    def pop_stats(self):
+        stats, self.stats = self.stats, {}
+        return stats
+
+    def get_stats(self):
+        return {"pool_size": 3, "pool_available": 1, "requests_waiting": 2}
+
+    @asynccontextmanager
+    async def connection(self):
+        conn = MagicMock()
+        conn.pool_name = self.name
+        yield conn
+
+
+class _DownPool(_FakePool):
+    """A replica pool whose checkouts fail"""
+
+    @asynccontextmanager
+    async def connection(self):
+        raise psycopg.OperationalError("connection refused")
+        yield
+
+
+def _database(replica: bool = False):
+    database = Database(instrument=False)
+    names = (POOL_INTERACTIVE, POOL_BACKGROUND, POOL_ANALYTICS) + ((POOL_REPLICA,) if replica else ())
+    database._configs = {
+        name: PoolConfig(name=name, min_size=1, max_size=4, max_size_ceiling=8, timeout=5.0)
+        for name in names
+    }
+    database._pools = {name: _FakePool(name) for name in database._configs}
+    database._idle_intervals = {name: 0 for name in database._configs}
+    return database
+
+
+class TestPoolRouting:
+    """Test which pool connection() uses"""
+
+    def test_pool_configs(self):
+        configs = calculate_pool_configs()
+        assert set(configs) == {POOL_INTERACTIVE, POOL_BACKGROUND, POOL_ANALYTICS}
+        assert configs[POOL_INTERACTIVE].timeout < configs[POOL_BACKGROUND].timeout
+        for config in configs.values():
+            assert config.min_size <= config.max_size <= config.max_size_ceiling
+
+    @pytest.mark.asyncio
+    async def test_default_and_explicit_kind(self):
+        database = _database()
+
+        async with database.connection() as conn:
+            assert conn.pool_name == POOL_INTERACTIVE
+        async with database.connection(POOL_ANALYTICS) as conn:
+            assert conn.pool_name == POOL_ANALYTICS
+
+    @pytest.mark.asyncio
+    async def test_use_pool_covers_spawned_tasks(self):
+        database = _database()
+
+        async def pool_name():
+            async with database.connection() as conn:
+                return conn.pool_name
+
+        with database.use_pool(POOL_BACKGROUND):
+            task = asyncio.create_task(pool_name())
+            assert await pool_name() == POOL_BACKGROUND
+        assert await task == POOL_BACKGROUND
+        assert await pool_name() == POOL_INTERACTIVE
+
+    @pytest.mark.asyncio
+    async def test_uses_pool_decorator(self):
+        database = _database()
+
+        @uses_pool(POOL_ANALYTICS)
+        async def job():
+            async with database.connection() as conn:
+                return conn.pool_name
+
+        assert await job() == POOL_ANALYTICS
+        async with database.connection() as conn:
+            assert conn.pool_name == POOL_INTERACTIVE
+
+    @pytest.mark.asyncio
+    async def test_unknown_or_uninitialized_pool(self):
+        with pytest.raises(DBConnectionError, match="not initialized"):
+            async with Database(instrument=False).connection():
+                pass
+
+        with pytest.raises(DBConnectionError, match="Unknown database pool"):
+            async with _database().connection("reports"):
+                pass
+
+    def test_get_pool_stats(self):
+        stats = _database().get_pool_stats()
+        assert stats["active"] == 2
+        assert stats["pools"][POOL_BACKGROUND]["waiting"] == 2
+
+
+class TestAdaptiveSizing:
+    """Test max_size adjustments from checkout waits"""
+
+    @pytest.mark.asyncio
+    async def test_grows_on_long_waits_up_to_ceiling(self):
+        database = _database()
+        pool = database._pools[POOL_BACKGROUND]
+
+        for expected in (6, 8, None):
+            pool.stats = {"requests_queued": 10, "requests_wait_ms": 10 * 200}
+            assert await database.adjust_pool(POOL_BACKGROUND) == expected
+        assert pool.max_size == 8
+
+    @pytest.mark.asyncio
+    async def test_grows_on_timeouts(self):
+        database = _database()
+        database._pools[POOL_INTERACTIVE].stats = {"requests_errors": 1}
+
+        assert await database.adjust_pool(POOL_INTERACTIVE) == 6
+
+    @pytest.mark.asyncio
+    async def test_short_waits_do_not_grow(self):
+        database = _database()
+        database._pools[POOL_INTERACTIVE].stats = {"requests_queued": 10, "requests_wait_ms": 10}
+
+        assert await database.adjust_pool(POOL_INTERACTIVE) is None
+
+    @pytest.mark.asyncio
+    async def test_shrinks_back_after_idle_intervals(self):
+        database = _database()
+        pool = database._pools[POOL_ANALYTICS]
+        pool.max_size = 6
+
+        results = [await database.adjust_pool(POOL_ANALYTICS) for _ in range(connection.POOL_SHRINK_AFTER)]
+
+        assert results[:-1] == [None] * (connection.POOL_SHRINK_AFTER - 1)
+        assert results[-1] == 5
+        pool.max_size = 4
+        for _ in range(connection.POOL_SHRINK_AFTER):
+            assert await database.adjust_pool(POOL_ANALYTICS) is None  # never below configured size
+
+
+class TestReplicaRouting:
+    """Test read-only routing to the replica pool"""
+
+    async def _pool_name(self, database, **kwargs):
+        async with database.connection(**kwargs) as conn:
+            return conn.pool_name
+
+    @pytest.mark.asyncio
+    async def test_read_only_uses_replica_only_when_configured(self):
+        assert await self._pool_name(_database(), read_only=True) == POOL_INTERACTIVE
+
+        database = _database(replica=True)
+        assert await self._pool_name(database, read_only=True) == POOL_REPLICA
+        assert await self._pool_name(database) == POOL_INTERACTIVE
+
+    @pytest.mark.asyncio
+    async def test_replica_scope_and_explicit_primary(self):
+        database = _database(replica=True)
+
+        @uses_replica
+        async def dashboard(user_id):
+            return (
+                await self._pool_name(database),
+                await self._pool_name(database, read_only=False),
+            )
+
+        assert await dashboard("123") == (POOL_REPLICA, POOL_INTERACTIVE)
+        with database.use_replica():
+            assert await self._pool_name(database) == POOL_REPLICA
+        assert await self._pool_name(database) == POOL_INTERACTIVE
+
+    @pytest.mark.asyncio
+    async def test_recent_write_reads_from_primary(self):
+        database = _database(replica=True)
+        database.record_write("123")
+
+        assert await self._pool_name(database, read_only=True, user_id="123") == POOL_INTERACTIVE
+        assert await self._pool_name(database, read_only=True, user_id="456") == POOL_REPLICA
+        with database.use_replica("123"):
+            assert await self._pool_name(database) == POOL_INTERACTIVE
+
+        database.replica_staleness = 0.0
+        assert await self._pool_name(database, read_only=True, user_id="123") == POOL_REPLICA
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_primary_when_replica_is_down(self):
+        database = _database(replica=True)
+        database._pools[POOL_REPLICA] = _DownPool(POOL_REPLICA)
+
+        assert await self._pool_name(database, read_only=True, kind=POOL_ANALYTICS) == POOL_ANALYTICS
+        assert database._replica_down_until > 0
+
+        # Replica is skipped until the retry interval passes
+        database._pools[POOL_REPLICA] = _FakePool(POOL_REPLICA)
+        assert await self._pool_name(database, read_only=True) == POOL_INTERACTIVE
+        database._replica_down_until = 0.0
+        assert await self._pool_name(database, read_only=True) == POOL_REPLICA
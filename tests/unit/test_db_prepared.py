@@ -0,0 +1,87 @@
+"""
+Tests for the prepared statement registry and pipelined query helpers
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.db.prepared import PreparedStatementRegistry, prepared_statements
+
+
+class TestPreparedStatementRegistry:
+    """Test registration and execution of hot queries"""
+
+    def test_register_is_idempotent_for_same_sql(self):
+        registry = PreparedStatementRegistry()
+        first = registry.register("q", "SELECT 1")
+        assert registry.register("q", "SELECT 1") is first
+        assert registry.get("q") is first
+        assert registry.get("missing") is None
+
+    def test_register_rejects_conflicting_sql(self):
+        registry = PreparedStatementRegistry()
+        registry.register("q", "SELECT 1")
+        with pytest.raises(ValueError):
+            registry.register("q", "SELECT 2")
+
+    @pytest.mark.asyncio
+    async def test_execute_prepares_on_first_use(self):
+        registry = PreparedStatementRegistry(enabled=True)
+        query = registry.register("q", "SELECT %s")
+        cur = AsyncMock()
+
+        await registry.execute(cur, query, (1,))
+        await registry.execute(cur, query, (2,))
+
+        cur.execute.assert_awaited_with("SELECT %s", (2,), prepare=True)
+        assert registry.get_stats() == {"enabled": True, "statements": {"q": 2}}
+
+    @pytest.mark.asyncio
+    async def test_disabled_registry_never_prepares(self):
+        registry = PreparedStatementRegistry(enabled=False)
+        query = registry.register("q", "SELECT 1")
+        cur = AsyncMock()
+
+        await registry.execute(cur, query)
+
+        cur.execute.assert_awaited_once_with("SELECT 1", None, prepare=False)
+
+    def test_hot_queries_are_registered(self):
+        # Importing the query modules registers their hot statements
+        import src.db.queries  # noqa: F401
+
+        for name in (
+            "conversation_history",
+            "conversation_history_with_metadata_by_type",
+            "session_state",
+            "user_xp",
+            "reminder_completed_since",
+            "reminder_completed_for_schedule",
+        ):
+            assert prepared_statements.get(name) is not None, name
+
+
+class TestPipelinedWrites:
+    """Test multi-statement writes sent as one pipeline"""
+
+    @pytest.mark.asyncio
+    async def test_award_user_xp_pipelines_update_insert_and_commit(self):
+        from src.db.queries import gamification
+
+        cur = AsyncMock()
+        cur.fetchone.return_value = {"id": "tx-1"}
+        conn = MagicMock()
+        conn.commit = AsyncMock()
+        conn.cursor.return_value.__aenter__.return_value = cur
+
+        pipeline = MagicMock()
+        pipeline.return_value.__aenter__.return_value = conn
+
+        xp_data = {"total_xp": 150, "current_level": 2, "xp_to_next_level": 50, "level_tier": "bronze"}
+        with patch.object(gamification.db, "pipeline", pipeline):
+            tx_id = await gamification.award_user_xp("123", xp_data, 50, "meal", None, "Logged a meal")
+
+        assert tx_id == "tx-1"
+        assert cur.execute.await_count == 2
+        assert "UPDATE user_xp" in cur.execute.await_args_list[0].args[0]
+        assert "INSERT INTO xp_transactions" in cur.execute.await_args_list[1].args[0]
+        conn.commit.assert_awaited_once()
@@ -141,6 +141,9 @@ async def test_save_food_entry_success():
         assert "INSERT INTO food_entries" in call_args[0]
         assert entry.user_id in call_args[1]
         mock_conn.commit.assert_called_once()
+        # Meal-group index is updated in the same statement
+        assert "record_meal_group" in call_args[0]
+        assert "chicken breast:150g" in call_args[1]
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,139 @@
+"""
+Tests for dynamic tool loading: code cache, lazy compilation and per-user registration
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.agent.dynamic_tools import DynamicToolManager, is_tool_relevant, tool_code_hash
+
+
+TOOL_CODE = '''async def {name}(ctx, days: int = 7) -> dict:
+    return {{"tool": "{name}", "days": days, "id": str(uuid4())[:0]}}
+'''
+
+
+def _tool(name, created_by="system", code=None):
+    return {
+        "id": f"id-{name}",
+        "tool_name": name,
+        "tool_type": "read",
+        "function_code": code or TOOL_CODE.format(name=name),
+        "created_by": created_by,
+        "enabled": True,
+    }
+
+
+@pytest.fixture
+def manager():
+    """Manager with a minimal base namespace (avoids importing the agent module)"""
+    from uuid import uuid4
+    manager = DynamicToolManager()
+    manager._base_namespace = {"uuid4": uuid4, "get_tool_by_name": AsyncMock()}
+    return manager
+
+
+class TestDynamicToolLoading:
+    """Loading, caching and registration"""
+
+    @pytest.mark.asyncio
+    async def test_load_all_tools_compiles_lazily(self, manager):
+        tools = [_tool("weekly_calories"), _tool("sleep_average")]
+        with patch("src.db.queries.get_all_enabled_tools", AsyncMock(return_value=tools)):
+            names = await manager.load_all_tools()
+
+        assert names == ["weekly_calories", "sleep_average"]
+        assert manager.loaded_tools == {}
+
+        func = manager.get_tool_function("weekly_calories")
+        assert func.__name__ == "weekly_calories"
+        assert await func(None, days=3) == {"tool": "weekly_calories", "days": 3, "id": ""}
+        assert list(manager.loaded_tools) == ["weekly_calories"]
+
+    def test_defined_function_is_returned_not_base_names(self, manager):
+        func = manager._create_function_from_code(TOOL_CODE.format(name="t1"), "t1")
+        assert func.__name__ == "t1"
+        assert "t1" not in manager._base_namespace
+
+    def test_tool_may_shadow_a_base_name(self, manager):
+        code = TOOL_CODE.format(name="get_tool_by_name")
+        func = manager._create_function_from_code(code, "get_tool_by_name")
+        assert func is not manager._base_namespace["get_tool_by_name"]
+        assert func.__name__ == "get_tool_by_name"
+
+    def test_identical_code_compiles_once(self, manager):
+        code = TOOL_CODE.format(name="shared")
+        with patch("builtins.compile", wraps=compile) as compile_spy:
+            manager._create_function_from_code(code, "a")
+            manager._create_function_from_code(code, "b")
+
+        assert compile_spy.call_count == 1
+        assert tool_code_hash(code) in manager._code_cache
+
+    @pytest.mark.asyncio
+    async def test_reload_keeps_unchanged_and_drops_changed(self, manager):
+        with patch("src.db.queries.get_all_enabled_tools", AsyncMock(return_value=[_tool("a"), _tool("b")])):
+            await manager.load_all_tools()
+        func_a = manager.get_tool_function("a")
+        manager.get_tool_function("b")
+
+        changed = _tool("b", code=TOOL_CODE.format(name="b").replace("days: int = 7", "days: int = 30"))
+        with patch("src.db.queries.get_all_enabled_tools", AsyncMock(return_value=[_tool("a"), changed])):
+            await manager.load_all_tools()
+
+        assert manager.loaded_tools == {"a": func_a}
+        assert await manager.get_tool_function("b")(None) == {"tool": "b", "days": 30, "id": ""}
+
+    @pytest.mark.asyncio
+    async def test_load_tool_adds_one_tool(self, manager):
+        with patch("src.db.queries.get_tool_by_id", AsyncMock(return_value=_tool("approved"))) as get_tool:
+            assert await manager.load_tool("id-approved") == "approved"
+
+        get_tool.assert_awaited_once_with("id-approved")
+        assert "approved" in manager.tool_metadata
+
+    @pytest.mark.asyncio
+    async def test_load_tool_unloads_disabled_tool(self, manager):
+        manager.tool_metadata["old"] = _tool("old")
+        with patch("src.db.queries.get_tool_by_id", AsyncMock(return_value={**_tool("old"), "enabled": False})):
+            assert await manager.load_tool("id-old") is None
+
+        assert "old" not in manager.tool_metadata
+
+    def test_register_only_relevant_tools(self, manager):
+        for tool in (_tool("shared"), _tool("mine", created_by="111"), _tool("theirs", created_by="222")):
+            manager.tool_metadata[tool["tool_name"]] = tool
+        agent = MagicMock()
+
+        assert manager.register_tools_on_agent(agent, "111") == 2
+        registered = [c.args[0].__name__ for c in agent.tool.call_args_list]
+        assert registered == ["shared", "mine"]
+
+    def test_broken_tool_is_skipped_on_register(self, manager):
+        manager.tool_metadata["broken"] = _tool("broken", code="async def broken(ctx:\n")
+        manager.tool_metadata["ok"] = _tool("ok")
+        agent = MagicMock()
+
+        assert manager.register_tools_on_agent(agent) == 1
+
+    def test_is_tool_relevant(self):
+        assert is_tool_relevant({"created_by": None}, "1")
+        assert is_tool_relevant({"created_by": "2"}, None)
+        assert not is_tool_relevant({"created_by": "2"}, "1")
+
+    @pytest.mark.asyncio
+    async def test_created_tool_records_its_creator(self):
+        import src.agent as agent_module
+
+        ctx = MagicMock()
+        ctx.deps.telegram_id = "111"
+        with patch.object(agent_module, "get_tool_by_name", AsyncMock(return_value=None)), \
+                patch.object(agent_module, "_generate_tool_code",
+                             AsyncMock(return_value=TOOL_CODE.format(name="weekly_calories"))), \
+                patch.object(agent_module, "save_dynamic_tool", AsyncMock(return_value="id-1")) as save, \
+                patch.object(agent_module.tool_manager, "load_tool", AsyncMock()):
+            result = await agent_module.create_dynamic_tool(
+                ctx, "weekly calories", ["days"], ["integer"], "dict"
+            )
+
+        assert result.success
+        assert save.await_args.kwargs["created_by"] == "111"
@@ -431,3 +431,105 @@ class TestFormulaDetectionIntegration:
             )
 
             assert len(formulas) == 0
+
+
+def _welford(calories):
+    """Accumulate (count, mean, M2) the way record_meal_group() does"""
+    count, mean, m2 = 0, 0.0, 0.0
+    for x in calories:
+        if not x:
+            continue
+        count += 1
+        delta = x - mean
+        mean += delta / count
+        m2 += delta * (x - mean)
+    return count, mean, m2
+
+
+class TestIncrementalCandidateIndex:
+    """Candidate detection from meal_group_stats"""
+
+    @pytest.fixture
+    def service(self):
+        return FormulaDetectionService()
+
+    def test_meal_group_key_is_order_insensitive(self):
+        from src.utils.meal_grouping import meal_group_key
+
+        key = meal_group_key([
+            {"name": "Oats", "quantity": "40g"},
+            {"name": "Banana", "quantity": "118g"},
+        ])
+        assert key == "banana:120g|oats:40g"
+        assert key == meal_group_key(json.dumps([
+            {"name": "Banana", "quantity": "122g"},
+            {"name": "Oats", "quantity": "41g"},
+        ]))
+
+    def test_welford_consistency_matches_full_scan(self, service):
+        calories = [250, 0, 255, 245, 300, 210]
+        count, mean, m2 = _welford(calories)
+        stats = {
+            "occurrence_count": len(calories),
+            "calorie_count": count,
+            "calorie_mean": mean,
+            "calorie_m2": m2,
+        }
+        entries = [{"total_calories": c} for c in calories]
+
+        assert service._consistency_from_stats(stats) == pytest.approx(
+            service._calculate_consistency(entries)
+        )
+
+    @pytest.mark.asyncio
+    async def test_candidates_from_index(self, service):
+        from contextlib import asynccontextmanager
+
+        now = datetime.now()
+        count, mean, m2 = _welford([265, 270, 265, 260, 265, 265, 270, 265])
+        groups = [{
+            "group_key": "banana:1 medium|protein powder:30g",
+            "occurrence_count": 8,
+            "calorie_count": count,
+            "calorie_mean": mean,
+            "calorie_m2": m2,
+            "last_seen_at": now,
+        }]
+        # One template row per group, carrying all of the group's entry ids
+        templates = [{
+            "id": "uuid-0",
+            "foods": [{"name": "Protein Powder", "quantity": "30g"}, {"name": "Banana", "quantity": "1 medium"}],
+            "total_calories": 265,
+            "total_macros": {"protein": 25},
+            "photo_path": None,
+            "timestamp": now,
+            "notes": "morning protein shake",
+            "meal_group_key": "banana:1 medium|protein powder:30g",
+            "entry_ids": [f"uuid-{i}" for i in range(8)],
+        }]
+        cur = MagicMock()
+        cur.execute = AsyncMock()
+        cur.fetchall = AsyncMock(side_effect=[groups, templates])
+        conn = MagicMock()
+
+        @asynccontextmanager
+        async def _cursor():
+            yield cur
+
+        @asynccontextmanager
+        async def _connection():
+            yield conn
+
+        conn.cursor = _cursor
+        with patch("src.services.formula_detection.db.connection", _connection):
+            candidates = await service.detect_formula_candidates("test_user", min_occurrences=3)
+
+        assert len(candidates) == 1
+        assert candidates[0].occurrence_count == 8
+        assert candidates[0].entry_ids == [f"uuid-{i}" for i in range(8)]
+        assert candidates[0].confidence_score >= service.MIN_CONFIDENCE_SCORE
+
+        stats_sql, stats_params = cur.execute.await_args_list[0].args
+        assert "FROM meal_group_stats" in stats_sql
+        assert stats_params[2] == 3
+        assert "food_entries" not in stats_sql
@@ -0,0 +1,174 @@
+"""
+Tests for the in-process formula name index and the fuzzy matching that uses it
+"""
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.services.formula_detection import FormulaDetectionService
+from src.services.formula_name_index import (
+    FormulaNameIndex,
+    formula_name_index,
+    trigram_similarity,
+    trigrams,
+)
+
+
+def _formula(id, name, keywords, times_used=1):
+    return {
+        "id": id,
+        "name": name,
+        "keywords": keywords,
+        "foods": [{"name": name}],
+        "total_calories": 300,
+        "total_macros": {"protein": 20},
+        "times_used": times_used,
+    }
+
+
+def _mock_db(fetchall=None, fetchone=None):
+    """Patch db.connection() with a connection/cursor pair of mocks"""
+    cur = MagicMock()
+    cur.execute = AsyncMock()
+    cur.fetchall = AsyncMock(return_value=fetchall or [])
+    cur.fetchone = AsyncMock(return_value=fetchone)
+    conn = MagicMock()
+
+    @asynccontextmanager
+    async def _cursor():
+        yield cur
+
+    @asynccontextmanager
+    async def _connection():
+        yield conn
+
+    conn.cursor = _cursor
+    return patch("src.services.formula_detection.db.connection", _connection), cur
+
+
+class TestTrigrams:
+    """pg_trgm-compatible trigram extraction and similarity"""
+
+    def test_matches_pg_trgm_padding(self):
+        assert trigrams("Cat") == {"  c", " ca", "cat", "at "}
+
+    def test_words_split_on_punctuation(self):
+        assert trigrams("a-b") == {"  a", " a ", "  b", " b "}
+
+    def test_similarity(self):
+        assert trigram_similarity(trigrams("protein shake"), trigrams("Protein Shake")) == 1.0
+        assert trigram_similarity(trigrams("protein shake"), trigrams("bagel")) == 0.0
+        assert trigram_similarity(frozenset(), trigrams("x")) == 0.0
+
+
+class TestFormulaNameIndex:
+    """Matching, ordering, LRU and expiry"""
+
+    def test_keyword_in_text_scores_one(self):
+        index = FormulaNameIndex()
+        entries = index.put("u1", [_formula("f1", "Morning Protein Shake", ["protein shake"])])
+
+        row, score = index.match(entries, "I had my protein shake", 0.6)
+        assert row["id"] == "f1"
+        assert score == 1.0
+
+    def test_name_similarity(self):
+        index = FormulaNameIndex()
+        entries = index.put("u1", [
+            _formula("f1", "Usual Breakfast", []),
+            _formula("f2", "Chicken Salad", []),
+        ])
+
+        row, score = index.match(entries, "usual breakfast", 0.6)
+        assert row["id"] == "f1"
+        assert index.match(entries, "pizza", 0.6) is None
+
+    def test_ties_go_to_first_loaded(self):
+        index = FormulaNameIndex()
+        entries = index.put("u1", [
+            _formula("most_used", "Shake A", ["shake"], times_used=10),
+            _formula("least_used", "Shake B", ["shake"], times_used=1),
+        ])
+
+        row, _ = index.match(entries, "shake", 0.6)
+        assert row["id"] == "most_used"
+
+    def test_invalidate_and_lru(self):
+        index = FormulaNameIndex(max_users=2)
+        index.put("u1", [])
+        index.put("u2", [])
+        index.get("u1")
+        index.put("u3", [])
+
+        assert index.get("u2") is None  # least recently used
+        assert index.get("u1") == []
+        index.invalidate("u1")
+        assert index.get("u1") is None
+
+    def test_expired_entries_are_reloaded(self):
+        index = FormulaNameIndex(ttl_seconds=0)
+        index.put("u1", [])
+        with patch("src.services.formula_name_index.time.monotonic", return_value=10**9):
+            assert index.get("u1") is None
+
+    def test_oversized_user_is_not_indexed(self):
+        index = FormulaNameIndex(max_formulas=1)
+        rows = [_formula("f1", "A", []), _formula("f2", "B", [])]
+        assert index.put("u1", rows) is None
+        assert index.get("u1") is None
+
+
+class TestFuzzyMatchFormula:
+    """FormulaDetectionService.fuzzy_match_formula on top of the index"""
+
+    @pytest.fixture(autouse=True)
+    def clear_index(self):
+        formula_name_index.clear()
+        yield
+        formula_name_index.clear()
+
+    @pytest.mark.asyncio
+    async def test_loads_index_once(self):
+        service = FormulaDetectionService()
+        patcher, cur = _mock_db(fetchall=[
+            _formula("f1", "Morning Protein Shake", ["protein shake", "shake"])
+        ])
+
+        with patcher:
+            first = await service.fuzzy_match_formula("u1", "protein shake")
+            second = await service.fuzzy_match_formula("u1", "morning protein shake")
+
+        assert first["id"] == "f1"
+        assert first["match_score"] == 1.0
+        assert second["id"] == "f1"
+        cur.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("text,name,keywords,expected", [
+        ("protein shake", "Morning Protein Shake", [], "f1"),
+        ("protein shakes", "Protein Shake", [], "f1"),
+        ("the shake", "Protein Shake", ["shake"], "f1"),
+        ("the shake", "Protein Shake", [], None),
+    ])
+    async def test_docstring_examples(self, text, name, keywords, expected):
+        service = FormulaDetectionService()
+        patcher, _ = _mock_db(fetchall=[_formula("f1", name, keywords)])
+
+        with patcher:
+            match = await service.fuzzy_match_formula("u1", text)
+
+        assert (match["id"] if match else None) == expected
+
+    @pytest.mark.asyncio
+    async def test_oversized_user_falls_back_to_sql(self):
+        service = FormulaDetectionService()
+        rows = [_formula(f"f{i}", f"Formula {i}", []) for i in range(3)]
+        sql_row = {**_formula("f9", "Protein Shake", []), "match_score": 0.8}
+        patcher, cur = _mock_db(fetchall=rows, fetchone=sql_row)
+
+        with patcher, patch.object(formula_name_index, "max_formulas", 2):
+            match = await service.fuzzy_match_formula("u1", "protein shak")
+
+        assert match["id"] == "f9"
+        assert match["match_score"] == 0.8
+        assert "match_formulas_fuzzy" in cur.execute.await_args_list[-1].args[0]
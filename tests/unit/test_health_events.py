@@ -6,14 +6,21 @@ Tests the core event ingestion pipeline including:
 - Event creation validation
 - Event querying
 - Duplicate detection
+- Bulk ingestion and live batching
+- Streaming reads
 - Event type validation
 - Metadata handling
 """
 import pytest
 from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
 from uuid import uuid4, UUID
 from src.services.health_events import (
+    HealthEventBatcher,
+    HealthEventRecord,
+    iter_health_events,
     create_health_event,
+    create_health_events_bulk,
     get_health_events,
     check_duplicate_event,
     get_event_count_by_type,
@@ -252,6 +259,63 @@ class TestGetHealthEvents:
         assert events == []
 
 
+class TestIterHealthEvents:
+    """Tests for iter_health_events() streaming reads"""
+
+    @pytest.mark.asyncio
+    async def test_streams_same_rows_as_get(self):
+        """Test that streaming yields the same events as get_health_events"""
+        user_id = f"test_user_{uuid4()}"
+        now = datetime.now()
+        for i in range(5):
+            await create_health_event(
+                user_id=user_id,
+                event_type="meal",
+                timestamp=now - timedelta(hours=i),
+                metadata={"calories": i}
+            )
+
+        start, end = now - timedelta(days=1), now
+        expected = await get_health_events(user_id, start, end)
+        streamed = [e async for e in iter_health_events(user_id, start, end, fetch_size=2)]
+
+        assert streamed == expected
+
+    @pytest.mark.asyncio
+    async def test_query_and_row_format_are_passed_to_stream(self):
+        """Test ordering, type filter and fetch size reach the server-side cursor"""
+        record = HealthEventRecord(uuid4(), "u", "meal", datetime(2026, 1, 1), {"calories": 1})
+
+        async def _stream(query, params, fetch_size, row_factory):
+            assert "ORDER BY timestamp ASC" in query
+            assert "event_type = ANY(%s)" in query
+            assert params[-1] == ["meal"]
+            assert fetch_size == 50
+            yield record
+
+        with patch("src.services.health_events.db.stream", _stream):
+            events = [
+                e async for e in iter_health_events(
+                    "u", datetime(2026, 1, 1), datetime(2026, 2, 1),
+                    event_types=["meal"], row_format="record", ascending=True, fetch_size=50
+                )
+            ]
+
+        assert events == [record]
+
+    def test_record_supports_dict_style_access(self):
+        """Test that records can replace dict rows in existing consumers"""
+        ts = datetime(2026, 1, 1)
+        record = HealthEventRecord(uuid4(), "u", "sleep", ts, {"total_sleep_hours": 7})
+
+        assert record["event_type"] == "sleep" == record.event_type
+        assert record.get("metadata", {})["total_sleep_hours"] == 7
+        assert record.get("missing", "default") == "default"
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(KeyError):
+            record["missing"]
+
+
 class TestDuplicateDetection:
     """Tests for check_duplicate_event() function"""
 
@@ -302,6 +366,85 @@ class TestDuplicateDetection:
         assert is_duplicate is False
 
 
+class TestBulkIngestion:
+    """Tests for create_health_events_bulk() and HealthEventBatcher"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_is_idempotent_on_source_keys(self):
+        """Test that re-ingesting the same source records inserts nothing"""
+        user_id = f"test_user_{uuid4()}"
+        events = [
+            {
+                "user_id": user_id,
+                "event_type": "meal",
+                "timestamp": datetime.now(),
+                "metadata": {"calories": 100 * i},
+                "source_table": "food_entries",
+                "source_id": uuid4(),
+            }
+            for i in range(1, 4)
+        ]
+
+        assert await create_health_events_bulk(events) == 3
+        assert await create_health_events_bulk(events) == 0
+        assert await check_duplicate_event("food_entries", events[0]["source_id"]) is True
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_validates_before_writing(self):
+        """Test that one invalid event rejects the whole batch"""
+        events = [
+            {"user_id": "u", "event_type": "meal", "timestamp": datetime.now(), "metadata": {"a": 1}},
+            {"user_id": "u", "event_type": "invalid", "timestamp": datetime.now(), "metadata": {"a": 1}},
+        ]
+
+        with patch("src.services.health_events.db") as mock_db:
+            with pytest.raises(ValueError, match="Invalid event_type"):
+                await create_health_events_bulk(events)
+        mock_db.connection.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_batcher_flushes_queued_events_together(self):
+        """Test that events added within the window are written in one bulk call"""
+        batcher = HealthEventBatcher(flush_window=60)
+        with patch("src.services.health_events.create_health_events_bulk",
+                   AsyncMock(return_value=2)) as mock_bulk:
+            batcher.add("u", "meal", datetime.now(), {"calories": 300},
+                        source_table="food_entries", source_id=uuid4())
+            batcher.add("u", "sleep", datetime.now(), {"total_sleep_hours": 7},
+                        source_table="sleep_entries", source_id=uuid4())
+            assert batcher.pending == 2
+
+            assert await batcher.flush() == 2
+
+        mock_bulk.assert_awaited_once()
+        assert [e["event_type"] for e in mock_bulk.call_args.args[0]] == ["meal", "sleep"]
+        assert batcher.pending == 0
+        batcher._flush_task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_batcher_falls_back_to_single_inserts(self):
+        """Test that a failed bulk write retries events one by one"""
+        batcher = HealthEventBatcher(flush_window=0)
+        with patch("src.services.health_events.create_health_events_bulk",
+                   AsyncMock(side_effect=Exception("copy failed"))), \
+                patch("src.services.health_events.create_health_event",
+                      AsyncMock(side_effect=[uuid4(), Exception("bad row")])) as mock_single:
+            batcher.add("u", "meal", datetime.now(), {"calories": 300})
+            batcher.add("u", "meal", datetime.now(), {"calories": 400})
+
+            await batcher.drain()
+
+        assert mock_single.await_count == 2
+        assert batcher.pending == 0
+
+    def test_batcher_rejects_invalid_events(self):
+        """Test that validation errors surface at add() time"""
+        batcher = HealthEventBatcher()
+        with pytest.raises(ValueError):
+            batcher.add("u", "meal", datetime.now(), {})
+        assert batcher.pending == 0
+
+
 class TestEventCountByType:
     """Tests for get_event_count_by_type() function"""
 
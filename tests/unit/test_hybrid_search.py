@@ -0,0 +1,97 @@
+"""
+Tests for the fused single-statement hybrid search
+"""
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.services.hybrid_search import HybridSearchService
+
+
+def _mock_db(rows):
+    """Patch db.connection() with a cursor returning the fused rows"""
+    cur = MagicMock()
+    cur.execute = AsyncMock()
+    cur.fetchall = AsyncMock(return_value=rows)
+    conn = MagicMock()
+
+    @asynccontextmanager
+    async def _cursor():
+        yield cur
+
+    @asynccontextmanager
+    async def _connection():
+        yield conn
+
+    conn.cursor = _cursor
+    return patch("src.services.hybrid_search.db.connection", _connection), cur
+
+
+@pytest.fixture
+def service():
+    with patch("src.services.hybrid_search.get_visual_search_service") as visual, \
+            patch("src.services.hybrid_search.get_formula_detection_service"):
+        visual.return_value.embedding_service.generate_embedding = AsyncMock(return_value=[0.1] * 512)
+        yield HybridSearchService()
+
+
+class TestFusedHybridSearch:
+    """Test query assembly, result mapping and fallback"""
+
+    @pytest.mark.asyncio
+    async def test_text_only_search_skips_visual_ctes(self, service):
+        patcher, cur = _mock_db([])
+
+        with patcher:
+            assert await service.search("123", text="Protein Shake", search_domains=["formulas", "patterns"]) == []
+
+        query, params = cur.execute.await_args.args
+        assert "formulas_text AS" in query and "patterns_text AS" in query
+        assert "visual_candidates" not in query
+        assert params["words"] == ["protein", "shake"]
+        assert params["candidates"] == 10
+        service.visual_service.embedding_service.generate_embedding.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_embedding_is_generated_once_for_both_visual_branches(self, service):
+        patcher, cur = _mock_db([])
+
+        with patcher:
+            await service.search("123", image_path="/tmp/shake.jpg", search_domains=["foods", "formulas"])
+
+        service.visual_service.embedding_service.generate_embedding.assert_awaited_once_with("/tmp/shake.jpg")
+        query, params = cur.execute.await_args.args
+        assert query.count("FROM food_image_references") == 1
+        assert "foods_visual AS" in query and "formulas_visual AS" in query
+        assert params["embedding"].startswith("[0.1,")
+        cur.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_rows_map_to_hybrid_results(self, service):
+        patcher, cur = _mock_db([
+            {"id": "f1", "type": "formulas", "score": 2 / 61, "name": "Shake", "confidence": 0.9,
+             "ranks": {"formulas_semantic": 1, "formulas_visual": 1}, "data": {"id": "f1", "name": "Shake"}},
+            {"id": "p1", "type": "patterns", "score": 1 / 62, "name": "p1", "confidence": 0.5,
+             "ranks": {"patterns_semantic": 2}, "data": {"id": "p1"}},
+        ])
+
+        with patcher:
+            results = await service.search("123", text="shake", image_path="/tmp/shake.jpg")
+
+        assert [r.id for r in results] == ["f1", "p1"]
+        assert results[0].semantic_rank == 1 and results[0].visual_rank == 1
+        assert results[0].structured_rank == 1
+        assert results[1].semantic_rank == 2 and results[1].visual_rank is None
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_parallel_search_on_error(self, service):
+        patcher, cur = _mock_db([])
+        cur.execute.side_effect = Exception("function search_formulas_by_keyword does not exist")
+        service.formula_service.find_formulas_by_keyword = AsyncMock(
+            return_value=[{"id": "f1", "name": "Shake", "match_score": 1.0}]
+        )
+
+        with patcher:
+            results = await service.search("123", text="shake", search_domains=["formulas"])
+
+        assert [r.id for r in results] == ["f1"]
@@ -0,0 +1,94 @@
+"""
+Tests for the event loop lag and slow callback monitor
+"""
+import asyncio
+import time
+
+import pytest
+
+from src.observability.loop_monitor import LoopMonitor, dump_tasks
+
+
+def _block_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def _blocking_handler() -> None:
+    await asyncio.sleep(0)
+    _block_loop(0.2)
+
+
+@pytest.fixture
+async def monitor():
+    monitor = LoopMonitor(sample_interval_ms=10, slow_callback_ms=50)
+    monitor.start()
+    yield monitor
+    await monitor.stop()
+
+
+class TestLoopMonitor:
+    """Test lag sampling, slow callback reports and task dumps"""
+
+    def test_lag_percentiles(self):
+        monitor = LoopMonitor()
+        assert monitor.lag_percentiles() == {}
+
+        for lag_ms in range(1, 101):
+            monitor.record_lag(lag_ms / 1000)
+
+        assert monitor.lag_percentiles() == {"p50": 0.05, "p90": 0.09, "p99": 0.099, "max": 0.1}
+        assert monitor.get_stats()["lag_ms"]["p99"] == 99.0
+
+    @pytest.mark.asyncio
+    async def test_blocking_task_is_reported_with_its_stack(self, monitor):
+        await asyncio.create_task(_blocking_handler(), name="handler-42")
+
+        report = monitor.recent_slow_callbacks()[0]
+        assert report["kind"] == "task"
+        assert report["task"] == "handler-42"
+        assert report["coroutine"] == "_blocking_handler"
+        assert report["duration_ms"] >= 200
+        # Captured while blocked, so it shows the blocking call
+        assert any("_block_loop" in line for line in report["stack"])
+        assert monitor.get_stats()["slow_callbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_blocked_loop_shows_up_as_lag(self, monitor):
+        await asyncio.sleep(0.03)
+        _block_loop(0.1)
+        await asyncio.sleep(0.03)
+
+        assert max(monitor._lag_samples) >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_fast_callbacks_are_not_reported(self, monitor):
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert monitor.recent_slow_callbacks() == []
+
+    @pytest.mark.asyncio
+    async def test_stop_restores_handle_run(self):
+        original = asyncio.Handle._run
+        monitor = LoopMonitor(sample_interval_ms=10, slow_callback_ms=50)
+        monitor.start()
+        assert monitor.get_stats()["callbacks_timed"]
+
+        await monitor.stop()
+
+        assert asyncio.Handle._run is original
+        assert not monitor.running
+
+    @pytest.mark.asyncio
+    async def test_dump_tasks(self):
+        task = asyncio.create_task(asyncio.sleep(10), name="sleeper")
+        await asyncio.sleep(0)
+
+        try:
+            tasks = {entry["name"]: entry for entry in dump_tasks()}
+        finally:
+            task.cancel()
+
+        assert tasks["sleeper"]["coroutine"] == "sleep"
+        assert tasks["sleeper"]["stack"]
+        assert any(entry["current"] for entry in tasks.values())
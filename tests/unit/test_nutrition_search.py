@@ -426,3 +426,31 @@ class TestVerifyFoodItems:
                 assert len(result) == 1
                 assert result[0].verification_source == "ai_estimate"
                 assert result[0].confidence_score == 0.5
+
+    async def test_cached_foods_prefetched_in_one_batch(self):
+        """Should resolve cached foods with one get_many instead of a lookup per item"""
+        original_items = [
+            FoodItem(name="Chicken Breast", quantity="170g", calories=200,
+                     macros=FoodMacros(protein=30, carbs=0, fat=5)),
+            FoodItem(name="Rice", quantity="100g", calories=130,
+                     macros=FoodMacros(protein=3, carbs=28, fat=0)),
+        ]
+        chicken = {"foods": [{"description": "Chicken breast", "score": 800, "foodNutrients": [
+            {"nutrientName": "Energy", "value": 165},
+            {"nutrientName": "Protein", "value": 31},
+        ]}]}
+
+        redis_cache = MagicMock()
+        redis_cache.get_many = AsyncMock(return_value={"usda:chicken breast:3": chicken})
+        search = AsyncMock(return_value=None)
+
+        with patch('src.utils.nutrition_search.ENABLE_NUTRITION_VERIFICATION', True), \
+                patch('src.cache.redis_client.get_cache', return_value=redis_cache), \
+                patch('src.utils.nutrition_search.search_usda', search):
+            result = await verify_food_items(original_items)
+
+        redis_cache.get_many.assert_awaited_once()
+        assert set(redis_cache.get_many.await_args.args[0]) == {"usda:chicken breast:3", "usda:rice:3"}
+        search.assert_awaited_once_with("rice")
+        assert result[0].verification_source == "usda"
+        assert result[1].verification_source == "ai_estimate"
@@ -1,7 +1,11 @@
 """Tests for multi-agent nutrition validator"""
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
-from src.agent.nutrition_validator import NutritionValidator
+from src.agent.nutrition_validator import (
+    NutritionValidator,
+    CrossValidationBudget,
+    CrossValidationConfig,
+)
 from src.models.food import FoodItem, FoodMacros, VisionAnalysisResult
 
 
@@ -272,3 +276,80 @@ async def test_blend_different_food_counts(validator):
     # Should return primary result when counts don't match
     assert len(blended.foods) == 1
     assert blended.foods[0].name == "Food1"
+
+
+def _usda_match(calories=165, confidence_score=0.9):
+    return [FoodItem(
+        name="Chicken Breast",
+        quantity="100g",
+        calories=calories,
+        macros=FoodMacros(protein=31.0, carbs=0.0, fat=3.6),
+        verification_source="usda",
+        confidence_score=confidence_score
+    )]
+
+
+@pytest.fixture
+def no_audit_sample(monkeypatch):
+    monkeypatch.setattr(CrossValidationConfig, "AUDIT_SAMPLE_RATE", 0.0)
+
+
+@pytest.mark.asyncio
+async def test_confident_usda_match_skips_cross_validation(validator, good_vision_result, no_audit_sample):
+    """High confidence + USDA agreement + reasonable values: no second vision call"""
+    with patch.object(validator, "validate_with_cross_model", AsyncMock()) as mock_cross:
+        _, warnings = await validator.validate(
+            vision_result=good_vision_result,
+            photo_path="/tmp/test.jpg",
+            usda_verified_items=_usda_match(),
+            user_id="123"
+        )
+
+    mock_cross.assert_not_awaited()
+    assert warnings == []
+    assert validator.get_stats()["skipped"] == 1
+
+
+@pytest.mark.parametrize("confidence,usda,reason", [
+    ("medium", _usda_match(), "low_confidence"),
+    ("high", _usda_match(calories=300), "usda_disagreement"),
+    ("high", _usda_match(confidence_score=0.5), "no_usda_match"),
+    ("high", None, "no_usda_match"),
+])
+def test_outliers_escalate(validator, good_vision_result, no_audit_sample, confidence, usda, reason):
+    """Outliers are escalated to the secondary model"""
+    good_vision_result.confidence = confidence
+    usda_warnings = validator._compare_with_usda(good_vision_result.foods, usda) if usda else []
+
+    decision = validator.decide_cross_validation(good_vision_result, usda, [], usda_warnings, "123")
+
+    assert decision.run is True
+    assert decision.reason == reason
+
+
+def test_unreasonable_values_escalate(validator, bad_vision_result, no_audit_sample):
+    """Failed reasonableness checks are escalated"""
+    from src.utils.reasonableness_rules import validate_food_items
+    _, reasonableness_warnings = validate_food_items(bad_vision_result.foods)
+
+    decision = validator.decide_cross_validation(
+        bad_vision_result, None, reasonableness_warnings, [], "123"
+    )
+
+    assert decision.run is True
+    assert decision.reason == "unreasonable"
+
+
+def test_budget_limits_escalations_per_user(validator, bad_vision_result):
+    """Escalations beyond the hourly budget are skipped"""
+    validator.budget = CrossValidationBudget(max_per_hour=2)
+
+    decisions = [
+        validator.decide_cross_validation(bad_vision_result, None, ["warn"], [], "123")
+        for _ in range(3)
+    ]
+
+    assert [d.run for d in decisions] == [True, True, False]
+    assert decisions[2].reason == "budget_exhausted"
+    # Other users have their own budget
+    assert validator.decide_cross_validation(bad_vision_result, None, ["warn"], [], "456").run
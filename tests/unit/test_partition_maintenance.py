@@ -0,0 +1,88 @@
+"""
+Tests for the health_events partition maintenance job
+"""
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.scheduler.partition_maintenance import (
+    HEALTH_EVENTS_RETENTION_MONTHS,
+    MAINTENANCE_TIME,
+    PartitionMaintenanceScheduler,
+    run_partition_maintenance,
+)
+
+
+def _mock_db(created=0, archived=(), default_rows=0):
+    """Patch db.connection() with a cursor returning the maintenance results"""
+    cur = MagicMock()
+    cur.execute = AsyncMock()
+    cur.fetchone = AsyncMock(side_effect=[{"created": created}, {"count": default_rows}])
+    cur.fetchall = AsyncMock(return_value=[{"name": name} for name in archived])
+    conn = MagicMock()
+    conn.commit = AsyncMock()
+
+    @asynccontextmanager
+    async def _cursor():
+        yield cur
+
+    @asynccontextmanager
+    async def _connection():
+        yield conn
+
+    conn.cursor = _cursor
+    return patch("src.scheduler.partition_maintenance.db.connection", _connection), conn, cur
+
+
+class TestPartitionMaintenance:
+    """Test partition creation, archival and scheduling"""
+
+    @pytest.mark.asyncio
+    async def test_creates_and_archives_partitions(self):
+        patcher, conn, cur = _mock_db(created=2, archived=["health_events_2023_01"])
+
+        with patcher:
+            result = await run_partition_maintenance(months_ahead=3, retain_months=24)
+
+        assert result == {"created": 2, "archived": ["health_events_2023_01"], "default_rows": 0}
+        calls = [c.args for c in cur.execute.await_args_list]
+        assert calls[0] == ("SELECT ensure_health_events_partitions(%s) AS created", (3,))
+        assert calls[1] == ("SELECT archive_health_events_partitions(%s) AS name", (24,))
+        conn.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_archives_nothing_without_retention(self):
+        patcher, conn, cur = _mock_db(created=1)
+
+        with patcher:
+            result = await run_partition_maintenance()
+
+        assert result["archived"] == []
+        statements = [c.args[0] for c in cur.execute.await_args_list]
+        assert not any("archive_health_events_partitions" in sql for sql in statements)
+
+    @pytest.mark.asyncio
+    async def test_warns_about_rows_in_default_partition(self, caplog):
+        patcher, conn, cur = _mock_db(default_rows=5)
+
+        with patcher:
+            result = await run_partition_maintenance()
+
+        assert result["default_rows"] == 5
+        assert "default partition" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_scheduler_registers_daily_and_startup_runs(self):
+        app = MagicMock()
+        scheduler = PartitionMaintenanceScheduler(app)
+
+        await scheduler.schedule_partition_maintenance()
+
+        daily = app.job_queue.run_daily.call_args.kwargs
+        assert daily["time"] == MAINTENANCE_TIME
+        assert daily["name"] == "health_events_partition_maintenance"
+        assert daily["data"] == {"retain_months": HEALTH_EVENTS_RETENTION_MONTHS}
+        startup = app.job_queue.run_once.call_args.kwargs
+        assert startup["when"] == 0
+        # The startup run never archives
+        assert startup["data"] == {"retain_months": 0}
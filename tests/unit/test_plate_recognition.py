@@ -4,13 +4,26 @@ Unit Tests for Plate Recognition Service
 Tests for plate detection, matching, calibration, and portion estimation.
 Epic 009 - Phase 2: Plate Recognition & Calibration
 """
+import struct
+
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
 
+from src.db.vector import (
+    VectorBinaryLoader,
+    parse_vector,
+    register_vector_loader,
+    to_vector_literal,
+    use_binary_vectors,
+)
+from src.services import plate_recognition
 from src.services.plate_recognition import (
     PlateRecognitionService,
-    PlateRecognitionError
+    PlateRecognitionError,
+    PlateCache,
+    UserPlates
 )
 from src.models.plate import (
     PlateMetadata,
@@ -533,6 +546,186 @@ class TestPlateRecognitionService:
 # Edge Cases and Error Handling
 # ================================================================
 
+class TestPlateCache:
+    """Test in-process plate matching and the hydrated plate queries"""
+
+    @pytest.fixture(autouse=True)
+    def reset_module_state(self, monkeypatch):
+        """Fresh global service for each test"""
+        monkeypatch.setattr(plate_recognition, "_plate_recognition_service", None)
+
+    @staticmethod
+    def _vec(*head):
+        """512-dim embedding starting with head"""
+        return list(head) + [0.0] * (512 - len(head))
+
+    @staticmethod
+    def _plate(plate_id, embedding, user_id="test-user"):
+        now = datetime.utcnow()
+        return RecognizedPlate(
+            id=plate_id,
+            user_id=user_id,
+            plate_name=f"Plate {plate_id}",
+            embedding=list(embedding),
+            plate_type="plate",
+            color="white",
+            shape="round",
+            estimated_diameter_cm=None,
+            estimated_capacity_ml=None,
+            times_recognized=1,
+            first_seen_at=now,
+            last_seen_at=now,
+            is_calibrated=False,
+            calibration_confidence=None,
+            calibration_method=None,
+            model_version="clip-vit-base-patch32",
+            created_at=now,
+            updated_at=now
+        )
+
+    @staticmethod
+    def _row(plate):
+        row = plate.model_dump()
+        row["embedding"] = np.asarray(plate.embedding, dtype=np.float32)
+        return row
+
+    def _user_plates(self, *embeddings):
+        embeddings = [self._vec(*e) for e in embeddings]
+        plates = [self._plate(f"p{i}", e) for i, e in enumerate(embeddings)]
+        return UserPlates(plates, [np.asarray(e, dtype=np.float32) for e in embeddings])
+
+    @staticmethod
+    def _mock_db(rows):
+        cursor = AsyncMock()
+        cursor.fetchall.return_value = rows
+        cursor.fetchone.return_value = rows[0] if rows else None
+        cursor.__aenter__.return_value = cursor
+        cursor.__aexit__.return_value = None
+
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+        conn.__aenter__ = AsyncMock(return_value=conn)
+        conn.__aexit__ = AsyncMock(return_value=None)
+        return conn, cursor
+
+    def test_vector_binary_loader(self):
+        """Binary pgvector payload decodes to float32 without text parsing"""
+        values = [0.5, -1.25, 3.0]
+        data = struct.pack(">HH", len(values), 0) + struct.pack(">3f", *values)
+
+        loaded = VectorBinaryLoader(0).load(data)
+
+        assert loaded.dtype == np.float32
+        assert loaded.tolist() == values
+        assert parse_vector(to_vector_literal(values)).tolist() == values
+
+    @pytest.mark.asyncio
+    async def test_vector_loader_is_registered_per_connection(self):
+        """Each connection gets the vector OID of its own database"""
+        infos = {"db1": MagicMock(oid=16001), "db2": MagicMock(oid=17002)}
+        conns = {name: MagicMock(name=name) for name in infos}
+
+        async def fetch(conn, name):
+            return next(infos[key] for key, c in conns.items() if c is conn)
+
+        with patch("src.db.vector.psycopg.types.TypeInfo.fetch", side_effect=fetch):
+            for conn in conns.values():
+                assert await register_vector_loader(conn)
+
+        for name, conn in conns.items():
+            conn.adapters.register_loader.assert_called_once_with(infos[name].oid, VectorBinaryLoader)
+
+    @pytest.mark.asyncio
+    async def test_use_binary_vectors_registers_on_unconfigured_connection(self):
+        """Connections outside the pool get the loader on first use, cursor included"""
+        cur = MagicMock()
+        cur.adapters.types.get.return_value = None
+        info = MagicMock(oid=16001)
+
+        with patch("src.db.vector.psycopg.types.TypeInfo.fetch", AsyncMock(return_value=info)):
+            assert await use_binary_vectors(cur)
+        cur.adapters.register_loader.assert_called_once_with(16001, VectorBinaryLoader)
+        cur.connection.adapters.register_loader.assert_called_once_with(16001, VectorBinaryLoader)
+
+        with patch("src.db.vector.psycopg.types.TypeInfo.fetch", AsyncMock(return_value=None)):
+            cur.adapters.types.get.return_value = None
+            assert not await use_binary_vectors(cur)
+
+    def test_search_orders_by_similarity_and_applies_threshold(self):
+        """Cosine search returns closest plates first, within the distance threshold"""
+        entry = self._user_plates([1, 0, 0], [0.9, 0.1, 0], [0, 1, 0])
+
+        matches = entry.search(self._vec(1, 0, 0), limit=5, distance_threshold=0.15)
+
+        assert [p.id for p in matches] == ["p0", "p1"]
+        assert [p.id for p in entry.search(self._vec(1, 0, 0), limit=1, distance_threshold=1.0)] == ["p0"]
+
+    def test_search_ignores_zero_vectors(self):
+        entry = self._user_plates([0, 0, 0], [1, 0, 0])
+
+        assert [p.id for p in entry.search(self._vec(1, 0, 0), limit=5, distance_threshold=1.0)] == ["p1"]
+        assert entry.search(self._vec(), limit=5, distance_threshold=1.0) == []
+
+    def test_cache_lru_ttl_and_invalidation(self):
+        cache = PlateCache(max_users=1, ttl_seconds=300)
+        cache.put("u1", self._user_plates([1, 0, 0]))
+        assert cache.get_plate("p0") is not None
+
+        cache.put("u2", self._user_plates([0, 1, 0]))
+        assert cache.get("u1") is None  # evicted
+        assert cache.get("u2") is not None
+
+        cache.invalidate_plate("p0")
+        assert cache.get("u2") is None
+
+        cache.ttl_seconds = -1
+        cache.put("u3", self._user_plates([1, 0, 0]))
+        assert cache.get("u3") is None  # expired
+
+    def test_record_usage_updates_cached_plate(self):
+        cache = PlateCache()
+        cache.put("u1", self._user_plates([1, 0, 0]))
+
+        cache.record_usage("p0")
+
+        assert cache.get_plate("p0").times_recognized == 2
+
+    @pytest.mark.asyncio
+    async def test_search_loads_user_plates_in_one_query(self):
+        """A cache miss is one binary query; the next match needs none"""
+        service = PlateRecognitionService()
+        plate = self._plate("p0", self._vec(1.0))
+        conn, cursor = self._mock_db([self._row(plate)])
+
+        with patch("src.services.plate_recognition.db.connection", return_value=conn), \
+                patch("src.services.plate_recognition.use_binary_vectors", AsyncMock(return_value=True)):
+            first = await service._search_similar_plates("test-user", plate.embedding, 1, 0.15)
+            second = await service._search_similar_plates("test-user", plate.embedding, 1, 0.15)
+
+        assert [p.id for p in first] == [p.id for p in second] == ["p0"]
+        assert cursor.execute.await_count == 1
+        assert cursor.execute.call_args.kwargs["binary"] is True
+        assert (await service.get_plate_by_id("p0")).id == "p0"
+
+    @pytest.mark.asyncio
+    async def test_search_falls_back_to_sql_for_large_users(self):
+        """Users over the cache limit are matched with one hydrated pgvector query"""
+        service = PlateRecognitionService()
+        service.plate_cache.max_plates = 1
+        plates = [self._plate(f"p{i}", self._vec(1.0)) for i in range(2)]
+        conn, cursor = self._mock_db([self._row(p) for p in plates])
+
+        with patch("src.services.plate_recognition.db.connection", return_value=conn), \
+                patch("src.services.plate_recognition.use_binary_vectors", AsyncMock(return_value=True)):
+            await service._search_similar_plates("test-user", plates[0].embedding, 1, 0.15)
+            matches = await service._search_similar_plates("test-user", plates[0].embedding, 1, 0.15)
+
+        # Load (too many) + SQL search, then straight to SQL search
+        assert cursor.execute.await_count == 3
+        assert "<=>" in cursor.execute.call_args.args[0]
+        assert len(matches) == 2  # mocked rows, hydrated without extra lookups
+
+
 class TestEdgeCases:
     """Test edge cases and error conditions"""
 
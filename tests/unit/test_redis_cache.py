@@ -0,0 +1,345 @@
+"""
+Tests for RedisCache serialization, batch operations and pipelining
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.cache.redis_client import RedisCache
+from src.cache.serializers import (
+    FLAG_COMPRESSED,
+    JsonSerializer,
+    MSGPACK_AVAILABLE,
+    MsgpackSerializer,
+    Serializer,
+    get_serializer,
+)
+
+
+class _Pipeline:
+    """In-memory stand-in for a redis.asyncio pipeline"""
+
+    def __init__(self, client):
+        self._client = client
+        self._queued = []
+
+    def get(self, key):
+        self._queued.append(lambda: self._client.data.get(key))
+
+    def set(self, key, value):
+        self._queued.append(lambda: self._client.data.__setitem__(key, value) or True)
+
+    def setex(self, key, ttl, value):
+        self._queued.append(lambda: self._client.data.__setitem__(key, value) or True)
+
+    def delete(self, *keys):
+        self._queued.append(lambda: sum(self._client.data.pop(key, None) is not None for key in keys))
+
+    def expire(self, key, ttl, nx=False, gt=False):
+        self._queued.append(lambda: key in self._client.data)
+
+    def persist(self, key):
+        self._queued.append(lambda: False)
+
+    def sadd(self, key, member):
+        self._queued.append(lambda: self._client.data.setdefault(key, set()).add(member))
+
+    def smembers(self, key):
+        self._queued.append(lambda: set(self._client.data.get(key, ())))
+
+    async def execute(self, raise_on_error=True):
+        self._client.round_trips += 1
+        results = [command() for command in self._queued]
+        self._queued = []
+        return results
+
+
+class _Client:
+    """In-memory stand-in for redis.asyncio.Redis that counts round trips"""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+        self.published = []
+
+    async def get(self, key):
+        self.round_trips += 1
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        self.round_trips += 1
+        return [self.data.get(key) for key in keys]
+
+    async def setex(self, key, ttl, value):
+        self.round_trips += 1
+        self.data[key] = value
+
+    async def set(self, key, value):
+        self.round_trips += 1
+        self.data[key] = value
+
+    async def mset(self, mapping):
+        self.round_trips += 1
+        self.data.update(mapping)
+        return True
+
+    async def delete(self, *keys):
+        self.round_trips += 1
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def publish(self, channel, message):
+        self.round_trips += 1
+        self.published.append((channel, message))
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+def _cache(serializer=None) -> RedisCache:
+    cache = RedisCache(enabled=True, serializer=serializer or JsonSerializer(compress_min_bytes=1024))
+    cache.enabled = True
+    cache._client = _Client()
+    return cache
+
+
+class TestSerializers:
+    """Test value encoding, compression and legacy reads"""
+
+    def test_json_round_trip(self):
+        serializer = JsonSerializer()
+        value = {"foods": [{"description": "Rice", "score": 95.5}], "totalHits": 1}
+        assert serializer.loads(serializer.dumps(value)) == value
+
+    def test_large_values_are_compressed(self):
+        serializer = JsonSerializer(compress_min_bytes=256)
+        value = {"foods": [{"description": "Chicken, broilers or fryers", "score": 90}] * 50}
+
+        data = serializer.dumps(value)
+
+        assert data[0] & FLAG_COMPRESSED
+        assert len(data) < len(json.dumps(value))
+        assert serializer.loads(data) == value
+
+    def test_small_values_are_not_compressed(self):
+        data = JsonSerializer(compress_min_bytes=256).dumps({"a": 1})
+        assert not data[0] & FLAG_COMPRESSED
+
+    def test_reads_legacy_json_text(self):
+        serializer = JsonSerializer()
+        assert serializer.loads(b'{"a": 1}') == {"a": 1}
+        assert serializer.loads('[1, 2]') == [1, 2]
+
+    @pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack not installed")
+    def test_values_readable_across_serializers(self):
+        value = {"calories": 165, "name": "chicken"}
+        packed = MsgpackSerializer(compress_min_bytes=0).dumps(value)
+
+        assert JsonSerializer().loads(packed) == value
+        assert MsgpackSerializer().loads(JsonSerializer().dumps(value)) == value
+
+    def test_serializer_base_is_abstract(self):
+        with pytest.raises(TypeError):
+            Serializer()
+
+    def test_unknown_serializer_falls_back_to_json(self):
+        assert isinstance(get_serializer("pickle"), JsonSerializer)
+
+
+class TestBatchOperations:
+    """Test get_many/set_many and pipelines"""
+
+    @pytest.mark.asyncio
+    async def test_set_many_and_get_many_use_one_round_trip_each(self):
+        cache = _cache()
+
+        assert await cache.set_many({"a": {"x": 1}, "b": [1, 2]}, ttl=60)
+        assert cache._client.round_trips == 1
+
+        found = await cache.get_many(["a", "b", "missing", "a"])
+
+        assert found == {"a": {"x": 1}, "b": [1, 2]}
+        assert cache._client.round_trips == 2
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["sets"]) == (2, 1, 2)
+
+    @pytest.mark.asyncio
+    async def test_get_many_when_disabled(self):
+        cache = RedisCache(enabled=False, serializer=JsonSerializer())
+        assert await cache.get_many(["a", "b"]) == {}
+        assert cache.get_stats()["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_get_many_degrades_on_redis_error(self):
+        cache = _cache()
+        cache._client.mget = AsyncMock(side_effect=ConnectionError("down"))
+
+        assert await cache.get_many(["a"]) == {}
+        assert cache.get_stats()["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_pipeline_executes_on_exit(self):
+        cache = _cache()
+        await cache.set("existing", {"v": 1})
+        round_trips = cache._client.round_trips
+
+        async with cache.pipeline() as pipe:
+            pipe.set("new", {"v": 2}, ttl=60)
+            pipe.get("existing")
+            pipe.get("missing")
+
+        assert pipe.results == [True, {"v": 1}, None]
+        assert cache._client.round_trips == round_trips + 1
+        assert await cache.get("new") == {"v": 2}
+
+    @pytest.mark.asyncio
+    async def test_pipeline_discarded_when_block_raises(self):
+        cache = _cache()
+
+        with pytest.raises(RuntimeError):
+            async with cache.pipeline() as pipe:
+                pipe.set("new", 1)
+                raise RuntimeError("abort")
+
+        assert "new" not in cache._client.data
+
+    @pytest.mark.asyncio
+    async def test_operations_record_latency(self):
+        cache = _cache()
+        with patch("src.cache.redis_client._observe") as observe:
+            await cache.get_many(["a"])
+            await cache.set("a", 1)
+
+        assert [call.args[0] for call in observe.call_args_list] == ["get_many", "set"]
+
+
+class TestTagInvalidation:
+    """Test tag-indexed invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_deletes_only_tagged_keys(self):
+        cache = _cache()
+        await cache.set("user_memory:12", {"p": 1}, ttl=60, tags=["user:12", "user:12:user_memory"])
+        await cache.set("user_memory:123", {"p": 2}, ttl=60, tags=["user:123", "user:123:user_memory"])
+        await cache.set("untagged", 1)
+        round_trips = cache._client.round_trips
+
+        assert await cache.invalidate_tags("user:12") == 1
+
+        assert "user_memory:12" not in cache._client.data
+        assert "user_memory:123" in cache._client.data
+        assert "untagged" in cache._client.data
+        assert "tag:user:12" not in cache._client.data
+        assert cache._client.round_trips == round_trips + 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_unknown_tag(self):
+        cache = _cache()
+        assert await cache.invalidate_tags("user:missing") == 0
+
+    @pytest.mark.asyncio
+    async def test_pipeline_results_skip_tag_commands(self):
+        cache = _cache()
+
+        async with cache.pipeline() as pipe:
+            pipe.set("a", 1, ttl=60, tags=["user:1"])
+            pipe.get("a")
+
+        assert pipe.results == [True, 1]
+        assert await cache.invalidate_tags("user:1") == 1
+
+
+@pytest.fixture
+def tiered():
+    """L1 cache cleared, a fake-backed RedisCache as L2 and a bus publishing through it"""
+    from src.cache.invalidation import InvalidationBus
+    from src.utils import cache as l1
+
+    l1._cache.clear()
+    l2 = _cache()
+    bus = InvalidationBus()
+    bus._client = l2._client
+    with patch("src.cache.redis_client.get_cache", return_value=l2), \
+            patch("src.cache.invalidation.invalidation_bus", bus):
+        yield l1, l2, bus
+    l1._cache.clear()
+
+
+class TestTwoTierCache:
+    """Test cache_with_ttl over L1 and Redis with cross-process invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_shared_results_are_served_from_l2_in_another_process(self, tiered):
+        l1, l2, _ = tiered
+        calls = 0
+
+        @l1.cache_with_ttl(ttl=60, key_prefix="user_profile", shared=True)
+        async def get_profile(user_id: str):
+            nonlocal calls
+            calls += 1
+            return {"user_id": user_id}
+
+        assert await get_profile("42") == {"user_id": "42"}
+        assert calls == 1
+
+        # Another process: empty L1, same Redis
+        l1._cache.clear()
+        assert await get_profile("42") == {"user_id": "42"}
+        assert calls == 1
+        assert l1.get_cache_stats()["families"]["user_profile"]["l2_hits"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_unshared_results_stay_in_process(self, tiered):
+        l1, l2, _ = tiered
+
+        @l1.cache_with_ttl(ttl=60, key_prefix="user_streaks")
+        async def get_streaks(user_id: str):
+            return [1]
+
+        await get_streaks("42")
+        assert not [key for key in l2._client.data if "user_streaks" in key]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_clears_redis_and_publishes(self, tiered):
+        l1, l2, bus = tiered
+
+        @l1.cache_with_ttl(ttl=60, key_prefix="user_profile", shared=True)
+        async def get_profile(user_id: str):
+            return {"user_id": user_id}
+
+        await get_profile("42")
+        assert await l1.invalidate(l1.user_family_tag("42", "user_profile")) == 1
+
+        assert not [key for key in l2._client.data if key.startswith("user_profile:")]
+        channel, message = l2._client.published[-1]
+        assert json.loads(message) == {"origin": bus.instance_id, "tags": ["user:42:user_profile"]}
+
+    def test_bus_applies_messages_from_other_processes_only(self, tiered):
+        l1, _, bus = tiered
+        l1._store("user_xp:get:42:", {"xp": 1}, float("inf"), l1.user_tags("42", "user_xp"))
+
+        own = json.dumps({"origin": bus.instance_id, "tags": ["user:42"]})
+        assert bus.handle(own) == 0
+        assert "user_xp:get:42:" in l1._cache
+
+        other = json.dumps({"origin": "another-process", "tags": ["user:42"]}).encode()
+        assert bus.handle(other) == 1
+        assert "user_xp:get:42:" not in l1._cache
+
+    def test_bus_passes_tags_from_other_processes_to_listeners(self, tiered):
+        _, _, bus = tiered
+        seen = []
+        bus.add_listener(seen.append)
+
+        bus.handle(json.dumps({"origin": bus.instance_id, "tags": ["user:42:conversation"]}))
+        bus.handle(json.dumps({"origin": "another-process", "tags": ["user:42:conversation"]}))
+
+        assert seen == [["user:42:conversation"]]
+
+    def test_l1_is_bounded(self, tiered):
+        l1, _, _ = tiered
+        with patch.object(l1.CacheConfig, "MAX_ENTRIES", 2):
+            for key in ("a", "b", "c"):
+                l1._store(key, key, float("inf"), [l1.family_tag("test")])
+
+        assert list(l1._cache) == ["b", "c"]
+        assert l1._tag_index[l1.family_tag("test")] == {"b", "c"}
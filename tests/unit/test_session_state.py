@@ -0,0 +1,128 @@
+"""
+Tests for the per-message session state loader and its short-TTL cache
+"""
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from src.utils.session_state import (
+    SessionState,
+    SessionStateConfig,
+    get_session_state,
+    invalidate_session_state,
+    get_session_stats,
+    _session_cache,
+)
+from src.utils.auth import is_authorized
+
+
+def _row(status="active", end_date=None, with_onboarding=True):
+    """Build a get_session_state_row() style result"""
+    row = {
+        "subscription_status": status,
+        "subscription_tier": "pro",
+        "subscription_start_date": None,
+        "subscription_end_date": end_date,
+        "activated_at": None,
+        "invite_code_used": "CODE",
+        "onboarding_user_id": None,
+        "onboarding_path": None,
+        "current_step": None,
+        "step_data": None,
+        "completed_steps": None,
+        "started_at": None,
+        "completed_at": None,
+        "last_interaction_at": None,
+    }
+    if with_onboarding:
+        row.update(onboarding_user_id="123", onboarding_path="quick", current_step="timezone_setup")
+    return row
+
+
+@pytest.fixture(autouse=True)
+def reset_session_cache():
+    """Reset cache before and after each test"""
+    invalidate_session_state()
+    SessionStateConfig.ENABLED = True
+    yield
+    invalidate_session_state()
+
+
+class TestSessionState:
+    """Test SessionState construction and authorization decision"""
+
+    def test_from_row_splits_subscription_and_onboarding(self):
+        state = SessionState.from_row("123", _row())
+        assert state.subscription["status"] == "active"
+        assert state.subscription["invite_code_used"] == "CODE"
+        assert state.onboarding["current_step"] == "timezone_setup"
+        assert state.is_authorized is True
+
+    def test_from_row_without_onboarding_row(self):
+        state = SessionState.from_row("123", _row(with_onboarding=False))
+        assert state.onboarding is None
+
+    def test_missing_user_is_not_authorized(self):
+        state = SessionState.from_row("123", None)
+        assert state.subscription is None
+        assert state.is_authorized is False
+
+    @pytest.mark.parametrize("status,end_date,expected", [
+        ("trial", None, True),
+        ("pending", None, False),
+        ("expired", None, False),
+        ("cancelled", datetime.now() + timedelta(days=1), True),
+        ("cancelled", datetime.now() - timedelta(days=1), False),
+    ])
+    def test_authorization_rules(self, status, end_date, expected):
+        state = SessionState.from_row("123", _row(status=status, end_date=end_date))
+        assert state.is_authorized is expected
+
+
+class TestSessionStateCache:
+    """Test caching, TTL and invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_second_lookup_hits_cache(self):
+        mock_query = AsyncMock(return_value=_row())
+        with patch("src.db.queries.get_session_state_row", mock_query):
+            await get_session_state("123")
+            await get_session_state("123")
+            assert await is_authorized("123") is True
+
+        mock_query.assert_awaited_once_with("123")
+        assert get_session_stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_reloaded(self):
+        mock_query = AsyncMock(return_value=_row())
+        with patch("src.db.queries.get_session_state_row", mock_query), \
+                patch("src.utils.session_state.time.monotonic", side_effect=[0.0, SessionStateConfig.TTL + 1]):
+            await get_session_state("123")
+            await get_session_state("123")
+
+        assert mock_query.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidation_forces_reload(self):
+        mock_query = AsyncMock(side_effect=[_row(status="pending"), _row(status="active")])
+        with patch("src.db.queries.get_session_state_row", mock_query):
+            assert await is_authorized("123") is False
+            invalidate_session_state("123")
+            assert await is_authorized("123") is True
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(SessionStateConfig, "MAX_SIZE", 2)
+        mock_query = AsyncMock(return_value=_row())
+        with patch("src.db.queries.get_session_state_row", mock_query):
+            for user_id in ("1", "2", "3"):
+                await get_session_state(user_id)
+
+        assert list(_session_cache.keys()) == ["2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_is_authorized_returns_false_on_error(self):
+        mock_query = AsyncMock(side_effect=Exception("db down"))
+        with patch("src.db.queries.get_session_state_row", mock_query):
+            assert await is_authorized("123") is False
@@ -0,0 +1,104 @@
+"""
+Tests for the cached user timezone resolver
+
+Covers LRU behaviour, batch lookups, invalidation and the sync helpers
+in datetime_helpers reading from the cache.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+from zoneinfo import ZoneInfo
+
+from src.utils.timezone_resolver import TimezoneResolver, timezone_resolver
+from src.utils.datetime_helpers import get_user_timezone, now_user_timezone
+
+
+@pytest.fixture(autouse=True)
+def reset_resolver():
+    """Clear the global resolver before and after each test"""
+    timezone_resolver.invalidate()
+    yield
+    timezone_resolver.invalidate()
+
+
+class TestTimezoneResolver:
+    """Test TimezoneResolver caching and lookups"""
+
+    @pytest.mark.asyncio
+    async def test_resolve_loads_once_then_hits_cache(self):
+        resolver = TimezoneResolver()
+        mock_query = AsyncMock(return_value={"123": "Europe/Stockholm"})
+
+        with patch("src.db.queries.get_user_timezones", mock_query):
+            tz1 = await resolver.resolve("123")
+            tz2 = await resolver.resolve("123")
+
+        assert tz1 == ZoneInfo("Europe/Stockholm")
+        assert tz2 is tz1
+        mock_query.assert_awaited_once_with(["123"])
+
+    @pytest.mark.asyncio
+    async def test_resolve_many_queries_only_misses(self):
+        resolver = TimezoneResolver()
+        resolver.prime("1", "America/New_York")
+        mock_query = AsyncMock(return_value={"2": "Asia/Tokyo"})
+
+        with patch("src.db.queries.get_user_timezones", mock_query):
+            result = await resolver.resolve_many(["1", "2", "3", "2"])
+
+        mock_query.assert_awaited_once_with(["2", "3"])
+        assert result["1"] == ZoneInfo("America/New_York")
+        assert result["2"] == ZoneInfo("Asia/Tokyo")
+        # Users without a profile fall back to the default and are cached
+        assert result["3"] == ZoneInfo("UTC")
+        assert resolver.get_cached("3") == ZoneInfo("UTC")
+
+    @pytest.mark.asyncio
+    async def test_resolve_does_not_cache_on_query_failure(self):
+        resolver = TimezoneResolver()
+        mock_query = AsyncMock(side_effect=Exception("db down"))
+
+        with patch("src.db.queries.get_user_timezones", mock_query):
+            tz = await resolver.resolve("123")
+
+        assert tz == ZoneInfo("UTC")
+        assert resolver.get_cached("123") is None
+
+    def test_lru_eviction(self):
+        resolver = TimezoneResolver(max_size=2)
+        resolver.prime("a", "Europe/Paris")
+        resolver.prime("b", "Europe/Berlin")
+        resolver.get_cached("a")  # Touch 'a' so 'b' is least recently used
+        resolver.prime("c", "Europe/Rome")
+
+        assert resolver.get_cached("a") is not None
+        assert resolver.get_cached("b") is None
+        assert resolver.get_cached("c") is not None
+
+    def test_invalid_timezone_falls_back_to_default(self):
+        resolver = TimezoneResolver()
+        assert resolver.prime("123", "Not/AZone") == ZoneInfo("UTC")
+
+    def test_invalidate_single_user(self):
+        resolver = TimezoneResolver()
+        resolver.prime("1", "Europe/Paris")
+        resolver.prime("2", "Europe/Paris")
+
+        resolver.invalidate("1")
+
+        assert resolver.get_cached("1") is None
+        assert resolver.get_cached("2") is not None
+
+
+class TestDatetimeHelpersUseCache:
+    """Test that sync datetime helpers read from the resolver cache"""
+
+    def test_get_user_timezone_uses_cache(self):
+        timezone_resolver.prime("123", "Asia/Tokyo")
+        assert get_user_timezone("123") == ZoneInfo("Asia/Tokyo")
+        assert now_user_timezone("123").tzinfo == ZoneInfo("Asia/Tokyo")
+
+    def test_get_user_timezone_miss_returns_default_without_io(self):
+        with patch("src.utils.timezone_helper.Path.read_text") as mock_read:
+            assert get_user_timezone("unknown") == ZoneInfo("UTC")
+        mock_read.assert_not_called()
+
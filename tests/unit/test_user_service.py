@@ -1,6 +1,7 @@
 """Unit tests for UserService"""
 
 import pytest
+from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 import sys
 
@@ -10,6 +11,7 @@ sys.modules['psycopg_pool'] = MagicMock()
 sys.modules['src.db.connection'] = MagicMock()
 
 from src.services.user_service import UserService
+from src.utils.session_state import SessionState
 
 
 @pytest.fixture
@@ -181,13 +183,15 @@ async def test_activate_user_invalid_code(mock_queries, user_service):
 
 
 @pytest.mark.asyncio
-@patch('src.services.user_service.queries')
-async def test_is_authorized_active(mock_queries, user_service):
+@patch('src.services.user_service.get_session_state')
+async def test_is_authorized_active(mock_get_state, user_service):
     """Test is_authorized for active user"""
     # Setup
     telegram_id = "12345"
-    mock_queries.get_user_subscription_status = AsyncMock(
-        return_value={'status': 'active', 'tier': 'pro'}
+    mock_get_state.return_value = SessionState(
+        user_id=telegram_id,
+        subscription={'status': 'active', 'tier': 'pro'},
+        onboarding=None
     )
 
     # Execute
@@ -198,13 +202,15 @@ async def test_is_authorized_active(mock_queries, user_service):
 
 
 @pytest.mark.asyncio
-@patch('src.services.user_service.queries')
-async def test_is_authorized_trial(mock_queries, user_service):
+@patch('src.services.user_service.get_session_state')
+async def test_is_authorized_trial(mock_get_state, user_service):
     """Test is_authorized for trial user"""
     # Setup
     telegram_id = "12345"
-    mock_queries.get_user_subscription_status = AsyncMock(
-        return_value={'status': 'trial', 'tier': 'pro'}
+    mock_get_state.return_value = SessionState(
+        user_id=telegram_id,
+        subscription={'status': 'trial', 'tier': 'pro'},
+        onboarding=None
     )
 
     # Execute
@@ -215,13 +221,15 @@ async def test_is_authorized_trial(mock_queries, user_service):
 
 
 @pytest.mark.asyncio
-@patch('src.services.user_service.queries')
-async def test_is_authorized_pending(mock_queries, user_service):
+@patch('src.services.user_service.get_session_state')
+async def test_is_authorized_pending(mock_get_state, user_service):
     """Test is_authorized for pending user"""
     # Setup
     telegram_id = "12345"
-    mock_queries.get_user_subscription_status = AsyncMock(
-        return_value={'status': 'pending', 'tier': 'basic'}
+    mock_get_state.return_value = SessionState(
+        user_id=telegram_id,
+        subscription={'status': 'pending', 'tier': 'basic'},
+        onboarding=None
     )
 
     # Execute
@@ -232,12 +240,33 @@ async def test_is_authorized_pending(mock_queries, user_service):
 
 
 @pytest.mark.asyncio
-@patch('src.services.user_service.queries')
-async def test_is_authorized_no_subscription(mock_queries, user_service):
+@patch('src.services.user_service.get_session_state')
+async def test_is_authorized_cancelled(mock_get_state, user_service):
+    """Test is_authorized for cancelled user with time left (unlike utils.auth)"""
+    # Setup
+    telegram_id = "12345"
+    mock_get_state.return_value = SessionState(
+        user_id=telegram_id,
+        subscription={'status': 'cancelled', 'end_date': datetime.now() + timedelta(days=1)},
+        onboarding=None
+    )
+
+    # Execute
+    result = await user_service.is_authorized(telegram_id)
+
+    # Assert
+    assert result is False
+
+
+@pytest.mark.asyncio
+@patch('src.services.user_service.get_session_state')
+async def test_is_authorized_no_subscription(mock_get_state, user_service):
     """Test is_authorized when user has no subscription"""
     # Setup
     telegram_id = "12345"
-    mock_queries.get_user_subscription_status = AsyncMock(return_value=None)
+    mock_get_state.return_value = SessionState(
+        user_id=telegram_id, subscription=None, onboarding=None
+    )
 
     # Execute
     result = await user_service.is_authorized(telegram_id)
@@ -343,21 +372,41 @@ async def test_get_subscription_status(mock_queries, user_service):
 
 
 @pytest.mark.asyncio
-async def test_set_timezone(user_service, mock_memory_manager):
+@patch('src.utils.timezone_resolver.timezone_resolver')
+@patch('src.services.user_service.queries')
+async def test_set_timezone(mock_queries, mock_resolver, user_service, mock_memory_manager):
     """Test setting user timezone"""
     # Setup
     telegram_id = "12345"
     timezone = "America/Los_Angeles"
+    mock_queries.set_user_timezone = AsyncMock()
 
     # Execute
     result = await user_service.set_timezone(telegram_id, timezone)
 
     # Assert
     assert result is True
+    mock_queries.set_user_timezone.assert_awaited_once_with(telegram_id, timezone)
+    mock_resolver.prime.assert_called_once_with(telegram_id, timezone)
     mock_memory_manager.update_preferences.assert_called_once_with(
         telegram_id, 'timezone', timezone
     )
 
 
+@pytest.mark.asyncio
+@patch('src.utils.timezone_resolver.timezone_resolver')
+@patch('src.services.user_service.queries')
+async def test_set_timezone_db_error(mock_queries, mock_resolver, user_service, mock_memory_manager):
+    """Test that a failed write drops the resolver entry and skips preferences"""
+    mock_queries.set_user_timezone = AsyncMock(side_effect=Exception("DB error"))
+
+    result = await user_service.set_timezone("12345", "America/Los_Angeles")
+
+    assert result is False
+    mock_resolver.invalidate.assert_called_once_with("12345")
+    mock_resolver.prime.assert_not_called()
+    mock_memory_manager.update_preferences.assert_not_called()
+
+
 # Note: test_get_timezone is skipped because it requires timezone_helper module
 # which has external dependencies. This functionality is tested in integration tests.
@@ -0,0 +1,117 @@
+"""
+Tests for the write-behind sink used by telemetry and audit writes
+"""
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.db.write_behind import WriteBehindSink, execute_write_behind, write_behind_sink
+
+
+def _mock_db(fail_executemany=False):
+    """Patch db.connection() with a connection/cursor pair of mocks"""
+    cur = MagicMock()
+    cur.execute = AsyncMock()
+    cur.executemany = AsyncMock(side_effect=Exception("fk violation") if fail_executemany else None)
+    conn = MagicMock()
+    conn.commit = AsyncMock()
+
+    @asynccontextmanager
+    async def _cursor():
+        yield cur
+
+    @asynccontextmanager
+    async def _connection(kind=None):
+        yield conn
+
+    conn.cursor = _cursor
+    return patch("src.db.write_behind.db.connection", _connection), conn, cur
+
+
+class TestWriteBehindSink:
+    """Test queueing, batching, fallback and shutdown"""
+
+    @pytest.mark.asyncio
+    async def test_not_running_rejects_records(self):
+        sink = WriteBehindSink()
+        assert sink.enqueue("INSERT 1", (1,)) is False
+
+    @pytest.mark.asyncio
+    async def test_consecutive_statements_batch_in_order(self):
+        patcher, conn, cur = _mock_db()
+        sink = WriteBehindSink(flush_interval=60)
+        sink.start()
+        try:
+            assert sink.enqueue("INSERT a", (1,))
+            assert sink.enqueue("INSERT a", (2,))
+            assert sink.enqueue("INSERT b", (3,))
+            assert sink.enqueue("INSERT a", (4,))
+
+            with patcher:
+                assert await sink.flush() == 4
+        finally:
+            sink._queue.clear()
+            await sink.stop()
+
+        assert [c.args for c in cur.executemany.await_args_list] == [
+            ("INSERT a", [(1,), (2,)]),
+            ("INSERT b", [(3,)]),
+            ("INSERT a", [(4,)]),
+        ]
+        conn.commit.assert_awaited_once()
+        assert sink.get_stats()["batched"] == 4
+
+    @pytest.mark.asyncio
+    async def test_overflow_is_rejected(self):
+        sink = WriteBehindSink(max_queue_size=2, flush_interval=60)
+        sink.start()
+        try:
+            assert sink.enqueue("INSERT a", (1,))
+            assert sink.enqueue("INSERT a", (2,))
+            assert sink.enqueue("INSERT a", (3,)) is False
+            assert sink.get_stats()["overflow"] == 1
+        finally:
+            sink._queue.clear()
+            await sink.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_queue(self):
+        patcher, conn, cur = _mock_db()
+        sink = WriteBehindSink(flush_interval=60)
+        sink.start()
+        sink.enqueue("INSERT a", (1,))
+
+        with patcher:
+            await sink.stop()
+
+        cur.executemany.assert_awaited_once_with("INSERT a", [(1,)])
+        assert sink.get_stats()["queued"] == 0
+        assert sink.enqueue("INSERT a", (2,)) is False
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_row_by_row(self):
+        patcher, conn, cur = _mock_db(fail_executemany=True)
+        cur.execute.side_effect = [None, Exception("bad row")]
+        sink = WriteBehindSink(flush_interval=60)
+        sink.start()
+        sink.enqueue("INSERT a", (1,))
+        sink.enqueue("INSERT a", (2,))
+
+        with patcher:
+            await sink.stop()
+
+        assert cur.execute.await_count == 2
+        stats = sink.get_stats()
+        assert stats["batched"] == 1
+        assert stats["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_write_behind_falls_back_to_direct_write(self):
+        patcher, conn, cur = _mock_db()
+        assert not write_behind_sink.running
+
+        with patcher:
+            await execute_write_behind("INSERT a", (1,))
+
+        cur.execute.assert_awaited_once_with("INSERT a", (1,))
+        conn.commit.assert_awaited_once()